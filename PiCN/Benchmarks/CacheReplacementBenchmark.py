@@ -0,0 +1,86 @@
+"""Measure the hit ratio of the content store for each replacement policy by replaying request traces. Requests follow a
+Zipf-Mandelbrot distribution over a catalogue of names, as generated for the consumers of the mobility simulations;
+in the second workload, a share of the requests are chunks of downloads, each requested only once.
+
+Usage: python3 -m PiCN.Benchmarks.CacheReplacementBenchmark [num_requests] [catalogue_size]
+"""
+
+import bisect
+import random
+import sys
+from typing import Callable, Dict, List
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import ARCPolicy, LFUPolicy, LRUPolicy, WTinyLFUPolicy
+from PiCN.Packets import Content, Name
+from PiCN.Simulations.MobilitySimulations.Helper.ConsumerDistributionHelper import ZipfMandelbrotDistribution
+
+POLICIES: Dict[str, Callable] = {"LRU": LRUPolicy, "LFU": LFUPolicy, "ARC": ARCPolicy, "W-TinyLFU": WTinyLFUPolicy}
+CACHE_SIZES = [0.01, 0.05, 0.1]  # share of the catalogue
+
+
+def zipf_trace(num_requests: int, catalogue_size: int, improve_rank: float = 0.7, power: float = 0.9,
+               seed: int = 0) -> List[Name]:
+    """Names requested by consumers following a Zipf-Mandelbrot distribution
+    :param num_requests: length of the trace
+    :param catalogue_size: number of different names
+    :param improve_rank: parameter q of the distribution
+    :param power: parameter s of the distribution
+    :param seed: seed of the random number generator
+    """
+    distribution = list(ZipfMandelbrotDistribution.create_zipf_mandelbrot_distribution(catalogue_size, improve_rank,
+                                                                                       power))
+    rand = random.Random(seed)
+    names = [Name("/zipf/" + str(i)) for i in range(catalogue_size + 1)]
+    # same as ZipfMandelbrotDistribution.get_next_zipfmandelbrot_random_number, by bisection of the cumulative array
+    return [names[bisect.bisect_left(distribution, 1.0 - rand.random(), 1)] for _ in range(num_requests)]
+
+
+def with_downloads(trace: List[Name], share: float, chunks: int = 50, seed: int = 0) -> List[Name]:
+    """Mix chunked downloads into a trace, each chunk is requested once
+    :param trace: requests of popular content
+    :param share: share of the chunk requests in the resulting trace
+    :param chunks: number of chunks per download
+    :param seed: seed of the random number generator
+    """
+    rand = random.Random(seed)
+    result, download, chunk = [], 0, 0
+    for name in trace:
+        while rand.random() < share:
+            result.append(Name("/download/" + str(download) + "/chunk" + str(chunk)))
+            chunk += 1
+            if chunk == chunks:
+                download, chunk = download + 1, 0
+        result.append(name)
+    return result
+
+
+def replay(cs: ContentStoreMemoryExact, trace: List[Name]) -> float:
+    """Request each name of the trace from the CS like the ICN layer, insert it on a miss
+    :return: share of the requests answered from the CS
+    """
+    hits = 0
+    for name in trace:
+        entry = cs.find_content_object(name)
+        if entry is not None:
+            hits += 1
+            cs.update_timestamp(entry)
+        else:
+            cs.add_content_object(Content(name, b"x"))
+    return hits / len(trace)
+
+
+def main(num_requests: int = 100000, catalogue_size: int = 10000):
+    zipf = zipf_trace(num_requests, catalogue_size)
+    workloads = {"zipf": zipf, "zipf+downloads": with_downloads(zipf, 0.3)}
+    print("%-16s %-8s" % ("workload", "cache") + "".join("%-11s" % p for p in POLICIES))
+    for workload, trace in workloads.items():
+        for size in CACHE_SIZES:
+            capacity = int(catalogue_size * size)
+            ratios = [replay(ContentStoreMemoryExact(cs_timeout=10 ** 9, max_entries=capacity, policy=policy()), trace)
+                      for policy in POLICIES.values()]
+            print("%-16s %-8d" % (workload, capacity) + "".join("%-11.3f" % r for r in ratios))
+
+
+if __name__ == "__main__":
+    main(*[int(a) for a in sys.argv[1:3]])
@@ -0,0 +1,66 @@
+"""Measure the packets per second a LayerStack passes, comparing the multi-process (with and without batching between
+the layers) and the in-process execution mode.
+
+A stack of pass-through layers is set up (3 layers like an ICN Forwarder, 6 like a NFN Forwarder). Content objects are
+put on the queue from higher and read from the queue to lower of the stack.
+
+Usage: python3 -m PiCN.Benchmarks.LayerStackBenchmark [num_packets] [payload_size]
+"""
+
+import multiprocessing
+import sys
+import time
+
+from PiCN.LayerStack import LayerStack
+from PiCN.Packets import Content
+from PiCN.Processes import LayerProcess
+
+
+class PassThroughLayer(LayerProcess):
+    """Layer that forwards all data unchanged"""
+
+    def __init__(self):
+        super().__init__(logger_name="PassThrough")
+
+    def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        to_higher.put(data)
+
+    def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        to_lower.put(data)
+
+
+def run(num_layers: int, in_process: bool, num_packets: int, payload_size: int, batch_size: int = 1) -> float:
+    """Run one benchmark
+    :param num_layers: number of layers in the stack
+    :param in_process: execution mode of the stack
+    :param num_packets: number of packets to pass through the stack
+    :param payload_size: size of the content payload in bytes
+    :param batch_size: batch size between the layers
+    :return: packets per second
+    """
+    lstack = LayerStack([PassThroughLayer() for _ in range(num_layers)], in_process=in_process, batch_size=batch_size)
+    lstack.start_all()
+    packets = [[0, Content("/benchmark/" + str(i), b'x' * payload_size)] for i in range(num_packets)]
+    start = time.perf_counter()
+    for p in packets:
+        lstack.queue_from_higher.put(p)
+    for _ in range(num_packets):
+        lstack.queue_to_lower.get(timeout=30)
+    duration = time.perf_counter() - start
+    lstack.stop_all()
+    lstack.close_all()
+    return num_packets / duration
+
+
+def main(num_packets: int = 5000, payload_size: int = 4096):
+    print("%-8s %-14s %-14s %-14s %s" % ("layers", "multi-process", "batched (32)", "in-process", "speedup"))
+    for num_layers in [3, 6]:
+        mp_pps = run(num_layers, False, num_packets, payload_size)
+        batch_pps = run(num_layers, False, num_packets, payload_size, batch_size=32)
+        ip_pps = run(num_layers, True, num_packets, payload_size)
+        print("%-8d %-14.0f %-14.0f %-14.0f %.2fx" % (num_layers, mp_pps, batch_pps, ip_pps, ip_pps / mp_pps))
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
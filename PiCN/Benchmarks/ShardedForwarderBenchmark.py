@@ -0,0 +1,72 @@
+"""Measure the Interests per second an ICNForwarder answers from its content store over the loopback interface,
+depending on the number of ICN workers (ICNForwarder(icn_workers=N)).
+
+A client keeps a window of Interests for distinct names outstanding, the forwarder answers them from its CS. The
+throughput can only grow with the number of workers if the host has enough cores for the workers and for the link and
+encoding layer processes.
+
+Usage: python3 -m PiCN.Benchmarks.ShardedForwarderBenchmark [num_interests] [max_workers]
+"""
+
+import os
+import socket
+import sys
+import time
+
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+from PiCN.Packets import Content, Interest, Name
+from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
+
+
+def run(icn_workers: int, num_interests: int, num_names: int = 1000, window: int = 64) -> float:
+    """Run one benchmark
+    :param icn_workers: number of ICN workers of the forwarder
+    :param num_interests: number of Interests to be answered
+    :param num_names: number of distinct names in the CS
+    :param window: number of outstanding Interests
+    :return: Interests answered per second
+    """
+    encoder = NdnTlvEncoder()
+    forwarder = ICNForwarder(0, encoder=NdnTlvEncoder(), local_tables=True, icn_workers=icn_workers)
+    port = forwarder.linklayer.interfaces[0].get_port()
+    forwarder.start_forwarder()
+    names = [Name("/benchmark/data/" + str(i)) for i in range(num_names)]
+    for name in names:
+        forwarder.cs.add_content_object(Content(name, "x" * 1024), static=True)
+    interests = [encoder.encode(Interest(name)) for name in names]
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.5)
+    sent = received = 0
+    start = time.perf_counter()
+    while received < num_interests:
+        while sent - received < window and sent < num_interests:
+            sock.sendto(interests[sent % num_names], ("127.0.0.1", port))
+            sent += 1
+        try:
+            sock.recvfrom(8192)
+            received += 1
+        except socket.timeout:
+            sent = received  # Interests were lost, refill the window
+    duration = time.perf_counter() - start
+    sock.close()
+    forwarder.stop_forwarder()
+    return num_interests / duration
+
+
+def main(num_interests: int = 5000, max_workers: int = 4):
+    print("%d cores" % os.cpu_count())
+    print("%-10s %-14s %s" % ("workers", "interests/s", "speedup"))
+    baseline = None
+    workers = 1
+    while workers <= max_workers:
+        pps = run(workers, num_interests)
+        baseline = baseline or pps
+        print("%-10d %-14.0f %.2fx" % (workers, pps, pps / baseline))
+        workers *= 2
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,89 @@
+"""Measure the time from starting a Python interpreter to the first packet fetched from a forwarder, for different
+ways of starting the layers of the Fetch tool:
+
+* fork: one process per layer, forked from the client (default on Linux)
+* forkserver: one process per layer, forked from a fork server that imported the PiCN layers beforehand
+* spawn: one process per layer, each a new interpreter importing PiCN (default on macOS and Windows)
+* in-process: all layers in the client process, no manager process for the tables
+
+Each run starts a new interpreter, so the time includes importing PiCN. The forwarder is started once and answers
+from its content store.
+
+Usage: python3 -m PiCN.Benchmarks.StartupBenchmark [runs]
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+VARIANTS = ["fork", "forkserver", "spawn", "in-process"]
+
+
+def client(port: int, variant: str):
+    """Fetch one content object and print the time of each startup phase as JSON, executed in a new interpreter
+    :param port: port of the forwarder
+    :param variant: one of VARIANTS
+    """
+    start = time.perf_counter()
+    import multiprocessing
+    from PiCN.Processes import use_fork_server
+    if variant == "forkserver":
+        use_fork_server(force=True)
+    elif variant != "in-process":
+        multiprocessing.set_start_method(variant)
+    from PiCN.ProgramLibs.Fetch import Fetch
+    from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+    from PiCN.Packets import Name
+    imported = time.perf_counter()
+    fetch = Fetch("127.0.0.1", port, encoder=NdnTlvEncoder(), in_process_stack=variant == "in-process")
+    started = time.perf_counter()
+    content = fetch.fetch_data(Name("/benchmark/startup"), timeout=10)
+    received = time.perf_counter()
+    fetch.stop_fetch()
+    stopped = time.perf_counter()
+    print(json.dumps({"import": imported - start, "start": started - imported, "first_packet": received - started,
+                      "stop": stopped - received, "ok": content == "data"}))
+
+
+def run(port: int, variant: str) -> dict:
+    """Run the client in a new interpreter
+    :param port: port of the forwarder
+    :param variant: one of VARIANTS
+    :return: times of the startup phases in seconds, "total" is the time until the interpreter exited
+    """
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-m", "PiCN.Benchmarks.StartupBenchmark", "--client", str(port), variant],
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout
+    result = json.loads(out.decode().strip().splitlines()[-1])
+    result["total"] = time.perf_counter() - start
+    return result
+
+
+def main(runs: int = 3):
+    from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+    from PiCN.Packets import Content
+    from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
+    forwarder = ICNForwarder(0, encoder=NdnTlvEncoder(), local_tables=True)
+    port = forwarder.linklayer.interfaces[0].get_port()
+    forwarder.start_forwarder()
+    forwarder.cs.add_content_object(Content("/benchmark/startup", "data"), static=True)
+    try:
+        print("%-12s %-8s %-8s %-14s %-8s %s" % ("variant", "import", "start", "first packet", "stop", "total"))
+        for variant in VARIANTS:
+            results = [run(port, variant) for _ in range(runs)]
+            if not all(r["ok"] for r in results):
+                print("%-12s failed" % variant)
+                continue
+            mean = {k: sum(r[k] for r in results) / runs for k in ["import", "start", "first_packet", "stop", "total"]}
+            print("%-12s %-8.3f %-8.3f %-14.3f %-8.3f %.3f" % (variant, mean["import"], mean["start"],
+                                                              mean["first_packet"], mean["stop"], mean["total"]))
+    finally:
+        forwarder.stop_forwarder()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--client":
+        client(int(sys.argv[2]), sys.argv[3])
+    else:
+        main(*[int(a) for a in sys.argv[1:2]])
@@ -0,0 +1,80 @@
+"""Measure the time of a FIB and CS lookup for the ways the ICN layer can access its tables: through a
+multiprocessing manager proxy (default of the forwarders), directly as owner (local_tables=True) and through a
+TableClient, as used by other processes if the tables are local.
+
+Usage: python3 -m PiCN.Benchmarks.TableAccessBenchmark [num_lookups] [num_entries]
+"""
+
+import sys
+import time
+
+from PiCN.LayerStack import LayerStack
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Packets import Content, Name
+from PiCN.Processes import LayerProcess, PiCNSyncDataStructFactory, TableChannel
+
+
+class IdleLayer(LayerProcess):
+    """Layer that only serves its tables"""
+
+    def __init__(self):
+        super().__init__(logger_name="IdleLayer")
+
+    def data_from_lower(self, to_lower, to_higher, data):
+        pass
+
+    def data_from_higher(self, to_lower, to_higher, data):
+        pass
+
+
+def fill(cs, fib, num_entries: int):
+    for i in range(num_entries):
+        fib.add_fib_entry(Name("/prefix/" + str(i)), [i], True)
+        cs.add_content_object(Content("/prefix/" + str(i) + "/data", "x"), static=True)
+
+
+def measure(cs, fib, num_lookups: int, num_entries: int) -> float:
+    """Lookup FIB and CS num_lookups times
+    :return: mean time of one FIB plus CS lookup in microseconds
+    """
+    names = [Name("/prefix/" + str(i % num_entries) + "/data") for i in range(num_lookups)]
+    start = time.perf_counter()
+    for name in names:
+        fib.find_fib_entry(name)
+        cs.find_content_object(name)
+    return (time.perf_counter() - start) / num_lookups * 1e6
+
+
+def main(num_lookups: int = 2000, num_entries: int = 100):
+    factory = PiCNSyncDataStructFactory()
+    factory.register("cs", ContentStoreMemoryExact)
+    factory.register("fib", ForwardingInformationBaseMemoryPrefix)
+    factory.create_manager()
+    proxy_cs, proxy_fib = factory.manager.cs(), factory.manager.fib()
+    fill(proxy_cs, proxy_fib, num_entries)
+
+    local_cs, local_fib = ContentStoreMemoryExact(), ForwardingInformationBaseMemoryPrefix()
+    fill(local_cs, local_fib, num_entries)
+
+    channel = TableChannel()
+    layer = IdleLayer()
+    channel.attach(layer, {"cs": local_cs, "fib": local_fib})
+    client_cs, client_fib = channel.client("cs"), channel.client("fib")
+    lstack = LayerStack([layer])
+    lstack.start_all()
+
+    print("%-16s %s" % ("access", "us per FIB+CS lookup"))
+    print("%-16s %.1f" % ("manager proxy", measure(proxy_cs, proxy_fib, num_lookups, num_entries)))
+    print("%-16s %.1f" % ("local (owner)", measure(local_cs, local_fib, num_lookups, num_entries)))
+    print("%-16s %.1f" % ("table client", measure(client_cs, client_fib, num_lookups, num_entries)))
+
+    lstack.stop_all()
+    lstack.close_all()
+    channel.close()
+    factory.manager.shutdown()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
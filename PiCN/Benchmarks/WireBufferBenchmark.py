@@ -0,0 +1,58 @@
+"""Measure the packets per second a multi-process LayerStack passes for content objects holding their payload as bytes
+and for content objects referencing their wire format in a WireBufferArena (ICNForwarder(wire_buffers=True)).
+
+The link layer receives packets directly into the arena, so the benchmark writes each wire format once and passes
+content objects referencing it through a stack of 3 pass-through layers.
+
+Usage: python3 -m PiCN.Benchmarks.WireBufferBenchmark [num_packets]
+"""
+
+import sys
+import time
+
+from PiCN.Benchmarks.LayerStackBenchmark import PassThroughLayer
+from PiCN.LayerStack import LayerStack
+from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
+from PiCN.Packets import Content, Name
+from PiCN.Processes import WireBufferArena
+
+
+def run(packets: list) -> float:
+    """Pass packets through a stack of 3 layers
+    :return: packets per second
+    """
+    lstack = LayerStack([PassThroughLayer() for _ in range(3)])
+    lstack.start_all()
+    start = time.perf_counter()
+    for p in packets:
+        lstack.queue_from_higher.put(p)
+    for _ in range(len(packets)):
+        lstack.queue_to_lower.get(timeout=30)
+    duration = time.perf_counter() - start
+    lstack.stop_all()
+    lstack.close_all()
+    return len(packets) / duration
+
+
+def main(num_packets: int = 3000):
+    encoder = NdnTlvEncoder()
+    arena = WireBufferArena()
+    print("%-14s %-14s %-14s %s" % ("payload size", "bytes", "wire buffer", "speedup"))
+    for payload_size in [1024, 8192, 65536]:
+        name = Name("/benchmark/data")
+        wire_format = encoder.encode(Content(name, b'x' * payload_size))
+        wire_buffer = arena.write(wire_format)
+        _, payload_start, payload_end = encoder.decode_data_range(wire_format)
+        bytes_packets = [[0, Content(name, wire_format[payload_start:payload_end], wire_format)]
+                         for _ in range(num_packets)]
+        buffer_packets = [[0, Content.from_wire_buffer(name, wire_buffer, payload_start, payload_end)]
+                          for _ in range(num_packets)]
+        bytes_pps = run(bytes_packets)
+        buffer_pps = run(buffer_packets)
+        print("%-14d %-14.0f %-14.0f %.2fx" % (payload_size, bytes_pps, buffer_pps, buffer_pps / bytes_pps))
+    arena.close()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    main(*args)
@@ -0,0 +1 @@
+"""Package that contains runnable benchmarks for PiCN components"""
\ No newline at end of file
@@ -8,8 +8,7 @@ from PiCN.Packets import Name
 from PiCN.ProgramLibs.Fetch import Fetch
 from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder
-from PiCN.Layers.NFNLayer.Parser import DefaultNFNParser
-from PiCN.Layers.NFNLayer.NFNOptimizer import BaseNFNOptimizer
+from PiCN.Processes import use_fork_server
 
 def main(args):
     name_str = args.name
@@ -27,7 +26,10 @@ def main(args):
     log_level = 255
 
     encoder = NdnTlvEncoder() if args.format == 'ndntlv' else SimpleStringEncoder()
-    fetchTool = Fetch(ip=args.ip, port=args.port, log_level=log_level, encoder=encoder, autoconfig=args.autoconfig)
+    if args.layer_processes:
+        use_fork_server()
+    fetchTool = Fetch(ip=args.ip, port=args.port, log_level=log_level, encoder=encoder, autoconfig=args.autoconfig,
+                      in_process_stack=not args.layer_processes)
 
     content = fetchTool.fetch_data(name, timeout=10)
     print(content)
@@ -60,6 +62,10 @@ def unescape_str_to_Name(name: str) -> Name:
     return name
 
 def parse_nfn_str(name: str) -> Name:
+    # NFN support is only imported if an NFN expression is fetched
+    from PiCN.Layers.NFNLayer.Parser import DefaultNFNParser
+    from PiCN.Layers.NFNLayer.NFNOptimizer import BaseNFNOptimizer
+
     name = name.replace("""'""", "")
     parser = DefaultNFNParser()
     optimizer = BaseNFNOptimizer(None, None, None, None)
@@ -88,6 +94,8 @@ if __name__ == "__main__":
     parser.add_argument('--format', choices=['ndntlv', 'simple'], type=str,
                         default='ndntlv', help='default is: "ndntlv"')
     parser.add_argument('-a', '--autoconfig', action='store_true')
+    parser.add_argument('--layer-processes', action='store_true',
+                        help="run each layer in its own process instead of a single process")
     parser.add_argument('ip', type=str,
                         help="IP addr of forwarder")
     parser.add_argument('port', type=int,
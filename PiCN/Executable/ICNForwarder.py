@@ -8,11 +8,14 @@ from PiCN.Executable.Helpers.ConfigParser import ConfigParser
 from PiCN.Executable.Helpers.ConfigParser.ConfigParser import CouldNotOpenConfigError, CouldNotParseError, MalformedConfigurationError
 from PiCN.Logger import Logger
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import LRUPolicy, LFUPolicy, ARCPolicy, WTinyLFUPolicy
+from PiCN.Processes import use_fork_server
 
 # default arguments
 default_port = 9000
 default_format = "ndntlv"
 default_logging = "info"
+cs_policies = {"lru": LRUPolicy, "lfu": LFUPolicy, "arc": ARCPolicy, "wtinylfu": WTinyLFUPolicy}
 
 def main(args):
     logger = Logger("ICNForwarder", logging.DEBUG) # note: set later according to cli/config arguments
@@ -72,8 +75,11 @@ def main(args):
     # Packet encoder
     encoder = NdnTlvEncoder(log_level) if args.format == 'ndntlv' else SimpleStringEncoder(log_level)
 
-    # Start
-    forwarder = PiCN.ProgramLibs.ICNForwarder.ICNForwarder(args.port, log_level, encoder, autoconfig=args.autoconfig)
+    # Start, layer processes are forked from a prewarmed fork server where new interpreters would be spawned
+    use_fork_server()
+    forwarder = PiCN.ProgramLibs.ICNForwarder.ICNForwarder(args.port, log_level, encoder, autoconfig=args.autoconfig,
+                                                           cs_max_entries=args.cs_entries, cs_max_bytes=args.cs_bytes,
+                                                           cs_policy=cs_policies[args.cs_policy](), cs_db_path=args.cs_db)
     forwarder.start_forwarder()
     forwarder.linklayer.process.join()
 
@@ -84,6 +90,10 @@ if __name__ == "__main__":
     parser.add_argument('-f', '--format', choices=['ndntlv', 'simple'], type=str, default=None, help=f'Packet Format (default: {default_format})')
     parser.add_argument('-c', '--config', type=str, default="none", help="Path to configuration file")
     parser.add_argument('-a', '--autoconfig', action='store_true', help='Enable autoconfig server')
+    parser.add_argument('--cs-entries', type=int, default=0, help='Maximum number of content objects in the content store (default: unlimited)')
+    parser.add_argument('--cs-bytes', type=int, default=0, help='Maximum size of the content store in bytes (default: unlimited)')
+    parser.add_argument('--cs-db', type=str, default=None, help='Directory of a disk tier of the content store, which receives the content evicted from memory (default: none)')
+    parser.add_argument('--cs-policy', choices=list(cs_policies), type=str, default='lru', help='Replacement policy of the content store (default: lru)')
     parser.add_argument('-l', '--logging', choices=['debug', 'info', 'warning', 'error', 'none'], type=str, default=None, help=f'Logging Level (default: {default_logging})')
     args = parser.parse_args()
     main(args)
@@ -46,6 +46,14 @@ def main(args, help_string):
         except:
             print(help_string)
 
+    elif args.command == "removeface":
+        try:
+            data = mgmt_client.remove_face(int(args.parameters))
+        except ConnectionRefusedError:
+            print("Connection Refused. Forwarder not running?")
+        except:
+            print(help_string)
+
     elif args.command == "newforwardingrule":
         try:
             faceids_str = args.parameters.split(":")[1].split(",")
@@ -73,7 +81,7 @@ if __name__ == "__main__":
     parser.add_argument('-i', '--ip', type=str, default='127.0.0.1',
                             help="IP address or hostname of forwarder (default: 127.0.0.1)")
     parser.add_argument('-p', '--port', type=int, default=9000, help="UDP port of forwarder(default: 9000)")
-    parser.add_argument('command', type=str, choices = ['shutdown', 'getrepoprefix', 'getrepopath', 'newface', 'newforwardingrule', 'newcontent'], help="Management Command")
+    parser.add_argument('command', type=str, choices = ['shutdown', 'getrepoprefix', 'getrepopath', 'newface', 'removeface', 'newforwardingrule', 'newcontent'], help="Management Command")
     parser.add_argument('parameters', type=str, nargs='?', help="Command Parameter")
     args = parser.parse_args()
     help_string = parser.format_help()
@@ -84,5 +92,6 @@ if __name__ == "__main__":
 # print("\t\tgetrepopath")
 # print("\t\tgetrepoprefix")
 # print("\t\tnewface ip:port")
+# print("\t\tremoveface faceid")
 # print("\t\tnewforwardingrule prefix:face[, face]")
 # print("\t\tnewcontent name:content")
\ No newline at end of file
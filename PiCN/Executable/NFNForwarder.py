@@ -8,6 +8,7 @@ import PiCN.ProgramLibs.NFNForwarder
 from PiCN.Logger import Logger
 from PiCN.Layers.NFNLayer.NFNOptimizer import EdgeComputingOptimizer, MapReduceOptimizer, EagerOptimizer
 from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvEncoder
+from PiCN.Processes import use_fork_server
 
 def main(argv):
 
@@ -33,6 +34,8 @@ def main(argv):
     # Packet encoder
     encoder = NdnTlvEncoder(log_level) if args.format == 'ndntlv' else SimpleStringEncoder(log_level)
 
+    # layer processes are forked from a prewarmed fork server where new interpreters would be spawned
+    use_fork_server()
 
     if args.optimizer == "Edge":
         forwarder = PiCN.ProgramLibs.NFNForwarder.NFNForwarder(args.port, log_level, encoder, ageing_interval=1)
@@ -1,9 +1,13 @@
 """Data Structure for managing LayerProcesses and their queues"""
 
 import multiprocessing
-from typing import List
+import os
+import selectors
+import threading
+from typing import Dict, List
 
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, InProcessQueue, AsyncioLayerRuntime, BatchingQueue, ShardedQueue, \
+    BoundedQueue, DropPolicy
 
 
 class LayerStack(object):
@@ -11,13 +15,52 @@ class LayerStack(object):
     Data structure for managing LayerProcesses and their queues
     """
 
-    def __init__(self, layers: List[LayerProcess]):
+    def __init__(self, layers: List[LayerProcess], in_process: bool = False, use_asyncio: bool = False,
+                 batch_size: int = 1, max_batch_delay: float = 0.001, queue_capacity: int = 0,
+                 high_watermark: int = None, low_watermark: int = None,
+                 drop_policy: DropPolicy = DropPolicy.DROP_INTERESTS):
         """
         Create a layer stack from a list of layers, where the topmost layer is the first element in the list.
         :param layers: List of layers to stack onto each other.
+        :param in_process: If true, all layers are driven by a single thread of the current process and the queues
+                           between the layers are in-memory deques. Packets between layers are not pickled. The queues
+                           to and from the outside of the stack remain multiprocessing queues.
+        :param use_asyncio: If true, the layers are driven by an asyncio event loop (one per layer process, or one for
+                            the whole stack in in-process mode), which also executes the periodic tasks of the layers.
+        :param batch_size: Maximum number of messages a layer takes from a queue per wakeup. If larger than 1 and the
+                           layers run in separate processes, items put by a layer into a queue between two layers are
+                           collected and sent as one PacketBatch of up to batch_size items.
+        :param max_batch_delay: Maximum time in seconds an item is held back for batching.
+        :param queue_capacity: If larger than 0 and the layers run in separate processes, the queues between two layers
+                               hold at most queue_capacity messages. Packets put into a full or congested queue are
+                               dropped, a dropped Interest is answered with a Nack (reason CONGESTION), see BoundedQueue.
+        :param high_watermark: Number of messages at which a bounded queue becomes congested, default 3/4 of the capacity.
+        :param low_watermark: Number of messages at which a bounded queue is no longer congested, default half of the
+                              high watermark.
+        :param drop_policy: Packets dropped by a congested queue.
+        Layers with a num_shards attribute larger than 1 (e.g. the ShardedICNLayer) run in several processes, the queues
+        to them are ShardedQueues dispatching each item with the shard_of method of the layer.
         """
         self.layers: List[LayerProcess] = []
         self.queues: List[multiprocessing.Queue] = []
+        self._in_process: bool = in_process
+        self._use_asyncio: bool = use_asyncio
+        self._batch_size: int = batch_size
+        self._max_batch_delay: float = max_batch_delay
+        self._queue_capacity: int = 0 if in_process else queue_capacity
+        self._high_watermark: int = high_watermark
+        self._low_watermark: int = low_watermark
+        self._drop_policy: DropPolicy = drop_policy
+        self.bounded_queues: Dict[str, BoundedQueue] = {}
+        self._asyncio_runtime: AsyncioLayerRuntime = None
+        self._runner: threading.Thread = None
+        self._running: bool = False
+        self._wakeup_reader: int = None
+        self._wakeup_writer: int = None
+        if in_process:
+            self._wakeup_reader, self._wakeup_writer = os.pipe()
+            os.set_blocking(self._wakeup_reader, False)
+            os.set_blocking(self._wakeup_writer, False)
         self._queue_to_higher = multiprocessing.Queue()
         self._queue_from_higher = multiprocessing.Queue()
         self._queue_to_lower = multiprocessing.Queue()
@@ -30,8 +73,8 @@ class LayerStack(object):
             upper = layers[i]
             lower = layers[i + 1]
             # Create two queues for communication
-            q_to_upper = multiprocessing.Queue()
-            q_to_lower = multiprocessing.Queue()
+            q_to_upper = self._create_queue()
+            q_to_lower = self._create_queue()
             upper.queue_to_lower = q_to_lower
             upper.queue_from_lower = q_to_upper
             lower.queue_to_higher = q_to_upper
@@ -42,10 +85,14 @@ class LayerStack(object):
             self.queues.append(q_to_lower)
         # Append last layer to resource list
         self.layers.append(layers[len(layers)-1])
+        for layer in self.layers:
+            layer.driven_by_stack = in_process
+            layer.use_asyncio = use_asyncio
         self.layers[0].queue_to_higher = self.queue_to_higher
         self.layers[0].queue_from_higher = self.queue_from_higher
         self.layers[len(self.layers)-1].queue_to_lower = self.queue_to_lower
         self.layers[len(self.layers)-1].queue_from_lower = self.queue_from_lower
+        self._shard_queues()
 
     def insert(self, layer: LayerProcess, on_top_of: LayerProcess = None, below_of: LayerProcess = None):
         """
@@ -91,20 +138,53 @@ class LayerStack(object):
         self._queue_from_higher.close()
         self._queue_to_lower.close()
         self._queue_from_lower.close()
+        if self._wakeup_reader is not None:
+            os.close(self._wakeup_reader)
+            os.close(self._wakeup_writer)
+            self._wakeup_reader = None
+            self._wakeup_writer = None
 
     def start_all(self):
         """
-        Utility function to start all LayerProcesses managed by the LayerStack.
+        Utility function to start all LayerProcesses managed by the LayerStack. In in-process mode, a single thread
+        is started that drives all layers.
         """
         self.__started = True
+        if self._queue_capacity > 0:
+            self._bound_queues()
+        for layer in self.layers:
+            layer.batch_size = self._batch_size
+            if self._batch_size > 1 and not self._in_process:
+                layer.queue_to_lower = self._batching(layer.queue_to_lower)
+                layer.queue_to_higher = self._batching(layer.queue_to_higher)
         [l.start_process() for l in self.layers]
+        if self._in_process:
+            self._running = True
+            if self._use_asyncio:
+                self._asyncio_runtime = AsyncioLayerRuntime(self.layers, self.queues, self._wakeup_reader)
+                self._runner = threading.Thread(target=self._asyncio_runtime.run, daemon=True)
+            else:
+                self._runner = threading.Thread(target=self._run_in_process, daemon=True)
+            self._runner.start()
 
     def stop_all(self):
         """
         Utility function to stop all LayerProcesses managed by the LayerStack.
         """
+        if self._in_process and self._runner is not None:
+            self._running = False
+            if self._asyncio_runtime is not None:
+                self._asyncio_runtime.stop()
+            self._wakeup()
+            self._runner.join(timeout=1.0)
+            self._runner = None
         [l.stop_process() for l in self.layers]
 
+    @property
+    def in_process(self) -> bool:
+        """True if all layers of the stack are driven by one thread of the current process"""
+        return self._in_process
+
     @property
     def queue_to_higher(self):
         return self._queue_to_higher
@@ -149,6 +229,141 @@ class LayerStack(object):
         self.queue_from_lower = queue
         self.layers[len(self.layers)-1].queue_from_lower = queue
 
+    def queue_stats(self) -> Dict[str, dict]:
+        """Counters of the bounded queues between the layers, see BoundedQueue.stats
+        :return: the counters by queue, named "<producer layer>-><consumer layer>"
+        """
+        return {name: q.stats() for name, q in self.bounded_queues.items()}
+
+    def _create_queue(self):
+        """Create a queue between two layers of the stack"""
+        if self._in_process:
+            return InProcessQueue(wakeup_fd=self._wakeup_writer)
+        return multiprocessing.Queue(self._queue_capacity)
+
+    def _bound_queues(self):
+        """Let the layers put into the queues between them through BoundedQueues"""
+        for upper, lower in zip(self.layers, self.layers[1:]):
+            down, up = upper.queue_to_lower, lower.queue_to_higher
+            upper.queue_to_lower = self._bounded(upper, lower, down, up)
+            lower.queue_to_higher = self._bounded(lower, upper, up, down)
+
+    def _bounded(self, producer: LayerProcess, consumer: LayerProcess, queue, reverse) -> BoundedQueue:
+        """Producer side of a bounded queue, Nacks for dropped Interests are put into the reverse queue"""
+        bounded = BoundedQueue(queue, reverse, self._queue_capacity, self._high_watermark, self._low_watermark,
+                               self._drop_policy)
+        name = type(producer).__name__ + "->" + type(consumer).__name__
+        if name in self.bounded_queues:  # stack of several layers of the same type
+            name += "#" + str(sum(1 for n in self.bounded_queues if n.split("#")[0] == name) + 1)
+        self.bounded_queues[name] = bounded
+        return bounded
+
+    def _shard_queues(self):
+        """Let the queues to sharded layers dispatch to the shards, replace sharded queues to other layers"""
+        if self._in_process and any(getattr(l, "num_shards", 1) > 1 for l in self.layers):
+            raise ValueError("Sharded layers can not be driven by an in-process LayerStack")
+        last = len(self.layers) - 1
+        for i, layer in enumerate(self.layers):
+            q = self._queue_for(layer, layer.queue_from_higher, inner=i > 0)
+            layer.queue_from_higher = q
+            if i > 0:
+                self.layers[i - 1].queue_to_lower = q
+            else:
+                self._queue_from_higher = q
+            q = self._queue_for(layer, layer.queue_from_lower, inner=i < last)
+            layer.queue_from_lower = q
+            if i < last:
+                self.layers[i + 1].queue_to_higher = q
+            else:
+                self._queue_from_lower = q
+
+    def _queue_for(self, consumer: LayerProcess, queue, inner: bool):
+        """The queue to a layer, replaced by a new queue if it does not match the sharding of the layer"""
+        num_shards = getattr(consumer, "num_shards", 1)
+        if isinstance(queue, ShardedQueue) == (num_shards > 1) and \
+                (num_shards == 1 or len(queue.shards) == num_shards):
+            return queue
+        if num_shards > 1:
+            capacity = self._queue_capacity if inner else 0
+            new_queue = ShardedQueue([multiprocessing.Queue(capacity) for _ in range(num_shards)], consumer.shard_of)
+        else:
+            new_queue = self._create_queue() if inner else multiprocessing.Queue()
+        if inner:
+            self.queues = [new_queue if q is queue else q for q in self.queues]
+        queue.close()
+        return new_queue
+
+    def _batching(self, queue):
+        """Wrap a queue between two layers into a BatchingQueue, queues to the outside of the stack are not batched"""
+        if any(getattr(queue, "queue", queue) is q for q in self.queues):
+            return BatchingQueue(queue, self._batch_size, self._max_batch_delay)
+        return queue
+
+    def _wakeup(self):
+        """Interrupt the select call of the in-process runner"""
+        try:
+            os.write(self._wakeup_writer, b'\x00')
+        except (BlockingIOError, OSError, TypeError):
+            pass
+
+    def _run_in_process(self):
+        """
+        Execution loop of an in-process LayerStack. Items on the in-memory queues are handed to the layers directly,
+        the loop only blocks in select if all in-memory queues are empty, and fires the timers of the layers (including
+        the periodic tasks of layers with periodic_in_loop set).
+        """
+        for q in self.queues:
+            q.bind_to_current_thread()
+        sources = {}
+        for layer in self.layers:
+            for source in layer.in_process_sources():
+                sources[source] = layer
+            if layer.periodic_in_loop:
+                layer.schedule_periodic_tasks()
+        # poll instead of select, which cannot wait for file descriptors above FD_SETSIZE (e.g. in a process which
+        # started many layer stacks)
+        selector = selectors.DefaultSelector()
+        for selectable in list(sources.keys()) + [self._wakeup_reader]:
+            selector.register(selectable, selectors.EVENT_READ)
+        try:
+            self._loop_in_process(selector, sources)
+        finally:
+            selector.close()
+
+    def _loop_in_process(self, selector: selectors.BaseSelector, sources: Dict):
+        """loop of _run_in_process, waiting for the registered sources with the selector"""
+        while self._running:
+            busy = False
+            for layer in self.layers:
+                try:
+                    busy = layer.dispatch_in_process() or busy
+                except Exception as e:
+                    layer.logger.error("Exception in in-process layer stack: " + str(e))
+                    busy = True
+            timeouts = [t for t in (layer.timers.next_timeout() for layer in self.layers) if t is not None]
+            timeout = 0 if busy else min(timeouts, default=None)
+            try:
+                ready = [key.fileobj for key, _ in selector.select(timeout)]
+            except (OSError, ValueError):
+                return
+            for layer in self.layers:
+                try:
+                    layer.timers.expire()
+                except Exception as e:
+                    layer.logger.warning("Exception during timer: " + str(e))
+            for source in ready:
+                if source == self._wakeup_reader:
+                    try:
+                        while os.read(self._wakeup_reader, 4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                try:
+                    sources[source].handle_in_process_source(source)
+                except Exception as e:
+                    sources[source].logger.error("Exception in in-process layer stack: " + str(e))
+
     def __insert(self, layer: LayerProcess, at: int):
         # Get the layers between which to insert the new layer
         layer_above = self.layers[at - 1] if at > 0 else None
@@ -160,7 +375,7 @@ class LayerStack(object):
             queues.append(layer_above.queue_from_lower)
         # Create two new queues needed for connecting the new layer to the stack.
         for x in range(2):
-            q = multiprocessing.Queue()
+            q = self._create_queue()
             self.queues.append(q)
             queues.append(q)
         # Set up queues to the layer above
@@ -181,7 +396,10 @@ class LayerStack(object):
             layer_below.queue_from_higher = q_down
         # Insert the new layer at the wanted position
         self.layers.insert(at, layer)
+        layer.driven_by_stack = self._in_process
+        layer.use_asyncio = self._use_asyncio
         self.layers[0].queue_to_higher = self.queue_to_higher
         self.layers[0].queue_from_higher = self.queue_from_higher
         self.layers[len(self.layers)-1].queue_to_lower = self.queue_to_lower
         self.layers[len(self.layers)-1].queue_from_lower = self.queue_from_lower
+        self._shard_queues()
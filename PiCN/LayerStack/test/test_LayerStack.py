@@ -1,9 +1,42 @@
 
+import threading
 import unittest
 
+from multiprocessing import Queue
+
 from PiCN.LayerStack import LayerStack
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
-from PiCN.Processes import LayerProcess
+from PiCN.Packets import Interest, Nack, NackReason
+from PiCN.Processes import LayerProcess, InProcessQueue, BatchingQueue, ShardedQueue, BoundedQueue
+
+
+class ForwardingLayerMock(LayerProcess):
+    """ Mock implementation of a LayerProcess that passes data through and counts it"""
+    def __init__(self):
+        LayerProcess.__init__(self)
+        self.passed = 0
+
+    def data_from_lower(self, to_lower: Queue, to_higher: Queue, data):
+        self.passed += 1
+        to_higher.put(data)
+
+    def data_from_higher(self, to_lower: Queue, to_higher: Queue, data):
+        self.passed += 1
+        to_lower.put(data)
+
+
+class TickLayerMock(ForwardingLayerMock):
+    """ Mock implementation of a layer with a periodic task"""
+    def periodic_tasks(self):
+        return [(0.1, lambda: self.queue_to_higher.put("tick"))]
+
+
+class ShardedLayerMock(ForwardingLayerMock):
+    """ Mock implementation of a layer running in two shards, items are dispatched by their first element"""
+    num_shards = 2
+
+    def shard_of(self, data):
+        return data[0] % 2
 
 
 class test_LayerStack(unittest.TestCase):
@@ -82,6 +115,167 @@ class test_LayerStack(unittest.TestCase):
         self.assertNotEqual(toplayer.queue_to_lower, bottomlayer.queue_from_higher)
         self.assertNotEqual(toplayer.queue_from_lower, bottomlayer.queue_to_higher)
 
+    def test_create_in_process(self):
+        toplayer: LayerProcess = ForwardingLayerMock()
+        bottomlayer: LayerProcess = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], in_process=True)
+        self.assertTrue(lstack.in_process)
+        self.assertTrue(toplayer.driven_by_stack)
+        self.assertTrue(bottomlayer.driven_by_stack)
+        self.assertIsInstance(toplayer.queue_to_lower, InProcessQueue)
+        self.assertIsInstance(toplayer.queue_from_lower, InProcessQueue)
+        self.assertNotIsInstance(lstack.queue_from_higher, InProcessQueue)
+        lstack.close_all()
+
+    def test_in_process_passing(self):
+        toplayer = ForwardingLayerMock()
+        middlelayer = ForwardingLayerMock()
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, middlelayer, bottomlayer], in_process=True)
+        lstack.start_all()
+        try:
+            self.assertIsNone(toplayer.process)
+            lstack.queue_from_higher.put([1, "down"])
+            self.assertEqual([1, "down"], lstack.queue_to_lower.get(timeout=2.0))
+            lstack.queue_from_lower.put([2, "up"])
+            self.assertEqual([2, "up"], lstack.queue_to_higher.get(timeout=2.0))
+            self.assertEqual(2, middlelayer.passed)
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_in_process_periodic(self):
+        toplayer = TickLayerMock()
+        toplayer.periodic_in_loop = True
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], in_process=True)
+        lstack.start_all()
+        try:
+            self.assertEqual("tick", lstack.queue_to_higher.get(timeout=2.0))
+            self.assertEqual("tick", lstack.queue_to_higher.get(timeout=2.0))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_in_process_put_from_other_thread(self):
+        toplayer = ForwardingLayerMock()
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], in_process=True)
+        lstack.start_all()
+        try:
+            t = threading.Timer(0.1, toplayer.queue_to_lower.put, args=[[3, "timer"]])
+            t.start()
+            self.assertEqual([3, "timer"], lstack.queue_to_lower.get(timeout=2.0))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_batched_passing(self):
+        toplayer = ForwardingLayerMock()
+        middlelayer = ForwardingLayerMock()
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, middlelayer, bottomlayer], batch_size=8)
+        lstack.start_all()
+        try:
+            self.assertIsInstance(toplayer.queue_to_lower, BatchingQueue)
+            self.assertIsInstance(middlelayer.queue_to_higher, BatchingQueue)
+            self.assertNotIsInstance(toplayer.queue_to_higher, BatchingQueue)
+            self.assertNotIsInstance(bottomlayer.queue_to_lower, BatchingQueue)
+            for i in range(20):
+                lstack.queue_from_higher.put([i, "down"])
+            for i in range(20):
+                self.assertEqual([i, "down"], lstack.queue_to_lower.get(timeout=2.0))
+            lstack.queue_from_lower.put([1, "up"])
+            self.assertEqual([1, "up"], lstack.queue_to_higher.get(timeout=2.0))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_bounded_passing(self):
+        toplayer = ForwardingLayerMock()
+        middlelayer = TickLayerMock()
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, middlelayer, bottomlayer], queue_capacity=64)
+        lstack.start_all()
+        try:
+            self.assertIsInstance(toplayer.queue_to_lower, BoundedQueue)
+            self.assertIsInstance(bottomlayer.queue_to_higher, BoundedQueue)
+            self.assertNotIsInstance(toplayer.queue_to_higher, BoundedQueue)
+            self.assertNotIsInstance(bottomlayer.queue_to_lower, BoundedQueue)
+            self.assertEqual(["ForwardingLayerMock->TickLayerMock", "TickLayerMock->ForwardingLayerMock",
+                              "TickLayerMock->ForwardingLayerMock#2", "ForwardingLayerMock->TickLayerMock#2"],
+                             list(lstack.queue_stats().keys()))
+            for i in range(20):
+                lstack.queue_from_higher.put([i, Interest("/test/" + str(i))])
+            for i in range(20):
+                self.assertEqual("/test/" + str(i), lstack.queue_to_lower.get(timeout=2.0)[1].name.components_to_string())
+            self.assertEqual(0, sum(stats["dropped"] for stats in lstack.queue_stats().values()))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_bounded_congestion(self):
+        toplayer = ForwardingLayerMock()
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, bottomlayer], queue_capacity=4, high_watermark=2)
+        lstack.start_all()
+        bottomlayer.stop_process()
+        try:
+            for i in range(3):
+                lstack.queue_from_higher.put([i, Interest("/test/" + str(i))])
+            nack = lstack.queue_to_higher.get(timeout=2.0)
+            self.assertEqual(2, nack[0])
+            self.assertIsInstance(nack[1], Nack)
+            self.assertEqual(NackReason.CONGESTION, nack[1].reason)
+            stats = lstack.queue_stats()["ForwardingLayerMock->ForwardingLayerMock"]
+            self.assertEqual(1, stats["dropped"])
+            self.assertEqual(1, stats["congestion_nacks"])
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_in_process_unbounded(self):
+        lstack: LayerStack = LayerStack([ForwardingLayerMock(), ForwardingLayerMock()], in_process=True,
+                                        queue_capacity=4)
+        lstack.start_all()
+        try:
+            self.assertEqual({}, lstack.queue_stats())
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
+
+    def test_create_sharded(self):
+        toplayer = ForwardingLayerMock()
+        shardedlayer = ShardedLayerMock()
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([toplayer, shardedlayer, bottomlayer])
+        self.assertIsInstance(shardedlayer.queue_from_higher, ShardedQueue)
+        self.assertIsInstance(shardedlayer.queue_from_lower, ShardedQueue)
+        self.assertEqual(toplayer.queue_to_lower, shardedlayer.queue_from_higher)
+        self.assertEqual(bottomlayer.queue_to_higher, shardedlayer.queue_from_lower)
+        self.assertNotIsInstance(toplayer.queue_from_lower, ShardedQueue)
+        self.assertNotIsInstance(bottomlayer.queue_from_higher, ShardedQueue)
+        self.assertEqual(4, len(lstack.queues))
+        shardedlayer.queue_from_lower.put([3, "up"])
+        self.assertEqual([3, "up"], shardedlayer.queue_from_lower.shards[1].get(timeout=2.0))
+        lstack.close_all()
+
+    def test_insert_below_sharded(self):
+        shardedlayer = ShardedLayerMock()
+        bottomlayer = ForwardingLayerMock()
+        lstack: LayerStack = LayerStack([shardedlayer, bottomlayer])
+        self.assertIsInstance(lstack.queue_from_higher, ShardedQueue)
+        newlayer = ForwardingLayerMock()
+        lstack.insert(newlayer, below_of=shardedlayer)
+        self.assertIsInstance(newlayer.queue_to_higher, ShardedQueue)
+        self.assertEqual(newlayer.queue_to_higher, shardedlayer.queue_from_lower)
+        self.assertNotIsInstance(newlayer.queue_from_lower, ShardedQueue)
+        self.assertEqual(bottomlayer.queue_to_higher, newlayer.queue_from_lower)
+        lstack.close_all()
+
+    def test_in_process_sharded(self):
+        self.assertRaises(ValueError, LayerStack, [ShardedLayerMock(), ForwardingLayerMock()], in_process=True)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -54,8 +54,8 @@ class BasicChunkLayer(LayerProcess):
             return
         if isinstance(packet, Content):
             self.logger.info("Packet is Content (name=%s, %d bytes)" % \
-                                      (str(packet.name), len(packet.content)))
-            if len(packet.content) < self.chunk_size:
+                                      (str(packet.name), packet.payload_size))
+            if packet.payload_size < self.chunk_size:
                 to_lower.put([faceid, packet])
             else:
                 self.logger.info("Chunking Packet")
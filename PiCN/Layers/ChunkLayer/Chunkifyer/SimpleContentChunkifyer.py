@@ -15,8 +15,8 @@ class SimpleContentChunkifyer(BaseChunkifyer):
     def chunk_data(self, packet: Content) -> (List[Content], List[Content]):
         """Split content to chunks and generate metadata"""
         name = packet.name
-        data = packet.content
-        content_size = len(packet.content)
+        data = packet.payload  # chunked as bytes, so binary payloads are not decoded
+        content_size = len(data)
         chunks = [data[i:i + self._chunksize] for i in range(0, len(data), self._chunksize)]
         num_of_chunks = len(chunks)
         meta_data = []
@@ -37,10 +37,7 @@ class SimpleContentChunkifyer(BaseChunkifyer):
 
 
     def reassamble_data(self, name: Name, chunks: List[Content]) -> Content:
-        data = ""
-        for d in chunks:
-            data = data + d.content
-        return Content(name, data)
+        return Content(name, b"".join(d.payload for d in chunks))
 
 
     def generate_meta_data(self, startindex: int, endindex: int, md_num: int, next: int, name: Name, content_size: int)\
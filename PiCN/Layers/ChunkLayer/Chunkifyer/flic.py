@@ -36,7 +36,7 @@ class MkFlic():
         # the non-root manifest or data nodes)
 
         subname = copy.deepcopy(name)
-        subname._components.pop()
+        subname.components = subname.components[:-1]
 
         # cut content in pieces
         raw = []
@@ -146,7 +146,7 @@ class DeFlic():
     def bytesFromManifestName(self, name: Name):
         chunk = self.icn.readChunk(name)
         content = NdnTlvEncoder().decode(chunk)
-        name._components.pop() # drop the last component (e.g. '_')
+        name.components = name.components[:-1] # drop the last component (e.g. '_')
         return self._manifestToBytes(name, content.get_bytes())
 
     # TODO:
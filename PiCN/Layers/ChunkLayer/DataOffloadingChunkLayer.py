@@ -113,8 +113,8 @@ class DataOffloadingChunklayer(LayerProcess):
             return
 
         elif isinstance(packet, Content):
-            self.logger.info("Packet is Content (name=%s, %d bytes)" %(str(packet.name), len(packet.content)))
-            if len(packet.content) < self.chunk_size:
+            self.logger.info("Packet is Content (name=%s, %d bytes)" %(str(packet.name), packet.payload_size))
+            if packet.payload_size < self.chunk_size:
                 to_lower.put(data)
             else:
                 self.logger.info("Chunking Packet")
@@ -194,7 +194,7 @@ class DataOffloadingChunklayer(LayerProcess):
                         self._request_table.append(RequestTableEntry(packet.name))
                     self._ca_table[self.unpack(packet.name)] = ca_entry
                 else:  # This is not the requesting node --> pass on to neighbour
-                    to_lower.put([faceid, Content(self.increase_name(packet.name), packet.content)])
+                    to_lower.put([faceid, Content(self.increase_name(packet.name), packet.payload)])
                     return
 
             # Content from the chunklayer of a neighbouring node
@@ -205,7 +205,7 @@ class DataOffloadingChunklayer(LayerProcess):
                     # Save the sender of this packet as the recipient for further interests. Used in pack_cl()
                     self.recipient_cl[packet.name] = Name(components[:1])
                 else:  # This is not the requesting node --> pass on to neighbour
-                    to_lower.put([faceid, Content(self.increase_name(packet.name), packet.content)])
+                    to_lower.put([faceid, Content(self.increase_name(packet.name), packet.payload)])
                     return
 
             request_entry = self.get_request_entry(packet.name)
@@ -394,7 +394,7 @@ class DataOffloadingChunklayer(LayerProcess):
 
         if chunks_available:
             chunks_available = Content(packet.name, ";".join(chunks_available))
-            if len(chunks_available.content) > self.chunk_size:
+            if chunks_available.payload_size > self.chunk_size:
                 meta_data, chunks = self.chunkifyer.chunk_data(chunks_available)
                 meta_data.extend(chunks)
                 for data in meta_data:
@@ -438,8 +438,8 @@ class DataOffloadingChunklayer(LayerProcess):
         """
         if packet.get_bytes().startswith(b'mdo:'):  # Content is metadata, read size from metadata
             _, _, content_size = self.chunkifyer.parse_meta_data(packet.content)
-        else:  # Content is string, size equals length of the string
-            content_size = (len(packet.content))
+        else:  # Content is not chunked, size equals length of the payload
+            content_size = packet.payload_size
         content_size = int(content_size)
         if content_size > ca_entry.size:
             ca_entry.ca = packet
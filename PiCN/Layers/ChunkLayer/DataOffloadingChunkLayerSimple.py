@@ -104,8 +104,8 @@ class DataOffloadingChunklayerSimple(LayerProcess):
             return
 
         elif isinstance(packet, Content):
-            self.logger.info("Packet is Content (name=%s, %d bytes)" %(str(packet.name), len(packet.content)))
-            if len(packet.content) < self.chunk_size:
+            self.logger.info("Packet is Content (name=%s, %d bytes)" %(str(packet.name), packet.payload_size))
+            if packet.payload_size < self.chunk_size:
                 to_lower.put(data)
             else:
                 self.logger.info("Chunking Packet")
@@ -169,7 +169,7 @@ class DataOffloadingChunklayerSimple(LayerProcess):
                         self._cl_table[request_entry.name] = cl_entry
 
                 else:  # This is not the requesting node --> pass on to neighbour
-                    to_lower.put([faceid, Content(self.increase_name(packet.name), packet.content)])
+                    to_lower.put([faceid, Content(self.increase_name(packet.name), packet.payload)])
                     return
 
             request_entry = self.get_request_entry(packet.name)
@@ -1,18 +1,26 @@
 """Basic ICN Forwarding Layer"""
 
+import copy
 import multiprocessing
-import threading
 
+from PiCN.Layers.ICNLayer.CachingDecision import BaseCachingDecision, LeaveCopyEverywhere
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase, ForwardingInformationBaseEntry
+from PiCN.Layers.ICNLayer.ForwardingStrategy import StrategyChoiceTable
+from PiCN.Layers.ICNLayer.DeadNonceList import DeadNonceList, DUPLICATE, LOOP
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import BaseRoutingInformationBase
 from PiCN.Layers.ICNLayer.PendingInterestTable import BasePendingInterestTable, PendingInterestTableEntry
+from PiCN.Layers.ICNLayer.SharedNameIndex import SharedNameIndex
 from PiCN.Packets import Name, Content, Interest, Packet, Nack, NackReason
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, TimerThread
 
 
 class BasicICNLayer(LayerProcess):
-    """ICN Forwarding Plane. Maintains data structures for ICN Forwarding
+    """ICN Forwarding Plane. Maintains data structures for ICN Forwarding. The next hops of a FIB entry an Interest is
+    forwarded to are chosen by the forwarding strategy of its name in strategy_choice (by default all next hops).
+    Interests carrying a nonce which is in the dead_nonce_list are dropped if they arrived on the same face before,
+    and answered with a DUPLICATE Nack if they arrived on another face or were sent by the node itself (a loop).
+    Content objects received from lower are inserted into the CS if the caching_decision decides so (by default all)
     """
 
     def __init__(self, cs: BaseContentStore = None, pit: BasePendingInterestTable = None,
@@ -27,8 +35,14 @@ class BasicICNLayer(LayerProcess):
         self._interest_to_app: bool = False
         self._session_initiator = 'session_connector'
         self._session_identifier = 'sid'
+        self.name_index: SharedNameIndex = None  # if set, FIB prefixes and CS names are published into it
+        self.name_index_interval: float = 0.05
+        self.strategy_choice: StrategyChoiceTable = StrategyChoiceTable()
+        self.dead_nonce_list: DeadNonceList = DeadNonceList()
+        self.caching_decision: BaseCachingDecision = LeaveCopyEverywhere()
 
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self.publish_name_index()
         high_level_id = data[0]
         packet = data[1]
 
@@ -40,6 +54,7 @@ class BasicICNLayer(LayerProcess):
             self.handle_nack(high_level_id, packet, to_lower, to_higher, True)  # Nack handled same as for NACK from network
 
     def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self.publish_name_index()
         if len(data) != 2:
             self.logger.warning("ICN Layer expects to receive [face id, packet] from lower layer")
             return
@@ -87,7 +102,8 @@ class BasicICNLayer(LayerProcess):
             self.pit.append(new_pit_entry)
 
             new_reconnect_interest = interest
-            new_reconnect_interest.name.components[-1] = remaining_hops
+            new_reconnect_interest.name.components = new_reconnect_interest.name.components[:-1] + \
+                                                     (str(remaining_hops).encode('ascii'),)
 
             to_lower.put([face_id, new_reconnect_interest])
 
@@ -107,6 +123,12 @@ class BasicICNLayer(LayerProcess):
             self.handle_reconncet(face_id, interest, to_lower, to_higher)
             return
 
+        if interest.nonce is None and interest.wire_format is None:
+            # Interests of the node carry a nonce, so they are recognized if they loop back. The nonce is set on a
+            # copy: a higher layer sending the same object again expects a new nonce, not a duplicate.
+            interest = interest.with_nonce(self.dead_nonce_list.new_nonce())
+            self.dead_nonce_list.add(interest.name, interest.nonce)
+
         pit_entry = self.pit.find_pit_entry(interest.name)
         self.pit.add_pit_entry(interest.name, face_id, interest, local_app=True)
 
@@ -116,13 +138,7 @@ class BasicICNLayer(LayerProcess):
             fib_entry = self.fib.find_fib_entry(interest.name)
         if fib_entry is not None:
             self.pit.set_number_of_forwards(interest.name, 0)
-            for fid in fib_entry.faceid:
-                try:
-                    if not self.pit.test_faceid_was_nacked(interest.name, fid):
-                        self.pit.increase_number_of_forwards(interest.name)
-                        to_lower.put([fid, interest])
-                except:
-                    pass
+            self.forward_interest(interest, fib_entry, to_lower)
         else:
             self.logger.info("No FIB entry, sending Nack: " + str(interest.name))
             nack = Nack(interest.name, NackReason.NO_ROUTE, interest=interest)
@@ -139,11 +155,22 @@ class BasicICNLayer(LayerProcess):
     def handle_interest_from_lower(self, face_id: int, interest: Interest, to_lower: multiprocessing.Queue,
                                    to_higher: multiprocessing.Queue, from_local: bool = False):
         self.logger.info("Handling Interest (from lower): " + str(interest.name) + "; Face ID: " + str(face_id))
+        if interest.nonce is not None:
+            seen = self.dead_nonce_list.check(interest.name, interest.nonce, face_id)
+            if seen == DUPLICATE:
+                self.logger.info("Duplicate Interest, dropping")
+                return
+            if seen == LOOP:
+                self.logger.info("Looping Interest, sending Nack")
+                to_lower.put([face_id, Nack(interest.name, NackReason.DUPLICATE, interest=interest)])
+                return
+        self.count_hop(interest)
         cs_entry = self.cs.find_content_object(interest.name)
+        self.caching_decision.lookup(cs_entry is not None)
 
         if cs_entry is not None:
             self.logger.info("Found in content store")
-            to_lower.put([face_id, cs_entry.content])
+            to_lower.put([face_id, self.served_content(cs_entry.content)])
             self.cs.update_timestamp(cs_entry)
             return
 
@@ -172,11 +199,7 @@ class BasicICNLayer(LayerProcess):
             self.logger.info("Found in FIB, forwarding to Face: " + str(new_face_id.faceid))
 
             self.pit.add_pit_entry(interest.name, face_id, interest, local_app=from_local)
-
-            for fid in new_face_id.faceid:
-                if not self.pit.test_faceid_was_nacked(interest.name, fid):
-                    self.pit.increase_number_of_forwards(interest.name)
-                    to_lower.put([fid, interest])
+            self.forward_interest(interest, new_face_id, to_lower)
             return
 
         self.logger.info("No FIB entry, sending Nack")
@@ -188,7 +211,7 @@ class BasicICNLayer(LayerProcess):
 
     def handle_content(self, face_id: int, content: Content, to_lower: multiprocessing.Queue,
                        to_higher: multiprocessing.Queue, from_local: bool = False):
-        self.logger.info("Handling Content " + str(content.name) + " " + str(content.content))
+        self.logger.info("Handling Content " + str(content.name))
         pit_entry = self.pit.find_pit_entry(content.name)
         fib_entry = self.fib.find_fib_entry(content.name)
         self.logger.info(f"Found FIB entry for name: {content.name}: {fib_entry}")
@@ -198,9 +221,14 @@ class BasicICNLayer(LayerProcess):
             # TODO: NACK? Probably, since the fetch tool will retry if we don't NACK.
             return
         else:
+            if not from_local:
+                self.strategy_choice.find_strategy(content.name).content_received(content.name, face_id)
+                self.count_hop(content)
+            # a content object in a wire buffer is forwarded by descriptor, the copy is stored and passed to higher layers
+            stored_content = content.materialized()
             for i in range(0, len(pit_entry.faceids)):
                 if to_higher and pit_entry.local_app[i]:  # FIXME: Why check for to_higher? (Its already highest layer??)
-                    to_higher.put([face_id, content])
+                    to_higher.put([face_id, stored_content])
                 elif pit_entry.is_session:
                     if len(pit_entry.faceids) == 2:
                         other_fids = list(set(pit_entry.faceids) - set([face_id]))
@@ -211,12 +239,27 @@ class BasicICNLayer(LayerProcess):
                         self.fib.add_fib_entry(content.name, [face_id], static=True, is_session=True)
                     else:
                         self.logger.error(f"--> : There can only be 2 face id entries when using sessions (actual length: {len(pit_entry.faceids)})")
-                        self.logger.error(f"--> : Or this might be some other thing: {content.content}")
+                        self.logger.error(f"--> : Or this might be some other thing: {stored_content.content}")
                 else:
                     to_lower.put([pit_entry.faceids[i], content])
 
-            self.pit.remove_pit_entry(pit_entry.name, incoming_fid=face_id, content=content)
-            self.cs.add_content_object(content)
+            self.pit.remove_pit_entry(pit_entry.name, incoming_fid=face_id, content=stored_content)
+            if from_local or self.caching_decision.should_cache(stored_content, pit_entry.interest):
+                self.cs.add_content_object(stored_content)
+
+    def count_hop(self, packet: Packet):
+        """Count the hop of an Interest or content object received from lower in its hop tag, if it is tagged or the
+        caching decision uses hop tags"""
+        if packet.hops is not None or self.caching_decision.uses_tags:
+            packet.hops = (packet.hops or 0) + 1
+
+    def served_content(self, content: Content) -> Content:
+        """Content object served from the CS, with its hop tag reset to 0 if tags are used"""
+        if content.hops is None and not self.caching_decision.uses_tags:
+            return content
+        content = copy.copy(content)  # the stored content object keeps its tag
+        content.hops = 0
+        return content
 
     def handle_nack(self, face_id: int, nack: Nack, to_lower: multiprocessing.Queue,
                     to_higher: multiprocessing.Queue, from_local: bool = False):
@@ -227,6 +270,8 @@ class BasicICNLayer(LayerProcess):
             self.logger.info("No PIT entry for NACK available, dropping")
             return
         else:
+            if not from_local:
+                self.strategy_choice.find_strategy(nack.name).nack_received(nack.name, face_id)
             self.pit.add_nacked_faceid(nack.name, face_id)
             if cur_pit_entry.number_of_forwards > 1:
                 self.logger.info("Ignoring Nack from FaceID " + str(face_id) + " for " + str(nack.name) + " since other faces (" + str(cur_pit_entry.number_of_forwards) + ") are still active")
@@ -234,6 +279,10 @@ class BasicICNLayer(LayerProcess):
                 return
             self.pit.set_number_of_forwards(nack.name, 0)
             cur_fib_entry = self.fib.find_fib_entry(nack.name, cur_pit_entry.fib_entries_already_used, cur_pit_entry.faceids) #current entry
+            if cur_fib_entry is not None and self.forward_interest(cur_pit_entry.interest, cur_fib_entry, to_lower,
+                                                                   retry=True) > 0:
+                self.logger.info("Try next hop of the current FIB path for " + str(nack.name))
+                return
             self.pit.add_used_fib_entry(nack.name, cur_fib_entry)  # Add current entry to used list, modiefies pit entry in pit
             pit_entry = self.pit.find_pit_entry(nack.name)  # Read modified entry from pit
             fib_entry = self.fib.find_fib_entry(nack.name, pit_entry.fib_entries_already_used, pit_entry.faceids) #read new fib entry
@@ -264,36 +313,84 @@ class BasicICNLayer(LayerProcess):
                     self.pit.append(pit_entry)
             else:
                 self.logger.info("Try using next FIB path with FaceID: " + str(fib_entry.faceid))
-                for fid in fib_entry.faceid:
-                    if not self.pit.test_faceid_was_nacked(pit_entry.name, fid):
-                        self.pit.increase_number_of_forwards(pit_entry.name)
-                        to_lower.put([fid, pit_entry.interest])
+                self.forward_interest(pit_entry.interest, fib_entry, to_lower)
+
+    def forward_interest(self, interest: Interest, fib_entry: ForwardingInformationBaseEntry,
+                         to_lower: multiprocessing.Queue, retry: bool = False, count_forwards: bool = True) -> int:
+        """Forward an Interest to the next hops of a FIB entry chosen by its forwarding strategy, except the next hops
+        which sent a Nack for it
+        :param interest: Interest to forward, its PIT entry must exist
+        :param fib_entry: FIB entry of the Interest
+        :param to_lower: queue to the lower layer
+        :param retry: if true, the next hops are chosen after all next hops the Interest was forwarded to sent a Nack
+        :param count_forwards: if true, the number of forwards of the PIT entry is increased for each next hop
+        :return: number of next hops the Interest was forwarded to
+        """
+        faceids = [fid for fid in fib_entry.faceid if not self.pit.test_faceid_was_nacked(interest.name, fid)]
+        if not faceids:
+            return 0
+        strategy = self.strategy_choice.find_strategy(interest.name)
+        if retry:
+            selected = strategy.retry_faces(fib_entry.name, interest.name, faceids)
+        else:
+            selected = strategy.select_faces(fib_entry.name, faceids)
+        for fid in selected:
+            if count_forwards:
+                self.pit.increase_number_of_forwards(interest.name)
+            strategy.interest_forwarded(fib_entry.name, interest.name, fid)
+            to_lower.put([fid, interest])
+        return len(selected)
+
+    def periodic_tasks(self):
+        tasks = [(self._ageing_interval, self.ageing_step)]
+        if self.name_index is not None:
+            tasks.append((self.name_index_interval, self.publish_name_index))
+        return tasks
+
+    def publish_name_index(self):
+        """Publish FIB and CS into the shared name index, if set and the last publication is older than
+        name_index_interval. Only called by the thread handling the packets, which is the single writer."""
+        if self.name_index is None or not self.name_index.publish_due(self.name_index_interval):
+            return
+        try:
+            self.name_index.publish_tables(self.fib, self.cs)
+        except Exception as e:
+            self.logger.warning("Could not publish name index: " + str(e))
 
     def ageing(self):
-        """Ageing the data structs"""
+        """Ageing the data structs, reschedules itself on the timer thread of the process. Does nothing if the layer
+        executes the ageing as periodic task itself (asyncio runtime or periodic_in_loop)"""
+        if self.use_asyncio or self.periodic_in_loop:
+            return
         try:
-            self.logger.debug("Ageing")
-            # PIT ageing
-            retransmits, removed_pit_entries = self.pit.ageing()
-            for pit_entry in retransmits:
-                fib_entry = self.fib.find_fib_entry(pit_entry.name, pit_entry.fib_entries_already_used, pit_entry.faceids)
-                if not fib_entry:
-                    continue
-                for fid in fib_entry.faceid:
-                    if not self.pit.test_faceid_was_nacked(pit_entry.name, fid):
-                        self.queue_to_lower.put([fid, pit_entry.interest])
-            for pit_entry in removed_pit_entries:
-                if not pit_entry:
-                    continue
-                for fid, local in zip(pit_entry.faceids, pit_entry.local_app):
-                    if local is True:
-                        self.queue_to_higher.put([fid, Nack(pit_entry.name, NackReason.PIT_TIMEOUT, pit_entry.interest)])
-            # CS ageing
-            self.cs.ageing()
+            self.ageing_step()
         except Exception as e:
             self.logger.warning("Exception during ageing: " + str(e))
             pass
         finally:
-            t = threading.Timer(self._ageing_interval, self.ageing)
-            t.setDaemon(True)
-            t.start()
+            TimerThread.shared().schedule(self._ageing_interval, self.ageing)
+
+    def ageing_step(self):
+        """Age PIT and CS once"""
+        self.logger.debug("Ageing")
+        # PIT ageing
+        retransmits, removed_pit_entries = self.pit.ageing()
+        for pit_entry in retransmits:
+            fib_entry = self.fib.find_fib_entry(pit_entry.name, pit_entry.fib_entries_already_used, pit_entry.faceids)
+            if not fib_entry:
+                continue
+            # a retransmission has a new nonce, otherwise the next hops would drop it as duplicate
+            interest = pit_entry.interest.with_nonce(self.dead_nonce_list.new_nonce())
+            self.dead_nonce_list.add(interest.name, interest.nonce)
+            self.forward_interest(interest, fib_entry, self.queue_to_lower, count_forwards=False)
+        for pit_entry in removed_pit_entries:
+            if not pit_entry:
+                continue
+            for fid, local in zip(pit_entry.faceids, pit_entry.local_app):
+                if local is True:
+                    self.queue_to_higher.put([fid, Nack(pit_entry.name, NackReason.PIT_TIMEOUT, pit_entry.interest)])
+        # Interests not answered in time count as timeouts of their next hops
+        self.strategy_choice.ageing()
+        self.dead_nonce_list.ageing()
+        # CS ageing
+        self.cs.ageing()
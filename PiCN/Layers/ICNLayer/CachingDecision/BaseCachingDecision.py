@@ -0,0 +1,60 @@
+"""Abstract caching decision of the ICN layer"""
+
+import abc
+import multiprocessing.sharedctypes
+
+from PiCN.Packets import Content, Interest
+
+_HITS, _MISSES, _CACHED, _NOT_CACHED = range(4)
+
+
+class BaseCachingDecision(object):
+    """Abstract caching decision. The ICN layer asks the decision whether to insert a content object it received from
+    the network into its CS. Decisions using hop tags (uses_tags) let the ICN layer count the hops of the Interests and
+    content objects it receives: an Interest carries the number of hops from its consumer, a content object the number
+    of hops from the node which served it from its CS or as producer (a node serving content from its CS resets the
+    tag). A packet carrying a tag is always counted further, so the tags work if only some nodes decide by them.
+    The counters of CS lookups and decisions are kept in shared memory, so they can be read in the process which
+    created the ICN layer; a decision used by several ICN workers counts for all of them.
+    """
+
+    uses_tags: bool = True
+    """True if Interests and content objects are tagged with their hop counts"""
+
+    def __init__(self):
+        self._counters = multiprocessing.sharedctypes.RawArray('q', 4)
+
+    @abc.abstractmethod
+    def decide(self, content: Content, interest: Interest) -> bool:
+        """
+        Decide whether a content object is cached
+        :param content: content object received from the network, tagged with its hop count if uses_tags
+        :param interest: Interest of the PIT entry the content object satisfied, tagged with its hop count if uses_tags
+            and it was received from the network
+        :return: True if the content object is inserted into the CS
+        """
+
+    def should_cache(self, content: Content, interest: Interest) -> bool:
+        """
+        Decide whether a content object is cached and count the decision
+        :param content: content object received from the network
+        :param interest: Interest of the PIT entry the content object satisfied
+        :return: True if the content object is inserted into the CS
+        """
+        cached = self.decide(content, interest)
+        self._counters[_CACHED if cached else _NOT_CACHED] += 1  # without a lock, counts of workers are approximate
+        return cached
+
+    def lookup(self, hit: bool):
+        """
+        Count a CS lookup of an Interest received from the network
+        :param hit: True if the CS held the content object
+        """
+        self._counters[_HITS if hit else _MISSES] += 1
+
+    def get_stats(self) -> dict:
+        """number of CS hits and misses of Interests from the network, hit ratio, and number of content objects which
+        were cached and not cached"""
+        hits, misses = self._counters[_HITS], self._counters[_MISSES]
+        return {"hits": hits, "misses": misses, "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+                "cached": self._counters[_CACHED], "not_cached": self._counters[_NOT_CACHED]}
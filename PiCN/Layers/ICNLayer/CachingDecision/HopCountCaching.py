@@ -0,0 +1,30 @@
+"""Hop count based probabilistic caching decision"""
+
+import random
+
+from PiCN.Layers.ICNLayer.CachingDecision.BaseCachingDecision import BaseCachingDecision
+from PiCN.Packets import Content, Interest
+
+
+class HopCountCaching(BaseCachingDecision):
+    """Caches a content object with a probability growing with its hop tag, min(1, hops / max_hops): nodes close to
+    the node which served it rarely keep another copy, nodes max_hops or more away always do.
+    :param max_hops: hop count from which content objects are always cached
+    :param seed: seed of the random decisions, e.g. for a reproducible simulation
+    """
+
+    def __init__(self, max_hops: int = 4, seed: int = None):
+        super().__init__()
+        self._max_hops = max_hops
+        self._random = random.Random(seed)
+
+    def probability(self, content: Content) -> float:
+        """
+        Caching probability of a content object
+        :param content: content object tagged with its hop count
+        :return: probability between 0 and 1
+        """
+        return min(1.0, (content.hops or 0) / self._max_hops)
+
+    def decide(self, content: Content, interest: Interest) -> bool:
+        return self._random.random() < self.probability(content)
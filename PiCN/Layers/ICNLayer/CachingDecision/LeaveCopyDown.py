@@ -0,0 +1,13 @@
+"""Leave Copy Down caching decision"""
+
+from PiCN.Layers.ICNLayer.CachingDecision.BaseCachingDecision import BaseCachingDecision
+from PiCN.Packets import Content, Interest
+
+
+class LeaveCopyDown(BaseCachingDecision):
+    """Leave Copy Down (Laoutaris et al., 2006): a content object is cached only by the node one hop below the node
+    which served it, so each request moves a copy one hop towards the consumers and popular content travels down
+    the path while unpopular content stays close to its producer."""
+
+    def decide(self, content: Content, interest: Interest) -> bool:
+        return content.hops == 1
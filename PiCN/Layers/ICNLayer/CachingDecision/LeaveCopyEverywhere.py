@@ -0,0 +1,14 @@
+"""Leave Copy Everywhere caching decision"""
+
+from PiCN.Layers.ICNLayer.CachingDecision.BaseCachingDecision import BaseCachingDecision
+from PiCN.Packets import Content, Interest
+
+
+class LeaveCopyEverywhere(BaseCachingDecision):
+    """Caches every content object, so each node on the path keeps a copy. Default of the ICN layer, does not use hop
+    tags."""
+
+    uses_tags = False
+
+    def decide(self, content: Content, interest: Interest) -> bool:
+        return True
@@ -0,0 +1,38 @@
+"""ProbCache caching decision"""
+
+import random
+
+from PiCN.Layers.ICNLayer.CachingDecision.BaseCachingDecision import BaseCachingDecision
+from PiCN.Packets import Content, Interest
+
+
+class ProbCache(BaseCachingDecision):
+    """ProbCache (Psaras et al., ICN workshop 2012): a node x hops from the node which served a content object, on a
+    path of c hops between that node and the consumer, caches it with probability (c - x + 1) / target_window * x / c.
+    The first factor is the caching capacity left on the path towards the consumer (all CS assumed of equal size), the
+    second one favours nodes close to the consumer. x is the hop tag of the content object, c - x the hop tag of the
+    Interest.
+    :param target_window: number of content objects the caches of a path are supposed to hold for a flow
+    :param seed: seed of the random decisions, e.g. for a reproducible simulation
+    """
+
+    def __init__(self, target_window: float = 10.0, seed: int = None):
+        super().__init__()
+        self._target_window = target_window
+        self._random = random.Random(seed)
+
+    def probability(self, content: Content, interest: Interest) -> float:
+        """
+        Caching probability of a content object
+        :param content: content object tagged with its hop count
+        :param interest: Interest of the PIT entry, untagged if it came from a higher layer
+        :return: probability between 0 and 1
+        """
+        x = content.hops or 0
+        c = x + (interest.hops or 0) if interest is not None else x
+        if c == 0:
+            return 0.0
+        return min(1.0, (c - x + 1) / self._target_window * x / c)
+
+    def decide(self, content: Content, interest: Interest) -> bool:
+        return self._random.random() < self.probability(content, interest)
@@ -0,0 +1,8 @@
+"""Caching decisions of the ICN layer"""
+
+from .BaseCachingDecision import BaseCachingDecision
+
+from .LeaveCopyEverywhere import LeaveCopyEverywhere
+from .LeaveCopyDown import LeaveCopyDown
+from .ProbCache import ProbCache
+from .HopCountCaching import HopCountCaching
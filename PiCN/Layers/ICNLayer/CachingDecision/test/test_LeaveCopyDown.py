@@ -0,0 +1,41 @@
+"""Tests for the Leave Copy Everywhere and Leave Copy Down caching decisions"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.CachingDecision import LeaveCopyDown, LeaveCopyEverywhere
+from PiCN.Packets import Content, Interest
+
+
+class test_LeaveCopyDown(unittest.TestCase):
+
+    def content(self, hops):
+        content = Content("/test/data", "data")
+        content.hops = hops
+        return content
+
+    def test_leave_copy_everywhere(self):
+        """Test that every content object is cached without hop tags"""
+        decision = LeaveCopyEverywhere()
+        self.assertFalse(decision.uses_tags)
+        self.assertTrue(decision.should_cache(Content("/test/data", "data"), Interest("/test/data")))
+        self.assertTrue(decision.should_cache(self.content(3), Interest("/test/data")))
+
+    def test_leave_copy_down(self):
+        """Test that only the node one hop below the serving node caches"""
+        decision = LeaveCopyDown()
+        self.assertTrue(decision.uses_tags)
+        self.assertTrue(decision.should_cache(self.content(1), Interest("/test/data")))
+        self.assertFalse(decision.should_cache(self.content(2), Interest("/test/data")))
+        self.assertFalse(decision.should_cache(self.content(5), Interest("/test/data")))
+
+    def test_stats(self):
+        """Test the counters of lookups and decisions"""
+        decision = LeaveCopyDown()
+        decision.lookup(True)
+        decision.lookup(False)
+        decision.lookup(False)
+        decision.lookup(False)
+        decision.should_cache(self.content(1), Interest("/test/data"))
+        decision.should_cache(self.content(2), Interest("/test/data"))
+        self.assertEqual(decision.get_stats(), {"hits": 1, "misses": 3, "hit_ratio": 0.25, "cached": 1,
+                                                "not_cached": 1})
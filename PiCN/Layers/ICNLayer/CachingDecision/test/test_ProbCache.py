@@ -0,0 +1,43 @@
+"""Tests for the ProbCache and hop count caching decisions"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.CachingDecision import HopCountCaching, ProbCache
+from PiCN.Packets import Content, Interest
+
+
+class test_ProbCache(unittest.TestCase):
+
+    def packets(self, content_hops, interest_hops):
+        content = Content("/test/data", "data")
+        content.hops = content_hops
+        interest = Interest("/test/data")
+        interest.hops = interest_hops
+        return content, interest
+
+    def test_probability(self):
+        """Test the caching probability on a path of four hops"""
+        decision = ProbCache(target_window=10)
+        # one hop below the serving node, three hops from the consumer
+        self.assertAlmostEqual(decision.probability(*self.packets(1, 3)), 4 / 10 * 1 / 4)
+        # next to the consumer
+        self.assertAlmostEqual(decision.probability(*self.packets(3, 1)), 2 / 10 * 3 / 4)
+        # Interest of a local application
+        self.assertAlmostEqual(decision.probability(*self.packets(2, None)), 1 / 10)
+        self.assertEqual(decision.probability(*self.packets(None, None)), 0.0)
+        self.assertEqual(ProbCache(target_window=0.1).probability(*self.packets(3, 1)), 1.0)
+
+    def test_decisions(self):
+        """Test that the share of cached content objects follows the probability"""
+        decision = ProbCache(target_window=2, seed=1)
+        for i in range(1000):
+            decision.should_cache(*self.packets(1, 1))
+        self.assertAlmostEqual(decision.get_stats()["cached"], 500, delta=60)
+
+    def test_hop_count_caching(self):
+        """Test that the caching probability grows with the hop tag"""
+        decision = HopCountCaching(max_hops=4, seed=1)
+        self.assertEqual(decision.probability(self.packets(1, 1)[0]), 0.25)
+        self.assertEqual(decision.probability(self.packets(6, 1)[0]), 1.0)
+        self.assertTrue(decision.should_cache(*self.packets(4, 1)))
+        self.assertFalse(decision.should_cache(*self.packets(0, 1)))
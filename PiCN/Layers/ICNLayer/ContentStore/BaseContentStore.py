@@ -2,10 +2,12 @@
 
 import abc
 import time
-from typing import List
+from typing import Iterable, List
 
 from PiCN.Packets import Content, Name
 from PiCN.Layers.ICNLayer import BaseICNDataStruct
+from PiCN.Layers.ICNLayer.ContentStore.CountingBloomFilter import CountingBloomFilter
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy
 
 class ContentStoreEntry(object):
     """Entry of the content store"""
@@ -48,12 +50,18 @@ class ContentStoreEntry(object):
 class BaseContentStore(BaseICNDataStruct):
     """Abstract BaseContentStore for usage in BasicICNLayer
     :param cs_timeout: Time interval in which a CS entry will be cached
+    :param policy: replacement policy choosing the entries evicted if the CS is full
+    :param ageing_limit: maximum number of entries removed by one call of ageing, unlimited if 0
     """
 
-    def __init__(self, cs_timeout: int=10):
+    def __init__(self, cs_timeout: int=10, policy: BaseReplacementPolicy=None, ageing_limit: int=10000):
         super().__init__()
         self._container: List[ContentStoreEntry] = []
         self._cs_timeout = cs_timeout
+        self._policy = policy
+        self._ageing_limit = ageing_limit
+        self._filter: CountingBloomFilter = None
+        self._filter_lookup = True
 
     @abc.abstractmethod
     def add_content_object(self, content: Content, static: bool=False):
@@ -102,3 +110,54 @@ class BaseContentStore(BaseICNDataStruct):
         """
         self._cs_timeout = timeout
 
+    def set_ageing_limit(self, limit: int):
+        """set the maximum number of entries removed by one call of ageing, so a single call does not delay the
+        forwarding of packets for long; the remaining expired entries are removed by the following calls
+        :param limit: maximum number of entries, unlimited if 0
+        """
+        self._ageing_limit = limit
+
+    def set_replacement_policy(self, policy: BaseReplacementPolicy):
+        """set the replacement policy choosing the entries evicted if the CS is full
+        :param policy: the replacement policy
+        """
+        self._policy = policy
+
+    def set_membership_filter(self, membership_filter: CountingBloomFilter, lookup: bool = True):
+        """set a filter holding the names of all entries, so lookups of names which are not in the CS are answered
+        without searching the CS. The names of the current entries are added to the filter
+        :param membership_filter: an empty filter, None to remove the filter
+        :param lookup: if false, the filter is only maintained, e.g. if it is shared with another CS answering lookups
+        """
+        self._filter = membership_filter
+        self._filter_lookup = lookup
+        for key in self._keys():
+            self._filter_add(key)
+
+    def _keys(self) -> Iterable[str]:
+        """names (Name.to_string()) of all entries"""
+        return [entry.name.to_string() for entry in self.container]
+
+    def _filter_add(self, key: str):
+        if self._filter is not None:
+            self._filter.add(key)
+
+    def _filter_remove(self, key: str):
+        if self._filter is not None:
+            self._filter.remove(key)
+
+    def _filter_excludes(self, key: str) -> bool:
+        """true if the filter shows that no entry has the name key"""
+        return self._filter is not None and self._filter_lookup and not self._filter.might_contain(key)
+
+    def _filter_missed(self):
+        """count a lookup which the filter let pass but which found no entry"""
+        if self._filter is not None and self._filter_lookup:
+            self._filter.report_false_positive()
+
+    def _filter_stats(self) -> dict:
+        """statistics of the filter, to be included in get_stats"""
+        if self._filter is None or not self._filter_lookup:
+            return {}
+        return {"filter_" + key: value for key, value in self._filter.get_stats().items()}
+
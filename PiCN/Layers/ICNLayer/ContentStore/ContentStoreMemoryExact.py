@@ -1,46 +1,196 @@
 """ An in-memory content store with exact matching"""
 
 import time
+from collections import OrderedDict
+from typing import Callable, List
 
 from PiCN.Packets import Content, Name
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Layers.ICNLayer.ContentStore.CountingBloomFilter import CountingBloomFilter
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy, LRUPolicy
 
 
 class ContentStoreMemoryExact(BaseContentStore):
-    """ A in memory Content Store using exact matching"""
+    """ A in memory Content Store using exact matching. Entries are kept in a hash map keyed by name, ordered by the
+    time they were inserted or refreshed, so lookup, insert and refresh are O(1). The non-static entries are also kept
+    in the order of their expiry, so ageing only inspects expired entries. If a capacity is set, the entries
+    chosen by the replacement policy are evicted when the store is full; static entries are never evicted, but count
+    towards the capacity.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param max_entries: maximum number of entries, unlimited if 0
+    :param max_bytes: maximum sum of the payload sizes of all entries, unlimited if 0
+    :param policy: replacement policy, least recently used (LRUPolicy) if None
+    :param on_evict: function called with each evicted entry, e.g. to move it to another store
+    :param membership_filter: filter answering lookups of names which are not in the CS, see set_membership_filter
+    """
 
-    def __init__(self, cs_timeout: int = 10):
-        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
+    def __init__(self, cs_timeout: int = 10, max_entries: int = 0, max_bytes: int = 0,
+                 policy: BaseReplacementPolicy = None, on_evict: Callable[[ContentStoreEntry], None] = None,
+                 membership_filter: CountingBloomFilter = None):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout, policy=policy if policy is not None else LRUPolicy())
+        self._container: OrderedDict = OrderedDict()  # name -> ContentStoreEntry, oldest timestamp first
+        self._expiry: OrderedDict = OrderedDict()  # names of the non-static entries, oldest timestamp first
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._evictions = 0
+        self._on_evict = on_evict
+        if membership_filter is not None:
+            self.set_membership_filter(membership_filter)
+
+    @property
+    def container(self) -> List[ContentStoreEntry]:
+        return list(self._container.values())
+
+    @container.setter
+    def container(self, container: List[ContentStoreEntry]):
+        for key in self._container:
+            self._policy.remove(key)
+            self._filter_remove(key)
+        self._container = OrderedDict()
+        self._expiry = OrderedDict()
+        self._bytes = 0
+        for entry in container:
+            self._insert(entry)
+
+    def get_container_size(self) -> int:
+        return len(self._container)
 
     def find_content_object(self, name: Name) -> ContentStoreEntry:
-        for c in self._container:
-            if c.content.name == name: #and c.content.name_payload == name_payload:
-                return c
-        return None
-
-    def add_content_object(self, content: Content, static: bool=False):
-        for c in self._container:
-            if content == c.content:
-                return
-        self._container.append(ContentStoreEntry(content, static=static))
+        if not isinstance(name, Name):  # e.g. a string or None, matches no content object
+            return None
+        key = name.to_string()
+        if self._filter_excludes(key):
+            self._policy.miss(key)
+            return None
+        entry = self._container.get(key)
+        if entry is None:
+            self._policy.miss(key)
+            self._filter_missed()
+        elif not entry.static:
+            self._policy.hit(key)
+        return entry
+
+    def add_content_object(self, content: Content, static: bool=False, timestamp: float = None):
+        """
+        Insert content object
+        :param content: content object to insert
+        :param static: if true the conent object will not be considered by ageing
+        :param timestamp: time the content object was cached, now if None; e.g. the timestamp of an entry moved from
+            another store, which keeps its remaining time to live. Such an entry is aged exactly if it is older than
+            all entries, otherwise ageing may keep it until the entries inserted before it expire.
+        :return: None
+        """
+        key = content.name.to_string()
+        entry = self._container.get(key)
+        if entry is not None:
+            self._bytes -= self._size(entry)
+            entry.content = content
+            if static and not entry.static:
+                entry.static = True
+                self._policy.remove(key)
+                del self._expiry[key]
+            entry.timestamp = time.time()
+            self._bytes += self._size(entry)
+            self._container.move_to_end(key)
+            if not entry.static:
+                self._expiry.move_to_end(key)
+        else:
+            entry = ContentStoreEntry(content, static=static)
+            self._insert(entry)
+        if timestamp is not None:
+            self._backdate(key, entry, timestamp)
+        self._evict()
 
     def remove_content_object(self, name: Name):
-        rem = self.find_content_object(name)
-        if rem is not None:
-            self._container.remove(rem)
+        if not isinstance(name, Name):
+            return
+        key = name.to_string()
+        entry = self._container.pop(key, None)
+        if entry is not None:
+            self._expiry.pop(key, None)
+            self._bytes -= self._size(entry)
+            self._policy.remove(key)
+            self._filter_remove(key)
 
     def update_timestamp(self, cs_entry: ContentStoreEntry):
-        self._container.remove(cs_entry)
-        cs_entry.timestamp = time.time()
-        self._container.append(cs_entry)
+        # the entry may be a copy (e.g. passed through a manager), refresh the stored entry
+        key = cs_entry.name.to_string()
+        entry = self._container.get(key)
+        if entry is None:
+            return
+        entry.timestamp = cs_entry.timestamp = time.time()
+        self._container.move_to_end(key)
+        if key in self._expiry:
+            self._expiry.move_to_end(key)
 
     def ageing(self):
         cur_time = time.time()
-        remove = []
-        for cs_entry in self._container:
-            if cs_entry.static is True:
-                continue
-            if cs_entry.timestamp + self._cs_timeout < cur_time:
-                remove.append(cs_entry)
-        for cs_entry in remove:
-            self.remove_content_object(cs_entry.content.name)
+        for _ in range(self._ageing_limit or len(self._expiry)):
+            key = next(iter(self._expiry), None)
+            if key is None or self._container[key].timestamp + self._cs_timeout >= cur_time:
+                break  # entries are ordered by their timestamp, all following entries are younger
+            del self._expiry[key]
+            self._bytes -= self._size(self._container.pop(key))
+            self._policy.remove(key)
+            self._filter_remove(key)
+
+    def set_capacity(self, max_entries: int = 0, max_bytes: int = 0):
+        """set the capacity of the CS, evicting least recently used entries if it is exceeded
+        :param max_entries: maximum number of entries, unlimited if 0
+        :param max_bytes: maximum sum of the payload sizes of all entries, unlimited if 0
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def set_replacement_policy(self, policy: BaseReplacementPolicy):
+        self._policy = policy
+        for key, entry in self._container.items():
+            if not entry.static:
+                policy.add(key)
+
+    def get_stats(self) -> dict:
+        """number of entries, sum of the payload sizes, capacity, number of evicted entries and filter statistics"""
+        return dict({"entries": len(self._container), "bytes": self._bytes, "max_entries": self._max_entries,
+                     "max_bytes": self._max_bytes, "evictions": self._evictions}, **self._filter_stats())
+
+    def _insert(self, entry: ContentStoreEntry):
+        key = entry.name.to_string()
+        self._container[key] = entry
+        self._bytes += self._size(entry)
+        self._filter_add(key)
+        if not entry.static:
+            self._expiry[key] = None
+            self._policy.add(key)
+
+    def _backdate(self, key: str, entry: ContentStoreEntry, timestamp: float):
+        """set the timestamp of the newest entry to an earlier time, moving it to the front if it is the oldest"""
+        entry.timestamp = timestamp
+        oldest = next(iter(self._container))
+        if oldest != key and self._container[oldest].timestamp >= timestamp:
+            self._container.move_to_end(key, last=False)
+            if not entry.static:
+                self._expiry.move_to_end(key, last=False)
+
+    def _full(self) -> bool:
+        return (0 < self._max_entries < len(self._container)) or (0 < self._max_bytes < self._bytes)
+
+    def _evict(self):
+        """remove the entries chosen by the replacement policy until the capacity is no longer exceeded"""
+        while self._full():
+            key = self._policy.evict()
+            if key is None:  # only static entries left
+                return
+            entry = self._container.pop(key)
+            self._expiry.pop(key, None)
+            self._bytes -= self._size(entry)
+            self._filter_remove(key)
+            self._evictions += 1
+            if self._on_evict is not None:
+                self._on_evict(entry)
+
+    @staticmethod
+    def _size(entry: ContentStoreEntry) -> int:
+        payload = entry.content.get_bytes()
+        return len(payload) if payload is not None else 0
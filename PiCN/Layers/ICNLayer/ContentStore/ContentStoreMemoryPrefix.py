@@ -1,16 +1,65 @@
 """ An in-memory content store with prefix matching"""
 
+import heapq
 import time
+from typing import Dict, Iterable, List, Tuple
 
 from PiCN.Packets import Content, Name
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Layers.ICNLayer.ContentStore.CountingBloomFilter import CountingBloomFilter
 from PiCN.Layers.ICNLayer.ContentStore.NamedObjectTree import NamedObjectTree
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy, LRUPolicy
 
 class ContentStoreMemoryPrefix(BaseContentStore):
-    """ An in-memory content store with prefix matching"""
+    """ An in-memory content store with prefix matching, e.g. to answer Interests for the next chunk or the latest
+    version of a content object. Entries are kept in a NamedObjectTree; if several entries have the name of an Interest
+    as prefix, the one with the shortest name (prefer="shortest", the exact match if any) or the most recently inserted
+    or refreshed one (prefer="freshest") is returned. Each entry expires cs_timeout after its last refresh, a heap
+    ordered by expiry lets ageing() inspect only expired entries. If a capacity is set, the entries chosen by the
+    replacement policy are evicted when the store is full; static entries never expire and are never evicted.
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param max_entries: maximum number of entries, unlimited if 0
+    :param max_bytes: maximum sum of the payload sizes of all entries, unlimited if 0
+    :param policy: replacement policy, least recently used (LRUPolicy) if None
+    :param prefer: "shortest" or "freshest", entry returned if several match
+    :param membership_filter: filter answering lookups of names which are not a prefix of the name of an entry, see
+        set_membership_filter; all prefixes of the names are added to it
+    """
 
-    def __init__(self):
-        self._container:NamedObjectTree = NamedObjectTree()
+    def __init__(self, cs_timeout: int = 10, max_entries: int = 0, max_bytes: int = 0,
+                 policy: BaseReplacementPolicy = None, prefer: str = "shortest",
+                 membership_filter: CountingBloomFilter = None):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout, policy=policy if policy is not None else LRUPolicy())
+        if prefer not in ("shortest", "freshest"):
+            raise ValueError("prefer must be 'shortest' or 'freshest', not %r" % prefer)
+        self._prefer = prefer
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._evictions = 0
+        self._entries: Dict[str, ContentStoreEntry] = {}
+        self.container = []
+        if membership_filter is not None:
+            self.set_membership_filter(membership_filter)
+
+    @property
+    def container(self) -> List[ContentStoreEntry]:
+        return list(self._entries.values())
+
+    @container.setter
+    def container(self, container: List[ContentStoreEntry]):
+        for key, entry in self._entries.items():
+            self._policy.remove(key)
+            self._filter_remove(entry.name.components_to_string())
+        self._container: NamedObjectTree = NamedObjectTree()
+        self._entries: Dict[str, ContentStoreEntry] = {}  # name -> entry
+        self._expiry: List[Tuple[float, str]] = []  # heap of (timestamp, name)
+        self._queued: Dict[str, float] = {}  # name -> timestamp of its latest item in the heap
+        self._bytes = 0
+        for entry in container:
+            self._insert(entry)
+
+    def get_container_size(self) -> int:
+        return len(self._entries)
 
     def find_content_object(self, name: Name) -> ContentStoreEntry:
         """
@@ -18,18 +67,43 @@ class ContentStoreMemoryPrefix(BaseContentStore):
         :param name:  Name
         :return:      Matching Content Object or None
         """
-        return self._container.prefix_lookup(name)
+        if not isinstance(name, Name):  # e.g. a string or None, matches no content object
+            return None
+        if len(name.components) > 0 and self._filter_excludes(name.components_to_string()):
+            self._policy.miss(name.to_string())
+            return None
+        if self._prefer == "freshest":
+            entry = self._container.prefix_lookup(name, key=lambda e: e.timestamp)
+        else:
+            entry = self._container.prefix_lookup(name)
+        if entry is None:
+            self._policy.miss(name.to_string())
+            self._filter_missed()
+        elif not entry.static:
+            self._policy.hit(entry.name.to_string())
+        return entry
 
     def add_content_object(self, content: Content, static: bool=False):
         """
         Insert content object
         :param content: content object to insert
-        :param static: <todo>
+        :param static: if true the content object will not be considered by ageing and eviction
         :return: None
         """
-        entry = ContentStoreEntry(content, static=static)
-        entry.timestamp = time.time()
-        self._container.insert(entry)
+        key = content.name.to_string()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._bytes -= self._size(entry)
+            entry.content = content
+            if static and not entry.static:
+                entry.static = True
+                self._policy.remove(key)
+            entry.timestamp = time.time()
+            self._bytes += self._size(entry)
+            self._schedule(entry)
+        else:
+            self._insert(ContentStoreEntry(content, static=static))
+        self._evict()
 
     def remove_content_object(self, name: Name):
         """
@@ -37,7 +111,12 @@ class ContentStoreMemoryPrefix(BaseContentStore):
         :param name: Name (exact)
         :return: None
         """
-        self._container.remove(name)
+        if not isinstance(name, Name):
+            return
+        key = name.to_string()
+        if key in self._entries:
+            self._remove(key)
+            self._policy.remove(key)
 
     def update_timestamp(self, cs_entry: ContentStoreEntry):
         """
@@ -45,13 +124,110 @@ class ContentStoreMemoryPrefix(BaseContentStore):
         :param cs_entry: content store entry
         :return: None
         """
-        self._container.remove(cs_entry.name)
-        cs_entry.timestamp = time.time()
-        self._container.insert(cs_entry)
+        # the entry may be a copy (e.g. passed through a manager), refresh the stored entry
+        entry = self._entries.get(cs_entry.name.to_string())
+        if entry is None:
+            return
+        entry.timestamp = cs_entry.timestamp = time.time()
+        self._schedule(entry)
 
     def ageing(self):
         """
-        Update the entries periodically
+        Remove the entries which were not refreshed within cs_timeout
         :return: None
         """
-        raise NotImplemented()
+        cur_time = time.time()
+        limit = self._ageing_limit or len(self._expiry)
+        while limit > 0 and self._expiry and self._expiry[0][0] + self._cs_timeout < cur_time:
+            limit -= 1
+            timestamp, key = heapq.heappop(self._expiry)
+            if self._queued.get(key) != timestamp:  # entry removed or refreshed, a newer item is in the heap
+                continue
+            del self._queued[key]
+            entry = self._entries[key]
+            if entry.static:
+                continue
+            if entry.timestamp != timestamp:  # timestamp changed without update_timestamp
+                self._schedule(entry)
+                continue
+            self._remove(key)
+            self._policy.remove(key)
+
+    def set_capacity(self, max_entries: int = 0, max_bytes: int = 0):
+        """set the capacity of the CS, evicting entries if it is exceeded
+        :param max_entries: maximum number of entries, unlimited if 0
+        :param max_bytes: maximum sum of the payload sizes of all entries, unlimited if 0
+        """
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._evict()
+
+    def set_replacement_policy(self, policy: BaseReplacementPolicy):
+        self._policy = policy
+        for key, entry in self._entries.items():
+            if not entry.static:
+                policy.add(key)
+
+    def get_stats(self) -> dict:
+        """number of entries, sum of the payload sizes, capacity, number of evicted entries and filter statistics"""
+        return dict({"entries": len(self._entries), "bytes": self._bytes, "max_entries": self._max_entries,
+                     "max_bytes": self._max_bytes, "evictions": self._evictions}, **self._filter_stats())
+
+    def _insert(self, entry: ContentStoreEntry):
+        key = entry.name.to_string()
+        self._container.insert(entry)
+        self._entries[key] = entry
+        self._bytes += self._size(entry)
+        self._schedule(entry)
+        self._filter_add(entry.name.components_to_string())
+        if not entry.static:
+            self._policy.add(key)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._container.remove(entry.name)
+        self._queued.pop(key, None)
+        self._bytes -= self._size(entry)
+        self._filter_remove(entry.name.components_to_string())
+
+    def _keys(self) -> Iterable[str]:
+        return [entry.name.components_to_string() for entry in self._entries.values()]  # without digest, as matched
+
+    def _filter_add(self, key: str):
+        for prefix in self._prefixes(key):
+            BaseContentStore._filter_add(self, prefix)
+
+    def _filter_remove(self, key: str):
+        for prefix in self._prefixes(key):
+            BaseContentStore._filter_remove(self, prefix)
+
+    @staticmethod
+    def _prefixes(key: str) -> List[str]:
+        """the name key and its prefixes, e.g. /a/b, /a for /a/b (a '/' in a component only adds a superfluous key)"""
+        return [key[:i] for i in range(1, len(key)) if key[i] == "/"] + [key]
+
+    def _schedule(self, entry: ContentStoreEntry):
+        """put the entry into the expiry heap, rebuilding the heap if it holds too many outdated items"""
+        key = entry.name.to_string()
+        self._queued[key] = entry.timestamp
+        heapq.heappush(self._expiry, (entry.timestamp, key))
+        if len(self._expiry) > 2 * len(self._queued) + 64:
+            self._expiry = [(timestamp, key) for key, timestamp in self._queued.items()]
+            heapq.heapify(self._expiry)
+
+    def _full(self) -> bool:
+        return (0 < self._max_entries < len(self._entries)) or (0 < self._max_bytes < self._bytes)
+
+    def _evict(self):
+        """remove the entries chosen by the replacement policy until the capacity is no longer exceeded"""
+        while self._full():
+            key = self._policy.evict()
+            if key is None:  # only static entries left
+                return
+            self._remove(key)
+            self._evictions += 1
+
+    @staticmethod
+    def _size(entry: ContentStoreEntry) -> int:
+        payload = entry.content.get_bytes()
+        return len(payload) if payload is not None else 0
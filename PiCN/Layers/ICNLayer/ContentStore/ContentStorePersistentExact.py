@@ -1,60 +1,406 @@
 """ An persistent content store with exact matching """
 
-import time
-import shelve
+import dbm
+import io
+import mmap
+import os
+import pickle
 import random
+import shutil
 import string
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
 
 from PiCN.Packets import Content, Name
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry
+from PiCN.Layers.ICNLayer.ContentStore.CountingBloomFilter import CountingBloomFilter
+
+_HEADER = struct.Struct("<IIBBd")  # crc32 of the rest of the record, length of the body, kind, static, timestamp
+_LENGTH = struct.Struct("<I")
+_PUT, _DELETE, _TOUCH = 0, 1, 2
+_NONE = 0xffffffff  # length of a field which is None
+
+
+class _IndexEntry(object):
+    """location and metadata of the latest record of a content object in the log"""
+
+    __slots__ = ("segment", "offset", "length", "static", "timestamp")
+
+    def __init__(self, segment: int, offset: int, length: int, static: bool, timestamp: float):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.static = static
+        self.timestamp = timestamp
+
+
+class _LegacyObject(object):
+    """attributes of a pickled PiCN object of an older version, e.g. a content store entry"""
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """unpickles the PiCN objects of an older version as plain objects with their pickled attributes, independent of
+    the current classes"""
+
+    def find_class(self, module, name):
+        if module.startswith("PiCN."):
+            return _LegacyObject
+        return pickle.Unpickler.find_class(self, module, name)
 
 
 class ContentStorePersistentExact(BaseContentStore):
-    """ A persistent content store with exact matching"""
+    """ A persistent content store with exact matching. Content objects are appended to a log of segment files in the
+    directory db_path; an in-memory index maps each name to the offset of its latest record, so lookups read a single
+    record through a memory map and ageing only inspects expired entries, without touching the disk. Removals and refreshes are appended as small
+    records, the log is replayed to rebuild the index when the store is opened, a torn record at the end of the log is
+    truncated. If more than compaction_threshold of the completed segments is outdated, a background thread copies the
+    live records of the oldest segments to the end of the log and deletes the segments. A database of the former
+    shelve-based store at db_path is converted into a log when the store is opened; its files are kept in
+    db_path + ".legacy".
+    :param cs_timeout: Time interval in which a CS entry will be cached
+    :param db_path: directory of the log, a new directory in /tmp if None
+    :param segment_size: size in bytes after which a new segment is started
+    :param compaction_threshold: share of outdated bytes in the completed segments which triggers a compaction
+    :param membership_filter: filter answering lookups of names which are not in the CS, see set_membership_filter
+    """
 
-    def __init__(self, cs_timeout: int = 10, db_path: str = None):
+    def __init__(self, cs_timeout: int = 10, db_path: str = None, segment_size: int = 4 * 1024 * 1024,
+                 compaction_threshold: float = 0.5, membership_filter: CountingBloomFilter = None):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout)
         if db_path is None:
             self.db_path = "/tmp/" + ''.join(random.choice(string.ascii_lowercase) for x in range(9)) + ".db"
         else:
             self.db_path = db_path
-        self._container = shelve.open(self.db_path)
-        self._cs_timeout = cs_timeout
-
+        self._segment_size = segment_size
+        self._compaction_threshold = compaction_threshold
+        self._lock = threading.RLock()
+        self._compaction_requested = threading.Event()
+        self._compactor: Optional[threading.Thread] = None
+        self._closed = False
+        self._open()
+        if membership_filter is not None:
+            self.set_membership_filter(membership_filter)
 
     def close_cs(self):
-        self._container.close()
+        with self._lock:
+            self._closed = True
+            self._compaction_requested.set()
+            self._close_files()
 
     def get_db_path(self) -> str:
         return self.db_path
 
     def delete_all(self):
-        self._container.clear()
+        with self._lock:
+            for key in self._index:
+                self._filter_remove(key)
+            self._close_files()
+            shutil.rmtree(self.db_path, ignore_errors=True)
+            self._open()
+
+    @property
+    def container(self) -> List[ContentStoreEntry]:
+        with self._lock:
+            return [self._load(key, entry) for key, entry in self._index.items()]
+
+    def get_container_size(self) -> int:
+        return len(self._index)
 
     def find_content_object(self, name: Name) -> ContentStoreEntry:
-        if name.to_string() in self._container.keys():
-            return self._container[name.to_string()]
-        else:
+        if not isinstance(name, Name):  # e.g. a string or None, matches no content object
             return None
+        key = name.to_string()
+        with self._lock:
+            if self._filter_excludes(key):
+                return None
+            entry = self._index.get(key)
+            if entry is None:
+                self._filter_missed()
+                return None
+            return self._load(key, entry)
 
     def add_content_object(self, content: Content, static: bool = False):
-        self._container[content.name.to_string()] = ContentStoreEntry(content, static=static)
+        key = content.name.to_string()
+        with self._lock:
+            old = self._index.pop(key, None)
+            if old is not None:
+                self._outdated(old)
+                self._expiry.pop(key, None)
+            else:
+                self._filter_add(key)
+            timestamp = time.time()
+            self._index[key] = self._append(_PUT, key, static, timestamp, self._encode_content(content))
+            if not static:
+                self._expiry[key] = None
 
     def remove_content_object(self, name: Name):
-        if name.to_string() in self._container.keys():
-            del self._container[name.to_string()]
+        if not isinstance(name, Name):
+            return
+        with self._lock:
+            self._remove(name.to_string())
 
     def update_timestamp(self, cs_entry: ContentStoreEntry):
-        self.remove_content_object(cs_entry.name)
-        cs_entry.timestamp = time.time()
-        self._container[cs_entry.name.to_string()] = cs_entry
+        key = cs_entry.name.to_string()
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return
+            entry.timestamp = cs_entry.timestamp = time.time()
+            self._index.move_to_end(key)
+            if key in self._expiry:
+                self._expiry.move_to_end(key)
+            self._outdated(self._append(_TOUCH, key, entry.static, entry.timestamp))
 
     def ageing(self):
-        keys_to_remove = []
         cur_time = time.time()
-        for key in self._container:
-            if self._container[key].static is True:
-                continue
-            if self._container[key].timestamp + self._cs_timeout < cur_time:
-                keys_to_remove.append(key)
-        for key in keys_to_remove:
-            self.remove_content_object(self._container[key].name.to_string())
+        with self._lock:
+            for _ in range(self._ageing_limit or len(self._expiry)):
+                key = next(iter(self._expiry), None)
+                if key is None or self._index[key].timestamp + self._cs_timeout >= cur_time:
+                    break  # entries are ordered by their timestamp, all following entries are younger
+                self._remove(key)
+
+    def compact(self):
+        """copy the live records of the oldest segments to the end of the log and delete the segments, until at most
+        compaction_threshold of the completed segments is outdated. Segments completed during the compaction are left
+        for the next one.
+        """
+        with self._lock:
+            last = self._active - 1
+        while True:
+            with self._lock:
+                if self._closed or not self._needs_compaction() or min(self._segments) > last:
+                    return
+                self._compact_segment(min(self._segments))
+
+    def get_stats(self) -> dict:
+        """number of entries, number of segments, bytes of the log, outdated bytes of the log and filter statistics"""
+        with self._lock:
+            return dict({"entries": len(self._index), "segments": len(self._segments),
+                         "bytes": sum(self._segments.values()), "outdated_bytes": sum(self._outdated_bytes.values())},
+                        **self._filter_stats())
+
+    def _keys(self) -> Iterable[str]:
+        with self._lock:
+            return list(self._index)
+
+    def _open(self):
+        """open the log in db_path and rebuild the index by replaying it"""
+        if not os.path.isdir(self.db_path):
+            legacy = dbm.whichdb(self.db_path)
+            if legacy:
+                self._migrate(legacy)
+            elif os.path.exists(self.db_path):
+                raise ValueError("db_path %s is neither a directory nor a content store database" % self.db_path)
+        os.makedirs(self.db_path, exist_ok=True)
+        self._index: Dict[str, _IndexEntry] = OrderedDict()  # name -> entry, oldest timestamp first
+        self._segments: Dict[int, int] = {}  # segment -> size in bytes
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._outdated_bytes: Dict[int, int] = {}  # segment -> bytes of records which are no longer needed
+        self._closed = False
+        segments = sorted(int(f[:-4]) for f in os.listdir(self.db_path) if f.endswith(".log") and f[:-4].isdigit())
+        for segment in segments:
+            self._replay(segment)
+        self._outdated_bytes = dict(self._segments)
+        for entry in self._index.values():
+            self._outdated_bytes[entry.segment] -= entry.length
+        self._index = OrderedDict(sorted(self._index.items(), key=lambda item: item[1].timestamp))
+        # names of the non-static entries, oldest timestamp first
+        self._expiry: Dict[str, None] = OrderedDict((key, None) for key, e in self._index.items() if not e.static)
+        if segments and self._segments[segments[-1]] < self._segment_size:
+            self._active = segments[-1]
+            self._file = open(self._path(self._active), "ab")
+        else:
+            self._start_segment()
+
+    def _migrate(self, legacy: str):
+        """convert the shelve database at db_path into a log in db_path and move its files to db_path + ".legacy"
+        :param legacy: dbm module of the database
+        """
+        db_path = self.db_path
+        files = [path for path in [db_path] + [db_path + suffix for suffix in (".db", ".pag", ".dir", ".dat", ".bak")]
+                 if os.path.isfile(path)]
+        self.db_path = db_path + ".migrating"
+        shutil.rmtree(self.db_path, ignore_errors=True)
+        try:
+            self._open()
+            with dbm.open(db_path, "r") as db:
+                for key in db.keys():
+                    entry = _LegacyUnpickler(io.BytesIO(db[key])).load()
+                    name, content = entry._content._name, entry._content
+                    new_name = Name(name._components, suite=name.suite)
+                    new_name.digest = name.digest
+                    new_content = Content(new_name, content._content, content._wire_format)
+                    self._append(_PUT, new_name.to_string(), entry._static, entry._timestamp,
+                                 self._encode_content(new_content))
+            self._close_files()
+        except Exception as e:
+            log = getattr(self, "_file", None)  # not set if the log could not be created
+            if log is not None and not log.closed:
+                self._close_files()
+            shutil.rmtree(self.db_path, ignore_errors=True)
+            self.db_path = db_path
+            raise ValueError("db_path %s is a %s database of an older content store which could not be converted: %s"
+                             % (db_path, legacy, e)) from e
+        os.makedirs(db_path + ".legacy", exist_ok=True)
+        for path in files:
+            os.rename(path, os.path.join(db_path + ".legacy", os.path.basename(path)))
+        os.rename(self.db_path, db_path)
+        self.db_path = db_path
+
+    def _replay(self, segment: int):
+        """apply the records of a segment to the index, truncating the segment at the first invalid record"""
+        with open(self._path(segment), "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            crc, body_length, kind, static, timestamp = _HEADER.unpack_from(data, offset)
+            end = offset + _HEADER.size + body_length
+            if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc:
+                break
+            key_length = _LENGTH.unpack_from(data, offset + _HEADER.size)[0]
+            key_start = offset + _HEADER.size + _LENGTH.size
+            key = data[key_start:key_start + key_length].decode()
+            if kind == _PUT:
+                self._index.pop(key, None)
+                self._index[key] = _IndexEntry(segment, offset, end - offset, bool(static), timestamp)
+            elif kind == _DELETE:
+                self._index.pop(key, None)
+            elif kind == _TOUCH and key in self._index:
+                self._index[key].timestamp = timestamp
+            offset = end
+        if offset < len(data):  # torn or corrupted record, e.g. written during a crash
+            with open(self._path(segment), "r+b") as f:
+                f.truncate(offset)
+        self._segments[segment] = offset
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.db_path, "%08d.log" % segment)
+
+    def _start_segment(self):
+        self._active = max(self._segments, default=-1) + 1
+        self._segments[self._active] = 0
+        self._outdated_bytes[self._active] = 0
+        self._file = open(self._path(self._active), "ab")
+
+    def _append(self, kind: int, key: str, static: bool, timestamp: float, data: bytes = b"") -> _IndexEntry:
+        """append a record to the active segment
+        :return: location of the record
+        """
+        encoded_key = key.encode()
+        body = _LENGTH.pack(len(encoded_key)) + encoded_key + data
+        record = _HEADER.pack(0, len(body), kind, static, timestamp)[4:] + body
+        return self._write(struct.pack("<I", zlib.crc32(record)) + record, static, timestamp)
+
+    def _write(self, record: bytes, static: bool, timestamp: float) -> _IndexEntry:
+        if self._segments[self._active] >= self._segment_size:
+            self._file.close()
+            self._start_segment()
+        offset = self._segments[self._active]
+        self._file.write(record)
+        self._file.flush()
+        self._segments[self._active] = offset + len(record)
+        return _IndexEntry(self._active, offset, len(record), static, timestamp)
+
+    def _read(self, entry: _IndexEntry) -> bytes:
+        """read a record through the memory map of its segment"""
+        m = self._maps.get(entry.segment)
+        if m is None or len(m) < entry.offset + entry.length:  # the segment grew since it was mapped
+            if m is not None:
+                m.close()
+            with open(self._path(entry.segment), "rb") as f:
+                m = self._maps[entry.segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return m[entry.offset:entry.offset + entry.length]
+
+    def _load(self, key: str, entry: _IndexEntry) -> ContentStoreEntry:
+        record = self._read(entry)
+        cs_entry = ContentStoreEntry(self._decode_content(record, _HEADER.size + _LENGTH.size + len(key.encode())),
+                                     static=entry.static)
+        cs_entry.timestamp = entry.timestamp
+        return cs_entry
+
+    def _remove(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._expiry.pop(key, None)
+            self._filter_remove(key)
+            self._outdated(entry)
+            self._outdated(self._append(_DELETE, key, False, time.time()))
+
+    def _outdated(self, entry: _IndexEntry):
+        """account for a record which is no longer needed, and start a compaction if the log holds too many"""
+        self._outdated_bytes[entry.segment] += entry.length
+        if self._needs_compaction():
+            if self._compactor is None or not self._compactor.is_alive():
+                self._compactor = threading.Thread(target=self._compact_loop, name="ContentStoreCompactor",
+                                                   daemon=True)
+                self._compactor.start()
+            self._compaction_requested.set()
+
+    def _needs_compaction(self) -> bool:
+        completed = [segment for segment in self._segments if segment != self._active]
+        outdated = sum(self._outdated_bytes[segment] for segment in completed)
+        return outdated > 0 and outdated > self._compaction_threshold * sum(self._segments[s] for s in completed)
+
+    def _compact_loop(self):
+        while not self._closed:
+            self._compaction_requested.wait()
+            self._compaction_requested.clear()
+            self.compact()
+
+    def _compact_segment(self, segment: int):
+        """copy the live records of a segment to the end of the log and delete the segment. Only the oldest segment is
+        compacted: removal records then only refer to records in the same segment, and can be dropped
+        """
+        live = [(key, entry) for key, entry in self._index.items() if entry.segment == segment]
+        for key, entry in live:
+            record = bytearray(self._read(entry))
+            _HEADER.pack_into(record, 0, 0, len(record) - _HEADER.size, _PUT, entry.static, entry.timestamp)
+            struct.pack_into("<I", record, 0, zlib.crc32(memoryview(record)[4:]))
+            moved = self._write(bytes(record), entry.static, entry.timestamp)
+            entry.segment, entry.offset = moved.segment, moved.offset
+        m = self._maps.pop(segment, None)
+        if m is not None:
+            m.close()
+        del self._segments[segment]
+        del self._outdated_bytes[segment]
+        os.remove(self._path(segment))
+
+    def _close_files(self):
+        for m in self._maps.values():
+            m.close()
+        self._maps = {}
+        self._file.close()
+
+    @staticmethod
+    def _encode_content(content: Content) -> bytes:
+        name = content.name
+        fields = [name.suite.encode(), name.digest] + [c if isinstance(c, bytes) else c.encode()
+                                                       for c in name.components]
+        data = [struct.pack("<H", len(name.components))]
+        for field in fields + [content.get_bytes(), content.wire_format]:
+            data.append(_LENGTH.pack(_NONE if field is None else len(field)))
+            if field is not None:
+                data.append(bytes(field))
+        return b"".join(data)
+
+    @staticmethod
+    def _decode_content(record: bytes, offset: int) -> Content:
+        count = struct.unpack_from("<H", record, offset)[0]
+        offset += 2
+        fields = []
+        for _ in range(count + 4):
+            length = _LENGTH.unpack_from(record, offset)[0]
+            offset += _LENGTH.size
+            if length == _NONE:
+                fields.append(None)
+            else:
+                fields.append(record[offset:offset + length])
+                offset += length
+        name = Name(fields[2:2 + count], suite=fields[0].decode())
+        name.digest = fields[1]
+        return Content(name, fields[-2], fields[-1])
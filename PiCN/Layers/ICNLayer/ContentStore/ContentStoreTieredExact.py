@@ -0,0 +1,153 @@
+""" A content store with exact matching, keeping popular content in memory and the remaining content on disk"""
+
+from typing import List
+
+from PiCN.Packets import Content, Name
+from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore, ContentStoreEntry, ContentStoreMemoryExact, \
+    ContentStorePersistentExact
+from PiCN.Layers.ICNLayer.ContentStore.CountingBloomFilter import CountingBloomFilter
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy
+
+
+class ContentStoreTieredExact(BaseContentStore):
+    """ A content store with exact matching made of a bounded in-memory hot tier (ContentStoreMemoryExact) and a
+    disk-backed cold tier (ContentStorePersistentExact). Entries evicted from the hot tier by its replacement policy are
+    demoted to the cold tier, entries found in the cold tier are promoted to the hot tier. New content objects are
+    admitted to the hot tier (admission="hot") or to the cold tier (admission="cold"), in which case only content
+    requested again occupies memory. Static entries are always kept in the hot tier. Entries expire from the cold tier
+    after cold_timeout, which is much longer than the cs_timeout of the hot tier, so the cold tier keeps far more content
+    than fits in memory. Promoted entries keep their timestamp.
+    :param cs_timeout: Time interval in which a CS entry will be cached in the hot tier
+    :param max_entries: maximum number of entries of the hot tier, unlimited if 0
+    :param max_bytes: maximum sum of the payload sizes of the entries of the hot tier, unlimited if 0
+    :param policy: replacement policy of the hot tier, least recently used (LRUPolicy) if None
+    :param db_path: directory of the cold tier, a new directory in /tmp if None
+    :param admission: "hot" or "cold", tier new content objects are inserted into
+    :param membership_filter: filter answering lookups of names which are in neither tier, see set_membership_filter
+    :param cold_timeout: Time interval in which a CS entry will be cached in the cold tier
+    """
+
+    def __init__(self, cs_timeout: int = 10, max_entries: int = 0, max_bytes: int = 0,
+                 policy: BaseReplacementPolicy = None, db_path: str = None, admission: str = "hot",
+                 membership_filter: CountingBloomFilter = None, cold_timeout: int = 3600):
+        BaseContentStore.__init__(self, cs_timeout=cs_timeout, policy=policy)
+        if admission not in ("hot", "cold"):
+            raise ValueError("admission must be 'hot' or 'cold', not %r" % admission)
+        self._admission = admission
+        self.hot = ContentStoreMemoryExact(cs_timeout=cs_timeout, max_entries=max_entries, max_bytes=max_bytes,
+                                           policy=policy, on_evict=self._demote)
+        self.cold = ContentStorePersistentExact(cs_timeout=cold_timeout, db_path=db_path)
+        self._counters = {"hot_hits": 0, "hot_misses": 0, "cold_hits": 0, "cold_misses": 0, "promotions": 0,
+                          "demotions": 0}
+        if membership_filter is not None:
+            self.set_membership_filter(membership_filter)
+
+    @property
+    def container(self) -> List[ContentStoreEntry]:
+        return self.hot.container + self.cold.container
+
+    def get_container_size(self) -> int:
+        return self.hot.get_container_size() + self.cold.get_container_size()
+
+    def find_content_object(self, name: Name) -> ContentStoreEntry:
+        if not isinstance(name, Name):  # e.g. a string or None, matches no content object
+            return None
+        if self._filter_excludes(name.to_string()):
+            return None
+        entry = self.hot.find_content_object(name)
+        if entry is not None:
+            self._counters["hot_hits"] += 1
+            return entry
+        self._counters["hot_misses"] += 1
+        entry = self.cold.find_content_object(name)
+        if entry is None:
+            self._counters["cold_misses"] += 1
+            self._filter_missed()
+            return None
+        self._counters["cold_hits"] += 1
+        self._counters["promotions"] += 1
+        self.cold.remove_content_object(name)
+        self.hot.add_content_object(entry.content, static=entry.static, timestamp=entry.timestamp)
+        return entry
+
+    def add_content_object(self, content: Content, static: bool = False):
+        if static or self._admission == "hot":
+            self.cold.remove_content_object(content.name)
+            self.hot.add_content_object(content, static=static)
+        else:
+            self.hot.remove_content_object(content.name)
+            self.cold.add_content_object(content)
+
+    def remove_content_object(self, name: Name):
+        self.hot.remove_content_object(name)
+        self.cold.remove_content_object(name)
+
+    def update_timestamp(self, cs_entry: ContentStoreEntry):
+        self.hot.update_timestamp(cs_entry)
+        self.cold.update_timestamp(cs_entry)
+
+    def ageing(self):
+        self.hot.ageing()
+        self.cold.ageing()
+
+    def set_cs_timeout(self, timeout: float):
+        """set the timeout intervall for an entry of the hot tier
+        :param timeout: the timeout intervall to be set
+        """
+        BaseContentStore.set_cs_timeout(self, timeout)
+        self.hot.set_cs_timeout(timeout)
+
+    def set_cold_timeout(self, timeout: float):
+        """set the timeout intervall for an entry of the cold tier
+        :param timeout: the timeout intervall to be set
+        """
+        self.cold.set_cs_timeout(timeout)
+
+    def set_ageing_limit(self, limit: int):
+        BaseContentStore.set_ageing_limit(self, limit)
+        self.hot.set_ageing_limit(limit)
+        self.cold.set_ageing_limit(limit)
+
+    def set_membership_filter(self, membership_filter: CountingBloomFilter, lookup: bool = True):
+        """set a filter holding the names of the entries of both tiers, which is maintained by the tiers, so entries
+        moved between the tiers stay in the filter
+        :param membership_filter: an empty filter, None to remove the filter
+        :param lookup: if false, the filter is only maintained
+        """
+        self._filter = membership_filter
+        self._filter_lookup = lookup
+        self.hot.set_membership_filter(membership_filter, lookup=False)
+        self.cold.set_membership_filter(membership_filter, lookup=False)
+
+    def set_capacity(self, max_entries: int = 0, max_bytes: int = 0):
+        """set the capacity of the hot tier, demoting entries if it is exceeded
+        :param max_entries: maximum number of entries, unlimited if 0
+        :param max_bytes: maximum sum of the payload sizes of all entries, unlimited if 0
+        """
+        self.hot.set_capacity(max_entries, max_bytes)
+
+    def set_replacement_policy(self, policy: BaseReplacementPolicy):
+        self._policy = policy
+        self.hot.set_replacement_policy(policy)
+
+    def get_stats(self) -> dict:
+        """hits and misses of each tier, number of promoted and demoted entries, the size of each tier and filter
+        statistics"""
+        hot, cold = self.hot.get_stats(), self.cold.get_stats()
+        return dict(self._counters, hot_entries=hot["entries"], hot_bytes=hot["bytes"], cold_entries=cold["entries"],
+                    cold_bytes=cold["bytes"], **self._filter_stats())
+
+    def close_cs(self):
+        self.cold.close_cs()
+
+    def get_db_path(self) -> str:
+        return self.cold.get_db_path()
+
+    def delete_all(self):
+        self.hot.container = []
+        self.cold.delete_all()
+
+    def _demote(self, entry: ContentStoreEntry):
+        """move an entry evicted from the hot tier to the cold tier"""
+        self._counters["demotions"] += 1
+        self.cold.add_content_object(entry.content)
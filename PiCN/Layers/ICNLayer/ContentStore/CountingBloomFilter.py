@@ -0,0 +1,97 @@
+"""Counting Bloom filter answering lookups of names which are definitely not in a content store or repository"""
+
+import contextlib
+import hashlib
+import math
+import multiprocessing
+import multiprocessing.sharedctypes
+from typing import Union
+
+_MASK64 = (1 << 64) - 1
+_QUERIES, _NEGATIVES, _FALSE_POSITIVES, _KEYS = range(4)
+
+
+class CountingBloomFilter(object):
+    """Counting Bloom filter (Fan et al., IEEE/ACM ToN 2000) over the names of the entries of a store. might_contain
+    returns False only if a name was never added or was removed again, so a store can answer the lookup without
+    searching its data structure; True may be a false positive. Each name increments one 8 bit counter per hash
+    function and removing it decrements them; saturated counters are never decremented, so removals never cause false
+    negatives. The indices are derived from a BLAKE2 digest of the name (double hashing), so they are the same in all
+    processes.
+    :param capacity: expected number of names
+    :param false_positive_rate: false positive rate with capacity names, determines the number of counters
+    :param memory: number of counters (bytes), used instead of false_positive_rate if not 0
+    :param shared: if true, counters and statistics are kept in shared memory, so processes forked after the filter was
+        created use the same filter (e.g. for a repository whose storage is shared through a manager)
+    """
+
+    def __init__(self, capacity: int = 10000, false_positive_rate: float = 0.01, memory: int = 0,
+                 shared: bool = False):
+        if capacity <= 0 or not 0 < false_positive_rate < 1:
+            raise ValueError("capacity must be positive and false_positive_rate between 0 and 1")
+        self.capacity = capacity
+        if memory > 0:
+            self.size = memory
+        else:
+            self.size = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        if shared:
+            self._counters = multiprocessing.sharedctypes.RawArray('B', self.size)
+            self._stats = multiprocessing.sharedctypes.RawArray('q', 4)
+            self._lock = multiprocessing.Lock()
+        else:
+            self._counters = bytearray(self.size)
+            self._stats = [0] * 4
+            self._lock = contextlib.nullcontext()
+
+    def add(self, key: Union[str, bytes]):
+        """add a name, a name added n times must be removed n times
+        :param key: the name, e.g. Name.to_string()
+        """
+        with self._lock:
+            for index in self._indices(key):
+                if self._counters[index] < 255:
+                    self._counters[index] += 1
+            self._stats[_KEYS] += 1
+
+    def remove(self, key: Union[str, bytes]):
+        """remove a name which was added before
+        :param key: the name, e.g. Name.to_string()
+        """
+        with self._lock:
+            for index in self._indices(key):
+                if 0 < self._counters[index] < 255:
+                    self._counters[index] -= 1
+            self._stats[_KEYS] -= 1
+
+    def might_contain(self, key: Union[str, bytes]) -> bool:
+        """check if a name may have been added
+        :param key: the name, e.g. Name.to_string()
+        :return: False if the name is definitely not in the filter
+        """
+        self._stats[_QUERIES] += 1  # without the lock, statistics of concurrent lookups are approximate
+        for index in self._indices(key):
+            if self._counters[index] == 0:
+                self._stats[_NEGATIVES] += 1
+                return False
+        return True
+
+    def report_false_positive(self):
+        """count a lookup which might_contain let pass but which found nothing"""
+        self._stats[_FALSE_POSITIVES] += 1
+
+    def expected_false_positive_rate(self) -> float:
+        """false positive rate expected with the current number of names"""
+        keys = max(0, self._stats[_KEYS])
+        return (1 - math.exp(-self.hashes * keys / self.size)) ** self.hashes
+
+    def get_stats(self) -> dict:
+        """number of lookups, lookups answered as definite misses, reported false positives, names, and bytes used"""
+        return {"queries": self._stats[_QUERIES], "negatives": self._stats[_NEGATIVES],
+                "false_positives": self._stats[_FALSE_POSITIVES], "keys": self._stats[_KEYS], "bytes": self.size}
+
+    def _indices(self, key: Union[str, bytes]) -> list:
+        digest = hashlib.blake2b(key.encode() if isinstance(key, str) else key, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [((h1 + i * h2) & _MASK64) % self.size for i in range(self.hashes)]
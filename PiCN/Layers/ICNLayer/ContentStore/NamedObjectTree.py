@@ -2,20 +2,19 @@
 
 from PiCN.Packets import Name
 
-from functools import reduce
-from collections import defaultdict
-import operator
+from collections import deque
 import json
-from typing import List
+from typing import Callable, Iterator, List, Optional
 
 
 def Tree(named_object=None):
-    return {"subtree": defaultdict(Tree), "leaf": named_object}
+    return {"subtree": {}, "leaf": named_object}
 
 class NamedObjectTree():
     """
     Data structure to organize objects with property 'name' (of type PiCN.Packets.Name) in a tree reflecting their
-    namespace hierarchy (e.g. Content, ContentStoreEntry). Exact and prefix lookup is possible.
+    namespace hierarchy (e.g. Content, ContentStoreEntry). Exact and prefix lookup is possible. Nodes which no longer
+    hold an object or lead to one are removed, lookups never add nodes.
     """
 
     def __init__(self):
@@ -23,16 +22,20 @@ class NamedObjectTree():
        Create empty tree
         """
         self.__tree = Tree()
+        self.__size = 0
 
-    def __get_subtree(self, path: List[str]):
+    def __get_node(self, path: List[bytes]) -> Optional[dict]:
         """
-        Get subtree of a certain path
-        :param path: path of subtree to return
-        :return: subtree of given path
+        Get the node of a certain path
+        :param path: path of the node to return
+        :return: node of given path or None if it does not exist
         """
-        if len(path) == 0:
-            return self.__tree["subtree"]
-        return reduce(lambda subtree, key: operator.getitem(subtree["subtree"], key), path, self.__tree)["subtree"]
+        node = self.__tree
+        for key in path:
+            node = node["subtree"].get(key)
+            if node is None:
+                return None
+        return node
 
     def as_json(self) -> str:
         """
@@ -43,22 +46,40 @@ class NamedObjectTree():
 
     def insert(self, named_object) -> None:
         """
-        Insert an object
+        Insert an object, replacing an object of the same name
         :param named_object: Object to insert (must have a property 'name' of type PiCN.Packets.Name)
         :return: None
         """
-        path = named_object.name.components
-        (self.__get_subtree(path[:-1])[path[-1]])["leaf"] = named_object
+        node = self.__tree
+        for key in named_object.name.components:
+            subtree = node["subtree"]
+            node = subtree.get(key)
+            if node is None:
+                node = subtree[key] = Tree()
+        if node["leaf"] is None:
+            self.__size += 1
+        node["leaf"] = named_object
 
     def remove(self, name: Name) -> None:
         """
-        Remove an object
+        Remove an object and the nodes which became empty
         :param name: Name of object to remove
         :return: None
         """
-        # TODO: this only removes the leaf (=value) but not nodes (=nested dicts) which are no longer used (if any).
         path = name.components
-        del ((self.__get_subtree(path[:-1]))[path[-1]])["leaf"]
+        nodes = [self.__tree]
+        for key in path:
+            node = nodes[-1]["subtree"].get(key)
+            if node is None:
+                return
+            nodes.append(node)
+        if nodes[-1]["leaf"] is not None:
+            self.__size -= 1
+        nodes[-1]["leaf"] = None
+        for depth in range(len(path), 0, -1):
+            if nodes[depth]["leaf"] is not None or nodes[depth]["subtree"]:
+                break
+            del nodes[depth - 1]["subtree"][path[depth - 1]]
 
     def exact_lookup(self, name: Name):
         """
@@ -66,26 +87,42 @@ class NamedObjectTree():
         :param name: Name to lookup
         :return: Named object or None
         """
-        path = name.components
-        try:
-            return ((self.__get_subtree(path[:-1]))[path[-1]])["leaf"]
-        except KeyError:
-            return None
+        node = self.__get_node(name.components)
+        return node["leaf"] if node is not None else None
+
+    def prefix_objects(self, name: Name) -> Iterator:
+        """
+        Iterate over the objects which have a given prefix (or exact match), ordered by the length of their name,
+        names of the same length in the order their nodes were created
+        :param name: name/prefix
+        :return: iterator of named objects
+        """
+        start = self.__get_node(name.components)
+        if start is None:
+            return
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node["leaf"] is not None:
+                yield node["leaf"]
+            queue.extend(node["subtree"].values())
 
-    def prefix_lookup(self, name: Name):
+    def prefix_lookup(self, name: Name, key: Callable = None):
         """
-        Find any object which has a given prefix (or exact match)
+        Find an object which has a given prefix (or exact match). Without key, the object with the shortest name is
+        returned (the exact match if any), otherwise the object with the largest key, the first in the order of
+        prefix_objects if several have the same key
         :param name: name/prefix
+        :param key: function rating an object, e.g. by its timestamp
         :return: Named object or None
         """
-        def traverse(tree):
-            if tree["leaf"] is not None:
-                return tree["leaf"]
-            else:
-                for key in tree["subtree"]:
-                    return traverse(tree["subtree"][key])
-            return None
+        if key is None:
+            return next(self.prefix_objects(name), None)
+        best = None
+        for named_object in self.prefix_objects(name):
+            if best is None or key(named_object) > key(best):
+                best = named_object
+        return best
 
-        path = name.components
-        start = (self.__get_subtree(path[:-1]))[path[-1]]
-        return traverse(start)
+    def __len__(self) -> int:
+        return self.__size
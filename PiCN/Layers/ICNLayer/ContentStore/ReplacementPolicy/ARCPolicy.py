@@ -0,0 +1,81 @@
+"""Adaptive replacement cache (ARC) policy"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy.BaseReplacementPolicy import BaseReplacementPolicy
+
+
+class ARCPolicy(BaseReplacementPolicy):
+    """Adaptive replacement cache (Megiddo and Modha, FAST 2003). Entries requested once are kept in the list t1,
+    entries requested again in t2; the names of entries evicted from them are remembered in the ghost lists b1 and b2.
+    Inserting a name found in a ghost list shifts the target size p of t1 towards recency (b1) or frequency (b2), so
+    the policy adapts to the workload. The capacity c is the number of entries cached when an entry is evicted, the
+    ghost lists hold at most c names.
+    """
+
+    def __init__(self):
+        self._t1: OrderedDict = OrderedDict()  # least recently used first
+        self._t2: OrderedDict = OrderedDict()
+        self._b1: OrderedDict = OrderedDict()
+        self._b2: OrderedDict = OrderedDict()
+        self._p = 0.0
+        self._last_added: str = None
+        self._from_b2 = False
+
+    def add(self, key: str):
+        self.remove(key)
+        capacity = len(self._t1) + len(self._t2) + 1
+        self._from_b2 = False
+        if key in self._b1:
+            self._p = min(self._p + max(len(self._b2) / len(self._b1), 1), capacity)
+            del self._b1[key]
+            self._t2[key] = None
+        elif key in self._b2:
+            self._p = max(self._p - max(len(self._b1) / len(self._b2), 1), 0)
+            del self._b2[key]
+            self._t2[key] = None
+            self._from_b2 = True
+        else:
+            self._t1[key] = None
+        self._last_added = key
+
+    def hit(self, key: str):
+        if key in self._t1:
+            del self._t1[key]
+            self._t2[key] = None
+        elif key in self._t2:
+            self._t2.move_to_end(key)
+
+    def remove(self, key: str):
+        self._t1.pop(key, None)
+        self._t2.pop(key, None)
+
+    def evict(self) -> Optional[str]:
+        if not self._t1 and not self._t2:
+            return None
+        capacity = len(self._t1) + len(self._t2)
+        # the entry just added takes the place of the evicted one, it is not part of t1 yet (REPLACE of ARC)
+        t1 = len(self._t1) - (1 if self._last_added in self._t1 else 0)
+        if t1 > 0 and (t1 > self._p or (self._from_b2 and t1 == self._p) or not self._t2):
+            key = self._t1.popitem(last=False)[0]
+            self._b1[key] = None
+        elif self._t2:
+            key = self._t2.popitem(last=False)[0]
+            self._b2[key] = None
+        else:
+            key = self._t1.popitem(last=False)[0]
+            self._b1[key] = None
+        while self._b1 and len(self._t1) + len(self._b1) > capacity:
+            self._b1.popitem(last=False)
+        while self._b2 and len(self._t1) + len(self._t2) + len(self._b1) + len(self._b2) > 2 * capacity:
+            self._b2.popitem(last=False)
+        return key
+
+    @property
+    def target(self) -> float:
+        """target size p of the list of entries requested once"""
+        return self._p
+
+    def __len__(self) -> int:
+        return len(self._t1) + len(self._t2)
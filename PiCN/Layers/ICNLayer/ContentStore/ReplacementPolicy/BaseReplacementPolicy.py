@@ -0,0 +1,53 @@
+"""Abstract replacement policy of a content store"""
+
+import abc
+from typing import Optional
+
+
+class BaseReplacementPolicy(object):
+    """Abstract replacement policy, deciding which entry a content store evicts if it is full. The content store
+    reports each request and each change of its entries; keys are the names of the entries as strings. Static entries
+    are not reported, they are never evicted.
+    """
+
+    @abc.abstractmethod
+    def add(self, key: str):
+        """
+        An entry was inserted
+        :param key: name of the entry
+        :return: None
+        """
+
+    @abc.abstractmethod
+    def hit(self, key: str):
+        """
+        An entry was requested
+        :param key: name of the entry
+        :return: None
+        """
+
+    def miss(self, key: str):
+        """
+        A name without entry was requested, the content may be inserted later
+        :param key: name requested
+        :return: None
+        """
+
+    @abc.abstractmethod
+    def remove(self, key: str):
+        """
+        An entry was removed by the content store (e.g. by ageing), does nothing if the policy does not know the key
+        :param key: name of the entry
+        :return: None
+        """
+
+    @abc.abstractmethod
+    def evict(self) -> Optional[str]:
+        """
+        Choose the entry to be evicted and forget it
+        :return: name of the entry, None if the policy knows no entry
+        """
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """number of entries known by the policy"""
@@ -0,0 +1,52 @@
+"""Count-min sketch estimating how often names were requested"""
+
+_MASK64 = (1 << 64) - 1
+
+
+class CountMinSketch(object):
+    """Count-min sketch with small saturating counters, as used by TinyLFU (Einziger et al., ACM ToS 2017). Each key
+    increments one counter per row; its frequency is estimated by the minimum of its counters, which may overestimate
+    but never underestimates. After sample_size increments all counters are halved, so the sketch follows changes of
+    the popularity (ageing).
+    :param width: number of counters per row, rounded up to a power of two
+    :param depth: number of rows
+    :param max_count: maximum value of a counter
+    :param sample_size: number of increments after which the counters are halved, 10 * width if None
+    """
+
+    def __init__(self, width: int = 1024, depth: int = 4, max_count: int = 15, sample_size: int = None):
+        self.width = 1 << max(0, (width - 1).bit_length())
+        self.depth = depth
+        self.max_count = max_count
+        self.sample_size = sample_size if sample_size is not None else 10 * self.width
+        self._shift = 64 - (self.width.bit_length() - 1)
+        # odd multipliers, one per row, so the rows index independently (multiplicative hashing)
+        self._seeds = [((0x9e3779b97f4a7c15 * (2 * row + 1)) & _MASK64) | 1 for row in range(depth)]
+        self._counters = bytearray(self.width * depth)
+        self._additions = 0
+
+    def increment(self, key):
+        """count a request of key"""
+        added = False
+        for index in self._indices(key):
+            if self._counters[index] < self.max_count:
+                self._counters[index] += 1
+                added = True
+        if added:
+            self._additions += 1
+            if self._additions >= self.sample_size:
+                self.reset()
+
+    def estimate(self, key) -> int:
+        """estimated number of requests of key since the counters were halved"""
+        return min(self._counters[index] for index in self._indices(key))
+
+    def reset(self):
+        """halve all counters"""
+        self._counters = bytearray(c >> 1 for c in self._counters)
+        self._additions //= 2
+
+    def _indices(self, key):
+        h = hash(key) & _MASK64
+        for row, seed in enumerate(self._seeds):
+            yield row * self.width + ((((h ^ seed) * seed) & _MASK64) >> self._shift if self._shift < 64 else 0)
@@ -0,0 +1,62 @@
+"""Least frequently used replacement policy"""
+
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy.BaseReplacementPolicy import BaseReplacementPolicy
+
+
+class LFUPolicy(BaseReplacementPolicy):
+    """Evicts the entry with the fewest hits since it was inserted, the least recently used of them on a tie.
+    Entries are kept in one bucket per hit count, so each operation is O(1).
+    """
+
+    def __init__(self):
+        self._frequency: Dict[str, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}  # hit count -> entries, least recently used first
+        self._min_frequency = 0
+
+    def add(self, key: str):
+        self.remove(key)
+        self._frequency[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_frequency = 1
+
+    def hit(self, key: str):
+        frequency = self._frequency.get(key)
+        if frequency is None:
+            return
+        self._unlink(key, frequency)
+        self._frequency[key] = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[key] = None
+        if self._min_frequency == frequency and frequency not in self._buckets:
+            self._min_frequency = frequency + 1
+
+    def remove(self, key: str):
+        frequency = self._frequency.pop(key, None)
+        if frequency is not None:
+            self._unlink(key, frequency)
+
+    def evict(self) -> Optional[str]:
+        if not self._frequency:
+            return None
+        if self._min_frequency not in self._buckets:  # the least frequent entries were removed
+            self._min_frequency = min(self._buckets)
+        key = self._buckets[self._min_frequency].popitem(last=False)[0]
+        if not self._buckets[self._min_frequency]:
+            del self._buckets[self._min_frequency]
+        del self._frequency[key]
+        return key
+
+    def frequency(self, key: str) -> int:
+        """number of hits of an entry since it was inserted, plus one, 0 if unknown"""
+        return self._frequency.get(key, 0)
+
+    def _unlink(self, key: str, frequency: int):
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+
+    def __len__(self) -> int:
+        return len(self._frequency)
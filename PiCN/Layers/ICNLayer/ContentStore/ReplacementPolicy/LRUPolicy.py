@@ -0,0 +1,32 @@
+"""Least recently used replacement policy"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy.BaseReplacementPolicy import BaseReplacementPolicy
+
+
+class LRUPolicy(BaseReplacementPolicy):
+    """Evicts the least recently used entry"""
+
+    def __init__(self):
+        self._entries: OrderedDict = OrderedDict()  # least recently used first
+
+    def add(self, key: str):
+        self._entries[key] = None
+        self._entries.move_to_end(key)
+
+    def hit(self, key: str):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+    def remove(self, key: str):
+        self._entries.pop(key, None)
+
+    def evict(self) -> Optional[str]:
+        if not self._entries:
+            return None
+        return self._entries.popitem(last=False)[0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
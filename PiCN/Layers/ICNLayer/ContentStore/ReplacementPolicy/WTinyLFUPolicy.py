@@ -0,0 +1,83 @@
+"""Window TinyLFU replacement and admission policy"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy.BaseReplacementPolicy import BaseReplacementPolicy
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy.CountMinSketch import CountMinSketch
+
+
+class WTinyLFUPolicy(BaseReplacementPolicy):
+    """Window TinyLFU (Einziger et al., ACM ToS 2017). New entries are inserted into a small LRU window; entries
+    leaving the window become candidates in the probation segment of the main cache, a segmented LRU whose entries
+    move to the protected segment when they are hit. On eviction the oldest candidate competes with the victim of the
+    main cache: the entry requested less often according to a count-min sketch of all requests (hits and misses) is
+    evicted. One-hit wonders, e.g. the chunks of a single download, therefore do not displace popular content.
+    :param window: share of the entries kept in the window
+    :param protected: share of the main cache kept in the protected segment
+    :param sketch_width: initial number of counters per row of the sketch, grows with the number of entries
+    """
+
+    def __init__(self, window: float = 0.01, protected: float = 0.8, sketch_width: int = 1024):
+        self._window_share = window
+        self._protected_share = protected
+        self.sketch = CountMinSketch(sketch_width)
+        self._window: OrderedDict = OrderedDict()  # least recently used first
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+        self._candidates: OrderedDict = OrderedDict()  # entries of probation that came from the window, oldest first
+
+    def add(self, key: str):
+        self.remove(key)
+        self._window[key] = None
+        if len(self) > self.sketch.width:
+            self.sketch = CountMinSketch(2 * len(self))
+        window_size = max(1, int(len(self) * self._window_share))
+        while len(self._window) > window_size:
+            candidate = self._window.popitem(last=False)[0]
+            self._probation[candidate] = None
+            self._candidates[candidate] = None
+        while len(self._candidates) > window_size:  # older candidates become regular entries of the main cache
+            self._candidates.popitem(last=False)
+
+    def hit(self, key: str):
+        self.sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._candidates.pop(key, None)
+            self._protected[key] = None
+            protected_size = max(1, int((len(self) - len(self._window)) * self._protected_share))
+            while len(self._protected) > protected_size:
+                demoted = self._protected.popitem(last=False)[0]
+                self._probation[demoted] = None
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+
+    def miss(self, key: str):
+        self.sketch.increment(key)
+
+    def remove(self, key: str):
+        self._window.pop(key, None)
+        self._probation.pop(key, None)
+        self._protected.pop(key, None)
+        self._candidates.pop(key, None)
+
+    def evict(self) -> Optional[str]:
+        victim = next((k for k in self._probation if k not in self._candidates), None)
+        if victim is None and self._protected:
+            victim = next(iter(self._protected))
+        if self._candidates and victim is not None:
+            candidate = next(iter(self._candidates))
+            del self._candidates[candidate]
+            if self.sketch.estimate(candidate) <= self.sketch.estimate(victim):
+                victim = candidate  # not admitted
+        elif victim is None:
+            victim = next(iter(self._probation or self._window), None)
+        if victim is not None:
+            self.remove(victim)
+        return victim
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
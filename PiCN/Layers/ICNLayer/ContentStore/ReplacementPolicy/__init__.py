@@ -0,0 +1,9 @@
+"""Replacement policies of the content store"""
+
+from .BaseReplacementPolicy import BaseReplacementPolicy
+
+from .CountMinSketch import CountMinSketch
+from .LRUPolicy import LRUPolicy
+from .LFUPolicy import LFUPolicy
+from .ARCPolicy import ARCPolicy
+from .WTinyLFUPolicy import WTinyLFUPolicy
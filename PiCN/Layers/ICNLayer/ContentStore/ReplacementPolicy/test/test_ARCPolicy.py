@@ -0,0 +1,47 @@
+"""Tests for the ARC replacement policy"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import ARCPolicy
+
+
+class test_ARCPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = ARCPolicy()
+
+    def test_scan_does_not_evict_frequent(self):
+        """Test that entries requested twice survive a scan of entries requested once"""
+        for key in ["/a", "/b", "/c"]:
+            self.policy.add(key)
+        self.policy.hit("/a")
+        self.policy.hit("/b")
+        evicted = []
+        for i in range(10):
+            self.policy.add("/scan/" + str(i))
+            evicted.append(self.policy.evict())
+        self.assertNotIn("/a", evicted)
+        self.assertNotIn("/b", evicted)
+        self.assertEqual(len(self.policy), 3)
+
+    def test_adapt_to_recency(self):
+        """Test that inserting entries evicted from t1 again increases the target size of t1"""
+        for key in ["/a", "/b"]:
+            self.policy.add(key)
+        self.policy.hit("/a")
+        self.policy.hit("/b")
+        self.policy.add("/c")
+        self.assertEqual(self.policy.evict(), "/a")
+        self.policy.add("/d")
+        self.assertEqual(self.policy.evict(), "/c")
+        self.policy.add("/c")  # ghost hit in b1, t1 may now hold one entry
+        self.assertEqual(self.policy.target, 1)
+        self.assertEqual(self.policy.evict(), "/b")
+
+    def test_remove(self):
+        """Test that removed entries are not evicted"""
+        self.policy.add("/a")
+        self.policy.add("/b")
+        self.policy.remove("/a")
+        self.assertEqual(self.policy.evict(), "/b")
+        self.assertIsNone(self.policy.evict())
@@ -0,0 +1,36 @@
+"""Tests for the count-min sketch"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import CountMinSketch
+
+
+class test_CountMinSketch(unittest.TestCase):
+
+    def test_estimate(self):
+        """Test estimating the number of increments"""
+        sketch = CountMinSketch(width=256)
+        for i in range(5):
+            sketch.increment("/a")
+        sketch.increment("/b")
+        self.assertGreaterEqual(sketch.estimate("/a"), 5)
+        self.assertGreaterEqual(sketch.estimate("/b"), 1)
+        self.assertLess(sketch.estimate("/b"), 5)
+        self.assertEqual(sketch.width, 256)
+
+    def test_saturate(self):
+        """Test that counters do not exceed the maximum count"""
+        sketch = CountMinSketch(width=100, max_count=15, sample_size=1000)
+        for i in range(100):
+            sketch.increment("/a")
+        self.assertEqual(sketch.estimate("/a"), 15)
+        self.assertEqual(sketch.width, 128)
+
+    def test_reset(self):
+        """Test halving the counters after sample_size increments"""
+        sketch = CountMinSketch(width=64, sample_size=8)
+        for i in range(7):
+            sketch.increment("/a")
+        self.assertGreaterEqual(sketch.estimate("/a"), 7)
+        sketch.increment("/a")
+        self.assertEqual(sketch.estimate("/a"), 4)
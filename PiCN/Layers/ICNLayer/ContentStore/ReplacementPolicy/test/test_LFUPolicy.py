@@ -0,0 +1,37 @@
+"""Tests for the LFU replacement policy"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import LFUPolicy
+
+
+class test_LFUPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = LFUPolicy()
+
+    def test_evict_least_frequently_used(self):
+        """Test evicting the entry with the fewest hits, the least recently used on a tie"""
+        for key in ["/a", "/b", "/c"]:
+            self.policy.add(key)
+        self.policy.hit("/a")
+        self.policy.hit("/a")
+        self.policy.hit("/c")
+        self.assertEqual(self.policy.frequency("/a"), 3)
+        self.assertEqual(self.policy.evict(), "/b")
+        self.policy.add("/d")
+        self.assertEqual(self.policy.evict(), "/d")
+        self.assertEqual(self.policy.evict(), "/c")
+        self.assertEqual(self.policy.evict(), "/a")
+        self.assertIsNone(self.policy.evict())
+
+    def test_remove_least_frequent(self):
+        """Test evicting after the least frequent entries were removed"""
+        self.policy.add("/a")
+        self.policy.add("/b")
+        self.policy.hit("/b")
+        self.policy.hit("/b")
+        self.policy.remove("/a")
+        self.assertEqual(len(self.policy), 1)
+        self.assertEqual(self.policy.evict(), "/b")
+        self.assertEqual(self.policy.frequency("/b"), 0)
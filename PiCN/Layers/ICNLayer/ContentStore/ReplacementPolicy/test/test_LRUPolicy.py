@@ -0,0 +1,31 @@
+"""Tests for the LRU replacement policy"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import LRUPolicy
+
+
+class test_LRUPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = LRUPolicy()
+
+    def test_evict_least_recently_used(self):
+        """Test evicting the entry which was not hit for the longest time"""
+        for key in ["/a", "/b", "/c"]:
+            self.policy.add(key)
+        self.policy.hit("/a")
+        self.assertEqual(self.policy.evict(), "/b")
+        self.assertEqual(self.policy.evict(), "/c")
+        self.assertEqual(self.policy.evict(), "/a")
+        self.assertIsNone(self.policy.evict())
+
+    def test_remove(self):
+        """Test that removed and unknown entries are not evicted"""
+        self.policy.add("/a")
+        self.policy.add("/b")
+        self.policy.remove("/a")
+        self.policy.hit("/x")
+        self.policy.remove("/x")
+        self.assertEqual(len(self.policy), 1)
+        self.assertEqual(self.policy.evict(), "/b")
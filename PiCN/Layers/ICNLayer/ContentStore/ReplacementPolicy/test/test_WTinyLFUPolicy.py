@@ -0,0 +1,56 @@
+"""Tests for the W-TinyLFU replacement policy"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import WTinyLFUPolicy
+
+
+class test_WTinyLFUPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.policy = WTinyLFUPolicy()
+
+    def fill(self, keys, requests: int):
+        for key in keys:
+            for i in range(requests):
+                self.policy.miss(key)
+            self.policy.add(key)
+
+    def test_one_hit_wonders_not_admitted(self):
+        """Test that entries requested once do not displace popular entries"""
+        popular = ["/popular/" + str(i) for i in range(10)]
+        self.fill(popular, 3)
+        evicted = []
+        for i in range(100):
+            self.fill(["/chunk/" + str(i)], 1)
+            evicted.append(self.policy.evict())
+        self.assertEqual(len(self.policy), 10)
+        # the entry in the window when the first chunk arrives loses the tie against the victim of the main cache
+        self.assertEqual(len([key for key in popular if key in evicted]), 1)
+        self.assertEqual(len([key for key in evicted if key.startswith("/chunk")]), 99)
+
+    def test_popular_entry_admitted(self):
+        """Test that a candidate requested more often than the victim replaces it"""
+        self.fill(["/a", "/b", "/c"], 1)
+        self.fill(["/d"], 5)
+        self.fill(["/e"], 5)
+        self.assertIn(self.policy.evict(), ["/a", "/b", "/c"])
+        self.assertIn(self.policy.evict(), ["/a", "/b", "/c"])
+
+    def test_protected_on_hit(self):
+        """Test that hit entries of the main cache are evicted after entries which were not hit"""
+        keys = ["/" + str(i) for i in range(10)]
+        self.fill(keys, 1)
+        self.policy.hit("/0")
+        self.policy.hit("/0")
+        evicted = [self.policy.evict() for _ in range(8)]
+        self.assertNotIn("/0", evicted)
+        self.assertEqual(self.policy.evict(), "/0")
+
+    def test_remove(self):
+        """Test that removed entries are not evicted"""
+        self.fill(["/a", "/b"], 1)
+        self.policy.remove("/a")
+        self.policy.remove("/b")
+        self.assertEqual(len(self.policy), 0)
+        self.assertIsNone(self.policy.evict())
@@ -1,4 +1,7 @@
+from .CountingBloomFilter import CountingBloomFilter
 from .BaseContentStore import BaseContentStore
 from .BaseContentStore import ContentStoreEntry
 from .ContentStoreMemoryExact import ContentStoreMemoryExact
-from .ContentStorePersistentExact import ContentStorePersistentExact
\ No newline at end of file
+from .ContentStoreMemoryPrefix import ContentStoreMemoryPrefix
+from .ContentStorePersistentExact import ContentStorePersistentExact
+from .ContentStoreTieredExact import ContentStoreTieredExact
\ No newline at end of file
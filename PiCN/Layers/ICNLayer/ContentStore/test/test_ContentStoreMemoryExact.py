@@ -1,9 +1,12 @@
 """Tests for the in Memory Content Store with exact matching"""
 
+import time
 import unittest
 
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreEntry, CountingBloomFilter
 from PiCN.Layers.ICNLayer.ContentStore.ContentStoreMemoryExact import ContentStoreMemoryExact
-from PiCN.Packets import Content
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import LFUPolicy
+from PiCN.Packets import Content, Name
 
 
 class test_ContentStoreMemoryExact(unittest.TestCase):
@@ -18,7 +21,7 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         """Test adding data to CS"""
         c = Content("/test/data", "Hello World")
         self.cs.add_content_object(c)
-        entry = self.cs._container[0]
+        entry = self.cs.get_container()[0]
         self.assertIsNotNone(self.cs.find_content_object(entry.name))
         self.assertEqual(entry.content, c)
 
@@ -28,10 +31,10 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         c2 = Content("/data/test", "Goodbye")
         self.cs.add_content_object(c1)
         self.cs.add_content_object(c2)
-        entry1 = self.cs._container[0]
+        entry1 = self.cs.get_container()[0]
         self.assertIsNotNone(self.cs.find_content_object(entry1.name))
         self.assertEqual(entry1.content, c1)
-        entry2 = self.cs._container[1]
+        entry2 = self.cs.get_container()[1]
         self.assertIsNotNone(self.cs.find_content_object(entry2.name))
         self.assertEqual(entry2.content, c2)
 
@@ -39,7 +42,7 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         """Test adding and searching data to CS"""
         c = Content("/test/data", "Hello World")
         self.cs.add_content_object(c)
-        entry = self.cs._container[0].content
+        entry = self.cs.get_container()[0].content
         self.assertEqual(entry, c)
         fc = self.cs.find_content_object(c.name)
         self.assertEqual(fc.content, c)
@@ -50,10 +53,10 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         c2 = Content("/data/test", "Goodbye")
         self.cs.add_content_object(c1)
         self.cs.add_content_object(c2)
-        entry1 = self.cs._container[0]
+        entry1 = self.cs.get_container()[0]
         self.assertTrue(entry1 in self.cs.get_container())
         self.assertEqual(entry1.content, c1)
-        entry2 = self.cs._container[1]
+        entry2 = self.cs.get_container()[1]
         self.assertTrue(entry2 in self.cs.get_container())
         self.assertEqual(entry2.content, c2)
 
@@ -68,7 +71,7 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         c1 = Content("/test/data", "Hello World")
         c2 = Content("/data/test", "Hello World")
         self.cs.add_content_object(c1)
-        entry = self.cs._container[0].content
+        entry = self.cs.get_container()[0].content
         self.assertEqual(entry, c1)
         fc = self.cs.find_content_object(c2.name)
         self.assertEqual(fc, None)
@@ -77,8 +80,146 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         """Test adding and removing data from CS"""
         c = Content("/test/data", "Hello World")
         self.cs.add_content_object(c)
-        entry = self.cs._container[0].content
+        entry = self.cs.get_container()[0].content
         self.assertEqual(entry, c)
         self.assertEqual(len(self.cs.get_container()), 1)
         self.cs.remove_content_object(c.name)
-        self.assertEqual(len(self.cs.get_container()), 0)
\ No newline at end of file
+        self.assertEqual(len(self.cs.get_container()), 0)
+
+    def test_add_content_replaces_entry(self):
+        """Test adding content with the name of an existing entry"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.add_content_object(Content("/test/data", "Goodbye"))
+        self.assertEqual(self.cs.get_container_size(), 1)
+        self.assertEqual(self.cs.find_content_object(Name("/test/data")).content.content, "Goodbye")
+
+    def test_update_timestamp_with_copy(self):
+        """Test refreshing an entry with a copy of the entry, as passed by a manager"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.add_content_object(Content("/data/test", "Goodbye"))
+        entry = self.cs.find_content_object(Name("/test/data"))
+        self.cs.update_timestamp(ContentStoreEntry(Content(entry.name, "Hello World")))
+        self.cs.update_timestamp(ContentStoreEntry(Content(entry.name, "Hello World")))
+        self.assertEqual([e.name.to_string() for e in self.cs.get_container()], ["/data/test", "/test/data"])
+
+    def test_lru_eviction_by_entries(self):
+        """Test evicting the least recently used entry if the CS is full"""
+        cs = ContentStoreMemoryExact(max_entries=3)
+        for i in range(3):
+            cs.add_content_object(Content("/test/" + str(i), "data"))
+        cs.update_timestamp(cs.find_content_object(Name("/test/0")))
+        cs.add_content_object(Content("/test/3", "data"))
+        self.assertEqual(cs.get_container_size(), 3)
+        self.assertIsNone(cs.find_content_object(Name("/test/1")))
+        self.assertIsNotNone(cs.find_content_object(Name("/test/0")))
+        self.assertEqual(cs.get_stats()["evictions"], 1)
+
+    def test_lru_eviction_by_bytes(self):
+        """Test evicting entries if the payloads exceed the byte capacity"""
+        cs = ContentStoreMemoryExact(max_bytes=10)
+        cs.add_content_object(Content("/test/0", "aaaa"))
+        cs.add_content_object(Content("/test/1", "bbbb"))
+        cs.add_content_object(Content("/test/2", "cccccc"))
+        self.assertIsNone(cs.find_content_object(Name("/test/0")))
+        self.assertIsNotNone(cs.find_content_object(Name("/test/1")))
+        self.assertEqual(cs.get_stats()["bytes"], 10)
+        cs.remove_content_object(Name("/test/1"))
+        self.assertEqual(cs.get_stats()["bytes"], 6)
+
+    def test_static_entries_not_evicted(self):
+        """Test that static entries are kept if the CS is full"""
+        cs = ContentStoreMemoryExact(max_entries=2)
+        cs.add_content_object(Content("/static/0", "data"), static=True)
+        cs.add_content_object(Content("/static/1", "data"), static=True)
+        cs.add_content_object(Content("/test/0", "data"))
+        self.assertEqual(cs.get_container_size(), 2)
+        self.assertIsNotNone(cs.find_content_object(Name("/static/0")))
+        self.assertIsNotNone(cs.find_content_object(Name("/static/1")))
+        cs.set_capacity(max_entries=3)
+        cs.add_content_object(Content("/test/0", "data"))
+        cs.add_content_object(Content("/test/1", "data"))
+        self.assertIsNone(cs.find_content_object(Name("/test/0")))
+        self.assertIsNotNone(cs.find_content_object(Name("/test/1")))
+
+    def test_replacement_policy(self):
+        """Test evicting the entries chosen by the replacement policy, which does not know static entries"""
+        cs = ContentStoreMemoryExact(max_entries=3, policy=LFUPolicy())
+        cs.add_content_object(Content("/static/0", "data"), static=True)
+        cs.add_content_object(Content("/test/0", "data"))
+        cs.add_content_object(Content("/test/1", "data"))
+        cs.find_content_object(Name("/test/0"))
+        cs.find_content_object(Name("/static/0"))
+        cs.add_content_object(Content("/test/2", "data"))
+        self.assertIsNone(cs.find_content_object(Name("/test/1")))
+        self.assertIsNotNone(cs.find_content_object(Name("/test/0")))
+        cs.remove_content_object(Name("/test/0"))
+        cs.ageing()
+        cs.set_replacement_policy(LFUPolicy())
+        cs.set_capacity(max_entries=1)
+        self.assertEqual([e.name.to_string() for e in cs.get_container()], ["/static/0"])
+
+    def test_ageing(self):
+        """Test removing expired entries, but no static entries"""
+        cs = ContentStoreMemoryExact(cs_timeout=0.1)
+        cs.add_content_object(Content("/static/0", "data"), static=True)
+        cs.add_content_object(Content("/test/0", "data"))
+        time.sleep(0.2)
+        cs.add_content_object(Content("/test/1", "data"))
+        cs.ageing()
+        self.assertEqual([e.name.to_string() for e in cs.get_container()], ["/static/0", "/test/1"])
+
+    def test_ageing_with_timestamp(self):
+        """Test that an entry added with an earlier timestamp is aged with that timestamp"""
+        cs = ContentStoreMemoryExact(cs_timeout=0.1)
+        cs.add_content_object(Content("/test/0", "data"))
+        cs.add_content_object(Content("/test/moved", "data"), timestamp=time.time() - 1)
+        self.assertEqual([e.name.to_string() for e in cs.get_container()], ["/test/moved", "/test/0"])
+        cs.ageing()
+        self.assertEqual([e.name.to_string() for e in cs.get_container()], ["/test/0"])
+
+    def test_ageing_limit(self):
+        """Test that one call of ageing removes at most ageing_limit entries, static entries do not count"""
+        cs = ContentStoreMemoryExact(cs_timeout=0)
+        cs.set_ageing_limit(10)
+        for i in range(1000):
+            cs.add_content_object(Content("/static/" + str(i), "data"), static=True)
+        for i in range(25):
+            cs.add_content_object(Content("/test/" + str(i), "data"))
+        cs.add_content_object(Content("/static/0", "data"))  # stays static
+        time.sleep(0.01)
+        cs.ageing()
+        self.assertEqual(1015, cs.get_container_size())
+        self.assertIsNone(cs.find_content_object(Name("/test/9")))
+        self.assertIsNotNone(cs.find_content_object(Name("/test/10")))
+        cs.ageing()
+        cs.ageing()
+        self.assertEqual(1000, cs.get_container_size())
+        cs.ageing()
+        self.assertEqual(1000, cs.get_container_size())
+
+    def test_many_entries(self):
+        """Test a CS with 100000 entries"""
+        cs = ContentStoreMemoryExact(max_entries=100000)
+        for i in range(110000):
+            cs.add_content_object(Content("/test/" + str(i), "data"))
+        self.assertEqual(cs.get_container_size(), 100000)
+        start = time.time()
+        for i in range(10000, 20000):
+            cs.update_timestamp(cs.find_content_object(Name("/test/" + str(i))))
+        self.assertLess(time.time() - start, 2)
+        self.assertIsNone(cs.find_content_object(Name("/test/9999")))
+
+    def test_membership_filter(self):
+        """Test answering lookups of missing names with a membership filter"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.set_membership_filter(CountingBloomFilter(capacity=100))
+        self.cs.add_content_object(Content("/test/data2", "Hello World"))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data2")))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data3")))
+        self.cs.remove_content_object(Name("/test/data"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data")))
+        stats = self.cs.get_stats()
+        self.assertEqual(4, stats["filter_queries"])
+        self.assertEqual(2, stats["filter_negatives"] + stats["filter_false_positives"])
+        self.assertEqual(1, stats["filter_keys"])
@@ -1,9 +1,34 @@
 """Tests for the in Memory Content Store with exact matching"""
 
+import dbm
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import time
 import unittest
 
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreEntry, CountingBloomFilter
 from PiCN.Layers.ICNLayer.ContentStore.ContentStorePersistentExact import ContentStorePersistentExact
-from PiCN.Packets import Content
+from PiCN.Packets import Content, Name
+
+
+class _Legacy(object):
+    """an object of a class of the version of the shelve-based content store, with its attributes"""
+
+    def __init__(self, cls: type, **attributes):
+        self.cls = cls
+        self.attributes = attributes
+
+
+class _LegacyPickler(pickle.Pickler):
+    """pickles legacy objects like the pickle module pickled the objects of that version"""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, _Legacy):
+            return object.__new__, (obj.cls,), obj.attributes
+        return NotImplemented
 
 
 class test_ContentStoreMemoryExact(unittest.TestCase):
@@ -12,7 +37,8 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         self.cs = ContentStorePersistentExact()
 
     def tearDown(self):
-        pass
+        self.cs.close_cs()
+        shutil.rmtree(self.cs.get_db_path(), ignore_errors=True)
 
     def test_find_content_to_cs(self):
         """Test adding and searching data to CS"""
@@ -49,3 +75,155 @@ class test_ContentStoreMemoryExact(unittest.TestCase):
         restored_cs = ContentStorePersistentExact(db_path=db_path)
         restored_content = restored_cs.find_content_object(c.name).content # TODO
         self.assertEqual(restored_content, c)
+
+
+    def test_legacy_database_converted(self):
+        """Test that a database of the former shelve-based store is converted into a log"""
+        db_path = os.path.join(tempfile.mkdtemp(), "pushrepo.db")
+        with dbm.open(db_path, "c") as db:
+            for name, static in (("/test/data", False), ("/test/static", True)):
+                legacy_name = _Legacy(Name, suite="ndn2013", digest=None,
+                                      _components=[c.encode() for c in name.split("/")[1:]])
+                legacy_content = _Legacy(Content, _name=legacy_name, _wire_format=None, _content=b"data")
+                f = io.BytesIO()
+                _LegacyPickler(f).dump(_Legacy(ContentStoreEntry, _content=legacy_content, _static=static,
+                                               _timestamp=1000.0))
+                db[name] = f.getvalue()
+        cs = ContentStorePersistentExact(db_path=db_path)
+        try:
+            self.assertTrue(os.path.isdir(db_path))
+            self.assertTrue(os.listdir(db_path + ".legacy"))
+            entry = cs.find_content_object(Name("/test/data"))
+            self.assertEqual(Content("/test/data", "data"), entry.content)
+            self.assertEqual(1000.0, entry.timestamp)
+            self.assertTrue(cs.find_content_object(Name("/test/static")).static)
+            cs.ageing()
+            self.assertIsNone(cs.find_content_object(Name("/test/data")))
+            self.assertIsNotNone(cs.find_content_object(Name("/test/static")))
+        finally:
+            cs.close_cs()
+            shutil.rmtree(os.path.dirname(db_path), ignore_errors=True)
+
+    def test_db_path_not_a_database(self):
+        """Test that a db_path naming a file which is no database is rejected"""
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b"no database")
+            f.flush()
+            self.assertRaises(ValueError, ContentStorePersistentExact, db_path=f.name)
+
+    def test_restored_log(self):
+        """Test that removals, refreshes and static entries are restored"""
+        c1 = Content("/test/data1", "Hello World")
+        c2 = Content("/test/data2", b"\x00\x01\x02")
+        c3 = Content("/test/static", "static")
+        self.cs.add_content_object(c1)
+        self.cs.add_content_object(c2)
+        self.cs.add_content_object(c3, static=True)
+        self.cs.add_content_object(Content("/test/data1", "replaced"))
+        self.cs.remove_content_object(c2.name)
+        entry = self.cs.find_content_object(c1.name)
+        self.cs.update_timestamp(entry)
+        self.cs.close_cs()
+        self.cs = ContentStorePersistentExact(db_path=self.cs.get_db_path())
+        self.assertEqual(2, self.cs.get_container_size())
+        self.assertEqual("replaced", self.cs.find_content_object(c1.name).content.content)
+        self.assertEqual(entry.timestamp, self.cs.find_content_object(c1.name).timestamp)
+        self.assertIsNone(self.cs.find_content_object(c2.name))
+        self.assertTrue(self.cs.find_content_object(c3.name).static)
+
+    def test_name_and_wire_format_restored(self):
+        """Test that name digest and wire format of a content object are stored"""
+        name = Name("/test/data")
+        name.digest = b"\x12\x34"
+        c = Content(name, b"payload", b"wire format")
+        self.cs.add_content_object(c)
+        fc = self.cs.find_content_object(name).content
+        self.assertEqual(name, fc.name)
+        self.assertEqual(b"payload", fc.get_bytes())
+        self.assertEqual(b"wire format", fc.wire_format)
+
+    def test_torn_record_truncated(self):
+        """Test recovery from a record only partially written before a crash"""
+        self.cs.add_content_object(Content("/test/data1", "Hello World"))
+        self.cs.add_content_object(Content("/test/data2", "Hello World"))
+        self.cs.close_cs()
+        segment = os.path.join(self.cs.get_db_path(), "00000000.log")
+        with open(segment, "r+b") as f:
+            f.truncate(os.path.getsize(segment) - 3)
+        self.cs = ContentStorePersistentExact(db_path=self.cs.get_db_path())
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data1")))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data2")))
+        self.cs.add_content_object(Content("/test/data3", "Hello World"))
+        self.cs.close_cs()
+        self.cs = ContentStorePersistentExact(db_path=self.cs.get_db_path())
+        self.assertEqual(2, self.cs.get_container_size())
+
+    def test_ageing(self):
+        """Test that entries not refreshed within the timeout are removed"""
+        self.cs.set_cs_timeout(0.2)
+        self.cs.add_content_object(Content("/test/old", "old"))
+        self.cs.add_content_object(Content("/test/refreshed", "refreshed"))
+        self.cs.add_content_object(Content("/test/static", "static"), static=True)
+        time.sleep(0.15)
+        self.cs.update_timestamp(self.cs.find_content_object(Name("/test/refreshed")))
+        time.sleep(0.1)
+        self.cs.ageing()
+        self.assertIsNone(self.cs.find_content_object(Name("/test/old")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/refreshed")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/static")))
+
+    def test_ageing_limit(self):
+        """Test that one call of ageing removes at most ageing_limit entries, also after restoring the store"""
+        self.cs.set_cs_timeout(0)
+        self.cs.set_ageing_limit(10)
+        self.cs.add_content_object(Content("/test/static", "static"), static=True)
+        for i in range(25):
+            self.cs.add_content_object(Content("/test/%d" % i, "data"))
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertEqual(16, self.cs.get_container_size())
+        self.cs.close_cs()
+        self.cs = ContentStorePersistentExact(cs_timeout=0, db_path=self.cs.get_db_path())
+        self.cs.set_ageing_limit(10)
+        self.cs.ageing()
+        self.cs.ageing()
+        self.assertEqual(1, self.cs.get_container_size())
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/static")))
+
+    def test_compaction(self):
+        """Test that outdated records are removed from the log and live records are kept"""
+        self.cs.close_cs()
+        self.cs = ContentStorePersistentExact(db_path=self.cs.get_db_path(), segment_size=4096)
+        for i in range(1000):
+            self.cs.add_content_object(Content("/test/%d" % (i % 100), "version %d" % i))
+        self.cs.compact()
+        stats = self.cs.get_stats()
+        self.assertEqual(100, stats["entries"])
+        self.assertLess(stats["bytes"], 5 * 100 * 64)
+        self.assertEqual(stats["segments"], len(os.listdir(self.cs.get_db_path())))
+        for i in range(900, 1000):
+            self.assertEqual("version %d" % i, self.cs.find_content_object(Name("/test/%d" % (i % 100))).content.content)
+        self.cs.close_cs()
+        self.cs = ContentStorePersistentExact(db_path=self.cs.get_db_path())
+        self.assertEqual(100, self.cs.get_container_size())
+        self.assertEqual("version 999", self.cs.find_content_object(Name("/test/99")).content.content)
+
+    def test_delete_all(self):
+        """Test removing all content objects"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.delete_all()
+        self.assertEqual(0, self.cs.get_container_size())
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data")))
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data")))
+
+    def test_membership_filter(self):
+        """Test that restored entries are added to a membership filter"""
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.close_cs()
+        self.cs = ContentStorePersistentExact(db_path=self.cs.get_db_path(),
+                                              membership_filter=CountingBloomFilter(capacity=100))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/data")))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data2")))
+        self.cs.delete_all()
+        self.assertEqual(0, self.cs.get_stats()["filter_keys"])
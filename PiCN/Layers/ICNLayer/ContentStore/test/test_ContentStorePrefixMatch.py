@@ -1,9 +1,11 @@
 """Tests for ContentStorePrefixMatch"""
 
+import time
 import unittest
 
+from PiCN.Layers.ICNLayer.ContentStore import CountingBloomFilter
 from PiCN.Layers.ICNLayer.ContentStore.ContentStoreMemoryPrefix import ContentStoreMemoryPrefix
-from PiCN.Packets import Content
+from PiCN.Packets import Content, Name
 
 
 class test_ContentStorePrefixMatch(unittest.TestCase):
@@ -38,4 +40,101 @@ class test_ContentStorePrefixMatch(unittest.TestCase):
         self.cs.find_content_object(c4.name).content.name.is_prefix_of(c4.name)
         self.cs.find_content_object(c5.name).content.name.is_prefix_of(c5.name)
         self.cs.find_content_object(c6.name).content.name.is_prefix_of(c6.name)
-        self.cs.find_content_object(c7.name).content.name.is_prefix_of(c7.name)
\ No newline at end of file
+        self.cs.find_content_object(c7.name).content.name.is_prefix_of(c7.name)
+    def test_prefer_shortest(self):
+        """Test that the exact match or the entry with the shortest name is found"""
+        self.cs.add_content_object(Content("/video/v2/chunk0", "c0"))
+        self.cs.add_content_object(Content("/video/v1", "v1"))
+        self.cs.add_content_object(Content("/video/v2", "v2"))
+        # names of the same length are found in the order their prefixes were first inserted
+        self.assertEqual(Name("/video/v2"), self.cs.find_content_object(Name("/video")).name)
+        self.assertEqual(Name("/video/v1"), self.cs.find_content_object(Name("/video/v1")).name)
+        self.assertEqual(Name("/video/v2/chunk0"), self.cs.find_content_object(Name("/video/v2/chunk0")).name)
+        self.assertIsNone(self.cs.find_content_object(Name("/video/v3")))
+
+    def test_prefer_freshest(self):
+        """Test that the most recently refreshed entry is found"""
+        self.cs = ContentStoreMemoryPrefix(prefer="freshest")
+        self.cs.add_content_object(Content("/video/v1", "v1"))
+        time.sleep(0.01)
+        self.cs.add_content_object(Content("/video/v2", "v2"))
+        self.assertEqual(Name("/video/v2"), self.cs.find_content_object(Name("/video")).name)
+        time.sleep(0.01)
+        self.cs.update_timestamp(self.cs.find_content_object(Name("/video/v1")))
+        self.assertEqual(Name("/video/v1"), self.cs.find_content_object(Name("/video")).name)
+        self.assertRaises(ValueError, ContentStoreMemoryPrefix, prefer="random")
+
+    def test_remove(self):
+        """Test removing entries by their exact name"""
+        self.cs.add_content_object(Content("/ndn/ch/unibas/foo1", "unibas-foo1"))
+        self.cs.add_content_object(Content("/ndn/ch", "ndn-ch"))
+        self.cs.remove_content_object(Name("/ndn/ch"))
+        self.assertEqual(Name("/ndn/ch/unibas/foo1"), self.cs.find_content_object(Name("/ndn/ch")).name)
+        self.cs.remove_content_object(Name("/ndn/ch/unibas/foo1"))
+        self.assertIsNone(self.cs.find_content_object(Name("/ndn")))
+        self.assertEqual(0, self.cs.get_container_size())
+
+    def test_ageing(self):
+        """Test that only entries not refreshed within the timeout are removed"""
+        self.cs = ContentStoreMemoryPrefix(cs_timeout=0.2)
+        self.cs.add_content_object(Content("/test/old", "old"))
+        self.cs.add_content_object(Content("/test/refreshed", "refreshed"))
+        self.cs.add_content_object(Content("/test/static", "static"), static=True)
+        time.sleep(0.15)
+        self.cs.update_timestamp(self.cs.find_content_object(Name("/test/refreshed")))
+        time.sleep(0.1)
+        self.cs.ageing()
+        self.assertIsNone(self.cs.find_content_object(Name("/test/old")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/refreshed")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/static")))
+        time.sleep(0.25)
+        self.cs.ageing()
+        self.assertEqual([Name("/test/static")], [e.name for e in self.cs.get_container()])
+
+    def test_ageing_limit(self):
+        """Test that one call of ageing removes at most ageing_limit entries"""
+        self.cs = ContentStoreMemoryPrefix(cs_timeout=0)
+        self.cs.set_ageing_limit(10)
+        for i in range(25):
+            self.cs.add_content_object(Content("/test/%d" % i, "data"))
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertEqual(15, self.cs.get_container_size())
+        self.cs.ageing()
+        self.cs.ageing()
+        self.assertEqual(0, self.cs.get_container_size())
+
+    def test_max_bytes(self):
+        """Test that least recently used entries are evicted if the byte budget is exceeded"""
+        self.cs = ContentStoreMemoryPrefix(max_bytes=10)
+        self.cs.add_content_object(Content("/test/a", "aaaa"))
+        self.cs.add_content_object(Content("/test/b", "bbbb"))
+        self.cs.find_content_object(Name("/test/a"))
+        self.cs.add_content_object(Content("/test/c", "cccc"))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/b")))
+        self.assertIsNotNone(self.cs.find_content_object(Name("/test/a")))
+        self.assertEqual({"entries": 2, "bytes": 8, "max_entries": 0, "max_bytes": 10, "evictions": 1},
+                         self.cs.get_stats())
+
+    def test_many_entries(self):
+        """Test prefix matching and ageing with many entries"""
+        self.cs = ContentStoreMemoryPrefix(cs_timeout=0)
+        for i in range(10000):
+            self.cs.add_content_object(Content("/test/%d/chunk%d" % (i // 10, i % 10), "x"))
+        self.assertEqual(Name("/test/42/chunk0"), self.cs.find_content_object(Name("/test/42")).name)
+        time.sleep(0.01)
+        self.cs.ageing()
+        self.assertEqual(0, self.cs.get_container_size())
+        self.assertIsNone(self.cs.find_content_object(Name("/test")))
+
+    def test_membership_filter(self):
+        """Test that a membership filter answers prefix lookups"""
+        cs = ContentStoreMemoryPrefix(membership_filter=CountingBloomFilter(capacity=100))
+        cs.add_content_object(Content("/test/42/chunk0", "data"))
+        self.assertEqual(Name("/test/42/chunk0"), cs.find_content_object(Name("/test")).name)
+        self.assertEqual(Name("/test/42/chunk0"), cs.find_content_object(Name("/test/42")).name)
+        self.assertIsNone(cs.find_content_object(Name("/test/43")))
+        self.assertEqual(Name("/test/42/chunk0"), cs.find_content_object(Name()).name)
+        cs.remove_content_object(Name("/test/42/chunk0"))
+        self.assertIsNone(cs.find_content_object(Name("/test")))
+        self.assertEqual(0, cs.get_stats()["filter_keys"])
@@ -0,0 +1,116 @@
+"""Tests for the tiered Content Store with exact matching"""
+
+import shutil
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreTieredExact, CountingBloomFilter
+from PiCN.Packets import Content, Name
+
+
+class test_ContentStoreTieredExact(unittest.TestCase):
+
+    def setUp(self):
+        self.cs = ContentStoreTieredExact(max_entries=2)
+
+    def tearDown(self):
+        self.cs.close_cs()
+        shutil.rmtree(self.cs.get_db_path(), ignore_errors=True)
+
+    def test_find_content_to_cs(self):
+        """Test adding and searching data to CS"""
+        c = Content("/test/data", "Hello World")
+        self.cs.add_content_object(c)
+        fc = self.cs.find_content_object(c.name)
+        self.assertEqual(fc.content, c)
+        self.assertIsNone(self.cs.find_content_object(Name("/test/other")))
+        stats = self.cs.get_stats()
+        self.assertEqual(1, stats["hot_hits"])
+        self.assertEqual(1, stats["hot_misses"])
+        self.assertEqual(1, stats["cold_misses"])
+
+    def test_demote_and_promote(self):
+        """Test that entries evicted from the hot tier are moved to the cold tier and back on access"""
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/%d" % i, "data %d" % i))
+        self.assertEqual(2, self.cs.hot.get_container_size())
+        self.assertEqual(1, self.cs.cold.get_container_size())
+        self.assertEqual(3, self.cs.get_container_size())
+        fc = self.cs.find_content_object(Name("/test/0"))
+        self.assertEqual("data 0", fc.content.content)
+        self.assertIsNotNone(self.cs.hot.find_content_object(Name("/test/0")))
+        self.assertIsNone(self.cs.hot.find_content_object(Name("/test/1")))
+        self.assertIsNotNone(self.cs.cold.find_content_object(Name("/test/1")))
+        stats = self.cs.get_stats()
+        self.assertEqual(1, stats["cold_hits"])
+        self.assertEqual(1, stats["promotions"])
+        self.assertEqual(2, stats["demotions"])
+        self.assertEqual(2, stats["hot_entries"])
+        self.assertEqual(1, stats["cold_entries"])
+
+    def test_cold_admission(self):
+        """Test that new content objects are admitted to the cold tier"""
+        self.cs.close_cs()
+        self.cs = ContentStoreTieredExact(max_entries=2, admission="cold")
+        self.cs.add_content_object(Content("/test/data", "Hello World"))
+        self.cs.add_content_object(Content("/test/static", "static"), static=True)
+        self.assertEqual(1, self.cs.cold.get_container_size())
+        self.assertIsNotNone(self.cs.hot.find_content_object(Name("/test/static")))
+        self.cs.find_content_object(Name("/test/data"))
+        self.assertEqual(2, self.cs.hot.get_container_size())
+        self.assertEqual(0, self.cs.cold.get_container_size())
+        self.assertRaises(ValueError, ContentStoreTieredExact, admission="warm")
+
+    def test_remove_content_from_cs(self):
+        """Test removing content from both tiers"""
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/%d" % i, "data %d" % i))
+        for i in range(3):
+            self.cs.remove_content_object(Name("/test/%d" % i))
+        self.assertEqual(0, self.cs.get_container_size())
+
+    def test_ageing(self):
+        """Test that expired entries are removed from both tiers, each with its own timeout"""
+        self.cs.set_cs_timeout(0)
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/%d" % i, "data %d" % i))
+        self.cs.ageing()
+        self.assertEqual(0, self.cs.hot.get_container_size())
+        self.assertEqual(1, self.cs.cold.get_container_size())
+        self.cs.set_cold_timeout(0)
+        self.cs.ageing()
+        self.assertEqual(0, self.cs.get_container_size())
+
+    def test_promote_keeps_timestamp(self):
+        """Test that a promoted entry keeps its timestamp and is aged with it"""
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/%d" % i, "data %d" % i))
+        timestamp = self.cs.cold.find_content_object(Name("/test/0")).timestamp
+        time.sleep(0.1)
+        self.cs.find_content_object(Name("/test/0"))
+        self.assertEqual(timestamp, self.cs.hot.find_content_object(Name("/test/0")).timestamp)
+        self.cs.set_cs_timeout(0.05)
+        self.cs.ageing()
+        self.assertIsNone(self.cs.find_content_object(Name("/test/0")))
+
+    def test_restored(self):
+        """Test that the cold tier survives a restart"""
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/%d" % i, "data %d" % i))
+        self.cs.close_cs()
+        self.cs = ContentStoreTieredExact(max_entries=2, db_path=self.cs.get_db_path())
+        self.assertEqual("data 0", self.cs.find_content_object(Name("/test/0")).content.content)
+
+    def test_membership_filter(self):
+        """Test that entries moved between the tiers stay in the membership filter"""
+        self.cs.set_membership_filter(CountingBloomFilter(capacity=100))
+        for i in range(3):
+            self.cs.add_content_object(Content("/test/data/" + str(i), "HelloWorld"))
+        self.assertEqual(1, self.cs.get_stats()["demotions"])
+        for i in range(3):
+            self.assertIsNotNone(self.cs.find_content_object(Name("/test/data/" + str(i))))
+        self.assertIsNone(self.cs.find_content_object(Name("/test/data/3")))
+        stats = self.cs.get_stats()
+        self.assertEqual(3, stats["filter_keys"])
+        self.assertEqual(4, stats["filter_queries"])
+        self.assertEqual(1, stats["filter_negatives"] + stats["filter_false_positives"])
@@ -0,0 +1,59 @@
+"""Tests for the counting Bloom filter"""
+
+import multiprocessing
+import unittest
+
+from PiCN.Layers.ICNLayer.ContentStore import CountingBloomFilter
+
+
+class test_CountingBloomFilter(unittest.TestCase):
+
+    def test_add_and_remove(self):
+        """Test that added names are found and removed names are not"""
+        bf = CountingBloomFilter(capacity=100)
+        bf.add("/test/data")
+        bf.add("/test/data")
+        self.assertTrue(bf.might_contain("/test/data"))
+        bf.remove("/test/data")
+        self.assertTrue(bf.might_contain("/test/data"))
+        bf.remove("/test/data")
+        self.assertFalse(bf.might_contain("/test/data"))
+        self.assertEqual({"queries": 3, "negatives": 1, "false_positives": 0, "keys": 0, "bytes": bf.size},
+                         bf.get_stats())
+
+    def test_no_false_negatives(self):
+        """Test that no added name is reported as missing, and that the false positive rate is close to the target"""
+        bf = CountingBloomFilter(capacity=1000, false_positive_rate=0.01)
+        for i in range(1000):
+            bf.add("/test/" + str(i))
+        for i in range(1000):
+            self.assertTrue(bf.might_contain("/test/" + str(i)))
+        false_positives = sum(bf.might_contain("/other/" + str(i)) for i in range(10000))
+        self.assertLess(false_positives, 300)
+        self.assertAlmostEqual(0.01, bf.expected_false_positive_rate(), delta=0.005)
+
+    def test_memory(self):
+        """Test sizing the filter by memory"""
+        bf = CountingBloomFilter(capacity=1000, memory=4096)
+        self.assertEqual(4096, bf.size)
+        self.assertEqual(3, bf.hashes)
+        with self.assertRaises(ValueError):
+            CountingBloomFilter(false_positive_rate=1)
+
+    def test_saturated_counter(self):
+        """Test that saturated counters are not decremented"""
+        bf = CountingBloomFilter(capacity=10, memory=1)
+        for i in range(300):
+            bf.add("/test/" + str(i))
+        for i in range(300):
+            bf.remove("/test/" + str(i))
+        self.assertTrue(bf.might_contain("/test/0"))
+
+    def test_shared(self):
+        """Test that a shared filter is updated by forked processes"""
+        bf = CountingBloomFilter(capacity=100, shared=True)
+        p = multiprocessing.get_context("fork").Process(target=bf.add, args=("/test/data",))
+        p.start()
+        p.join()
+        self.assertTrue(bf.might_contain("/test/data"))
+        self.assertEqual(1, bf.get_stats()["keys"])
@@ -262,4 +262,52 @@ class test_NamedObjectTree(unittest.TestCase):
         self.assertTrue(Name("/ndn").is_prefix_of(n1))
 
         n2 = self.tree_cse.prefix_lookup(Name("/ndn/ch")).name
-        self.assertTrue(Name("/ndn/ch").is_prefix_of(n2))
\ No newline at end of file
+        self.assertTrue(Name("/ndn/ch").is_prefix_of(n2))
+
+    #################### Pruning and deterministic prefix lookup ####################
+
+
+    def test_remove_prunes_empty_nodes(self):
+        c1 = Content("/ndn/ch/unibas/foo/bar1", "unibas-foo-bar1")
+        c2 = Content("/ndn/ch", "ndn-ch")
+        self.tree1_co.insert(c1)
+        self.tree1_co.insert(c2)
+        self.assertEqual(2, len(self.tree1_co))
+        self.tree1_co.remove(c1.name)
+        self.assertEqual(1, len(self.tree1_co))
+        self.assertEqual(self.tree1_co.prefix_lookup(Name("/ndn/ch/unibas")), None)
+        self.assertEqual(self.tree1_co.prefix_lookup(Name("/ndn")), c2)
+        self.tree1_co.remove(c2.name)
+        self.assertEqual(0, len(self.tree1_co))
+        self.assertEqual('{"subtree": {}, "leaf": null}', self.tree1_co.as_json())
+
+    def test_lookup_does_not_add_nodes(self):
+        self.tree1_co.exact_lookup(Name("/does/not/exist"))
+        self.tree1_co.prefix_lookup(Name("/does/not/exist"))
+        self.tree1_co.remove(Name("/does/not/exist"))
+        self.assertEqual('{"subtree": {}, "leaf": null}', self.tree1_co.as_json())
+
+    def test_prefix_lookup_shortest(self):
+        c1 = Content("/ndn/ch/unibas/foo/bar1", "unibas-foo-bar1")
+        c2 = Content("/ndn/ch/unibas/foo1", "unibas-foo1")
+        c3 = Content("/ndn/ch/unibas/foo2", "unibas-foo2")
+        self.tree1_co.insert(c1)
+        self.tree1_co.insert(c2)
+        self.tree1_co.insert(c3)
+        self.assertEqual(c2, self.tree1_co.prefix_lookup(Name("/ndn")))
+        self.assertEqual(c1, self.tree1_co.prefix_lookup(Name("/ndn/ch/unibas/foo")))
+        self.assertEqual([c2, c3, c1], list(self.tree1_co.prefix_objects(Name("/ndn/ch"))))
+        c4 = Content("/ndn/ch/unibas", "unibas")
+        self.tree1_co.insert(c4)
+        self.assertEqual(c4, self.tree1_co.prefix_lookup(Name("/ndn/ch/unibas")))
+
+    def test_prefix_lookup_key(self):
+        cse1 = ContentStoreEntry(Content("/ndn/ch/unibas/foo1", "unibas-foo1"))
+        cse2 = ContentStoreEntry(Content("/ndn/ch/unibas/foo/bar1", "unibas-foo-bar1"))
+        cse3 = ContentStoreEntry(Content("/ndn/ch/unibas/foo2", "unibas-foo2"))
+        cse1.timestamp, cse2.timestamp, cse3.timestamp = 1, 3, 2
+        self.tree_cse.insert(cse1)
+        self.tree_cse.insert(cse2)
+        self.tree_cse.insert(cse3)
+        self.assertEqual(cse2, self.tree_cse.prefix_lookup(Name("/ndn"), key=lambda e: e.timestamp))
+        self.assertEqual(cse1, self.tree_cse.prefix_lookup(Name("/ndn"), key=lambda e: -e.timestamp))
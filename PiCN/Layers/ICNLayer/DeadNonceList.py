@@ -0,0 +1,85 @@
+"""Recently seen Interest nonces, to detect duplicated and looping Interests"""
+
+import multiprocessing.sharedctypes
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from PiCN.Packets import Name
+
+NEW, DUPLICATE, LOOP = "new", "duplicate", "loop"
+_DUPLICATES, _LOOPS, _NONCES = range(3)
+
+
+class DeadNonceList(object):
+    """Bounded table of the (name, nonce) pairs of the Interests a forwarder handled recently, with the face each one
+    arrived on first (None for Interests of the node itself). An Interest whose name and nonce are in the table arrived
+    before: on the same face it is a duplicate (e.g. duplicated by the link), on another face it is looping or reached
+    the node on two paths. Pairs are kept for lifetime seconds, at most max_entries (the oldest are dropped first).
+    The counters are kept in shared memory, so they can be read in the process which created the ICN layer.
+    :param max_entries: maximum number of pairs
+    :param lifetime: time in seconds a pair is kept, should exceed the time an Interest needs to loop
+    """
+
+    def __init__(self, max_entries: int = 10000, lifetime: float = 6.0):
+        self._max_entries = max_entries
+        self._lifetime = lifetime
+        # (name, nonce) -> (face the Interest arrived on first, time), oldest first
+        self._entries: Dict[Tuple[Name, bytes], Tuple[int, float]] = OrderedDict()
+        self._counters = multiprocessing.sharedctypes.RawArray('q', 3)
+
+    @staticmethod
+    def new_nonce() -> bytes:
+        """a random nonce for an Interest of the node itself or a retransmission"""
+        return os.urandom(4)
+
+    def check(self, name: Name, nonce: bytes, faceid: int) -> str:
+        """
+        Check if an Interest arrived before and record it if it did not
+        :param name: name of the Interest
+        :param nonce: nonce of the Interest
+        :param faceid: face the Interest arrived on
+        :return: NEW, DUPLICATE if it arrived on the same face before, LOOP if it arrived on another face before or
+            was sent by the node itself
+        """
+        entry = self._entries.get((name, nonce))
+        if entry is not None and entry[1] >= time.time() - self._lifetime:
+            if entry[0] == faceid:
+                self._counters[_DUPLICATES] += 1
+                return DUPLICATE
+            self._counters[_LOOPS] += 1
+            return LOOP
+        self.add(name, nonce, faceid)
+        return NEW
+
+    def add(self, name: Name, nonce: bytes, faceid: int = None):
+        """
+        Record the nonce of an Interest
+        :param name: name of the Interest
+        :param nonce: nonce of the Interest
+        :param faceid: face the Interest arrived on, None if the node sends it itself
+        """
+        key = (name, nonce)
+        self._entries.pop(key, None)
+        self._entries[key] = (faceid, time.time())
+        self._counters[_NONCES] += 1
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def ageing(self):
+        """remove the pairs older than lifetime"""
+        deadline = time.time() - self._lifetime
+        while self._entries:
+            key, (faceid, timestamp) = next(iter(self._entries.items()))
+            if timestamp >= deadline:
+                break
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """number of duplicated and of looping Interests detected and of nonces recorded"""
+        return {"duplicates": self._counters[_DUPLICATES], "loops": self._counters[_LOOPS],
+                "nonces": self._counters[_NONCES]}
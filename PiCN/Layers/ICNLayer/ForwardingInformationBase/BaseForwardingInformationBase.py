@@ -6,7 +6,6 @@ import multiprocessing
 from PiCN.Layers.ICNLayer import BaseICNDataStruct
 from PiCN.Packets import Name
 from PiCN.Logger import Logger
-from tabulate import tabulate
 
 from typing import List, Optional
 
@@ -76,6 +75,14 @@ class BaseForwardingInformationBase(BaseICNDataStruct):
     def remove_fib_entry(self, name: Name):
         """Remove an entry from the FIB"""
 
+    @abc.abstractmethod
+    def remove_fib_entry_by_fid(self, faceid: int) -> int:
+        """Remove a face from the next hops of all entries, e.g. if the face went down; entries without next hop are
+        removed
+        :param faceid: face id of the face
+        :return: number of entries which used the face
+        """
+
     @abc.abstractmethod
     def find_fib_entry(self, name: Name, already_used: List[ForwardingInformationBaseEntry] = None,
                        incoming_faceids: List[int] = None) -> ForwardingInformationBaseEntry:
@@ -108,5 +115,6 @@ class BaseForwardingInformationBase(BaseICNDataStruct):
     def __repr__(self):
         headers = ['Name', 'FaceIDs', 'Static', 'Session']
         data = [[entry.name, entry.faceid, entry.static, entry.is_session]
-                for entry in self._container]
+                for entry in self.container]
+        from tabulate import tabulate  # optional, only needed to print the table
         return f"Fowarding Information Base for <<{self._node_name}>>:\n{tabulate(data, headers=headers, showindex=True, tablefmt='fancy_grid')}"
@@ -1,6 +1,6 @@
 """ A in memory Forwarding Information Base using longest matching"""
 
-from typing import List
+from typing import Dict, List
 
 from PiCN.Layers.ICNLayer.ForwardingInformationBase.BaseForwardingInformationBase import BaseForwardingInformationBase, \
     ForwardingInformationBaseEntry
@@ -9,41 +9,74 @@ from PiCN.Packets import Name
 from typing import Optional
 
 
+class _FibNode(object):
+    """node of the name component trie, holds the entries of one prefix, newest first"""
+
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: Dict[bytes, _FibNode] = {}
+        self.entries: List[ForwardingInformationBaseEntry] = []
+
+
 class ForwardingInformationBaseMemoryPrefix(BaseForwardingInformationBase):
+    """In-memory Forwarding Information Base using longest prefix matching. Entries are stored in a trie of name
+    components, so a lookup walks down the components of the name once and costs O(len(name)) independently of the
+    number of prefixes in the FIB. An index from face id to the entries using the face as next hop lets
+    remove_fib_entry_by_fid inspect only the entries of the face.
+    """
 
     def __init__(self):
         super().__init__()
+        self.container = []
+
+    @property
+    def container(self) -> List[ForwardingInformationBaseEntry]:
+        return list(reversed(self._container.values()))
+
+    @container.setter
+    def container(self, container: List[ForwardingInformationBaseEntry]):
+        self._root = _FibNode()
+        self._container: Dict[int, ForwardingInformationBaseEntry] = {}  # id of the entry -> entry, oldest first
+        self._by_face: Dict[int, Dict[int, None]] = {}  # face id -> ids of the entries which may use the face
+        for fib_entry in reversed(container):
+            self._insert(fib_entry)
+
+    def get_container_size(self) -> int:
+        return len(self._container)
 
     def find_fib_entry(self, name: Name, already_used: List[ForwardingInformationBaseEntry] = None,
                        incoming_faceids: List[int] = None) -> Optional[ForwardingInformationBaseEntry]:
-        components = name.components[:]
-        for i in range(0, len(name.components)):
-            complen = len(components)
-            for fib_entry in self._container:
+        matches = []
+        node = self._root
+        for component in name.components:
+            node = node.children.get(component)
+            if node is None:
+                break
+            if node.entries:
+                matches.append(node)
+        for node in reversed(matches):
+            for fib_entry in node.entries:
                 if already_used and fib_entry in already_used:
                     continue
-                forward_faceids = []
-                if fib_entry.name.components != components:
-                    continue
-                for faceid in fib_entry.faceid:
-                    if not incoming_faceids or faceid not in incoming_faceids:
-                        forward_faceids.append(faceid)
+                forward_faceids = [faceid for faceid in fib_entry.faceid
+                                   if not incoming_faceids or faceid not in incoming_faceids]
                 if len(forward_faceids) == 0:
                     continue
                 return ForwardingInformationBaseEntry(fib_entry.name, forward_faceids)
-            components = components[:complen - 1]
         return None
 
     def add_fib_entry(self, name: Name, faceid: List[int], static: bool = False, is_session: bool = False):
         assert (isinstance(faceid, List))
         fib_entry = ForwardingInformationBaseEntry(name, faceid, static, is_session)
-        if fib_entry not in self._container:
-            self._container.insert(0, fib_entry)
+        if fib_entry not in self._node(name).entries:
+            self._insert(fib_entry)
 
     def remove_fib_entry(self, name: Name):
-        for fib_entry in self._container:
-            if fib_entry.name == name:
-                self._container.remove(fib_entry)
+        path = self._path(name)
+        if path is None:
+            return
+        self._remove(name.components, path, lambda fib_entry: fib_entry.name == name)
 
     def add_faceid_to_entry(self, name, fid):
         entry = self.find_fib_entry(name)
@@ -52,9 +85,73 @@ class ForwardingInformationBaseMemoryPrefix(BaseForwardingInformationBase):
             return
         if fid not in entry.faceid:
             entry.faceid.append(fid)
-        self._container.insert(0, entry)
+        self._insert(entry)
+
+    def remove_fib_entry_by_fid(self, faceid: int) -> int:
+        removed = 0
+        for entry_id in self._by_face.pop(faceid, ()):
+            fib_entry = self._container.get(entry_id)
+            if fib_entry is None or faceid not in fib_entry.faceid:
+                continue
+            fib_entry.faceid = [fid for fid in fib_entry.faceid if fid != faceid]
+            if not fib_entry.faceid:  # no next hop left
+                self._remove(fib_entry.name.components, self._path(fib_entry.name), lambda e: e is fib_entry)
+            removed += 1
+        return removed
 
     def clear(self):
-        for fib_entry in self._container:
-            if not fib_entry.static:
-                self._container.remove(fib_entry)
+        stack = [([], [self._root])]
+        while stack:
+            components, path = stack.pop()
+            stack.extend((components + [component], path + [child])
+                         for component, child in path[-1].children.items())
+            self._remove(components, path, lambda fib_entry: not fib_entry.static)
+
+    def _node(self, name: Name, create: bool = False) -> _FibNode:
+        """trie node of the prefix name, an empty node if it does not exist and create is False"""
+        node = self._root
+        for component in name.components:
+            child = node.children.get(component)
+            if child is None:
+                if not create:
+                    return _FibNode()
+                child = node.children[component] = _FibNode()
+            node = child
+        return node
+
+    def _path(self, name: Name) -> Optional[List[_FibNode]]:
+        """trie nodes from the root to the node of the prefix name, None if the node does not exist"""
+        path = [self._root]
+        for component in name.components:
+            node = path[-1].children.get(component)
+            if node is None:
+                return None
+            path.append(node)
+        return path
+
+    def _insert(self, fib_entry: ForwardingInformationBaseEntry):
+        self._node(fib_entry.name, create=True).entries.insert(0, fib_entry)
+        self._container[id(fib_entry)] = fib_entry
+        for faceid in fib_entry.faceid:
+            self._by_face.setdefault(faceid, {})[id(fib_entry)] = None
+
+    def _remove(self, components: List[bytes], path: List[_FibNode], match):
+        """remove the entries of the last node of path that match, and the nodes of path that became empty
+        :param components: name components leading to the last node of path
+        :param path: trie nodes from the root to the node of the prefix
+        :param match: predicate selecting the entries to remove
+        """
+        node = path[-1]
+        for fib_entry in [e for e in node.entries if match(e)]:
+            node.entries.remove(fib_entry)
+            del self._container[id(fib_entry)]
+            for faceid in fib_entry.faceid:
+                entry_ids = self._by_face.get(faceid)
+                if entry_ids is not None:
+                    entry_ids.pop(id(fib_entry), None)
+                    if not entry_ids:
+                        del self._by_face[faceid]
+        for depth in range(len(components), 0, -1):
+            if path[depth].entries or path[depth].children:
+                break
+            del path[depth - 1].children[components[depth - 1]]
@@ -3,7 +3,8 @@
 import multiprocessing
 import unittest
 
-from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix, \
+    ForwardingInformationBaseEntry
 from PiCN.Packets import Name
 
 
@@ -22,7 +23,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         fid = [1]
         name = Name("/test/data")
         self.fib.add_fib_entry(name, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.get_container()[0]
         self.assertEqual(entry.name, name)
         self.assertEqual(entry.faceid, fid)
 
@@ -31,7 +32,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         fid = [1]
         name = Name("/test/data")
         self.fib.add_fib_entry(name, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.get_container()[0]
         self.assertEqual(entry.name, name)
         self.assertEqual(entry.faceid, fid)
         fib_entry = self.fib.find_fib_entry(name)
@@ -46,7 +47,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         name2 = Name("/data/test")
         self.fib.add_fib_entry(name2, fid2)
         self.fib.add_fib_entry(name1, fid1)
-        entry = self.fib._container[1]
+        entry = self.fib.get_container()[1]
         self.assertEqual(entry.name, name2)
         self.assertEqual(entry.faceid, fid2)
         fib_entry = self.fib.find_fib_entry(name1)
@@ -76,7 +77,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         name1 = Name("/test/data")
         name2 = Name("/data/test")
         self.fib.add_fib_entry(name1, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.get_container()[0]
         self.assertEqual(entry.name, name1)
         self.assertEqual(entry.faceid, fid)
         fib_entry = self.fib.find_fib_entry(name2)
@@ -87,7 +88,7 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         fid = [1]
         name = Name("/test/data")
         self.fib.add_fib_entry(name, fid)
-        entry = self.fib._container[0]
+        entry = self.fib.get_container()[0]
         self.assertEqual(entry.name, name)
         self.assertEqual(entry.faceid, fid)
         self.fib.remove_fib_entry(name)
@@ -139,3 +140,67 @@ class test_ForwardingInformationBaseMemoryPrefix(unittest.TestCase):
         self.fib.add_faceid_to_entry(Name("/test/bar"), 21)
         entry = self.fib.find_fib_entry(Name("/test/bar"))
         self.assertEqual([1337, 21], entry.faceid)
+
+    def test_find_entry_incoming_faceids(self):
+        """Test that the faces an Interest was received from are not used to forward it"""
+        self.fib.add_fib_entry(Name("/test"), [2])
+        self.fib.add_fib_entry(Name("/test/data"), [1, 3])
+        fib_entry = self.fib.find_fib_entry(Name("/test/data/object"), incoming_faceids=[1])
+        self.assertEqual(Name("/test/data"), fib_entry.name)
+        self.assertEqual([3], fib_entry.faceid)
+        fib_entry = self.fib.find_fib_entry(Name("/test/data/object"), incoming_faceids=[1, 3])
+        self.assertEqual(Name("/test"), fib_entry.name)
+        self.assertEqual([2], fib_entry.faceid)
+        self.assertIsNone(self.fib.find_fib_entry(Name("/test/data/object"), incoming_faceids=[1, 2, 3]))
+
+    def test_find_entry_same_prefix_newest_first(self):
+        """Test that the newest of several entries of a prefix is found first"""
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.fib.add_fib_entry(Name("/test"), [2])
+        self.assertEqual(2, self.fib.get_container_size())
+        fib_entry = self.fib.find_fib_entry(Name("/test/data"))
+        self.assertEqual([2], fib_entry.faceid)
+        fib_entry = self.fib.find_fib_entry(Name("/test/data"), already_used=[fib_entry])
+        self.assertEqual([1], fib_entry.faceid)
+        self.fib.remove_fib_entry(Name("/test"))
+        self.assertEqual(0, self.fib.get_container_size())
+        self.assertIsNone(self.fib.find_fib_entry(Name("/test/data")))
+
+    def test_set_container(self):
+        """Test replacing all entries of the FIB, keeping their order"""
+        self.fib.add_fib_entry(Name("/old"), [1])
+        entries = [ForwardingInformationBaseEntry(Name("/test/data"), [2]),
+                   ForwardingInformationBaseEntry(Name("/test"), [3])]
+        self.fib.container = entries
+        self.assertEqual(entries, self.fib.get_container())
+        self.assertIsNone(self.fib.find_fib_entry(Name("/old")))
+        self.assertEqual([2], self.fib.find_fib_entry(Name("/test/data")).faceid)
+        self.assertEqual([3], self.fib.find_fib_entry(Name("/test/foo")).faceid)
+
+    def test_large_fib(self):
+        """Test longest prefix matching in a FIB with many prefixes"""
+        for i in range(10000):
+            self.fib.add_fib_entry(Name("/prefix/" + str(i)), [i])
+            self.fib.add_fib_entry(Name("/prefix/" + str(i) + "/sub"), [i + 10000])
+        self.assertEqual(20000, self.fib.get_container_size())
+        for i in range(0, 10000, 7):
+            self.assertEqual([i + 10000], self.fib.find_fib_entry(Name("/prefix/%d/sub/object" % i)).faceid)
+            self.assertEqual([i], self.fib.find_fib_entry(Name("/prefix/%d/other" % i)).faceid)
+        self.fib.clear()
+        self.assertEqual(0, self.fib.get_container_size())
+        self.assertIsNone(self.fib.find_fib_entry(Name("/prefix/1/sub")))
+
+    def test_remove_fib_entry_by_fid(self):
+        """Test removing a face that went down from the next hops of the FIB entries"""
+        self.fib.add_fib_entry(Name("/test"), [1, 2])
+        self.fib.add_fib_entry(Name("/test/data"), [1], static=True)
+        self.fib.add_fib_entry(Name("/other"), [2])
+        self.assertEqual(2, self.fib.remove_fib_entry_by_fid(1))
+        self.assertEqual(2, self.fib.get_container_size())
+        self.assertEqual(Name("/test"), self.fib.find_fib_entry(Name("/test/data")).name)
+        self.assertEqual([2], self.fib.find_fib_entry(Name("/test/data")).faceid)
+        self.assertEqual(0, self.fib.remove_fib_entry_by_fid(1))
+        self.assertEqual(2, self.fib.remove_fib_entry_by_fid(2))
+        self.assertEqual(0, self.fib.get_container_size())
+        self.fib.add_fib_entry(Name("/test"), [2])
+        self.assertEqual(1, self.fib.remove_fib_entry_by_fid(2))
@@ -0,0 +1,106 @@
+"""Adaptive forwarding strategy measuring its next hops"""
+
+import time
+from typing import Dict, List, Tuple
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy.BaseForwardingStrategy import BaseForwardingStrategy
+from PiCN.Packets import Name
+
+
+class _FaceStats(object):
+    """measurements of a next hop of a FIB entry"""
+
+    __slots__ = ("srtt", "rttvar", "satisfaction", "satisfied", "nacks", "timeouts")
+
+    def __init__(self):
+        self.srtt: float = None  # None if no round trip time was measured yet
+        self.rttvar = 0.0
+        self.satisfaction = 1.0
+        self.satisfied = 0
+        self.nacks = 0
+        self.timeouts = 0
+
+
+class AdaptiveStrategy(BaseForwardingStrategy):
+    """Forwards an Interest to the next hop with the lowest cost, measured per FIB entry. The cost of a next hop is its
+    smoothed round trip time divided by its satisfaction ratio, an exponentially weighted average of the Interests it
+    satisfied (1) and the Nacks and timeouts (0); next hops without measured round trip time have the round trip time
+    initial_rtt. Every probe_interval seconds, an Interest of a FIB entry is additionally forwarded to one of the other
+    next hops (in turn), so the measurements of the alternatives stay current and a faster next hop is found.
+    :param timeout: time after which an Interest forwarded to a next hop is considered lost
+    :param probe_interval: interval of the probes of each FIB entry in seconds
+    :param initial_rtt: round trip time assumed for next hops which were not measured yet
+    :param alpha: weight of a new sample in the smoothed round trip time and the satisfaction ratio
+    """
+
+    def __init__(self, timeout: float = 4.0, probe_interval: float = 1.0, initial_rtt: float = 0.5,
+                 alpha: float = 0.125):
+        super().__init__(timeout=timeout)
+        self._probe_interval = probe_interval
+        self._initial_rtt = initial_rtt
+        self._alpha = alpha
+        self._faces: Dict[Tuple[Name, int], _FaceStats] = {}  # (prefix, next hop) -> measurements
+        self._probes: Dict[Name, Tuple[float, int]] = {}  # prefix -> time of the last probe, number of probes
+        self._counters["probes"] = 0
+
+    def select_faces(self, prefix: Name, faceids: List[int]) -> List[int]:
+        if len(faceids) <= 1:
+            return faceids
+        best = min(faceids, key=lambda faceid: self.cost(prefix, faceid))
+        now = time.time()
+        last_probe, probes = self._probes.get(prefix, (0.0, 0))
+        if now - last_probe < self._probe_interval:
+            return [best]
+        alternatives = [faceid for faceid in faceids if faceid != best]
+        self._probes[prefix] = (now, probes + 1)
+        self._counters["probes"] += 1
+        return [best, alternatives[probes % len(alternatives)]]
+
+    def cost(self, prefix: Name, faceid: int) -> float:
+        """
+        Cost of a next hop, lower is better
+        :param prefix: name of the FIB entry
+        :param faceid: next hop
+        :return: smoothed round trip time divided by the satisfaction ratio
+        """
+        stats = self._faces.get((prefix, faceid))
+        if stats is None:
+            return self._initial_rtt
+        srtt = stats.srtt if stats.srtt is not None else self._initial_rtt
+        return srtt / max(stats.satisfaction, 0.01)
+
+    def face_satisfied(self, prefix: Name, faceid: int, rtt: float):
+        stats = self._stats(prefix, faceid)
+        if stats.srtt is None:
+            stats.srtt, stats.rttvar = rtt, rtt / 2
+        else:
+            stats.rttvar = (1 - self._alpha / 2) * stats.rttvar + self._alpha / 2 * abs(stats.srtt - rtt)
+            stats.srtt = (1 - self._alpha) * stats.srtt + self._alpha * rtt
+        stats.satisfaction = (1 - self._alpha) * stats.satisfaction + self._alpha
+        stats.satisfied += 1
+
+    def face_failed(self, prefix: Name, faceid: int, timeout: bool):
+        stats = self._stats(prefix, faceid)
+        stats.satisfaction = (1 - self._alpha) * stats.satisfaction
+        if timeout:
+            stats.timeouts += 1
+        else:
+            stats.nacks += 1
+
+    def get_face_stats(self, prefix: Name) -> Dict[int, dict]:
+        """
+        Measurements of the next hops of a FIB entry
+        :param prefix: name of the FIB entry
+        :return: next hop -> smoothed round trip time, its variation, satisfaction ratio, cost and the number of
+            satisfied Interests, Nacks and timeouts
+        """
+        return {faceid: {"srtt": stats.srtt, "rttvar": stats.rttvar, "satisfaction": stats.satisfaction,
+                         "cost": self.cost(prefix, faceid), "satisfied": stats.satisfied, "nacks": stats.nacks,
+                         "timeouts": stats.timeouts}
+                for (entry_prefix, faceid), stats in self._faces.items() if entry_prefix == prefix}
+
+    def _stats(self, prefix: Name, faceid: int) -> _FaceStats:
+        stats = self._faces.get((prefix, faceid))
+        if stats is None:
+            stats = self._faces[(prefix, faceid)] = _FaceStats()
+        return stats
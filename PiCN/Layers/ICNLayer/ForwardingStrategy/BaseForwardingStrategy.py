@@ -0,0 +1,122 @@
+"""Abstract forwarding strategy of the ICN layer"""
+
+import abc
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from PiCN.Packets import Name
+
+
+class BaseForwardingStrategy(object):
+    """Abstract forwarding strategy, deciding to which next hops of a FIB entry an Interest is forwarded. The ICN layer
+    reports each forwarded Interest and the Content, Nack or timeout it results in, so a strategy can measure its next
+    hops; the round trip time of a next hop is the time from the last forwarding of an Interest to it until its
+    Content arrives. Interests which are neither satisfied nor nacked within timeout count as timeouts of the next hop.
+    :param timeout: time after which an Interest forwarded to a next hop is considered lost
+    """
+
+    def __init__(self, timeout: float = 4.0):
+        self._timeout = timeout
+        # Interest name -> (prefix of the FIB entry, next hop -> time the Interest was forwarded), least recently
+        # forwarded first
+        self._forwarded: Dict[Name, Tuple[Name, Dict[int, float]]] = OrderedDict()
+        self._counters = {"forwarded": 0, "satisfied": 0, "nacked": 0, "timeouts": 0}
+
+    @abc.abstractmethod
+    def select_faces(self, prefix: Name, faceids: List[int]) -> List[int]:
+        """
+        Choose the next hops a new Interest is forwarded to
+        :param prefix: name of the FIB entry
+        :param faceids: next hops of the FIB entry, without the faces the Interest came from or which sent a Nack
+        :return: next hops to forward the Interest to
+        """
+
+    def retry_faces(self, prefix: Name, name: Name, faceids: List[int]) -> List[int]:
+        """
+        Choose the next hops an Interest is forwarded to after all next hops it was forwarded to sent a Nack. By default,
+        select_faces chooses among the next hops the Interest was not forwarded to yet.
+        :param prefix: name of the FIB entry
+        :param name: name of the Interest
+        :param faceids: next hops of the FIB entry which did not send a Nack
+        :return: next hops to forward the Interest to, none to try the next FIB entry
+        """
+        forwarded = self._forwarded.get(name)
+        untried = [faceid for faceid in faceids if forwarded is None or faceid not in forwarded[1]]
+        return self.select_faces(prefix, untried) if untried else []
+
+    def interest_forwarded(self, prefix: Name, name: Name, faceid: int):
+        """
+        An Interest was forwarded to a next hop
+        :param prefix: name of the FIB entry
+        :param name: name of the Interest
+        :param faceid: next hop
+        """
+        forwarded = self._forwarded.get(name)
+        if forwarded is None:
+            forwarded = self._forwarded[name] = (prefix, {})
+        else:
+            self._forwarded.move_to_end(name)
+        forwarded[1][faceid] = time.time()
+        self._counters["forwarded"] += 1
+
+    def content_received(self, name: Name, faceid: int):
+        """
+        The Content of a forwarded Interest arrived
+        :param name: name of the Content
+        :param faceid: face the Content arrived on
+        """
+        forwarded = self._forwarded.pop(name, None)
+        if forwarded is None:
+            return
+        prefix, faces = forwarded
+        if faceid in faces:
+            self._counters["satisfied"] += 1
+            self.face_satisfied(prefix, faceid, time.time() - faces[faceid])
+
+    def nack_received(self, name: Name, faceid: int):
+        """
+        A next hop sent a Nack for a forwarded Interest
+        :param name: name of the Interest
+        :param faceid: face the Nack arrived on
+        """
+        forwarded = self._forwarded.get(name)
+        if forwarded is None or faceid not in forwarded[1]:
+            return
+        del forwarded[1][faceid]
+        if not forwarded[1]:
+            del self._forwarded[name]
+        self._counters["nacked"] += 1
+        self.face_failed(forwarded[0], faceid, timeout=False)
+
+    def face_satisfied(self, prefix: Name, faceid: int, rtt: float):
+        """
+        A next hop returned the Content of an Interest
+        :param prefix: name of the FIB entry
+        :param faceid: next hop
+        :param rtt: round trip time
+        """
+
+    def face_failed(self, prefix: Name, faceid: int, timeout: bool):
+        """
+        A next hop sent a Nack for an Interest or did not answer within timeout
+        :param prefix: name of the FIB entry
+        :param faceid: next hop
+        :param timeout: True if the next hop did not answer, False if it sent a Nack
+        """
+
+    def ageing(self):
+        """count the Interests which were not answered within timeout as timeouts of their next hops"""
+        deadline = time.time() - self._timeout
+        while self._forwarded:
+            name, (prefix, faces) = next(iter(self._forwarded.items()))
+            if max(faces.values()) >= deadline:
+                break
+            del self._forwarded[name]
+            for faceid in faces:
+                self._counters["timeouts"] += 1
+                self.face_failed(prefix, faceid, timeout=True)
+
+    def get_stats(self) -> dict:
+        """number of Interests forwarded to a next hop, satisfied, nacked and timed out, and of pending Interests"""
+        return dict(self._counters, pending=len(self._forwarded))
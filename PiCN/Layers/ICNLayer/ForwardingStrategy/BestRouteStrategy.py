@@ -0,0 +1,14 @@
+"""Best route forwarding strategy"""
+
+from typing import List
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy.BaseForwardingStrategy import BaseForwardingStrategy
+from PiCN.Packets import Name
+
+
+class BestRouteStrategy(BaseForwardingStrategy):
+    """Forwards an Interest to the first next hop of the FIB entry only. If it sends a Nack, the Interest is forwarded
+    to the next one, and to the next FIB entry after all next hops sent a Nack."""
+
+    def select_faces(self, prefix: Name, faceids: List[int]) -> List[int]:
+        return faceids[:1]
@@ -0,0 +1,17 @@
+"""Multicast forwarding strategy"""
+
+from typing import List
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy.BaseForwardingStrategy import BaseForwardingStrategy
+from PiCN.Packets import Name
+
+
+class MulticastStrategy(BaseForwardingStrategy):
+    """Forwards an Interest to all next hops of the FIB entry, the next FIB entry is tried after all of them sent a
+    Nack. This is the default strategy of the ICN layer."""
+
+    def select_faces(self, prefix: Name, faceids: List[int]) -> List[int]:
+        return faceids
+
+    def retry_faces(self, prefix: Name, name: Name, faceids: List[int]) -> List[int]:
+        return []
@@ -0,0 +1,80 @@
+"""Choice of the forwarding strategy per name prefix"""
+
+from typing import Dict, List, Tuple
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy.BaseForwardingStrategy import BaseForwardingStrategy
+from PiCN.Layers.ICNLayer.ForwardingStrategy.MulticastStrategy import MulticastStrategy
+from PiCN.Packets import Name
+
+
+class StrategyChoiceTable(object):
+    """Forwarding strategies of name prefixes. The strategy of a name is the strategy of its longest prefix in the
+    table, the default strategy if no prefix is in the table. Each strategy object keeps its own measurements, a
+    strategy set for several prefixes shares them.
+    :param default: strategy of names without prefix in the table, a MulticastStrategy if None
+    """
+
+    def __init__(self, default: BaseForwardingStrategy = None):
+        self._default = default if default is not None else MulticastStrategy()
+        self._strategies: Dict[Tuple[bytes, ...], BaseForwardingStrategy] = {}  # prefix components -> strategy
+        self._max_length = 0  # number of components of the longest prefix
+
+    @property
+    def default(self) -> BaseForwardingStrategy:
+        return self._default
+
+    @default.setter
+    def default(self, strategy: BaseForwardingStrategy):
+        self._default = strategy
+
+    def set_strategy(self, prefix: Name, strategy: BaseForwardingStrategy):
+        """
+        Choose the strategy of a prefix
+        :param prefix: name prefix
+        :param strategy: strategy of the names with the prefix
+        """
+        self._strategies[prefix.components] = strategy
+        self._max_length = max(self._max_length, len(prefix.components))
+
+    def unset_strategy(self, prefix: Name):
+        """
+        Remove the strategy choice of a prefix, its names use the strategy of a shorter prefix
+        :param prefix: name prefix
+        """
+        self._strategies.pop(prefix.components, None)
+        self._max_length = max((len(components) for components in self._strategies), default=0)
+
+    def find_strategy(self, name: Name) -> BaseForwardingStrategy:
+        """
+        Strategy of a name (longest prefix match)
+        :param name: name of an Interest
+        :return: strategy of the longest prefix of the name in the table, the default strategy if there is none
+        """
+        if self._strategies:
+            components = name.components
+            for length in range(min(len(components), self._max_length), -1, -1):
+                strategy = self._strategies.get(components[:length])
+                if strategy is not None:
+                    return strategy
+        return self._default
+
+    def strategies(self) -> List[BaseForwardingStrategy]:
+        """the default strategy and the strategies of the prefixes, each once"""
+        strategies = [self._default]
+        for strategy in self._strategies.values():
+            if all(strategy is not s for s in strategies):
+                strategies.append(strategy)
+        return strategies
+
+    def ageing(self):
+        """count the Interests of all strategies which were not answered in time as timeouts"""
+        for strategy in self.strategies():
+            strategy.ageing()
+
+    def get_stats(self) -> dict:
+        """counters of all strategies, summed up"""
+        stats = {}
+        for strategy in self.strategies():
+            for key, value in strategy.get_stats().items():
+                stats[key] = stats.get(key, 0) + value
+        return stats
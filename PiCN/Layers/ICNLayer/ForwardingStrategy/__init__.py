@@ -0,0 +1,8 @@
+"""Forwarding strategies of the ICN layer"""
+
+from .BaseForwardingStrategy import BaseForwardingStrategy
+
+from .MulticastStrategy import MulticastStrategy
+from .BestRouteStrategy import BestRouteStrategy
+from .AdaptiveStrategy import AdaptiveStrategy
+from .StrategyChoiceTable import StrategyChoiceTable
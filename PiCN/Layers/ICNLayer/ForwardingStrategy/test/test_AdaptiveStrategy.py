@@ -0,0 +1,73 @@
+"""Tests for the adaptive forwarding strategy"""
+
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy import AdaptiveStrategy
+from PiCN.Packets import Name
+
+
+class test_AdaptiveStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.prefix = Name("/test")
+        self.strategy = AdaptiveStrategy(timeout=0.05, probe_interval=60.0, initial_rtt=0.5)
+        self.strategy.select_faces(self.prefix, [2, 3])  # first selection probes
+
+    def test_prefer_faster_next_hop(self):
+        """Test that the next hop with the lower round trip time is chosen"""
+        self.strategy.face_satisfied(self.prefix, 2, 0.2)
+        self.strategy.face_satisfied(self.prefix, 3, 0.01)
+        self.assertEqual(self.strategy.select_faces(self.prefix, [2, 3]), [3])
+        stats = self.strategy.get_face_stats(self.prefix)
+        self.assertAlmostEqual(stats[3]["srtt"], 0.01)
+        self.assertEqual(stats[3]["satisfied"], 1)
+
+    def test_avoid_failing_next_hop(self):
+        """Test that Nacks and timeouts lower the satisfaction ratio of a next hop until another one is chosen"""
+        self.strategy.face_satisfied(self.prefix, 2, 0.01)
+        self.strategy.face_satisfied(self.prefix, 3, 0.02)
+        self.assertEqual(self.strategy.select_faces(self.prefix, [2, 3]), [2])
+        name = Name("/test/data")
+        self.strategy.interest_forwarded(self.prefix, name, 2)
+        self.strategy.nack_received(name, 2)
+        for i in range(10):
+            self.strategy.interest_forwarded(self.prefix, Name("/test/" + str(i)), 2)
+        time.sleep(0.1)
+        self.strategy.ageing()
+        stats = self.strategy.get_face_stats(self.prefix)
+        self.assertEqual(stats[2]["nacks"], 1)
+        self.assertEqual(stats[2]["timeouts"], 10)
+        self.assertLess(stats[2]["satisfaction"], 0.5)
+        self.assertEqual(self.strategy.select_faces(self.prefix, [2, 3]), [3])
+
+    def test_measure_round_trip_time(self):
+        """Test that the round trip time is measured from forwarding an Interest to receiving its Content"""
+        name = Name("/test/data")
+        self.strategy.interest_forwarded(self.prefix, name, 3)
+        time.sleep(0.02)
+        self.strategy.content_received(name, 3)
+        srtt = self.strategy.get_face_stats(self.prefix)[3]["srtt"]
+        self.assertGreaterEqual(srtt, 0.02)
+        self.assertLess(srtt, 0.5)
+        self.assertEqual(self.strategy.select_faces(self.prefix, [2, 3]), [3])
+
+    def test_probe_alternatives(self):
+        """Test that alternative next hops are probed in turn every probe interval"""
+        strategy = AdaptiveStrategy(probe_interval=0.05)
+        strategy.face_satisfied(self.prefix, 2, 0.01)
+        self.assertEqual(strategy.select_faces(self.prefix, [2, 3, 4]), [2, 3])
+        self.assertEqual(strategy.select_faces(self.prefix, [2, 3, 4]), [2])
+        time.sleep(0.1)
+        self.assertEqual(strategy.select_faces(self.prefix, [2, 3, 4]), [2, 4])
+        self.assertEqual(strategy.get_stats()["probes"], 2)
+        self.assertEqual(strategy.select_faces(self.prefix, [2]), [2])
+
+    def test_prefixes_measured_separately(self):
+        """Test that the next hops of different FIB entries are measured separately"""
+        other = Name("/other")
+        self.strategy.select_faces(other, [2, 3])
+        self.strategy.face_satisfied(self.prefix, 2, 0.01)
+        self.strategy.face_satisfied(other, 3, 0.01)
+        self.assertEqual(self.strategy.select_faces(self.prefix, [2, 3]), [2])
+        self.assertEqual(self.strategy.select_faces(other, [2, 3]), [3])
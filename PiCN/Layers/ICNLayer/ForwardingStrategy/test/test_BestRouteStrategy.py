@@ -0,0 +1,51 @@
+"""Tests for the best route and multicast forwarding strategies"""
+
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy import BestRouteStrategy, MulticastStrategy
+from PiCN.Packets import Name
+
+
+class test_BestRouteStrategy(unittest.TestCase):
+
+    def setUp(self):
+        self.prefix = Name("/test")
+        self.name = Name("/test/data")
+
+    def test_select_first_next_hop(self):
+        """Test that the best route strategy forwards to the first next hop only"""
+        strategy = BestRouteStrategy()
+        self.assertEqual(strategy.select_faces(self.prefix, [2, 3, 4]), [2])
+        self.assertEqual(strategy.select_faces(self.prefix, []), [])
+
+    def test_retry_untried_next_hop(self):
+        """Test that after a Nack the best route strategy tries a next hop the Interest was not forwarded to"""
+        strategy = BestRouteStrategy()
+        strategy.interest_forwarded(self.prefix, self.name, 2)
+        self.assertEqual(strategy.retry_faces(self.prefix, self.name, [2, 3, 4]), [3])
+        strategy.interest_forwarded(self.prefix, self.name, 3)
+        strategy.nack_received(self.name, 3)
+        self.assertEqual(strategy.retry_faces(self.prefix, self.name, [2, 4]), [4])
+
+    def test_multicast(self):
+        """Test that the multicast strategy forwards to all next hops and does not retry"""
+        strategy = MulticastStrategy()
+        self.assertEqual(strategy.select_faces(self.prefix, [2, 3]), [2, 3])
+        strategy.interest_forwarded(self.prefix, self.name, 2)
+        self.assertEqual(strategy.retry_faces(self.prefix, self.name, [3]), [])
+
+    def test_stats(self):
+        """Test the counters of forwarded, satisfied, nacked and timed out Interests"""
+        strategy = BestRouteStrategy(timeout=0.05)
+        for i in range(3):
+            strategy.interest_forwarded(self.prefix, Name("/test/" + str(i)), 2)
+        strategy.content_received(Name("/test/0"), 2)
+        strategy.nack_received(Name("/test/1"), 2)
+        strategy.content_received(Name("/test/unknown"), 2)
+        self.assertEqual(strategy.get_stats(), {"forwarded": 3, "satisfied": 1, "nacked": 1, "timeouts": 0,
+                                                "pending": 1})
+        time.sleep(0.1)
+        strategy.ageing()
+        self.assertEqual(strategy.get_stats()["timeouts"], 1)
+        self.assertEqual(strategy.get_stats()["pending"], 0)
@@ -0,0 +1,43 @@
+"""Tests for the strategy choice table"""
+
+import unittest
+
+from PiCN.Layers.ICNLayer.ForwardingStrategy import AdaptiveStrategy, BestRouteStrategy, MulticastStrategy, \
+    StrategyChoiceTable
+from PiCN.Packets import Name
+
+
+class test_StrategyChoiceTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = StrategyChoiceTable()
+
+    def test_default_strategy(self):
+        """Test that names without prefix in the table use the multicast strategy"""
+        self.assertIsInstance(self.table.find_strategy(Name("/test/data")), MulticastStrategy)
+        best_route = BestRouteStrategy()
+        self.table.default = best_route
+        self.assertIs(self.table.find_strategy(Name("/test/data")), best_route)
+
+    def test_longest_prefix_match(self):
+        """Test that the strategy of the longest prefix of a name is chosen"""
+        best_route, adaptive = BestRouteStrategy(), AdaptiveStrategy()
+        self.table.set_strategy(Name("/test"), best_route)
+        self.table.set_strategy(Name("/test/video"), adaptive)
+        self.assertIs(self.table.find_strategy(Name("/test/data")), best_route)
+        self.assertIs(self.table.find_strategy(Name("/test/video/c1")), adaptive)
+        self.assertIs(self.table.find_strategy(Name("/test")), best_route)
+        self.assertIs(self.table.find_strategy(Name("/testing")), self.table.default)
+        self.table.unset_strategy(Name("/test/video"))
+        self.assertIs(self.table.find_strategy(Name("/test/video/c1")), best_route)
+
+    def test_stats(self):
+        """Test that the counters of all strategies are summed up, a shared strategy is counted once"""
+        best_route = BestRouteStrategy()
+        self.table.set_strategy(Name("/a"), best_route)
+        self.table.set_strategy(Name("/b"), best_route)
+        self.table.find_strategy(Name("/a/x")).interest_forwarded(Name("/a"), Name("/a/x"), 2)
+        self.table.find_strategy(Name("/c/x")).interest_forwarded(Name("/c"), Name("/c/x"), 2)
+        self.assertEqual(len(self.table.strategies()), 2)
+        self.assertEqual(self.table.get_stats()["forwarded"], 2)
+        self.assertEqual(self.table.get_stats()["pending"], 2)
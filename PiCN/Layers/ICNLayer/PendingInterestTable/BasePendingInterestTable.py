@@ -2,7 +2,6 @@
 
 import abc
 import time
-from tabulate import tabulate
 
 from PiCN.Packets import Interest, Name, Content
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
@@ -130,8 +129,11 @@ class BasePendingInterestTable(BaseICNDataStruct):
         """Remove an entry in the PIT"""
 
     @abc.abstractmethod
-    def remove_pit_entry_by_fid(self, faceid: int):
-        """Removes all PIT entries refering to a given faceid"""
+    def remove_pit_entry_by_fid(self, faceid: int) -> int:
+        """Remove a face from the downstream faces of all PIT entries, e.g. if the face went down
+        :param faceid: face id of the face
+        :return: number of removed downstream records
+        """
 
     @abc.abstractmethod
     def update_timestamp(self, pit_entry: PendingInterestTableEntry):
@@ -218,5 +220,7 @@ class BasePendingInterestTable(BaseICNDataStruct):
     def __repr__(self):
         headers = ['Name', 'FaceIDs', 'Timestamp', 'Retransmits', 'Interest', 'Session', 'Local App']
         data = [[entry.name, entry.faceids, entry.timestamp,
-                 entry.retransmits, entry.interest.name, entry.is_session, entry.local_app] for entry in self._container]
+                 entry.retransmits, entry.interest.name if entry.interest else None, entry.is_session, entry.local_app]
+                for entry in self.container]
+        from tabulate import tabulate  # optional, only needed to print the table
         return f"Pending Interest Table for <<{self._node_name}>>:\n{tabulate(data, headers=headers, showindex=True, tablefmt='fancy_grid')}"
@@ -1,5 +1,6 @@
 """In-memory Pending Interest Table using exact prefix matching"""
 
+import heapq
 import time
 
 from PiCN.Layers.ICNLayer.PendingInterestTable.BasePendingInterestTable import BasePendingInterestTable, \
@@ -7,113 +8,173 @@ from PiCN.Layers.ICNLayer.PendingInterestTable.BasePendingInterestTable import B
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
 from PiCN.Packets import Interest, Name, Content
 
-from typing import Optional, Tuple, Union, List
+from typing import Dict, Optional, Tuple, Union, List
 
 
 class PendingInterestTableMemoryExact(BasePendingInterestTable):
-    """In-memory Pending Interest Table using exact prefix matching"""
+    """In-memory Pending Interest Table using exact prefix matching. Entries are kept in a dict keyed by name and
+    modified in place, so lookup, insert and update are O(1). A heap ordered by the time each entry was added, refreshed
+    or last retransmitted finds the entries whose timeout passed, without inspecting the other entries: ageing
+    retransmits an entry once per timeout and removes it when its timeout passes after pit_retransmits retransmits. An
+    index from face id to the entries with the face as downstream face lets remove_pit_entry_by_fid inspect only the
+    entries of the face.
+    """
 
     def __init__(self, pit_timeout: int = 4, pit_retransmits: int = 3) -> None:
         super().__init__(pit_timeout=pit_timeout, pit_retransmits=pit_retransmits)
 
+    @property
+    def container(self) -> List[PendingInterestTableEntry]:
+        return list(self._container.values())
+
+    @container.setter
+    def container(self, container: List[PendingInterestTableEntry]):
+        self._container: Dict[str, PendingInterestTableEntry] = {}
+        self._expiry: List[Tuple[float, str]] = []  # heap of (time of the last forwarding, name)
+        self._queued: Dict[str, float] = {}  # name -> time of its latest item in the heap
+        self._by_face: Dict[int, Dict[str, None]] = {}  # face id -> names of entries which may have the face
+        for entry in container:
+            self.append(entry)
+
+    def get_container_size(self) -> int:
+        return len(self._container)
+
     def add_pit_entry(self, name, faceid: Union[int, List[int]], interest: Interest = None, local_app=False, is_session: bool = False):
-        for pit_entry in self.container:
-            if pit_entry.name == name:
-                if faceid in pit_entry.faceids and local_app in pit_entry.local_app:
-                    return
-                self.container.remove(pit_entry)
-                if isinstance(faceid, int):
-                    pit_entry.faceids.append(faceid)
-                elif isinstance(faceid, list):
-                    pit_entry.faceids.extend(fid for fid in faceid if fid not in pit_entry.faceids)
-                pit_entry.local_app.append(local_app)
-                self.container.append(pit_entry)
+        pit_entry = self._container.get(name.to_string())
+        if pit_entry is not None:
+            if faceid in pit_entry.faceids and local_app in pit_entry.local_app:
                 return
+            if isinstance(faceid, int):
+                pit_entry.faceids.append(faceid)
+            elif isinstance(faceid, list):
+                pit_entry.faceids.extend(fid for fid in faceid if fid not in pit_entry.faceids)
+            pit_entry.local_app.append(local_app)
+            self._index_faces(pit_entry)
+            return
 
-        self.container.append(PendingInterestTableEntry(name, faceid, interest, local_app, is_session=is_session))
+        self.append(PendingInterestTableEntry(name, faceid, interest, local_app, is_session=is_session))
 
     def remove_pit_entry(self, name: Name, incoming_fid: Optional[int] = None, content: Optional[Content] = None):
-        to_remove = []
-        print(self)
-
-        for pit_entry in self.container:  # FIXED: by C. Scherb
-            if pit_entry.name == name and self._session_initiator in pit_entry.name.components_to_string() and content is not None:
-                print(f"--> : Adding session PIT entry: {Name('/sid') + [content.content]}")
-                faceids = []
-                faceids.extend(pit_entry.faceids)
-                if incoming_fid is not None:
-                    faceids.extend([incoming_fid])
-                self.add_pit_entry(name=Name('/sid') + [content.content], interest=pit_entry.interest,
-                                   faceid=faceids, is_session=True, local_app=[False, False])
-
-            if pit_entry.name == name and not pit_entry.is_session:
-                to_remove.append(pit_entry)
-
-        for r in to_remove:
-            print(f"--> : Removing PIT entry: {r.name}")
-            self.container.remove(r)
-
-        print(self)
-
-    def remove_pit_entry_by_fid(self, faceid: int):
-        for pit_entry in self.container:
-            if faceid in pit_entry.faceids:
-                self.container.remove(pit_entry)
-
-                new_faceids = pit_entry.faceids.remove(faceid)
-
-                new_entry = PendingInterestTableEntry(pit_entry.name, new_faceids, interest=pit_entry.interest,
-                                                      local_app=pit_entry.local_app,
-                                                      fib_entries_already_used=pit_entry.fib_entries_already_used,
-                                                      faces_already_nacked=pit_entry.faces_already_nacked,
-                                                      number_of_forwards=pit_entry.number_of_forwards)
-                new_entry.faces_already_nacked = pit_entry.faces_already_nacked
-                self.container.append(new_entry)
+        key = name.to_string()
+        pit_entry = self._container.get(key)
+        if pit_entry is None:
+            return
+        if self._session_initiator in pit_entry.name.components_to_string() and content is not None:
+            faceids = []
+            faceids.extend(pit_entry.faceids)
+            if incoming_fid is not None:
+                faceids.extend([incoming_fid])
+            self.add_pit_entry(name=Name('/sid') + [content.content], interest=pit_entry.interest,
+                               faceid=faceids, is_session=True, local_app=[False, False])
+        if not pit_entry.is_session:
+            self._remove(key)
+
+    def remove_pit_entry_by_fid(self, faceid: int) -> int:
+        removed = 0
+        for key in self._by_face.pop(faceid, ()):
+            pit_entry = self._container.get(key)
+            while pit_entry is not None and faceid in pit_entry.faceids:
+                index = pit_entry.faceids.index(faceid)
+                del pit_entry.faceids[index]
+                if index < len(pit_entry.local_app):
+                    del pit_entry.local_app[index]
+                removed += 1
+        return removed
 
     def find_pit_entry(self, name: Name) -> Optional[PendingInterestTableEntry]:
-        for pit_entry in self.container:
-            if pit_entry.name == name:
-                return pit_entry
-        return None
+        return self._container.get(name.to_string())
 
     def update_timestamp(self, pit_entry: PendingInterestTableEntry):
-        self.container.remove(pit_entry)
-        new_entry = PendingInterestTableEntry(pit_entry.name, pit_entry.faceids, interest=pit_entry.interest,
-                                              local_app=pit_entry.local_app,
-                                              fib_entries_already_used=pit_entry.fib_entries_already_used,
-                                              faces_already_nacked=pit_entry.faces_already_nacked,
-                                              number_of_forwards=pit_entry.number_of_forwards)
-        new_entry.faces_already_nacked = pit_entry.faces_already_nacked
-        self.container.append(new_entry)
+        # the entry may be a copy (e.g. passed through a manager), update the stored entry
+        stored = self._container.get(pit_entry.name.to_string())
+        if stored is None:
+            return
+        stored.timestamp = time.time()
+        stored.retransmits = 0
+        self._schedule(stored, stored.timestamp)
+        self._index_faces(stored)  # faces may have been added to the entry directly
 
     def add_used_fib_entry(self, name: Name, used_fib_entry: ForwardingInformationBaseEntry):  # FIXME: What is a used_fib_entry?
         pit_entry = self.find_pit_entry(name)
-        self.container.remove(pit_entry)
-        pit_entry.fib_entries_already_used.append(used_fib_entry)
-        self.container.append(pit_entry)
+        if pit_entry is not None:
+            pit_entry.fib_entries_already_used.append(used_fib_entry)
 
     def get_already_used_pit_entries(self, name: Name):
         pit_entry = self.find_pit_entry(name)
         return pit_entry.fib_entries_already_used
 
     def append(self, entry):
-        self.container.append(entry)
+        if entry is None:
+            return
+        key = entry.name.to_string()
+        if key in self._container:
+            self._unindex_faces(key)
+        self._container[key] = entry
+        self._schedule(entry, entry.timestamp)
+        self._index_faces(entry)
+
+    def set_number_of_forwards(self, name, forwards):
+        self.find_pit_entry(name).number_of_forwards = forwards
+
+    def increase_number_of_forwards(self, name):
+        pit_entry = self.find_pit_entry(name)
+        if pit_entry is not None:
+            pit_entry.number_of_forwards = pit_entry.number_of_forwards + 1
+
+    def decrease_number_of_forwards(self, name):
+        pit_entry = self.find_pit_entry(name)
+        pit_entry.number_of_forwards = pit_entry.number_of_forwards - 1
+
+    def add_nacked_faceid(self, name, fid: int):
+        self.find_pit_entry(name).faces_already_nacked.append(fid)
 
     def ageing(self) -> Tuple[List[PendingInterestTableEntry], List[PendingInterestTableEntry]]:
         cur_time = time.time()
-        remove = []
         updated = []
-        for pit_entry in self.container:
-            if pit_entry.timestamp + self._pit_timeout < cur_time and pit_entry.retransmits > self._pit_retransmits and not pit_entry.is_session:
+        remove = []
+        while self._expiry and self._expiry[0][0] + self._pit_timeout < cur_time:
+            forwarded, key = heapq.heappop(self._expiry)
+            if self._queued.get(key) != forwarded:  # entry removed or refreshed, a newer item is in the heap
+                continue
+            pit_entry = self._container[key]
+            if pit_entry.retransmits > self._pit_retransmits:
                 remove.append(pit_entry)
-            elif not pit_entry.is_session:  # FIXME: Eventually we will have to let sessions die?
+                self._remove(key)
+            else:
                 pit_entry.retransmits = pit_entry.retransmits + 1
                 updated.append(pit_entry)
-            else:
-                pass  # This case means there are still PIT entries the process tries to age
-        for pit_entry in remove:
-            self.remove_pit_entry(pit_entry.name)
-        for pit_entry in updated:
-            self.remove_pit_entry(pit_entry.name)
-            self.container.append(pit_entry)
+                self._schedule(pit_entry, cur_time)  # due again when the timeout passed after this retransmit
         return updated, remove
+
+    def _schedule(self, pit_entry: PendingInterestTableEntry, forwarded: float):
+        """put the entry into the expiry heap, rebuilding the heap if it holds too many outdated items
+        :param pit_entry: entry to schedule, session entries are not aged
+        :param forwarded: time the Interest of the entry was last forwarded, its timeout starts then
+        """
+        key = pit_entry.name.to_string()
+        if pit_entry.is_session:
+            self._queued.pop(key, None)
+            return
+        self._queued[key] = forwarded
+        heapq.heappush(self._expiry, (forwarded, key))
+        if len(self._expiry) > 2 * len(self._queued) + 64:
+            self._expiry = [(forwarded, key) for key, forwarded in self._queued.items()]
+            heapq.heapify(self._expiry)
+
+    def _index_faces(self, pit_entry: PendingInterestTableEntry):
+        key = pit_entry.name.to_string()
+        for faceid in pit_entry.faceids:
+            self._by_face.setdefault(faceid, {})[key] = None
+
+    def _unindex_faces(self, key: str):
+        for faceid in self._container[key].faceids:
+            keys = self._by_face.get(faceid)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self._by_face[faceid]
+
+    def _remove(self, key: str):
+        self._unindex_faces(key)
+        del self._container[key]
+        self._queued.pop(key, None)
@@ -1,11 +1,13 @@
 """Tests for the in Memory Content Store with exact matching"""
 
 import multiprocessing
+import time
 import unittest
 
 from PiCN.Layers.ICNLayer.PendingInterestTable.PendingInterestTableMemoryExact import PendingInterestTableMemoryExact
+from PiCN.Layers.ICNLayer.PendingInterestTable.BasePendingInterestTable import PendingInterestTableEntry
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseEntry
-from PiCN.Packets import Name
+from PiCN.Packets import Content, Interest, Name
 
 
 class test_PendingInterstTableMemoryExact(unittest.TestCase):
@@ -22,7 +24,7 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         fid = 1
         name = Name("/test/data")
         self.pit.add_pit_entry(name, fid)
-        data = self.pit._container[0]
+        data = self.pit.get_container()[0]
         self.assertEqual(data.name, name)
 
     def test_find_data_in_pit(self):
@@ -30,7 +32,7 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         fid = 1
         name = Name("/test/data")
         self.pit.add_pit_entry(name, fid)
-        data = self.pit._container[0]
+        data = self.pit.get_container()[0]
         self.assertEqual(data.name, name)
         res = self.pit.find_pit_entry(name)
         self.assertEqual(res.name, name)
@@ -42,7 +44,7 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         name1 = Name("/test/data")
         name2 = Name("/data/test")
         self.pit.add_pit_entry(name1, fid)
-        data = self.pit._container[0]
+        data = self.pit.get_container()[0]
         self.assertEqual(data.name, name1)
         res = self.pit.find_pit_entry(name2)
         self.assertEqual(res, None)
@@ -55,7 +57,7 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         name = Name("/test/data")
         self.pit.add_pit_entry(name, fid1)
         self.pit.add_pit_entry(name, fid2)
-        data = self.pit._container[0]
+        data = self.pit.get_container()[0]
         self.assertEqual(data.name, name)
         res = self.pit.find_pit_entry(name)
         self.assertEqual(res.name, name)
@@ -67,7 +69,7 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         name = Name("/test/data")
         self.pit.add_pit_entry(name, fid)
         self.pit.add_pit_entry(name, fid)
-        data = self.pit._container[0]
+        data = self.pit.get_container()[0]
         self.assertEqual(data.name, name)
         res = self.pit.find_pit_entry(name)
         self.assertEqual(res.name, name)
@@ -79,11 +81,11 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         name = Name("/test/data")
         self.pit.add_pit_entry(name, fid)
 
-        data = self.pit._container[0]
+        data = self.pit.get_container()[0]
         self.assertEqual(data.name, name)
-        self.assertEqual(len(self.pit._container), 1)
+        self.assertEqual(self.pit.get_container_size(), 1)
         self.pit.remove_pit_entry(name)
-        self.assertEqual(len(self.pit._container), 0)
+        self.assertEqual(self.pit.get_container_size(), 0)
 
     def test_add_already_used_fib_entry(self):
         """Test adding an already used FIB Entry"""
@@ -101,3 +103,103 @@ class test_PendingInterstTableMemoryExact(unittest.TestCase):
         entry = self.pit.find_pit_entry(n1)
 
         self.assertEqual(entry.number_of_forwards, 3)
+
+    def test_ageing_retransmit_and_remove(self):
+        """Test retransmitting a pending Interest once per timeout and removing it after timeout and retransmits"""
+        pit = PendingInterestTableMemoryExact(pit_timeout=0.1, pit_retransmits=1)
+        n1 = Name("/test/data1")
+        pit.add_pit_entry(n1, 1, Interest(n1))
+        for retransmits in range(1, 3):
+            time.sleep(0.15)
+            updated, removed = pit.ageing()
+            self.assertEqual([e.name for e in updated], [n1])
+            self.assertEqual(removed, [])
+            self.assertEqual(pit.find_pit_entry(n1).retransmits, retransmits)
+            self.assertEqual(pit.ageing(), ([], []))
+        time.sleep(0.15)
+        updated, removed = pit.ageing()
+        self.assertEqual(updated, [])
+        self.assertEqual([e.name for e in removed], [n1])
+        self.assertIsNone(pit.find_pit_entry(n1))
+
+    def test_ageing_only_expired_entries(self):
+        """Test that ageing neither returns nor modifies the entries whose timeout did not pass"""
+        pit = PendingInterestTableMemoryExact(pit_timeout=10, pit_retransmits=3)
+        old, refreshed = Name("/test/old"), Name("/test/refreshed")
+        for name in (old, refreshed):
+            entry = PendingInterestTableEntry(name, 1, Interest(name))
+            entry.timestamp = time.time() - 20
+            pit.append(entry)
+        pit.update_timestamp(pit.find_pit_entry(refreshed))
+        names = [Name("/test/" + str(i)) for i in range(10000)]
+        for name in names:
+            pit.add_pit_entry(name, 2, Interest(name))
+        updated, removed = pit.ageing()
+        self.assertEqual([e.name for e in updated], [old])
+        self.assertEqual(removed, [])
+        self.assertEqual(0, pit.find_pit_entry(refreshed).retransmits)
+        self.assertTrue(all(pit.find_pit_entry(name).retransmits == 0 for name in names))
+        self.assertEqual(pit.ageing(), ([], []))
+
+    def test_session_entries_kept(self):
+        """Test that session entries are neither removed nor aged"""
+        pit = PendingInterestTableMemoryExact(pit_timeout=0.01, pit_retransmits=0)
+        name = Name("/session_connector/data")
+        pit.add_pit_entry(name, 1, Interest(name))
+        pit.remove_pit_entry(name, incoming_fid=2, content=Content(name, "abc"))
+        self.assertIsNone(pit.find_pit_entry(name))
+        session = pit.find_pit_entry(Name("/sid/abc"))
+        self.assertTrue(session.is_session)
+        self.assertEqual(session.faceids, [1, 2])
+        time.sleep(0.05)
+        self.assertEqual(pit.ageing(), ([], []))
+        pit.remove_pit_entry(Name("/sid/abc"))
+        self.assertEqual(pit.get_container_size(), 1)
+
+    def test_update_entry_in_place(self):
+        """Test updating forwards, nacked faces and used FIB entries of an entry"""
+        n1 = Name("/test/data")
+        self.pit.add_pit_entry(n1, 1, Interest(n1))
+        self.pit.increase_number_of_forwards(n1)
+        self.pit.increase_number_of_forwards(n1)
+        self.pit.decrease_number_of_forwards(n1)
+        self.pit.add_nacked_faceid(n1, 3)
+        entry = self.pit.find_pit_entry(n1)
+        self.assertEqual(entry.number_of_forwards, 1)
+        self.assertTrue(self.pit.test_faceid_was_nacked(n1, 3))
+        self.pit.remove_pit_entry_by_fid(1)
+        self.assertEqual(entry.faceids, [])
+        self.assertEqual(self.pit.get_container_size(), 1)
+
+    def test_many_entries(self):
+        """Test a PIT with 100000 pending Interests"""
+        pit = PendingInterestTableMemoryExact()
+        names = [Name("/test/" + str(i)) for i in range(100000)]
+        for i, name in enumerate(names):
+            pit.add_pit_entry(name, i % 10, None)
+        start = time.time()
+        for name in names[:10000]:
+            pit.update_timestamp(pit.find_pit_entry(name))
+            pit.add_pit_entry(name, 11, None)
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual(pit.get_container_size(), 100000)
+        self.assertEqual(pit.find_pit_entry(names[0]).faceids, [0, 11])
+
+    def test_remove_pit_entry_by_fid(self):
+        """Test removing a face that went down from the entries of the face only"""
+        pit = PendingInterestTableMemoryExact()
+        names = [Name("/test/" + str(i)) for i in range(100000)]
+        for i, name in enumerate(names):
+            pit.add_pit_entry(name, i % 1000, None)
+        pit.add_pit_entry(names[1], 0, None)
+        start = time.time()
+        for faceid in range(0, 1000, 10):
+            self.assertEqual(101 if faceid == 0 else 100, pit.remove_pit_entry_by_fid(faceid))
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual([], pit.find_pit_entry(names[0]).faceids)
+        self.assertEqual([1], pit.find_pit_entry(names[1]).faceids)
+        self.assertEqual([], pit.find_pit_entry(names[1]).local_app[1:])
+        self.assertEqual(0, pit.remove_pit_entry_by_fid(0))
+        pit.remove_pit_entry(names[2])
+        pit.add_pit_entry(Name("/other"), 2, None)
+        self.assertEqual(100, pit.remove_pit_entry_by_fid(2))
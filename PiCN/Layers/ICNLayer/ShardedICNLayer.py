@@ -0,0 +1,130 @@
+"""ICN Forwarding Layer partitioned over several worker processes"""
+
+import functools
+import multiprocessing
+import zlib
+from typing import List
+
+from PiCN.Layers.ICNLayer.BasicICNLayer import BasicICNLayer
+from PiCN.Packets import Name
+from PiCN.Processes import LayerProcess
+
+
+def name_shard(name: Name, num_shards: int) -> int:
+    """Index of the shard responsible for a name. Independent of the hash seed, so all processes agree on it.
+    :param name: name of a packet
+    :param num_shards: number of shards
+    :return: index of the shard
+    """
+    if name is None or num_shards == 1:
+        return 0
+    return zlib.crc32(name.components_to_string().encode()) % num_shards
+
+
+class ShardedICNLayer(LayerProcess):
+    """ICN Forwarding Plane running in several worker processes. Each worker is a BasicICNLayer owning the PIT and CS
+    entries of the names hashed to it and a replica of the FIB. The LayerStack connects the layers below and above
+    with ShardedQueues, which put each packet directly into the queue of its worker; all workers share the queues to
+    the layers below and above.
+    :param workers: the ICN layers of the shards, with their tables set
+    :param log_level: log level
+    """
+
+    def __init__(self, workers: List[BasicICNLayer], log_level=255):
+        super().__init__(logger_name="ShardedICNLayer", log_level=log_level)
+        self.workers = workers
+
+    @property
+    def num_shards(self) -> int:
+        """number of workers, used by the LayerStack to create ShardedQueues to the layer"""
+        return len(self.workers)
+
+    def shard_of(self, data) -> int:
+        """Index of the worker a queue item [face id, packet] is handled by"""
+        try:
+            return name_shard(data[1].name, len(self.workers))
+        except (AttributeError, IndexError, TypeError):
+            return 0
+
+    def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self.workers[self.shard_of(data)].data_from_lower(to_lower, to_higher, data)
+
+    def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        self.workers[self.shard_of(data)].data_from_higher(to_lower, to_higher, data)
+
+    def start_process(self):
+        """Start one process per worker, reading from its shard of the queues from lower and from higher"""
+        if self.driven_by_stack:
+            raise multiprocessing.ProcessError("A sharded ICN layer can not be driven by an in-process LayerStack")
+        for i, worker in enumerate(self.workers):
+            worker.queue_from_lower = self._shard(self.queue_from_lower, i)
+            worker.queue_from_higher = self._shard(self.queue_from_higher, i)
+            worker.queue_to_lower = self.queue_to_lower
+            worker.queue_to_higher = self.queue_to_higher
+            worker.batch_size = self.batch_size
+            worker.use_asyncio = self.use_asyncio
+            worker.start_process()
+
+    def stop_process(self):
+        for worker in self.workers:
+            worker.stop_process()
+
+    def _shard(self, queue, i: int):
+        shards = getattr(queue, "shards", None)
+        return shards[i] if shards is not None else queue
+
+
+class PartitionedTable(object):
+    """Access to a table (CS or PIT) partitioned over the workers of a ShardedICNLayer. A method call is passed to the
+    partition responsible for the name in its first argument (a Name, or an object with a name, e.g. a Content).
+    Calls without a name are passed to all partitions; lists returned are concatenated, numbers and dicts of numbers
+    summed up.
+    :param tables: the partitions, accessible from the calling process (e.g. TableClients)
+    """
+
+    def __init__(self, tables: list):
+        self._tables = tables
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return functools.partial(self._call, method)
+
+    def snapshot(self) -> list:
+        """Copies of all partitions, if the partitions are TableClients"""
+        return [table.snapshot() for table in self._tables]
+
+    def _call(self, method: str, *args, **kwargs):
+        key = args[0] if args else kwargs.get("name", kwargs.get("content"))
+        name = key if isinstance(key, Name) else getattr(key, "name", None)
+        if isinstance(name, Name):
+            return getattr(self._tables[name_shard(name, len(self._tables))], method)(*args, **kwargs)
+        results = [getattr(table, method)(*args, **kwargs) for table in self._tables]
+        if all(isinstance(r, list) for r in results):
+            return [entry for r in results for entry in r]
+        if all(type(r) is int for r in results):
+            return sum(results)
+        if all(isinstance(r, dict) for r in results):  # counters, e.g. CS statistics
+            return {k: sum(r[k] for r in results) for k in results[0]}
+        return results[0]
+
+
+class ReplicatedTable(object):
+    """Access to a table (FIB) replicated to the workers of a ShardedICNLayer. Lookups (find_*, get_*) are answered
+    by the first replica, all other calls are passed to every replica.
+    :param tables: the replicas, accessible from the calling process (e.g. TableClients)
+    """
+
+    def __init__(self, tables: list):
+        self._tables = tables
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        if method.startswith("find_") or method.startswith("get_"):
+            return getattr(self._tables[0], method)
+        return functools.partial(self._call, method)
+
+    def _call(self, method: str, *args, **kwargs):
+        results = [getattr(table, method)(*args, **kwargs) for table in self._tables]
+        return results[0]
@@ -0,0 +1,153 @@
+"""Read index of FIB prefixes and CS names in shared memory"""
+
+import os
+import pickle
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from PiCN.Packets import Name
+
+
+class SharedNameIndex(object):
+    """Read index of the FIB prefixes and CS names of a forwarder in shared memory. The ICN layer is the only writer
+    and publishes its tables into the index; other layer processes (e.g. NFN optimizers) query it without IPC.
+    The index is versioned like a seqlock: the writer makes the version odd while writing and even afterwards, a
+    reader retries until it read the same even version before and after copying the data. A reader decodes the
+    index only if the version changed since its last read.
+    :param size: size of the data region in bytes. If a publication does not fit, the index is marked incomplete and
+                 readers must fall back to the tables.
+    """
+
+    _header = struct.Struct("QQ")  # version, length of data
+    _incomplete = 2 ** 64 - 1
+
+    def __init__(self, size: int = 1 << 20):
+        self._size = size
+        self._shm = shared_memory.SharedMemory(create=True, size=self._header.size + size)
+        self._header.pack_into(self._shm.buf, 0, 0, self._incomplete)
+        self._creator = os.getpid()
+        self._init_local_state()
+
+    def _init_local_state(self):
+        self._version = -1
+        self._fib: Dict[Tuple[bytes, ...], List[int]] = {}
+        self._cs: FrozenSet[Tuple[bytes, ...]] = frozenset()
+        self._complete = False
+        self._last_data: bytes = None
+        self._last_publish = 0.0
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "size": self._size, "creator": self._creator}
+
+    def __setstate__(self, state):
+        self._size = state["size"]
+        self._creator = state["creator"]
+        self._shm = shared_memory.SharedMemory(name=state["name"])
+        self._init_local_state()
+
+    def close(self):
+        """Release the shared memory, it is removed if called by the process that created the index"""
+        self._shm.close()
+        if os.getpid() == self._creator:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # writer
+
+    def publish(self, fib_index: Dict[Tuple[bytes, ...], List[int]], cs_index: FrozenSet[Tuple[bytes, ...]]) -> bool:
+        """Publish a new version of the index. Must only be called by the owner of the tables.
+        :param fib_index: face ids of the FIB entries, by name components of the prefix
+        :param cs_index: name components of the content objects in the CS
+        :return: True if a new version was written, False if the index did not change
+        """
+        self._last_publish = time.monotonic()
+        data = pickle.dumps((fib_index, cs_index), protocol=pickle.HIGHEST_PROTOCOL)
+        if data == self._last_data:
+            return False
+        self._last_data = data
+        buf = self._shm.buf
+        version, length = self._header.unpack_from(buf, 0)
+        self._header.pack_into(buf, 0, version + 1, length)
+        if len(data) <= self._size:
+            buf[self._header.size:self._header.size + len(data)] = data
+            length = len(data)
+        else:
+            length = self._incomplete
+        self._header.pack_into(buf, 0, version + 2, length)
+        return True
+
+    def publish_tables(self, fib, cs) -> bool:
+        """Publish the current content of a FIB and a CS
+        :param fib: the forwarding information base
+        :param cs: the content store
+        :return: True if a new version was written
+        """
+        fib_index = {}
+        for entry in fib.get_container():
+            prefix = tuple(entry.name.components)
+            if prefix not in fib_index and len(entry.faceid) > 0:
+                fib_index[prefix] = list(entry.faceid)
+        cs_index = frozenset(tuple(entry.content.name.components) for entry in cs.get_container())
+        return self.publish(fib_index, cs_index)
+
+    def publish_due(self, interval: float) -> bool:
+        """True if the last publication is older than interval seconds"""
+        return time.monotonic() - self._last_publish >= interval
+
+    # reader
+
+    @property
+    def version(self) -> int:
+        """Version of the index as last read by this process"""
+        self._refresh()
+        return self._version
+
+    def complete(self) -> bool:
+        """True if the index was published and fits in the shared memory. Otherwise, readers must use the tables"""
+        self._refresh()
+        return self._complete
+
+    def has_content(self, name: Name) -> bool:
+        """True if the CS contains a content object with exactly this name"""
+        if name is None:
+            return False
+        self._refresh()
+        return tuple(name.components) in self._cs
+
+    def find_fib_faceids(self, name: Name) -> Optional[List[int]]:
+        """Longest prefix match on the FIB prefixes
+        :return: face ids of the longest matching prefix, None if no prefix matches
+        """
+        if name is None:
+            return None
+        self._refresh()
+        components = tuple(name.components)
+        for length in range(len(components), 0, -1):
+            faceids = self._fib.get(components[:length])
+            if faceids is not None:
+                return faceids
+        return None
+
+    def _refresh(self):
+        """Decode the index if a new version was published"""
+        buf = self._shm.buf
+        while True:
+            version, length = self._header.unpack_from(buf, 0)
+            if version == self._version:
+                return
+            if version % 2 == 1:
+                time.sleep(0)
+                continue
+            data = None if length == self._incomplete else bytes(buf[self._header.size:self._header.size + length])
+            if self._header.unpack_from(buf, 0)[0] == version:
+                break
+        if data is None:
+            self._fib, self._cs, self._complete = {}, frozenset(), False
+        else:
+            self._fib, self._cs = pickle.loads(data)
+            self._complete = True
+        self._version = version
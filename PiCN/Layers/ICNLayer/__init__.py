@@ -8,4 +8,7 @@
 """
 
 from .BaseICNDataStruct import BaseICNDataStruct
-from .BasicICNLayer import BasicICNLayer
\ No newline at end of file
+from .SharedNameIndex import SharedNameIndex
+from .DeadNonceList import DeadNonceList
+from .BasicICNLayer import BasicICNLayer
+from .ShardedICNLayer import ShardedICNLayer, PartitionedTable, ReplicatedTable, name_shard
\ No newline at end of file
@@ -5,8 +5,10 @@ import time
 import unittest
 
 from PiCN.Layers.ICNLayer import BasicICNLayer
+from PiCN.Layers.ICNLayer.CachingDecision import LeaveCopyDown
 from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.ForwardingStrategy import BestRouteStrategy
 from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryExact
 from PiCN.Packets import Name, Interest, Content, Nack, NackReason
 from PiCN.Processes import PiCNSyncDataStructFactory
@@ -264,6 +266,7 @@ class test_BasicICNLayer(unittest.TestCase):
     def test_ICNLayer_ageing_pit(self):
         """Test PIT ageing"""
 
+        self.icn_layer.pit.set_pit_timeout(0.2)
         self.icn_layer.start_process()
         from_face_id_1 = 1
         to_face_id = 2
@@ -275,7 +278,13 @@ class test_BasicICNLayer(unittest.TestCase):
         self.assertEqual(self.icn_layer.pit.get_container_size(), 1)
         self.assertEqual(self.icn_layer.pit.find_pit_entry(name).name, name)
 
+        # not expired yet
+        self.icn_layer.ageing()
+        time.sleep(0.1)
+        self.assertTrue(self.icn_layer.queue_to_lower.empty())
+
         #test retransmit 1
+        time.sleep(0.2)
         self.icn_layer.ageing()
         time.sleep(0.1)
         self.assertFalse(self.icn_layer.queue_to_lower.empty())
@@ -288,6 +297,7 @@ class test_BasicICNLayer(unittest.TestCase):
         self.assertEqual(rinterest, interest)
 
         # test retransmit 2
+        time.sleep(0.2)
         self.icn_layer.ageing()
         time.sleep(0.1)
         self.assertFalse(self.icn_layer.queue_to_lower.empty())
@@ -300,7 +310,7 @@ class test_BasicICNLayer(unittest.TestCase):
         self.assertEqual(rinterest, interest)
 
         #Wait for timeout
-        time.sleep(2)
+        time.sleep(0.2)
 
         # test retransmit 3 to get number of retransmit
         self.icn_layer.ageing()
@@ -316,6 +326,7 @@ class test_BasicICNLayer(unittest.TestCase):
 
 
         # test remove pit entry
+        time.sleep(0.2)
         self.icn_layer.ageing()
         #nack = self.icn_layer.queue_to_lower.get(timeout=8.0) # invalid, no PIT Timeout Nack anymore
         #self.assertEqual(nack, [1, Nack(rinterest.name, NackReason.PIT_TIMEOUT, rinterest)])
@@ -649,6 +660,7 @@ class test_BasicICNLayer(unittest.TestCase):
         i1 = Interest("/test/data")
         n1 = Nack(i1.name, NackReason.NO_CONTENT, i1)
 
+        self.icn_layer.pit.set_pit_timeout(0.2)
         self.icn_layer.start_process()
 
         self.icn_layer.fib.add_fib_entry(i1.name, [2,3])
@@ -664,6 +676,7 @@ class test_BasicICNLayer(unittest.TestCase):
         self.icn_layer.queue_from_lower.put([3, n1])
         self.assertTrue(self.icn_layer.queue_to_lower.empty())
 
+        time.sleep(0.3)
         self.icn_layer.ageing()
         d3 = self.icn_layer.queue_to_lower.get(timeout=2.0)
         self.assertEqual([2, i1], d3)
@@ -673,6 +686,140 @@ class test_BasicICNLayer(unittest.TestCase):
         d4 = self.icn_layer.queue_to_lower.get(timeout=2.0)
         self.assertEqual([1, n1], d4)
 
+    def test_best_route_and_nack_handling(self):
+        """Test if the best route strategy forwards to one next hop and tries the next one after a Nack"""
+
+        i1 = Interest("/test/data")
+        n1 = Nack(i1.name, NackReason.NO_CONTENT, i1)
+
+        self.icn_layer.strategy_choice.set_strategy(Name("/test"), BestRouteStrategy())
+        self.icn_layer.start_process()
+
+        self.icn_layer.fib.add_fib_entry(i1.name, [2,3])
+
+        self.icn_layer.queue_from_lower.put([1, i1])
+        d1 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([2, i1], d1)
+        time.sleep(0.1)
+        self.assertTrue(self.icn_layer.queue_to_lower.empty())
+
+        self.icn_layer.queue_from_lower.put([2, n1])
+        d2 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([3, i1], d2)
+
+        self.icn_layer.queue_from_lower.put([3, n1])
+        d3 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([1, n1], d3)
+
+    def test_duplicate_and_looping_interest(self):
+        """Test if a duplicated Interest is dropped and a looping Interest is answered with a DUPLICATE Nack"""
+
+        i1 = Interest("/test/data", nonce=b"\x01\x02\x03\x04")
+
+        self.icn_layer.start_process()
+
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [2])
+
+        self.icn_layer.queue_from_lower.put([1, i1])
+        d1 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([2, i1], d1)
+        self.assertEqual(b"\x01\x02\x03\x04", d1[1].nonce)
+
+        self.icn_layer.queue_from_lower.put([1, i1])
+        self.icn_layer.queue_from_lower.put([3, i1])
+        d2 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([3, Nack(i1.name, NackReason.DUPLICATE, i1)], d2)
+        self.assertTrue(self.icn_layer.queue_to_lower.empty())
+        self.assertEqual(self.icn_layer.dead_nonce_list.get_stats()["duplicates"], 1)
+        self.assertEqual(self.icn_layer.dead_nonce_list.get_stats()["loops"], 1)
+
+    def test_own_interest_looping(self):
+        """Test if an Interest from higher gets a nonce and is recognized when it loops back"""
+        self.icn_layer.queue_to_higher = multiprocessing.Queue()
+        self.icn_layer.queue_from_higher = multiprocessing.Queue()
+        self.icn_layer.start_process()
+
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [2])
+
+        self.icn_layer.queue_from_higher.put([0, Interest("/test/data")])
+        d1 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual(2, d1[0])
+        self.assertIsNotNone(d1[1].nonce)
+
+        self.icn_layer.queue_from_lower.put([3, d1[1]])
+        d2 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual(3, d2[0])
+        self.assertEqual(NackReason.DUPLICATE, d2[1].reason)
+
+    def test_own_interest_not_modified(self):
+        """Test if the nonce of an Interest from higher is set on a copy, so the same object sent again gets a new one"""
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [2])
+        interest = Interest("/test/data")
+        nonces = set()
+        for _ in range(2):
+            self.icn_layer.handle_interest_from_higher(0, interest, self.icn_layer.queue_to_lower,
+                                                       self.icn_layer.queue_to_higher)
+            d1 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+            self.assertEqual([2, interest], d1)
+            nonces.add(d1[1].nonce)
+            self.assertIsNone(interest.nonce)
+        self.assertEqual(2, len(nonces - {None}))
+
+    def test_retransmit_keeps_interest(self):
+        """Test if a retransmission is a copy of the pending Interest with a new nonce"""
+        self.icn_layer.pit.set_pit_timeout(0.1)
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [2])
+        interest = Interest("/test/data", wire_format=b"\x05\x00", nonce=b"\x01\x02\x03\x04")
+        interest.hops = 3
+        self.icn_layer.pit.add_pit_entry(interest.name, 1, interest, False)
+        time.sleep(0.2)
+        self.icn_layer.ageing_step()
+        d1 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([2, interest], d1)
+        self.assertNotIn(d1[1].nonce, (None, interest.nonce))
+        self.assertEqual(3, d1[1].hops)
+        self.assertIsNone(d1[1].wire_format)
+
+    def test_leave_copy_down(self):
+        """Test if content objects are tagged with their hop count and cached one hop below the serving node only"""
+        decision = LeaveCopyDown()
+        self.icn_layer.caching_decision = decision
+        self.icn_layer.start_process()
+
+        self.icn_layer.fib.add_fib_entry(Name("/test"), [2])
+
+        i1 = Interest("/test/d1")
+        self.icn_layer.queue_from_lower.put([1, i1])
+        d1 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([2, i1], d1)
+        self.assertEqual(1, d1[1].hops)
+        c1 = Content("/test/d1", "data1")  # from the producer, untagged
+        self.icn_layer.queue_from_lower.put([2, c1])
+        d2 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([1, c1], d2)
+        self.assertEqual(1, d2[1].hops)
+
+        i2 = Interest("/test/d2")
+        self.icn_layer.queue_from_lower.put([1, i2])
+        self.icn_layer.queue_to_lower.get(timeout=2.0)
+        c2 = Content("/test/d2", "data2")
+        c2.hops = 1  # served by a node two hops away
+        self.icn_layer.queue_from_lower.put([2, c2])
+        d3 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual(2, d3[1].hops)
+
+        time.sleep(0.1)
+        self.assertEqual(self.icn_layer.cs.find_content_object(c1.name).content, c1)
+        self.assertIsNone(self.icn_layer.cs.find_content_object(c2.name))
+
+        self.icn_layer.queue_from_lower.put([3, Interest("/test/d1")])
+        d4 = self.icn_layer.queue_to_lower.get(timeout=2.0)
+        self.assertEqual([3, c1], d4)
+        self.assertEqual(0, d4[1].hops)
+        time.sleep(0.1)
+        stats = decision.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["cached"], stats["not_cached"]), (1, 2, 1, 1))
+
     # def test_nack_after_pit_timeout(self): #test invalid because not sending nacks after pit timeout anymore
     #     i1 = Interest("/test/data")
     #     n1 = Nack(i1.name, NackReason.PIT_TIMEOUT, i1)
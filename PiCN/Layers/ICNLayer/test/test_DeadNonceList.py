@@ -0,0 +1,42 @@
+"""Tests for the dead nonce list"""
+
+import time
+import unittest
+
+from PiCN.Layers.ICNLayer import DeadNonceList
+from PiCN.Layers.ICNLayer.DeadNonceList import NEW, DUPLICATE, LOOP
+from PiCN.Packets import Name
+
+
+class test_DeadNonceList(unittest.TestCase):
+
+    def setUp(self):
+        self.dnl = DeadNonceList(max_entries=3, lifetime=0.1)
+        self.name = Name("/test/data")
+
+    def test_duplicate_and_loop(self):
+        """Test that a nonce seen on the same face is a duplicate and on another face a loop"""
+        self.assertEqual(self.dnl.check(self.name, b"1234", 1), NEW)
+        self.assertEqual(self.dnl.check(self.name, b"1234", 1), DUPLICATE)
+        self.assertEqual(self.dnl.check(self.name, b"1234", 2), LOOP)
+        self.assertEqual(self.dnl.check(self.name, b"5678", 2), NEW)
+        self.assertEqual(self.dnl.check(Name("/test/other"), b"1234", 2), NEW)
+        self.assertEqual(self.dnl.get_stats(), {"duplicates": 1, "loops": 1, "nonces": 3})
+
+    def test_own_interest_loops(self):
+        """Test that an Interest sent by the node itself is a loop when it comes back"""
+        nonce = self.dnl.new_nonce()
+        self.assertEqual(len(nonce), 4)
+        self.dnl.add(self.name, nonce)
+        self.assertEqual(self.dnl.check(self.name, nonce, 1), LOOP)
+
+    def test_bounded(self):
+        """Test that the oldest nonces are dropped when the list is full or they expire"""
+        for i in range(4):
+            self.dnl.check(self.name, bytes([i]), 1)
+        self.assertEqual(len(self.dnl), 3)
+        self.assertEqual(self.dnl.check(self.name, bytes([0]), 1), NEW)
+        time.sleep(0.15)
+        self.assertEqual(self.dnl.check(self.name, bytes([1]), 2), NEW)
+        self.dnl.ageing()
+        self.assertEqual(len(self.dnl), 1)
@@ -0,0 +1,71 @@
+"""Test the ShardedICNLayer"""
+
+import multiprocessing
+import unittest
+
+from PiCN.LayerStack import LayerStack
+from PiCN.Layers.ICNLayer import BasicICNLayer, ShardedICNLayer, PartitionedTable, ReplicatedTable, name_shard
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryExact
+from PiCN.Packets import Content, Interest, Name
+
+
+class test_ShardedICNLayer(unittest.TestCase):
+    """Test the ShardedICNLayer"""
+
+    def setUp(self):
+        self.workers = []
+        for _ in range(3):
+            worker = BasicICNLayer()
+            worker.cs = ContentStoreMemoryExact()
+            worker.fib = ForwardingInformationBaseMemoryPrefix()
+            worker.pit = PendingInterestTableMemoryExact()
+            self.workers.append(worker)
+        self.icnlayer = ShardedICNLayer(self.workers)
+        self.cs = PartitionedTable([w.cs for w in self.workers])
+        self.pit = PartitionedTable([w.pit for w in self.workers])
+        self.fib = ReplicatedTable([w.fib for w in self.workers])
+
+    def test_name_shard(self):
+        """Test that names are spread over the shards"""
+        shards = [name_shard(Name("/test/data/" + str(i)), 3) for i in range(30)]
+        self.assertEqual({0, 1, 2}, set(shards))
+        self.assertEqual(shards[0], name_shard(Name("/test/data/0"), 3))
+        self.assertEqual(0, name_shard(Name("/test/data/0"), 1))
+
+    def test_partitioned_table(self):
+        """Test that CS calls are passed to the partition of the name"""
+        for i in range(10):
+            self.cs.add_content_object(Content("/test/data/" + str(i), "data"), static=True)
+        self.assertEqual(10, self.cs.get_container_size())
+        self.assertEqual(10, len(self.cs.get_container()))
+        name = Name("/test/data/7")
+        self.assertEqual(name, self.cs.find_content_object(name).content.name)
+        self.assertIsNotNone(self.workers[name_shard(name, 3)].cs.find_content_object(name))
+        self.assertEqual(1, len([w for w in self.workers if w.cs.find_content_object(name) is not None]))
+
+    def test_replicated_table(self):
+        """Test that FIB changes are passed to all replicas"""
+        self.fib.add_fib_entry(Name("/test"), [2], True)
+        for worker in self.workers:
+            self.assertEqual([2], worker.fib.find_fib_entry(Name("/test/data")).faceid)
+        self.fib.remove_fib_entry(Name("/test"))
+        for worker in self.workers:
+            self.assertIsNone(worker.fib.find_fib_entry(Name("/test/data")))
+
+    def test_forward_interest(self):
+        """Test that workers started by a LayerStack handle the Interests of their names"""
+        self.fib.add_fib_entry(Name("/test"), [2], True)
+        lstack = LayerStack([self.icnlayer])
+        lstack.start_all()
+        try:
+            for i in range(6):
+                lstack.queue_from_lower.put([1, Interest("/test/data/" + str(i))])
+            forwarded = [lstack.queue_to_lower.get(timeout=5.0) for _ in range(6)]
+            self.assertEqual({"/test/data/" + str(i) for i in range(6)},
+                             {data[1].name.components_to_string() for data in forwarded})
+            self.assertEqual([2] * 6, [data[0] for data in forwarded])
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
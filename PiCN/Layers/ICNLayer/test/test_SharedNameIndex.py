@@ -0,0 +1,72 @@
+"""Tests for the SharedNameIndex"""
+
+import multiprocessing
+import unittest
+
+from PiCN.Layers.ICNLayer import SharedNameIndex
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Packets import Content, Name
+
+
+def read_index(name_index: SharedNameIndex, results: multiprocessing.Queue):
+    results.put((name_index.has_content(Name("/test/data")), name_index.find_fib_faceids(Name("/test/other"))))
+
+
+class test_SharedNameIndex(unittest.TestCase):
+    """Tests for the SharedNameIndex"""
+
+    def setUp(self):
+        self.index = SharedNameIndex(size=4096)
+        self.fib = ForwardingInformationBaseMemoryPrefix()
+        self.cs = ContentStoreMemoryExact()
+
+    def tearDown(self):
+        self.index.close()
+
+    def test_not_published(self):
+        """Test that an index that was never published is incomplete"""
+        self.assertFalse(self.index.complete())
+        self.assertFalse(self.index.has_content(Name("/test")))
+
+    def test_publish_and_read(self):
+        """Test publishing FIB and CS and reading them"""
+        self.fib.add_fib_entry(Name("/test"), [1])
+        self.fib.add_fib_entry(Name("/test/data"), [2])
+        self.cs.add_content_object(Content("/test/data/object", "data"))
+        self.assertTrue(self.index.publish_tables(self.fib, self.cs))
+        self.assertTrue(self.index.complete())
+        self.assertTrue(self.index.has_content(Name("/test/data/object")))
+        self.assertFalse(self.index.has_content(Name("/test/data")))
+        self.assertEqual([2], self.index.find_fib_faceids(Name("/test/data/object")))
+        self.assertEqual([1], self.index.find_fib_faceids(Name("/test/other")))
+        self.assertIsNone(self.index.find_fib_faceids(Name("/other")))
+
+    def test_versioning(self):
+        """Test that only changes create a new version"""
+        self.index.publish_tables(self.fib, self.cs)
+        version = self.index.version
+        self.assertFalse(self.index.publish_tables(self.fib, self.cs))
+        self.assertEqual(version, self.index.version)
+        self.cs.add_content_object(Content("/test/data", "data"))
+        self.assertTrue(self.index.publish_tables(self.fib, self.cs))
+        self.assertEqual(version + 2, self.index.version)
+        self.assertTrue(self.index.has_content(Name("/test/data")))
+
+    def test_overflow(self):
+        """Test that an index too large for the shared memory is marked incomplete"""
+        for i in range(200):
+            self.fib.add_fib_entry(Name("/prefix/" + str(i)), [i])
+        self.index.publish_tables(self.fib, self.cs)
+        self.assertFalse(self.index.complete())
+
+    def test_read_from_other_process(self):
+        """Test that another process reads the published index"""
+        self.fib.add_fib_entry(Name("/test"), [3])
+        self.cs.add_content_object(Content("/test/data", "data"))
+        self.index.publish_tables(self.fib, self.cs)
+        results = multiprocessing.Queue()
+        p = multiprocessing.Process(target=read_index, args=[self.index, results])
+        p.start()
+        self.assertEqual((True, [3]), results.get(timeout=5.0))
+        p.join()
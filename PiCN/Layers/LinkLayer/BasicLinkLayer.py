@@ -3,13 +3,31 @@ import multiprocessing
 import select
 import socket
 
-from typing import List
+from typing import List, Tuple
 
 from PiCN.Processes import LayerProcess
+from PiCN.Processes.WireBufferArena import WireBuffer, WireBufferArena
 
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
 from PiCN.Layers.LinkLayer.Interfaces import BaseInterface
 from PiCN.Layers.LinkLayer.FaceIDTable import BaseFaceIDTable
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase
+from PiCN.Layers.ICNLayer.PendingInterestTable import BasePendingInterestTable
+
+
+def remove_face(faceid: int, faceidtable: BaseFaceIDTable, pit: BasePendingInterestTable = None,
+                fib: BaseForwardingInformationBase = None) -> Tuple[int, int]:
+    """Remove a face that went down from the face table, and its records in PIT (downstream faces) and FIB (next hops)
+    :param faceid: face id of the face
+    :param faceidtable: face table of the node
+    :param pit: PIT of the node, None to keep the PIT
+    :param fib: FIB of the node, None to keep the FIB
+    :return: number of removed PIT records and number of removed FIB entries
+    """
+    faceidtable.remove(faceid)
+    removed_pit = pit.remove_pit_entry_by_fid(faceid) if pit is not None else 0
+    removed_fib = fib.remove_fib_entry_by_fid(faceid) if fib is not None else 0
+    return removed_pit, removed_fib
 
 
 class BasicLinkLayer(LayerProcess):
@@ -17,12 +35,20 @@ class BasicLinkLayer(LayerProcess):
     :param interfaces: preconfigured interfaces used by the link layer
     :param faceidtable: faceidtable, that maintains the mapping between IDs and Interfaces
     :param log_level: Loglevel used in the Linklayer
+    :param wire_arena: if set, large packets are received into this shared-memory arena and passed to the higher layer
+                       as WireBuffer descriptor instead of bytes
     """
 
-    def __init__(self, interfaces: List[BaseInterface], faceidtable: BaseFaceIDTable, log_level=255):
+    def __init__(self, interfaces: List[BaseInterface], faceidtable: BaseFaceIDTable, log_level=255,
+                 wire_arena: WireBufferArena=None):
         super().__init__(logger_name="LinkLayer", log_level=log_level)
         self.interfaces = interfaces
         self.faceidtable = faceidtable
+        self.wire_arena = wire_arena
+        # if set, the PIT and FIB records of a face are removed when the face is removed (see remove_face), e.g. when a
+        # packet is sent to a face which is no longer in the face table
+        self.pit: BasePendingInterestTable = None
+        self.fib: BaseForwardingInformationBase = None
 
     def data_from_lower(self, interface: BaseInterface, to_higher: multiprocessing.Queue, data):
         """In the Linklayer, it handles received data, to lower is the network interface
@@ -47,27 +73,61 @@ class BasicLinkLayer(LayerProcess):
 
         faceid = data[0]  # This can now be and int or 'broadcast'
         packet = data[1]
+        if isinstance(packet, WireBuffer):
+            if not packet.valid():  # the link layer is the only writer of the arena, the packet stays valid
+                self.logger.error("Packet overwritten in wire buffer arena before sending, dropping")
+                return
+            packet = packet.view()
         self.logger.info("Got data from Higher Layer with faceid: " + str(faceid))
 
-        to_send: List[AddressInfo] = []
-
         if faceid == 'broadcast':
             self.logger.debug(f"Broadcasting to all faces")
-            to_send = [self.faceidtable.get_address_info(face) for face in self.faceidtable.get_faceids()]
+            faceids = list(self.faceidtable.get_faceids())
         else:
             self.logger.debug(f"Sending to face {faceid}")
-            to_send = [self.faceidtable.get_address_info(faceid)]
-
-        for addr_info in to_send:
-            if not to_send:
-                self.logger.error("No addr_info found for faceid: " + str(faceid))
-                return
+            faceids = [faceid]
+
+        for face in faceids:
+            addr_info = self.faceidtable.get_address_info(face)
+            if addr_info is None or not 0 <= addr_info.interface_id < len(self.interfaces):
+                # the face was removed (e.g. evicted from a full face table) or its interface is gone, so its PIT and
+                # FIB records are stale
+                self.logger.error("No addr_info found for faceid: " + str(face) + ", removing the face")
+                self.remove_face(face)
+                continue
             try:
                 self.interfaces[addr_info.interface_id].send(packet, addr_info.address)
             except Exception as e:  # TODO: Catch better exception.
                 self.logger.error(f"Could not send packet to {str(addr_info.address)} Interface with ID {addr_info.interface_id} not available")
                 self.logger.error(e)
             self.logger.info(f"Send packet to: {str(addr_info.address)}")
+        if isinstance(data[1], WireBuffer):
+            packet.release()
+
+    def remove_face(self, faceid: int):
+        """Remove a face that went down, and the records of the face in PIT (downstream faces) and FIB (next hops)
+        :param faceid: face id of the face
+        """
+        removed_pit, removed_fib = remove_face(faceid, self.faceidtable, self.pit, self.fib)
+        self.logger.info("Removed face " + str(faceid) + ", PIT records: " + str(removed_pit) + ", FIB entries: " +
+                         str(removed_fib))
+
+    def receive(self, interface: BaseInterface):
+        """Receive data from an interface. With a wire arena, packets are received into the arena, large packets are
+        passed on as WireBuffer.
+        :param interface: Network interface to receive from
+        :return: Tuple of received data and addr from which the data where received
+        """
+        if self.wire_arena is None or not hasattr(interface, "receive_into"):
+            return interface.receive()
+        position, view = self.wire_arena.reserve(interface.buffersize)
+        try:
+            length, addr = interface.receive_into(view)
+            if length < self.wire_arena.min_size:
+                return bytes(view[:length]), addr
+        finally:
+            view.release()
+        return self.wire_arena.commit(position, length), addr
 
     def _run_poll(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                   to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -78,38 +138,61 @@ class BasicLinkLayer(LayerProcess):
             for fd in fds:
                 poller.register(fd, READ_ONLY)
             poller.register(from_higher._reader, READ_ONLY)
+            sources = {s if isinstance(s, int) else s.fileno(): handler for s, handler in self._sources.items()}
+            for fd in sources:
+                poller.register(fd, READ_ONLY)
             ready_fds = poller.poll()
             for fd in ready_fds:
                 if fd[0] == from_higher._reader.fileno():
-                    data = from_higher.get()
-                    self.data_from_higher(to_lower, to_higher, data)
+                    self._drain(from_higher, self._from_higher, to_lower, to_higher)
+                elif fd[0] in sources:
+                    sources[fd[0]]()
                 else:
                     interfaces = list(filter(lambda x: x.file_descriptor.fileno() == fd[0], self.interfaces))
                     try:
                         interface = interfaces[0]
                     except:
                         return
-                    data = interface.receive()
+                    data = self.receive(interface)
                     self.data_from_lower(interface, to_higher, data)
+            self._flush(to_lower, to_higher)
 
     def _run_select(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                     to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
         while True:
             fds = list(map(lambda x: x.file_descriptor, self.interfaces))
             fds.append(from_higher._reader)
+            fds.extend(self._sources.keys())
             ready_fds, _, _ = select.select(fds, [], [])
             for fd in ready_fds:
                 if fd == from_higher._reader:
-                    data = from_higher.get()
-                    self.data_from_higher(to_lower, to_higher, data)
+                    self._drain(from_higher, self._from_higher, to_lower, to_higher)
+                elif fd in self._sources:
+                    self._sources[fd]()
                 else:
                     interfaces = list(filter(lambda x: x.file_descriptor == fd, self.interfaces))
                     try:
                         interface = interfaces[0]
                     except:
                         return
-                    data = interface.receive()
+                    data = self.receive(interface)
                     self.data_from_lower(interface, to_higher, data)
+            self._flush(to_lower, to_higher)
+
+    def in_process_sources(self) -> list:
+        sources = [i.file_descriptor for i in self.interfaces]
+        if self.queue_from_higher is not None and hasattr(self.queue_from_higher, '_reader'):
+            sources.append(self.queue_from_higher._reader)
+        sources.extend(self._sources.keys())
+        return sources
+
+    def handle_in_process_source(self, source):
+        for interface in self.interfaces:
+            if interface.file_descriptor is source:
+                self.data_from_lower(interface, self.queue_to_higher, self.receive(interface))
+                self._flush(self.queue_to_lower, self.queue_to_higher)
+                return
+        super().handle_in_process_source(source)
 
     def _run_sleep(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                    to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -25,6 +25,18 @@ class UDP4Interface(BaseInterface):
         data, addr = self.sock.recvfrom(self._buffersize)
         return data, addr
 
+    def receive_into(self, buffer):
+        """Receive a packet into a writable buffer of at least buffersize bytes, without copying it
+        :return: Tuple of the length of the received data and addr from which the data where received
+        """
+        length, addr = self.sock.recvfrom_into(buffer, self._buffersize)
+        return length, addr
+
+    @property
+    def buffersize(self) -> int:
+        """maximum size of a received packet"""
+        return self._buffersize
+
     @property
     def file_descriptor(self):
         return self.sock
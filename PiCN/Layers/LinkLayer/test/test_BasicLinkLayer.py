@@ -7,6 +7,9 @@ import unittest
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo
 from PiCN.Layers.LinkLayer import BasicLinkLayer
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryExact
+from PiCN.Packets import Name
 from PiCN.Processes import PiCNSyncDataStructFactory
 
 
@@ -198,4 +201,28 @@ class test_BasicLinkLayer(unittest.TestCase):
             self.assertEqual(data1_3[1].decode(), str1)
             self.assertEqual(data2_1[1].decode(), str2)
             self.assertEqual(data3_1[1].decode(), str3)
-            self.assertEqual(data3_2[1].decode(), str3)
\ No newline at end of file
+            self.assertEqual(data3_2[1].decode(), str3)
+
+    def test_remove_face(self):
+        """Test that removing a face removes its records in PIT and FIB"""
+        self.linklayer1.pit = PendingInterestTableMemoryExact()
+        self.linklayer1.fib = ForwardingInformationBaseMemoryPrefix()
+        fid = self.faceidtable1.get_or_create_faceid(AddressInfo(("127.0.0.1", self.test_port), 0))
+        self.linklayer1.pit.add_pit_entry(Name("/test/data"), [fid, fid + 1])
+        self.linklayer1.fib.add_fib_entry(Name("/test"), [fid])
+        self.linklayer1.remove_face(fid)
+        self.assertIsNone(self.faceidtable1.get_address_info(fid))
+        self.assertEqual([fid + 1], self.linklayer1.pit.find_pit_entry(Name("/test/data")).faceids)
+        self.assertIsNone(self.linklayer1.fib.find_fib_entry(Name("/test/data")))
+
+    def test_send_to_removed_face(self):
+        """Test that sending to a face which is no longer in the face table removes its records in PIT and FIB"""
+        self.linklayer1.pit = PendingInterestTableMemoryExact()
+        self.linklayer1.fib = ForwardingInformationBaseMemoryPrefix()
+        fid = self.faceidtable1.get_or_create_faceid(AddressInfo(("127.0.0.1", self.test_port), 0))
+        self.faceidtable1.remove(fid)
+        self.linklayer1.pit.add_pit_entry(Name("/test/data"), [fid, fid + 1])
+        self.linklayer1.fib.add_fib_entry(Name("/test"), [fid])
+        self.linklayer1.data_from_higher(None, None, [fid, b"data"])
+        self.assertEqual([fid + 1], self.linklayer1.pit.find_pit_entry(Name("/test/data")).faceids)
+        self.assertIsNone(self.linklayer1.fib.find_fib_entry(Name("/test/data")))
@@ -16,6 +16,7 @@ from PiCN.Layers.NFNLayer.R2C import BaseR2CHandler
 from PiCN.Layers.ICNLayer.PendingInterestTable import BasePendingInterestTable
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase
+from PiCN.Layers.ICNLayer.SharedNameIndex import SharedNameIndex
 from PiCN.Layers.LinkLayer.FaceIDTable import BaseFaceIDTable
 
 class BasicNFNLayer(LayerProcess):
@@ -34,8 +35,31 @@ class BasicNFNLayer(LayerProcess):
         self.executors = executors
         self.r2cclient = r2c_client
         self.parser: DefaultNFNParser = parser
+        self._name_index: SharedNameIndex = None
         self.optimizer: BaseNFNOptimizer = ToDataFirstOptimizer(self.cs, self.fib, self.pit, self.faceidtable)
 
+    @property
+    def optimizer(self) -> BaseNFNOptimizer:
+        """Optimizer deciding where to compute"""
+        return self._optimizer
+
+    @optimizer.setter
+    def optimizer(self, optimizer: BaseNFNOptimizer):
+        self._optimizer = optimizer
+        if optimizer is not None and self._name_index is not None:
+            optimizer.name_index = self._name_index
+
+    @property
+    def name_index(self) -> SharedNameIndex:
+        """Shared name index of the ICN layer, passed to the optimizer"""
+        return self._name_index
+
+    @name_index.setter
+    def name_index(self, name_index: SharedNameIndex):
+        self._name_index = name_index
+        if self._optimizer is not None:
+            self._optimizer.name_index = name_index
+
     def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         """handle incomming data from the lower layer """
         packet_id = data[0]
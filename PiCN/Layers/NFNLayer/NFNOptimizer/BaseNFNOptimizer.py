@@ -8,6 +8,7 @@ from PiCN.Layers.NFNLayer.Parser import *
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase
 from PiCN.Layers.ICNLayer.PendingInterestTable import BasePendingInterestTable
 from PiCN.Layers.ICNLayer.ContentStore import BaseContentStore
+from PiCN.Layers.ICNLayer.SharedNameIndex import SharedNameIndex
 from PiCN.Layers.LinkLayer.FaceIDTable import BaseFaceIDTable
 from PiCN.Packets import Interest
 
@@ -20,6 +21,7 @@ class BaseNFNOptimizer(object):
         self.fib = fib
         self.pit = pit
         self.faceidtable = faceidtable
+        self.name_index: SharedNameIndex = None  # if set and complete, used instead of CS and FIB lookups
 
     @abc.abstractmethod
     def required_data(self, prepended_prefix: Name, ast: AST) -> List[Name]:
@@ -54,6 +56,18 @@ class BaseNFNOptimizer(object):
         :return List of computation strings, including a marker which name should be prepended. List ordered by priority
         """
 
+    def _in_cs(self, name: Name) -> bool:
+        """check if the CS contains content with the name, using the shared name index if available"""
+        if self.name_index is not None and self.name_index.complete():
+            return self.name_index.has_content(name)
+        return self.cs.find_content_object(name) is not None
+
+    def _in_fib(self, name: Name) -> bool:
+        """check if the FIB has a matching prefix for the name, using the shared name index if available"""
+        if self.name_index is not None and self.name_index.complete():
+            return self.name_index.find_fib_faceids(name) is not None
+        return self.fib.find_fib_entry(name, []) is not None
+
     def _set_prepended_name(self, ast: AST, name: Name, root: AST) -> str:
         if isinstance(ast, AST_FuncCall) or isinstance(ast, AST_Name):
             if name == Name(ast._element):
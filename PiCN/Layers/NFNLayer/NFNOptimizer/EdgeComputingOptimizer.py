@@ -25,10 +25,9 @@ class EdgeComputingOptimizer(BaseNFNOptimizer):
         if not isinstance(ast, AST_FuncCall): #only start if computation function local
             return False
         function_name = Name(ast._element)
-        if not self.cs.find_content_object(function_name):
+        if not self._in_cs(function_name):
             return False #do not start computation
 
-        pit = self.pit.get_container()
         pit_entry = self.pit.find_pit_entry(interest.name)
         if not pit_entry:
             return True
@@ -46,7 +45,7 @@ class EdgeComputingOptimizer(BaseNFNOptimizer):
             if self.fib.find_fib_entry(interest.name, pit_entry.fib_entries_already_used, pit_entry.face_id) is None:
                 return False
         else:
-            if self.fib.find_fib_entry(interest.name) is None:
+            if not self._in_fib(interest.name):
                 return False
         return True
 
@@ -55,12 +54,12 @@ class EdgeComputingOptimizer(BaseNFNOptimizer):
         functions = self._get_functions_from_ast(ast)
         names_in_fib = []
         for n in names:
-            if self.fib.find_fib_entry(Name(n), []):
+            if self._in_fib(Name(n)):
                 names_in_fib.append(Name(n))
 
         functions_in_fib = []
         for f in functions:
-            if self.fib.find_fib_entry(Name(f), []):
+            if self._in_fib(Name(f)):
                 functions_in_fib.append(Name(f))
 
         rewrites = []
@@ -20,7 +20,7 @@ class MapReduceOptimizer(BaseNFNOptimizer):
         return []
 
     def compute_local(self, prepended_prefix: Name, ast: AST, interest: Interest) -> bool:
-        if self.cs.find_content_object(prepended_prefix):
+        if self._in_cs(prepended_prefix):
             return True
         if self.check_ast_params_against_fib_for_multiple_pathes(ast):
             return True
@@ -28,12 +28,12 @@ class MapReduceOptimizer(BaseNFNOptimizer):
         functions = self._get_functions_from_ast(ast)
         names_in_fib = []
         for n in names:
-            if self.fib.find_fib_entry(Name(n), []):
+            if self._in_fib(Name(n)):
                 names_in_fib.append(Name(n))
 
         functions_in_fib = []
         for f in functions:
-            if self.fib.find_fib_entry(Name(f), []):
+            if self._in_fib(Name(f)):
                 names_in_fib.append(Name(f))
 
         if len(names_in_fib) > 0 or len(functions_in_fib) > 0:
@@ -45,7 +45,7 @@ class MapReduceOptimizer(BaseNFNOptimizer):
             names = self._get_functions_from_ast(ast)
             if names != []:
                 prepended_prefix = names[0]
-        if self.cs.find_content_object(prepended_prefix):
+        if self._in_cs(prepended_prefix):
             return False
         if self.check_ast_params_against_fib_for_multiple_pathes(ast):
             return False
@@ -53,12 +53,12 @@ class MapReduceOptimizer(BaseNFNOptimizer):
         functions = self._get_functions_from_ast(ast)
         names_in_fib = []
         for n in names:
-            if self.fib.find_fib_entry(Name(n), []):
+            if self._in_fib(Name(n)):
                 names_in_fib.append(Name(n))
 
         functions_in_fib = []
         for f in functions:
-            if self.fib.find_fib_entry(Name(f), []):
+            if self._in_fib(Name(f)):
                 names_in_fib.append(Name(f))
 
         if len(names_in_fib) == 0 and len(functions_in_fib) == 0:
@@ -70,12 +70,12 @@ class MapReduceOptimizer(BaseNFNOptimizer):
         functions = self._get_functions_from_ast(ast)
         names_in_fib = []
         for n in names:
-            if self.fib.find_fib_entry(Name(n), []):
+            if self._in_fib(Name(n)):
                 names_in_fib.append(Name(n))
 
         functions_in_fib = []
         for f in functions:
-            if self.fib.find_fib_entry(Name(f), []):
+            if self._in_fib(Name(f)):
                 functions_in_fib.append(Name(f))
 
         rewrites = []
@@ -20,18 +20,18 @@ class ToDataFirstOptimizer(BaseNFNOptimizer):
         return []
 
     def compute_local(self, prepended_prefix: Name, ast: AST, interest: Interest) -> bool:
-        if self.cs.find_content_object(prepended_prefix):
+        if self._in_cs(prepended_prefix):
             return True
         names = self._get_names_from_ast(ast)
         functions = self._get_functions_from_ast(ast)
         names_in_fib = []
         for n in names:
-            if self.fib.find_fib_entry(Name(n), []):
+            if self._in_fib(Name(n)):
                 names_in_fib.append(Name(n))
 
         functions_in_fib = []
         for f in functions:
-            if self.fib.find_fib_entry(Name(f), []):
+            if self._in_fib(Name(f)):
                 names_in_fib.append(Name(f))
 
         if len(names_in_fib) > 0 or len(functions_in_fib) > 0:
@@ -43,18 +43,18 @@ class ToDataFirstOptimizer(BaseNFNOptimizer):
             names = self._get_functions_from_ast(ast)
             if names != []:
                 prepended_prefix = names[0]
-        if self.cs.find_content_object(prepended_prefix):
+        if self._in_cs(prepended_prefix):
             return False
         names = self._get_names_from_ast(ast)
         functions = self._get_functions_from_ast(ast)
         names_in_fib = []
         for n in names:
-            if self.fib.find_fib_entry(Name(n), []):
+            if self._in_fib(Name(n)):
                 names_in_fib.append(Name(n))
 
         functions_in_fib = []
         for f in functions:
-            if self.fib.find_fib_entry(Name(f), []):
+            if self._in_fib(Name(f)):
                 names_in_fib.append(Name(f))
 
         if len(names_in_fib) == 0 and len(functions_in_fib) == 0:
@@ -66,12 +66,12 @@ class ToDataFirstOptimizer(BaseNFNOptimizer):
         functions = self._get_functions_from_ast(ast)
         names_in_fib = []
         for n in names:
-            if self.fib.find_fib_entry(Name(n), []):
+            if self._in_fib(Name(n)):
                 names_in_fib.append(Name(n))
 
         functions_in_fib = []
         for f in functions:
-            if self.fib.find_fib_entry(Name(f), []):
+            if self._in_fib(Name(f)):
                 functions_in_fib.append(Name(f))
 
         rewrites = []
@@ -125,8 +125,7 @@ class test_ToDataFirstOptimizer(unittest.TestCase):
         """Test, if ToDataFirstOptimizer works correctly with a single function call with parameter, to function,
         fwd since prepended data are not local"""
         cmp_name = Name("/func/f1")
-        cmp_name._components.append("_(/test/data)")
-        cmp_name._components.append("NFN")
+        cmp_name += ["_(/test/data)", "NFN"]
         workflow = "/func/f1(/test/data)"
         fib = self.optimizer.fib
         fib.add_fib_entry(Name("/func"), [1], False)
@@ -7,6 +7,7 @@ from PiCN.Packets import Name, Content, Interest
 from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
 from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryExact
+from PiCN.Layers.ICNLayer import SharedNameIndex
 
 from PiCN.Layers.NFNLayer.NFNComputationTable import NFNComputationList
 from PiCN.Layers.NFNLayer.R2C import TimeoutR2CHandler
@@ -125,8 +126,7 @@ class test_ToDataFirstOptimizer(unittest.TestCase):
         """Test, if ToDataFirstOptimizer works correctly with a single function call with parameter, to function,
         fwd since prepended data are not local"""
         cmp_name = Name("/func/f1")
-        cmp_name._components.append("_(/test/data)")
-        cmp_name._components.append("NFN")
+        cmp_name += ["_(/test/data)", "NFN"]
         workflow = "/func/f1(/test/data)"
         fib = self.optimizer.fib
         fib.add_fib_entry(Name("/func"), [1], False)
@@ -220,3 +220,23 @@ class test_ToDataFirstOptimizer(unittest.TestCase):
 
 
 
+
+    def test_simple_call_no_params_fib_name_index(self):
+        """Test, if ToDataFirstOptimizer decides on the shared name index instead of the FIB"""
+        cmp_name = Name("/func/f1")
+        cmp_name += "_()"
+        cmp_name += "NFN"
+        workflow = "/func/f1()"
+        fib = ForwardingInformationBaseMemoryPrefix()
+        fib.add_fib_entry(Name("/func"), [1], False)
+        name_index = SharedNameIndex(size=4096)
+        try:
+            name_index.publish_tables(fib, ContentStoreMemoryExact())
+            self.optimizer.name_index = name_index
+            ast = self.parser.parse(workflow)
+            self.assertTrue(self.optimizer.compute_fwd(cmp_name, ast, Interest(cmp_name)))
+            self.assertFalse(self.optimizer.compute_local(cmp_name, ast, Interest(cmp_name)))
+            self.assertEqual(self.optimizer.rewrite(cmp_name, ast), ['%/func/f1%()', 'local'])
+            self.assertIsNone(self.optimizer.fib.find_fib_entry(Name("/func/f1")))
+        finally:
+            name_index.close()
@@ -29,20 +29,17 @@ class TimeoutR2CHandler(BaseR2CHandler):
     def R2C_create_message(self, name: Name):
         if type(name) is str:
             name = self.parser.nfn_str_to_network_name(name)
-        new_name = Name(name.components[:])
-        new_name.components.remove(b"NFN")
-        new_name.components.append(b"R2C")
-        new_name.components.append(b"KEEPALIVE")
-        new_name.components.append(b"NFN")
-        return new_name
+        components = list(name.components)
+        components.remove(b"NFN")
+        return Name(components + [b"R2C", b"KEEPALIVE", b"NFN"])
 
     def R2C_get_original_message(self, name: Name):
         if type(name) is str:
             name = self.parser.nfn_str_to_network_name(name)
-        new_name = Name(name.components[:])
-        new_name.components.remove(b"R2C")
-        new_name.components.remove(b"KEEPALIVE")
-        return new_name
+        components = list(name.components)
+        components.remove(b"R2C")
+        components.remove(b"KEEPALIVE")
+        return Name(components)
 
     def R2C_identify_Name(self, name: Name):
         if type(name) is str:
@@ -3,6 +3,7 @@
 import multiprocessing
 from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
 from PiCN.Processes import LayerProcess
+from PiCN.Processes.WireBufferArena import WireBuffer, WireBufferOverwritten
 
 
 class BasicPacketEncodingLayer(LayerProcess):
@@ -44,10 +45,20 @@ class BasicPacketEncodingLayer(LayerProcess):
 
     def encode(self, data):
         self.logger.info("Encode packet")
+        wire_buffer = getattr(data, "wire_buffer", None)
+        # received packet, pass the descriptor of its wire format to the link layer unless the encoder adds a hop tag
+        if wire_buffer is not None and wire_buffer.valid() and getattr(data, "hops", None) is None:
+            return wire_buffer
         return self._encoder.encode(data)
 
     def decode(self, data):
         self.logger.info("Decode packet")
+        if isinstance(data, WireBuffer):
+            try:
+                return self._encoder.decode_wire_buffer(data)
+            except WireBufferOverwritten:
+                self.logger.warning("Packet overwritten in wire buffer arena before decoding")
+                return None
         return self._encoder.decode(data)
 
     def check_data(self, data):
@@ -23,6 +23,10 @@ class BasicEncoder(object):
     def decode(self, wire_data) -> Packet:
         """decode a packet to Packet data structure"""
 
+    def decode_wire_buffer(self, wire_buffer) -> Packet:
+        """decode a packet held in a WireBufferArena to Packet data structure, by default from a copy of the packet"""
+        return self.decode(wire_buffer.tobytes())
+
     def __getstate__(self):
         d = dict(self.__dict__)
         if 'logger' in d:
@@ -2,6 +2,7 @@
 
 from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
 from PiCN.Packets import Packet, Content, Interest, Nack, NackReason, Name, UnknownPacket
+from PiCN.Processes.WireBufferArena import WireBufferOverwritten
 
 from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_encoder import TlvEncoder
 from PiCNExternal.pyndn.encoding.tlv.tlv.tlv_decoder import TlvDecoder
@@ -25,8 +26,13 @@ class NdnTlvEncoder(BasicEncoder):
 
        - Additional in-network computation related NACK Reasons
 
+       - Hop tags of interests and content objects in a NDNLPv2 HopCountTag header (only if the packet is tagged)
+
     """
 
+    _hop_count_tag = 84
+    """Type of the NDNLPv2 HopCountTag header field"""
+
     __nack_reason_values = {
         NackReason.NOT_SET: 0,                   # extension NDNLPv2 compatible
         NackReason.CONGESTION: 50,                  # NDNLPv2 compatible
@@ -71,15 +77,17 @@ class NdnTlvEncoder(BasicEncoder):
         if isinstance(packet, Interest):
             self.logger.info("Encode interest")
             if isinstance(packet.wire_format, bytes):
-                return packet.wire_format
+                wire_format = packet.wire_format
             else:
-                return self.encode_interest(packet.name)
+                wire_format = self.encode_interest(packet.name, packet.nonce)
+            return self.encode_hop_count_tag(wire_format, packet.hops)
         if isinstance(packet, Content):
             self.logger.info("Encode content object")
             if isinstance(packet.wire_format, bytes):
-                return packet.wire_format
+                wire_format = packet.wire_format
             else:
-                return self.encode_data(packet.name, packet.get_bytes())
+                wire_format = self.encode_data(packet.name, packet.get_bytes())
+            return self.encode_hop_count_tag(wire_format, packet.hops)
         if isinstance(packet, Nack):
             self.logger.info("Encode NACK")
             if isinstance(packet.wire_format, bytes):
@@ -108,11 +116,22 @@ class NdnTlvEncoder(BasicEncoder):
         if(self.is_interest(wire_data)):
             self.logger.info("Decode interest")
             try:
-                name = self.decode_interest(wire_data)
-                return Interest(name, wire_data)
+                (name, nonce) = self.decode_interest_nonce(wire_data)
+                return Interest(name, wire_data, nonce=nonce)
             except:
                 self.logger.info("Decoding failed (malformed packet)")
                 return UnknownPacket(wire_format=wire_data)
+        if(self.is_hop_count_tagged(wire_data)):
+            self.logger.info("Decode tagged packet")
+            try:
+                (hops, fragment) = self.decode_hop_count_tag(wire_data)
+            except:
+                self.logger.info("Decoding failed (malformed packet)")
+                return UnknownPacket(wire_format=wire_data)
+            packet = self.decode(fragment)
+            if isinstance(packet, (Interest, Content)):
+                packet.hops = hops
+            return packet
         if(self.is_nack(wire_data)):
             self.logger.info("Decode NACK")
             try:
@@ -125,6 +144,29 @@ class NdnTlvEncoder(BasicEncoder):
             self.logger.info("Decode failed (unknown packet type)")
             return UnknownPacket(wire_format=wire_data)
 
+    def decode_wire_buffer(self, wire_buffer) -> Packet:
+        """
+        NDN TLV wire format packet held in a WireBufferArena to python object. A content object references payload
+        and wire format in the arena instead of copying them, other packets are decoded from a copy.
+        :param wire_buffer: WireBuffer holding the packet in NDN TLV representation
+        :return: Packet in PiCN's internal representation
+        """
+        wire_data = wire_buffer.view()
+        try:
+            if not self.is_content(wire_data):
+                return self.decode(wire_buffer.tobytes())
+            self.logger.info("Decode content object")
+            try:
+                (name, payload_start, payload_end) = self.decode_data_range(wire_data)
+            except:
+                self.logger.info("Decoding failed (malformed packet)")
+                return UnknownPacket(wire_format=wire_buffer.tobytes())
+        finally:
+            wire_data.release()
+        if not wire_buffer.valid():
+            raise WireBufferOverwritten(repr(wire_buffer))
+        return Content.from_wire_buffer(name, wire_buffer, payload_start, payload_end)
+
 
     ### Helpers ###
 
@@ -146,17 +188,19 @@ class NdnTlvEncoder(BasicEncoder):
         encoder.writeTypeAndLength(Tlv.Name, len(encoder))
         return encoder.getOutput() #.tobytes()
 
-    def encode_interest(self, name: Name) -> bytearray:
+    def encode_interest(self, name: Name, nonce: bytes = None) -> bytearray:
         """
         Assembly an interest packet
         :param name: Name
+        :param nonce: Nonce of the interest, a random nonce if None
         :return: Interest-TLV
         """
         encoder = TlvEncoder()
         # Add nonce
-        nonce = bytearray(4)
-        for i in range(4):
-            nonce[i] = SystemRandom().randint(0, 0xff)
+        if nonce is None:
+            nonce = bytearray(4)
+            for i in range(4):
+                nonce[i] = SystemRandom().randint(0, 0xff)
         encoder.writeBlobTlv(Tlv.Nonce, nonce)
         # TODO: add implicitDigest flag here ?
         # Add name
@@ -203,7 +247,7 @@ class NdnTlvEncoder(BasicEncoder):
         encoder = TlvEncoder()
         # write fragment (interest packet)
         if interest.wire_format is None:
-            interest._wire_format = self.encode(interest)
+            interest._wire_format = self.encode_interest(interest.name, interest.nonce)
         encoder.writeBuffer(interest.wire_format)
         encoder.writeTypeAndLength(Tlv.LpPacket_Fragment, len(encoder))
         fragment_len = len(encoder)
@@ -218,6 +262,22 @@ class NdnTlvEncoder(BasicEncoder):
         encoder.writeTypeAndLength(Tlv.LpPacket_LpPacket, len(encoder))
         return encoder.getOutput().tobytes()
 
+    def encode_hop_count_tag(self, fragment: bytes, hops: int) -> bytes:
+        """
+        Assembly a link packet carrying the hop tag of an interest or content object
+        :param fragment: Interest-TLV or Data-TLV
+        :param hops: hop tag, None if the packet is not tagged
+        :return: LpPacket-TLV with HopCountTag and the fragment, the fragment itself if hops is None
+        """
+        if hops is None:
+            return fragment
+        encoder = TlvEncoder()
+        encoder.writeBuffer(fragment)
+        encoder.writeTypeAndLength(Tlv.LpPacket_Fragment, len(fragment))
+        encoder.writeNonNegativeIntegerTlv(self._hop_count_tag, hops)
+        encoder.writeTypeAndLength(Tlv.LpPacket_LpPacket, len(encoder))
+        return encoder.getOutput().tobytes()
+
     def encode_nack_reason(self, reason: NackReason) -> bytearray:
         """
         Encode a NackReason
@@ -278,6 +338,25 @@ class NdnTlvEncoder(BasicEncoder):
         decoder.readNestedTlvsStart(Tlv.Interest)
         return self.decode_name(decoder)
 
+    def decode_interest_nonce(self, input: bytearray) -> (Name, bytes):
+        """
+        Decode an interest packet including its nonce
+        :param input: Interest packet in NDN-TLV wire format
+        :return: Name and nonce (None if the interest has no nonce)
+        """
+        decoder = TlvDecoder(input)
+        endOffset = decoder.readNestedTlvsStart(Tlv.Interest)
+        name = self.decode_name(decoder)
+        nonce = None
+        # skip the fields between name and nonce (e.g. selectors)
+        while decoder.getOffset() < endOffset:
+            if decoder.peekType(Tlv.Nonce, endOffset):
+                nonce = decoder.readBlobTlv(Tlv.Nonce).tobytes()
+                break
+            decoder.readVarNumber()
+            decoder.seek(decoder.getOffset() + decoder.readVarNumber())
+        return (name, nonce)
+
     def decode_data(self, input: bytearray) -> ([bytearray], bytearray):
         """
         Decodes a data packet
@@ -291,6 +370,32 @@ class NdnTlvEncoder(BasicEncoder):
         payload = decoder.readBlobTlv(Tlv.Content).tobytes()
         return (name, payload)
 
+    def decode_data_range(self, input: bytearray) -> (Name, int, int):
+        """
+        Decodes a data packet without copying the payload
+        :param input: Data packet in NDN-TLV wire format
+        :return: Name, start and end of the payload in input
+        """
+        decoder = TlvDecoder(input)
+        decoder.readNestedTlvsStart(Tlv.Data)
+        name = self.decode_name(decoder)
+        self.decode_meta_info(decoder)
+        length = decoder.readTypeAndLength(Tlv.Content)
+        payload_start = decoder.getOffset()
+        return (name, payload_start, payload_start + length)
+
+    def decode_hop_count_tag(self, input: bytearray) -> (int, bytes):
+        """
+        Decode a link packet carrying a hop tag
+        :param input: LpPacket-TLV in NDN-TLV wire format
+        :return: hop tag and fragment (Interest-TLV or Data-TLV)
+        """
+        decoder = TlvDecoder(input)
+        endOffset = decoder.readNestedTlvsStart(Tlv.LpPacket_LpPacket)
+        hops = decoder.readOptionalNonNegativeIntegerTlv(self._hop_count_tag, endOffset)
+        fragment = decoder.readBlobTlv(Tlv.LpPacket_Fragment).tobytes()
+        return (hops, fragment)
+
     def decode_nack(self, input: bytearray) -> (Name, NackReason):
         """
         Decode NACK packet
@@ -334,6 +439,17 @@ class NdnTlvEncoder(BasicEncoder):
         except:
             return False
 
+    def is_hop_count_tagged(self, input: bytearray) -> bool:
+        """
+        Checks if link packet carrying a hop tag
+        :param input:  Packet in NDN-TLV wire format
+        :return: True if link packet which is not a NACK
+        """
+        try:
+            return input[0] == Tlv.LpPacket_LpPacket and not self.is_nack(input)
+        except:
+            return False
+
     def is_nack(selfself, input: bytearray) -> bool:
         """
         Checks if NACK packet
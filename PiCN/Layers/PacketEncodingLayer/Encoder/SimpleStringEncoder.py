@@ -4,7 +4,8 @@ from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
 from PiCN.Packets import Packet, Content, Interest, Name, Nack, NackReason, UnknownPacket
 
 class SimpleStringEncoder(BasicEncoder):
-    """An extreme simple Packet Encoder for the BasicPacketEncodingLayer"""
+    """An extreme simple Packet Encoder for the BasicPacketEncodingLayer. The hop tag of interests and content objects
+    is carried in the third field, which is empty if the packet is not tagged"""
     def __init__(self, log_level=255):
         super().__init__(logger_name="SimpleEnc", log_level=log_level)
 
@@ -13,12 +14,12 @@ class SimpleStringEncoder(BasicEncoder):
         name = self.escape_name(packet.name)
         if(isinstance(packet, Interest)):
             self.logger.info("Encode interest")
-            res = "I:" + name.to_string() + ":"
+            res = "I:" + name.to_string() + ":" + self.encode_hops(packet.hops)
         elif(isinstance(packet, Content)):
             self.logger.info("Encode content object")
             content = packet.content
             content = content.replace(":", "%58")
-            res = "C:" + name.to_string() + ":" + ":" + content
+            res = "C:" + name.to_string() + ":" + self.encode_hops(packet.hops) + ":" + content
         elif(isinstance(packet, Nack)):
             self.logger.info("Encode NACK")
             res = "N:" + name.to_string() + ":" + ":" + packet.reason.value
@@ -33,12 +34,16 @@ class SimpleStringEncoder(BasicEncoder):
         if data[0] == "I":
             self.logger.info("Decode interest")
             name = data.split(":")[1]
-            return Interest(self.unescape_name(Name(name)))
+            interest = Interest(self.unescape_name(Name(name)))
+            interest.hops = self.decode_hops(data.split(":")[2])
+            return interest
         elif data[0] == "C":
             self.logger.info("Decode content object")
             name = data.split(":")[1]
             content = data.split(":")[3].replace("%58", ":")
-            return Content(self.unescape_name(Name(name)), content)
+            content = Content(self.unescape_name(Name(name)), content)
+            content.hops = self.decode_hops(data.split(":")[2])
+            return content
         elif data[0] == "N":
             self.logger.info("Decode NACK")
             name = data.split(":")[1]
@@ -49,6 +54,14 @@ class SimpleStringEncoder(BasicEncoder):
             return UnknownPacket(wire_format=wire_data)
 
 
+    def encode_hops(self, hops: int) -> str:
+        """encode a hop tag, empty if the packet is not tagged"""
+        return str(hops) if hops is not None else ""
+
+    def decode_hops(self, field: str) -> int:
+        """decode a hop tag, None if the field is empty"""
+        return int(field) if field else None
+
     def escape_name(self, name: Name):
         """escape a name"""
         n2 = Name()
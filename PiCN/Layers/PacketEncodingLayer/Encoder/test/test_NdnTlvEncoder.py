@@ -4,6 +4,7 @@ import unittest
 
 from PiCN.Layers.PacketEncodingLayer.Encoder import NdnTlvEncoder
 from PiCN.Packets import Content, Interest, Nack, NackReason, Name
+from PiCN.Processes import WireBufferArena
 
 class test_NdnTlvEncoder(unittest.TestCase):
     """Test the NdnTlvEncoder"""
@@ -51,4 +52,50 @@ class test_NdnTlvEncoder(unittest.TestCase):
         self.assertFalse(self.encoder.is_content(enc_n1))
         self.assertTrue(self.encoder.is_nack(enc_n1))
         dec_n1 = self.encoder.decode(enc_n1)
-        self.assertEqual(dec_n1, n1)
\ No newline at end of file
+        self.assertEqual(dec_n1, n1)
+
+    def test_Content_decode_wire_buffer(self):
+        """Test decoding a content object in a wire buffer arena without copying the payload"""
+        arena = WireBufferArena(size=1 << 16)
+        try:
+            wire_format = self.encoder.encode(Content("/test/data", "x" * 4096))
+            content = self.encoder.decode_wire_buffer(arena.write(wire_format))
+            self.assertEqual(Name("/test/data"), content.name)
+            self.assertIsNotNone(content.wire_buffer)
+            self.assertEqual("x" * 4096, content.content)
+            self.assertEqual(wire_format, content.wire_format)
+            self.assertIsNone(content.wire_buffer)
+            interest = self.encoder.decode_wire_buffer(arena.write(self.encoder.encode(Interest("/test/data"))))
+            self.assertEqual(Name("/test/data"), interest.name)
+        finally:
+            arena.close()
+
+    def test_Interest_nonce(self):
+        """Test that the nonce of an interest is decoded and kept when it is encoded again"""
+        i1 = Interest("/test/data", nonce=b"\x01\x02\x03\x04")
+        dec_i1 = self.encoder.decode(self.encoder.encode(i1))
+        self.assertEqual(b"\x01\x02\x03\x04", dec_i1.nonce)
+        reencoded = self.encoder.decode(self.encoder.encode(Interest(dec_i1.name, nonce=dec_i1.nonce)))
+        self.assertEqual(b"\x01\x02\x03\x04", reencoded.nonce)
+        i2 = self.encoder.decode(self.encoder.encode(Interest("/test/data")))
+        self.assertEqual(4, len(i2.nonce))
+
+    def test_hop_tags(self):
+        """Test that hop tags of interests and content objects are carried in a link packet"""
+        i1 = Interest("/test/data", nonce=b"\x01\x02\x03\x04")
+        i1.hops = 2
+        dec_i1 = self.encoder.decode(self.encoder.encode(i1))
+        self.assertEqual(i1, dec_i1)
+        self.assertEqual(2, dec_i1.hops)
+        self.assertEqual(b"\x01\x02\x03\x04", dec_i1.nonce)
+        c1 = Content("/test/data", "HelloWorld")
+        untagged = self.encoder.encode(c1)
+        self.assertTrue(self.encoder.is_content(untagged))
+        self.assertIsNone(self.encoder.decode(untagged).hops)
+        c1.hops = 300
+        dec_c1 = self.encoder.decode(self.encoder.encode(c1))
+        self.assertEqual(c1, dec_c1)
+        self.assertEqual(300, dec_c1.hops)
+        self.assertEqual(untagged, dec_c1.wire_format)
+        n1 = Nack(i1.name, NackReason.DUPLICATE, i1)
+        self.assertEqual(n1, self.encoder.decode(self.encoder.encode(n1)))
@@ -74,4 +74,16 @@ class test_SimpleStringEncoder(unittest.TestCase):
         n = Nack("/data/test", NackReason.NO_CONTENT, interest=interest)
         en = self.encoder1.encode(n)
         dn = self.encoder1.decode(en)
-        self.assertTrue(n == dn)
\ No newline at end of file
+        self.assertTrue(n == dn)
+    def test_Encoder_encode_decode_hop_tags(self):
+        """Test the hop tags of interests and content objects"""
+        i = Interest("/data/test")
+        self.assertEqual(b"I:/data/test:", self.encoder1.encode(i))
+        i.hops = 2
+        self.assertEqual(2, self.encoder1.decode(self.encoder1.encode(i)).hops)
+        c = Content("/data/test", "Hello:World")
+        self.assertIsNone(self.encoder1.decode(self.encoder1.encode(c)).hops)
+        c.hops = 0
+        dc = self.encoder1.decode(self.encoder1.encode(c))
+        self.assertEqual(0, dc.hops)
+        self.assertEqual("Hello:World", dc.content)
@@ -2,7 +2,9 @@
 
 import abc
 from multiprocessing import Manager
+from typing import Iterable
 
+from PiCN.Layers.ICNLayer.ContentStore.CountingBloomFilter import CountingBloomFilter
 from PiCN.Packets import Content, Name
 
 
@@ -11,6 +13,7 @@ class BaseRepository(object):
 
     def __init__(self, prefix: Name, manager: Manager):
         self._prefix: manager.Value = manager.Value(Name, prefix)
+        self._filter: CountingBloomFilter = None
 
     @abc.abstractmethod
     def is_content_available(self, icnname: Name) -> bool:
@@ -27,6 +30,36 @@ class BaseRepository(object):
     def get_prefix(self) -> Name:
         return self._prefix.value
 
+    def set_membership_filter(self, membership_filter: CountingBloomFilter):
+        """Set a filter holding the names of all content objects, so lookups of names which are not in the repo are
+        answered without searching the repo. The names of the current content objects are added to the filter. If the
+        repo is used by several processes, the filter must be created with shared=True before they are started.
+        :param membership_filter: an empty filter, None to remove the filter
+        """
+        self._filter = membership_filter
+        if membership_filter is not None:
+            for key in self._keys():
+                membership_filter.add(key)
+
+    def get_stats(self) -> dict:
+        """Statistics of the filter, empty if no filter is set"""
+        if self._filter is None:
+            return {}
+        return {"filter_" + key: value for key, value in self._filter.get_stats().items()}
+
+    def _keys(self) -> Iterable[str]:
+        """Keys of all content objects in the filter"""
+        return []
+
+    def _filter_excludes(self, key: str) -> bool:
+        """true if the filter shows that the repo has no content object with the key"""
+        return self._filter is not None and not self._filter.might_contain(key)
+
+    def _filter_missed(self):
+        """count a lookup which the filter let pass but which found no content object"""
+        if self._filter is not None:
+            self._filter.report_false_positive()
+
     def get_data_size(self, icnname: Name):
         """Returns the size, of a data object
         :returns Size of data object if available
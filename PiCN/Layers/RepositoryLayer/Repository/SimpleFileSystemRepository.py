@@ -1,54 +1,73 @@
-"""A Simple File System Repository"""
-
-
-import os.path
-from multiprocessing import Manager
-
-from PiCN.Layers.RepositoryLayer.Repository import BaseRepository
-from PiCN.Packets import Content, Name
-from PiCN.Logger import Logger
-
-
-class SimpleFileSystemRepository(BaseRepository):
-    """A Simple File System Repository"""
-
-    def __init__(self, foldername: str, prefix: Name, manager: Manager, logger: Logger=None):
-        super().__init__(prefix, manager)
-        self._foldername: str = foldername
-        self._safepath = os.path.abspath(self._foldername)  # FIXME: What is safepath in this assignment? self._safepath = safepath = os.path.abspath(self._foldername)
-        self.logger = logger
-
-    def is_content_available(self, icnname: Name) -> bool:
-        if not icnname.components_to_string().startswith(self._prefix.value.components_to_string()):
-            return False
-        filename = icnname.string_components[-1]
-        filename_abs = self._foldername + "/" + filename
-        filepath = os.path.abspath(filename_abs)
-        if os.path.commonprefix([filepath, self._safepath]) != self._safepath:  # prevent directory traversal
-            return False
-        if os.path.isfile(filename_abs):
-            return True
-        return False
-
-    def get_content(self, icnname: Name) -> Content:
-        if not icnname.components_to_string().startswith(self._prefix.value.components_to_string()):
-            return None
-        try:
-            filename = icnname.string_components[-1]
-            filename_abs = self._foldername + "/" + filename
-            filepath = os.path.abspath(filename_abs)
-            if os.path.commonprefix([filepath, self._safepath]) != self._safepath: #prevent directory traversal
-                return None
-            with open(filename_abs, 'r') as content_file:
-                content = content_file.read()
-            return Content(icnname, content)
-        except:
-            return None
-
-    def set_content(self, icnname: Name, chunk: bytes):
-        try:
-            os.stat( self._foldername)
-        except:
-            os.mkdir( self._foldername)
-        with open( self._foldername + icnname.to_string(), 'w+') as f:
-            f.write(chunk)
+"""A Simple File System Repository"""
+
+
+import os.path
+from multiprocessing import Manager
+from typing import Iterable
+
+from PiCN.Layers.ICNLayer.ContentStore.CountingBloomFilter import CountingBloomFilter
+from PiCN.Layers.RepositoryLayer.Repository import BaseRepository
+from PiCN.Packets import Content, Name
+from PiCN.Logger import Logger
+
+
+class SimpleFileSystemRepository(BaseRepository):
+    """A Simple File System Repository. If a membership filter is set, files which are copied into the folder afterwards
+    by other means than set_content are not found."""
+
+    def __init__(self, foldername: str, prefix: Name, manager: Manager, logger: Logger=None,
+                 membership_filter: CountingBloomFilter=None):
+        super().__init__(prefix, manager)
+        self._foldername: str = foldername
+        self._safepath = os.path.abspath(self._foldername)  # FIXME: What is safepath in this assignment? self._safepath = safepath = os.path.abspath(self._foldername)
+        self.logger = logger
+        if membership_filter is not None:
+            self.set_membership_filter(membership_filter)
+
+    def is_content_available(self, icnname: Name) -> bool:
+        if not icnname.components_to_string().startswith(self._prefix.value.components_to_string()):
+            return False
+        filename = icnname.string_components[-1]
+        if self._filter_excludes(filename):
+            return False
+        filename_abs = self._foldername + "/" + filename
+        filepath = os.path.abspath(filename_abs)
+        if os.path.commonprefix([filepath, self._safepath]) != self._safepath:  # prevent directory traversal
+            return False
+        if os.path.isfile(filename_abs):
+            return True
+        self._filter_missed()
+        return False
+
+    def get_content(self, icnname: Name) -> Content:
+        if not icnname.components_to_string().startswith(self._prefix.value.components_to_string()):
+            return None
+        try:
+            filename = icnname.string_components[-1]
+            if self._filter_excludes(filename):
+                return None
+            filename_abs = self._foldername + "/" + filename
+            filepath = os.path.abspath(filename_abs)
+            if os.path.commonprefix([filepath, self._safepath]) != self._safepath: #prevent directory traversal
+                return None
+            with open(filename_abs, 'r') as content_file:
+                content = content_file.read()
+            return Content(icnname, content)
+        except:
+            return None
+
+    def set_content(self, icnname: Name, chunk: bytes):
+        try:
+            os.stat( self._foldername)
+        except:
+            os.mkdir( self._foldername)
+        path = self._foldername + icnname.to_string()
+        if self._filter is not None and not os.path.isfile(path):
+            self._filter.add(os.path.basename(path))
+        with open(path, 'w+') as f:
+            f.write(chunk)
+
+    def _keys(self) -> Iterable[str]:
+        if not os.path.isdir(self._foldername):
+            return []
+        return [f for f in os.listdir(self._foldername) if os.path.isfile(os.path.join(self._foldername, f))]
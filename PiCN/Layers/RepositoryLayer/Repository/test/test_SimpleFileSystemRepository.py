@@ -5,6 +5,7 @@ import shutil
 import unittest
 import multiprocessing
 
+from PiCN.Layers.ICNLayer.ContentStore import CountingBloomFilter
 from PiCN.Layers.RepositoryLayer.Repository import SimpleFileSystemRepository
 from PiCN.Packets import Content, Name
 
@@ -96,6 +97,12 @@ class test_SimpleFileSystemRepository(unittest.TestCase):
         size = len(c1.content)
         self.assertEqual(size, self.repository.get_data_size(Name("/test/data/f1")))
 
-
-
-
+    def test_membership_filter(self):
+        """Test that the files in the folder and stored files are added to a membership filter"""
+        self.repository.set_membership_filter(CountingBloomFilter(capacity=100))
+        self.assertEqual(2, self.repository.get_stats()["filter_keys"])
+        self.assertTrue(self.repository.is_content_available(Name("/test/data/f1")))
+        self.assertFalse(self.repository.is_content_available(Name("/test/data/f3")))
+        self.repository.set_content(Name("/f4"), "data4")
+        self.assertTrue(self.repository.is_content_available(Name("/test/data/f4")))
+        self.assertEqual(3, self.repository.get_stats()["filter_keys"])
@@ -3,6 +3,7 @@
 import unittest
 import multiprocessing
 
+from PiCN.Layers.ICNLayer.ContentStore import CountingBloomFilter
 from PiCN.Layers.RepositoryLayer.Repository import SimpleMemoryRepository
 from PiCN.Packets import Content, Name
 
@@ -64,4 +65,19 @@ class test_SimpleMemoryRepository(unittest.TestCase):
         """test the functionality of the get size function"""
         c1 = self.repository.get_content(Name("/test/data/f1"))
         size = len(c1.content)
-        self.assertEqual(size, self.repository.get_data_size(Name("/test/data/f1")))
\ No newline at end of file
+        self.assertEqual(size, self.repository.get_data_size(Name("/test/data/f1")))
+
+    def test_membership_filter(self):
+        """Test answering lookups of missing names with a membership filter"""
+        self.repository.set_membership_filter(CountingBloomFilter(capacity=100, shared=True))
+        self.repository.add_content(Name('/test/data/f4'), 'data4')
+        self.assertTrue(self.repository.is_content_available(Name("/test/data/f1")))
+        self.assertTrue(self.repository.is_content_available(Name("/test/data/f4")))
+        self.assertEqual(Content("/test/data/f4", "data4"), self.repository.get_content(Name("/test/data/f4")))
+        self.repository.remove_content(Name('/test/data/f4'))
+        self.assertFalse(self.repository.is_content_available(Name("/test/data/f4")))
+        self.assertIsNone(self.repository.get_content(Name("/test/data/f5")))
+        stats = self.repository.get_stats()
+        self.assertEqual(5, stats["filter_queries"])
+        self.assertEqual(3, stats["filter_keys"])
+        self.assertEqual(2, stats["filter_negatives"] + stats["filter_false_positives"])
@@ -2,11 +2,10 @@
 from typing import List, Tuple
 
 import multiprocessing
-import threading
 from datetime import datetime, timedelta
 
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, TimerThread, Timer
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import BaseForwardingInformationBase, ForwardingInformationBaseEntry
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import BaseRoutingInformationBase
 from PiCN.Layers.LinkLayer import BasicLinkLayer
@@ -25,7 +24,7 @@ class BasicRoutingLayer(LayerProcess):
         self._rib_maxage: timedelta = timedelta(seconds=3600)
         self._peers: List[Tuple[str, int]] = peers if peers is not None else []
         self._ageing_interval: float = 5.0
-        self._ageing_timer: threading.Timer = None
+        self._ageing_timer: Timer = None
 
     def start_process(self):
         super().start_process()
@@ -34,7 +33,7 @@ class BasicRoutingLayer(LayerProcess):
     def stop_process(self):
         super().stop_process()
         if self._ageing_timer is not None:
-            self._ageing_timer.cancel()
+            TimerThread.shared().cancel(self._ageing_timer)
             self._ageing_timer = None
 
     def data_from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
@@ -72,15 +71,22 @@ class BasicRoutingLayer(LayerProcess):
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         self.queue_to_lower.put(data)
 
+    def periodic_tasks(self):
+        return [(self._ageing_interval, self._ageing_step)]
+
     def _ageing(self):
+        if self.use_asyncio or self.periodic_in_loop:
+            return
+        self._ageing_step()
+        self._ageing_timer = TimerThread.shared().schedule(self._ageing_interval, self._ageing)
+
+    def _ageing_step(self):
         if self.rib is not None:
             self.rib.ageing()
             self.fib.clear()
             for entry in self.rib.build_fib():
                 self.fib.add_fib_entry(entry.name, [entry.faceid], static=entry.static)
         self._send_routing_interest()
-        self._ageing_timer = threading.Timer(self._ageing_interval, self._ageing)
-        self._ageing_timer.start()
 
     def _send_routing_interest(self):
         solicitation: Interest = Interest(self._prefix)
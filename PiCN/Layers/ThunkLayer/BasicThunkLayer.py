@@ -174,14 +174,11 @@ class BasicThunkLayer(LayerProcess):
 
     def removeThunkMarker(self, name: Name) -> Name:
         """Remove the Thunk Marker from a Name"""
-        ret = Name(name.components[:])
         if len(name.components) > 1 and name.components[-1] == b'THUNK':
-            del ret.components[-1]
-            return ret
+            return Name(name.components[:-1])
         if len(name.components) < 2 or name.components[-2] != b"THUNK":
             return name
-        del ret.components[-2]
-        return ret
+        return Name(name.components[:-2] + name.components[-1:])
 
     def addThunkMarker(self, name: Name) -> Name:
         """Add a thunk marker to a Name"""
@@ -193,9 +190,7 @@ class BasicThunkLayer(LayerProcess):
             return ret
         if len(name.components) < 2 or name.components[-2] == b"THUNK":
             return name
-        ret.components.append(ret.components[-1])
-        ret.components[-2] = b"THUNK"
-        return ret
+        return Name(name.components[:-1] + (b"THUNK", name.components[-1]))
 
     def generatePossibleThunkNames(self, ast: AST, res: List = None) -> List:
         """Generate names that can be used for the planning"""
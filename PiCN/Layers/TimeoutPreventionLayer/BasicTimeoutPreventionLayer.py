@@ -2,11 +2,11 @@
 Moreover, it contains handler for incomming R2C messages"""
 
 import multiprocessing
-import time, threading
+import time
 
 from typing import Dict
 
-from PiCN.Processes import LayerProcess
+from PiCN.Processes import LayerProcess, TimerThread
 from PiCN.Packets import Interest, Content, Nack, NackReason, Name
 from PiCN.Layers.NFNLayer.NFNComputationTable import BaseNFNComputationTable
 from PiCN.Layers.ICNLayer.PendingInterestTable import BasePendingInterestTable
@@ -149,64 +149,67 @@ class BasicTimeoutPreventionLayer(LayerProcess):
             self.message_dict.create_entry(name=keepalive_name, packet_id=packet_id)
         to_lower.put(data)
 
+    def periodic_tasks(self):
+        return [(self.ageing_interval, self.ageing_step)]
+
     def ageing(self):
+        """Send keep alive messages periodically, reschedules itself on the timer thread of the process. Does nothing
+        if the layer executes the ageing as periodic task itself (asyncio runtime or periodic_in_loop)"""
+        if self.use_asyncio or self.periodic_in_loop:
+            return
         if self.queue_to_lower._closed or self.queue_to_higher._closed:
             return
-        timestamp = time.time()
         try:
-            removes = []
-            container = self.message_dict.get_container()
-            for name in container:
-                entry = self.message_dict.get_entry(name)
-                if len(name.components) > 2 and name.string_components[-2] == "KEEPALIVE":
-
-                    if entry.timestamp + self.timeout_interval < timestamp:
-                        self.logger.info("Remove Keep Alvie Job because of timeout. Timestamp is: " + str(entry.timestamp) + " Now is: " + str(timestamp))
-                        removes.append(name)
-                        if name in self.running_computations:
-                            self.running_computations.remove(name)
-                        original_name = self.remove_keep_alive_from_name(name)
-                        removes.append(original_name)
-                        if original_name in self.running_computations:
-                            self.running_computations.remove(original_name)
-                        nack = Nack(name=original_name, reason=NackReason.COMP_NOT_RUNNING, interest=Interest(name))
-                        self.queue_to_higher.put([entry.packetid, nack])
-                    else:
-                        self.queue_to_lower.put([entry.packetid, Interest(name=name)])
-                else:
-                    if name.components[-1] != b'NFN' and entry.timestamp + self.timeout_interval < time.time():
-                        removes.append(name)
-                        nack = Nack(name=name, reason=NackReason.COMP_PARAM_UNAVAILABLE, interest=Interest(name))
-                        self.queue_to_higher.put([entry.packetid, nack])
-                    else:
-                        self.queue_to_lower.put([entry.packetid, Interest(name=name)])
-            for n in removes:
-                self.message_dict.remove_entry(n)
-                if self.pit is not None:
-                    self.pit.remove_pit_entry(n)
+            self.ageing_step()
         except Exception as e:
             self.logger.warning("Exception during ageing: " + str(e))
             return
-        t = threading.Timer(self.ageing_interval, self.ageing)
-        t.setDaemon(True)
-        t.start()
+        TimerThread.shared().schedule(self.ageing_interval, self.ageing)
+
+    def ageing_step(self):
+        """Send keep alive messages and remove timed out entries once"""
+        timestamp = time.time()
+        removes = []
+        container = self.message_dict.get_container()
+        for name in container:
+            entry = self.message_dict.get_entry(name)
+            if len(name.components) > 2 and name.string_components[-2] == "KEEPALIVE":
+
+                if entry.timestamp + self.timeout_interval < timestamp:
+                    self.logger.info("Remove Keep Alvie Job because of timeout. Timestamp is: " + str(entry.timestamp) + " Now is: " + str(timestamp))
+                    removes.append(name)
+                    if name in self.running_computations:
+                        self.running_computations.remove(name)
+                    original_name = self.remove_keep_alive_from_name(name)
+                    removes.append(original_name)
+                    if original_name in self.running_computations:
+                        self.running_computations.remove(original_name)
+                    nack = Nack(name=original_name, reason=NackReason.COMP_NOT_RUNNING, interest=Interest(name))
+                    self.queue_to_higher.put([entry.packetid, nack])
+                else:
+                    self.queue_to_lower.put([entry.packetid, Interest(name=name)])
+            else:
+                if name.components[-1] != b'NFN' and entry.timestamp + self.timeout_interval < time.time():
+                    removes.append(name)
+                    nack = Nack(name=name, reason=NackReason.COMP_PARAM_UNAVAILABLE, interest=Interest(name))
+                    self.queue_to_higher.put([entry.packetid, nack])
+                else:
+                    self.queue_to_lower.put([entry.packetid, Interest(name=name)])
+        for n in removes:
+            self.message_dict.remove_entry(n)
+            if self.pit is not None:
+                self.pit.remove_pit_entry(n)
 
     def add_keep_alive_from_name(self, name):
         if name.components[-1] != b"NFN":
             return name
-        new_name = Name()
-        for n in name.string_components:
-            new_name += n
-        new_name.components.remove(b"NFN")
-        new_name += "KEEPALIVE"
-        new_name += "NFN"
-        return new_name
+        components = list(name.components)
+        components.remove(b"NFN")
+        return Name(components) + ["KEEPALIVE", "NFN"]
 
     def remove_keep_alive_from_name(self, name):
         if name.components[-1] != b"NFN":
             return name
-        new_name = Name()
-        for n in name.string_components:
-            new_name += n
-        new_name.components.remove(b"KEEPALIVE")
-        return new_name
+        components = list(name.components)
+        components.remove(b"KEEPALIVE")
+        return Name(components)
@@ -15,6 +15,8 @@ from PiCN.Packets import Content, Name
 from PiCN.Processes import LayerProcess
 from PiCN.Processes import PiCNProcess
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo, BaseInterface, UDP4Interface
+from PiCN.Layers.LinkLayer.FaceIDTable import BaseFaceIDTable
+from PiCN.Layers.LinkLayer.BasicLinkLayer import remove_face
 
 
 class Mgmt(PiCNProcess):
@@ -22,12 +24,15 @@ class Mgmt(PiCNProcess):
 
     def __init__(self, cs: BaseContentStore, fib: BaseForwardingInformationBase, pit: BasePendingInterestTable,
                  linklayer: LayerProcess, port: int, shutdown=None,
-                 repo_prfx: str = None, repo_path: str = None, log_level=255):
+                 repo_prfx: str = None, repo_path: str = None, log_level=255, faceidtable: BaseFaceIDTable = None,
+                 lstack=None):
         super().__init__("MgmtSys", log_level)
         self.cs = cs
         self.fib = fib
         self.pit = pit
         self._linklayer = linklayer
+        self._faceidtable = faceidtable  # overrides the faceidtable of the linklayer, e.g. a TableClient
+        self._lstack = lstack  # LayerStack of the node, for the queue counters
 
         self._repo_prfx = repo_prfx
         self._repo_path = repo_path
@@ -44,6 +49,13 @@ class Mgmt(PiCNProcess):
         else:
             self.logger.critical("Shutdown not available on NT platform")
 
+    @property
+    def faceidtable(self) -> BaseFaceIDTable:
+        """faceidtable used to create new faces"""
+        if self._faceidtable is not None:
+            return self._faceidtable
+        return self._linklayer.faceidtable
+
     def mgmt(self, mgmt_sock):
         """parse mgmt message"""
         replysock, addr = mgmt_sock.accept()
@@ -78,6 +90,8 @@ class Mgmt(PiCNProcess):
                     self.icnl_mgmt(command, params, replysock)
                 elif(layer == "repolayer"):
                     self.repol_mgmt(command, params, replysock)
+                elif(layer == "layerstack"):
+                    self.lstack_mgmt(command, params, replysock)
             elif len(mgmt_request) == 2:
                 if mgmt_request[1] == "shutdown":
                     self.logger.info("Shutdown")
@@ -100,12 +114,21 @@ class Mgmt(PiCNProcess):
                 replysock.send(f"Interface Number {if_num} does not exit on node".encode())
                 return
             if port != 'None':
-                fid = self._linklayer.faceidtable.get_or_create_faceid(AddressInfo((ip, port), if_num))
+                fid = self.faceidtable.get_or_create_faceid(AddressInfo((ip, port), if_num))
             else:
-                fid = self._linklayer.faceidtable.get_or_create_faceid(AddressInfo(ip, if_num))
+                fid = self.faceidtable.get_or_create_faceid(AddressInfo(ip, if_num))
             reply = "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n newface OK:" + str(fid) + "\r\n"
             replysock.send(reply.encode())
             self.logger.info("New Face added " + ip + "|" + str(port) + ", FaceID: " + str(fid))
+        # removeface expects /linklayer/removeface/faceid
+        elif command == "removeface":
+            fid = int(params)
+            # downstream records in the PIT and next hops in the FIB of the face are removed as well
+            removed_pit, removed_fib = remove_face(fid, self.faceidtable, self.pit, self.fib)
+            reply = "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n removeface OK:" + str(fid) + "\r\n"
+            replysock.send(reply.encode())
+            self.logger.info("Face removed, FaceID: " + str(fid) + ", PIT records: " + str(removed_pit) +
+                             ", FIB entries: " + str(removed_fib))
         else:
             self.unknown_command(replysock)
             return
@@ -160,6 +183,21 @@ class Mgmt(PiCNProcess):
             return
 
 
+    def lstack_mgmt(self, command, params, replysock):
+        # queuestats expects /layerstack/queuestats/
+        if self._lstack is None:
+            reply = "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n No LayerStack OK\r\n"
+            replysock.send(reply.encode())
+        elif command == "queuestats":
+            lines = []
+            for name, stats in self._lstack.queue_stats().items():
+                lines.append(name + " " + " ".join(key + "=" + str(value) for key, value in stats.items()))
+            reply = "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n " + "\n".join(lines) + " OK\r\n"
+            replysock.send(reply.encode())
+        else:
+            self.unknown_command(replysock)
+            return
+
     def unknown_command(self, replysock):
         reply = "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n Unknown Command\r\n"
         replysock.send(reply.encode())
@@ -185,7 +223,10 @@ class Mgmt(PiCNProcess):
             self._run_poll(mgmt_sock)
 
     def start_process(self):
-        self._process = multiprocessing.Process(target=self._run, args=[self.mgmt_sock])
+        # the mgmt process is forked if possible, since the shutdown callback of the program can not be pickled
+        context = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() \
+            else multiprocessing
+        self._process = context.Process(target=self._run, args=[self.mgmt_sock])
         self._process.start()
 
     def stop_process(self):
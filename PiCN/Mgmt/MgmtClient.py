@@ -23,6 +23,13 @@ class MgmtClient(object):
         param = ip_addr + ":" + str(port) + ":" + str(if_num)
         return self.layercommand("linklayer", "newface", param)
 
+    def remove_face(self, faceid: int) -> str:
+        """remove a face, and its records in PIT and FIB
+        :param faceid: face id of the face
+        :return: reply message of the relay
+        """
+        return self.layercommand("linklayer", "removeface", str(faceid))
+
     def add_forwarding_rule(self, name: Name, faceid: List[int]) -> str:
         """adding a new forwarding rule to a face
         :param name: name for the forwarding rule which should be bound to the face
@@ -57,6 +64,14 @@ class MgmtClient(object):
         reply = self.layercommand("repolayer", "getpath", "")
         return self.parseHTTPReply(reply)
 
+    def get_queue_stats(self) -> str:
+        """get the counters of the bounded queues between the layers of a relay
+        :return: reply message of the relay, one line per queue with its depth, capacity, maximum depth, number of
+                 dropped packets, congestion Nacks and congestion events
+        """
+        reply = self.layercommand("layerstack", "queuestats", "")
+        return self.parseHTTPReply(reply)
+
     def parseHTTPReply(self, data: str) -> str:
         """parses a reply messages and removes the http tags
         :param data: reply message
@@ -172,6 +172,19 @@ class test_Mgmt(unittest.TestCase):
         self.assertEqual(self.linklayer.faceidtable.get_address_info(0), AddressInfo(("127.0.0.1", 9000), 0))
         self.assertEqual(self.linklayer.faceidtable.get_face_id(AddressInfo(("127.0.0.1", 9000), 0)), 0)
 
+    def test_remove_face_mgmt_client(self):
+        """Test removing a face and its PIT and FIB records using the mgmtclient"""
+        self.linklayer.start_process()
+        self.mgmt.start_process()
+        self.mgmt_client.add_face("127.0.0.1", 9000, 0)
+        self.mgmt.fib.add_fib_entry(Name("/test"), [0, 1])
+        self.mgmt.pit.add_pit_entry(Name("/test/data"), 0)
+        data = self.mgmt_client.remove_face(0)
+        self.assertEqual(data, "HTTP/1.1 200 OK \r\n Content-Type: text/html \r\n\r\n removeface OK:0\r\n")
+        self.assertEqual(self.linklayer.faceidtable.get_num_entries(), 0)
+        self.assertEqual(self.mgmt.fib.find_fib_entry(Name("/test/data")).faceid, [1])
+        self.assertEqual(self.mgmt.pit.find_pit_entry(Name("/test/data")).faceids, [])
+
     def test_add_forwarding_rule_mgmt_client(self):
         """Test adding forwarding rule using MgmtClient"""
         self.linklayer.start_process()
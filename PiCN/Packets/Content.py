@@ -2,14 +2,19 @@
 
 from .Packet import Packet
 
-from typing import Optional
+from typing import Optional, Union
 
 
 class Content(Packet):
     """
-    Internal representation of a content object
+    Internal representation of a content object. The payload is held as bytes (or in a WireBuffer) and is accessed as
+    bytes (payload, get_bytes) or as memoryview (payload_view); it is decoded to text only if requested (decode, or the
+    content property kept for existing callers). The hop tag (if any) is the number of hops the content object
+    travelled from the node which served it.
     """
 
+    __slots__ = ("_content", "_wire_buffer", "_payload_range", "_hops")
+
     def __init__(self, name=None, content=None, wire_format=None):
         Packet.__init__(self, name)
         if type(content) == str:
@@ -19,11 +24,104 @@ class Content(Packet):
         assert (type(self._content) in [bytes, bytearray, type(None)]), "MUST be raw bytes or None"
         self._wire_format = wire_format
         assert (type(self._wire_format) in [bytes, bytearray, type(None)]), "MUST be raw bytes or None"
+        self._wire_buffer = None
+        self._payload_range = None
+        self._hops = None
         if content is None:
             self.content = b""
 
+    @classmethod
+    def from_wire_buffer(cls, name, wire_buffer, payload_start: int, payload_end: int) -> 'Content':
+        """Content object whose wire format is in a WireBufferArena. Payload and wire format are copied out of the
+        arena only if they are accessed; pickling the object only pickles the descriptor.
+        :param name: name of the content object
+        :param wire_buffer: WireBuffer holding the wire format
+        :param payload_start: offset of the payload in the wire format
+        :param payload_end: end of the payload in the wire format
+        """
+        content = cls(name)
+        content._content = None
+        content._wire_buffer = wire_buffer
+        content._payload_range = (payload_start, payload_end)
+        return content
+
+    @property
+    def wire_buffer(self):
+        """WireBuffer holding the wire format, None if payload and wire format are held as bytes"""
+        return self._wire_buffer
+
+    @property
+    def wire_format(self):
+        if self._wire_buffer is not None:
+            self._resolve()
+        return self._wire_format
+
+    def materialized(self) -> 'Content':
+        """Content object holding payload and wire format as bytes, e.g. to be stored beyond the lifetime of the
+        WireBuffer. Returns the object itself if it does not use a WireBuffer.
+        """
+        if self._wire_buffer is None:
+            return self
+        wire_format = self._wire_buffer.tobytes()
+        start, end = self._payload_range
+        content = Content(self.name, wire_format[start:end], wire_format)
+        content._hops = self._hops
+        return content
+
+    def _resolve(self):
+        """Copy payload and wire format out of the WireBuffer"""
+        resolved = self.materialized()
+        self._content, self._wire_format = resolved._content, resolved._wire_format
+        self._wire_buffer = None
+        self._payload_range = None
+
+    @property
+    def hops(self) -> Optional[int]:
+        """hop tag, number of hops from the node which served the content object, None if it is not tagged"""
+        return self._hops
+
+    @hops.setter
+    def hops(self, hops: Optional[int]):
+        self._hops = hops
+
+    @property
+    def payload(self) -> Optional[bytes]:
+        """payload as bytes, without decoding it"""
+        return self.get_bytes()
+
+    def payload_view(self) -> memoryview:
+        """View of the payload, without copying it. If the content object uses a WireBuffer, the view is a view of the
+        shared memory, which may be overwritten if the writer laps the ring (see WireBuffer.view).
+        """
+        if self._wire_buffer is not None:
+            start, end = self._payload_range
+            return self._wire_buffer.view()[start:end]
+        return memoryview(self._content if self._content is not None else b"")
+
+    @property
+    def payload_size(self) -> int:
+        """size of the payload in bytes, without copying it out of a WireBuffer"""
+        if self._wire_buffer is not None:
+            start, end = self._payload_range
+            return end - start
+        return len(self._content) if self._content is not None else 0
+
+    def decode(self, encoding: str = "utf-8", errors: str = "strict") -> Optional[str]:
+        """payload as text
+        :param encoding: encoding of the payload
+        :param errors: error handling of bytes.decode, e.g. "replace"
+        :return: decoded payload, None if there is no payload
+        """
+        payload = self.get_bytes()
+        return payload.decode(encoding, errors) if payload is not None else None
+
     @property
     def content(self) -> Optional[str]:
+        """payload decoded as UTF-8, or as hex bytes if it is not valid UTF-8. Decodes the payload on each access,
+        use payload or payload_size where the text is not needed.
+        """
+        if self._wire_buffer is not None:
+            self._resolve()
         if self._content is None:
             return None
         try:
@@ -31,7 +129,9 @@ class Content(Packet):
         except:  # FIXME: Catch specific error?
             return "".join(" 0x%02x" % x for x in self._content)[1:]
 
-    def get_bytes(self) -> bytearray:
+    def get_bytes(self) -> Union[bytes, bytearray]:
+        if self._wire_buffer is not None:
+            self._resolve()
         return self._content
 
     @content.setter
@@ -39,9 +139,19 @@ class Content(Packet):
         if type(content) == str:
             content = content.encode()
         assert (type(content) in [bytes, bytearray]), "MUST be raw bytes"
+        if self._wire_buffer is not None:
+            self._resolve()
         self._content = content
 
+    def __getstate__(self):
+        # content objects using a WireBuffer are pickled with the descriptor only
+        return Packet.__getstate__(self) + (self._content, self._wire_buffer, self._payload_range, self._hops)
+
+    def __setstate__(self, state):
+        Packet.__setstate__(self, state[:2])
+        self._content, self._wire_buffer, self._payload_range, self._hops = state[2:]
+
     def __eq__(self, other):
         if type(other) is not Content:
             return False
-        return self.name == other.name and self._content == other.content
+        return self.name == other.name and self.get_bytes() == other.get_bytes()
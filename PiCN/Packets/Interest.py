@@ -1,16 +1,61 @@
 """Internal representation of an interest packet"""
 
+import copy
+
 from .Packet import Packet
 
 class Interest(Packet):
     """
-    Internal representation of an interest packet
+    Internal representation of an interest packet. The nonce (if any) identifies a single Interest, so that a
+    forwarder can recognize duplicated or looping copies of it; it is not part of the equality of Interests. The hop
+    tag (if any) is the number of hops the Interest travelled from its consumer.
     """
 
-    def __init__(self, name=None, wire_format=None):
+    __slots__ = ("_nonce", "_hops")
+
+    def __init__(self, name=None, wire_format=None, nonce: bytes = None):
         Packet.__init__(self, name, wire_format)
+        self._nonce = nonce
+        self._hops = None
         assert (type(self._wire_format) in [bytes, bytearray, type(None)]), "MUST be raw bytes or None"
 
+    @property
+    def nonce(self) -> bytes:
+        """nonce of the Interest, None if it has none (yet)"""
+        return self._nonce
+
+    @nonce.setter
+    def nonce(self, nonce: bytes):
+        self._nonce = nonce
+
+    def with_nonce(self, nonce: bytes) -> 'Interest':
+        """
+        Copy of the Interest with another nonce, e.g. for a retransmission. The wire format of the Interest carries
+        its nonce, so the copy has none and is encoded again.
+        :param nonce: nonce of the copy
+        :return: the copy
+        """
+        interest = copy.copy(self)
+        interest._nonce = nonce
+        interest._wire_format = None
+        return interest
+
+    @property
+    def hops(self) -> int:
+        """hop tag, number of hops from the consumer, None if the Interest is not tagged"""
+        return self._hops
+
+    @hops.setter
+    def hops(self, hops: int):
+        self._hops = hops
+
+    def __getstate__(self):
+        return Packet.__getstate__(self) + (self._nonce, self._hops)
+
+    def __setstate__(self, state):
+        Packet.__setstate__(self, state[:2])
+        self._nonce, self._hops = state[2:]
+
     def __eq__(self, other):
         if type(other) is not Interest:
             return False
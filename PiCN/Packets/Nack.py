@@ -10,6 +10,8 @@ class Nack(Packet):
     Internal representation of an NACK (negative acknowledgement) packet
     """
 
+    __slots__ = ("_reason", "_interest")
+
     def __init__(self, name: Name, reason: NackReason, interest, wire_format=None):
         """
         New negative acknowledgement (NACK) object
@@ -41,6 +43,13 @@ class Nack(Packet):
     def interest(self, i:Interest):
         self._interest = i
 
+    def __getstate__(self):
+        return Packet.__getstate__(self) + (self._reason, self._interest)
+
+    def __setstate__(self, state):
+        Packet.__setstate__(self, state[:2])
+        self._reason, self._interest = state[2:]
+
     def __eq__(self, other):
         if type(other) is not Nack:
             return False
@@ -2,42 +2,59 @@
 
 import binascii
 import json
-import os
 
-from typing import List, Union
+from typing import Dict, Iterable, List, Tuple, Union
+
+_PARSED_CACHE_SIZE = 10000
+_parsed: Dict[str, Tuple[Tuple[bytes, ...], str]] = {}  # name string -> components and their string
+_UNPICKLED = ('suite', '_components', '_hash', '_string')
+
+
+def _parse(name: str) -> Tuple[Tuple[bytes, ...], str]:
+    """components of a name string and the string of the components, cached for the most recently parsed names"""
+    parsed = _parsed.get(name)
+    if parsed is None:
+        # FIXME: handle '/' as part of a component, UTF etc
+        components = tuple(c.encode('ascii') for c in name.split("/")[1:])
+        parsed = (components, '/' + '/'.join([c.decode('ascii', 'replace') for c in components]))
+        if len(_parsed) >= _PARSED_CACHE_SIZE:
+            _parsed.pop(next(iter(_parsed)), None)
+        _parsed[name] = parsed
+    return parsed
 
 
 class Name(object):
     """
-    Internal representation of network name
+    Internal representation of network name. The components are an immutable tuple of bytes; the string of the
+    components and the hash are computed once per name, names created from a string reuse the components and string of
+    recently parsed names. Names are equal if their strings are (e.g. a component containing '/' and the components it
+    is split into), which is checked by comparing the components first. Assigning components replaces the tuple,
+    assigning components or the digest resets the cached hash.
     """
 
-    def __init__(self, name: Union[str, List[bytes]] = None, suite='ndn2013'):
+    def __init__(self, name: Union[str, Iterable[bytes]] = None, suite='ndn2013'):
         self.suite = suite
-        self.digest = None
+        self._digest = None
+        self._hash = None
+        self._string = None
         if name:
             if isinstance(name, str):
                 self.from_string(name)
             else:
-                self._components = name
+                self.components = name
         else:
-            self._components = []
+            self._components = ()
 
     def from_string(self, name: str):
         """Set the name from a string, components separated by /"""
-        # FIXME: handle '/' as part of a component, UTF etc
-        comps = name.split("/")[1:]
-        self._components = [c.encode('ascii') for c in comps]
+        self._components, self._string = _parse(name)
+        self._hash = None
 
     def components_to_string(self) -> str:
         # FIXME: handle '/' as part of a component, and binary components
-        if len(self._components) == 0:
-            return '/'
-        if type(self._components[0]) is str:
-            s = '/' + '/'.join([c for c in self._components])
-            return s
-        s = '/' + '/'.join([c.decode('ascii', 'replace') for c in self._components])
-        return s
+        if self._string is None:
+            self._string = '/' + '/'.join([c.decode('ascii', 'replace') for c in self._components])
+        return self._string
 
     def to_string(self) -> str:
         """Transform name to string, components separated by /"""
@@ -58,7 +75,7 @@ class Name(object):
     def from_json(self, s: str) -> str:
         n = json.loads(s)
         self.suite = n['suite']
-        self._components = [binascii.dehexlify(c) for c in n['comps']]
+        self.components = [binascii.dehexlify(c) for c in n['comps']]
         self.digest = binascii.dehexlify(n['dgest']) if 'dgest' in n else None
         return self
 
@@ -69,21 +86,20 @@ class Name(object):
     def __str__(self) -> str:
         return self.to_string()
 
-    def __repr__(self) -> str:
-        return f'<PiCN.Packets.Name.Name {str(self)} at {hex(id(self))}>'
-
     def __eq__(self, other) -> bool:
-        if type(other) is not Name:
-            return False
-        if self.suite != other.suite:
+        if self is other:
+            return True
+        if type(other) is not Name or self.suite != other.suite:
             return False
+        if self._components == other._components and self.digest == other.digest:
+            return True
         return self.to_string() == other.to_string()
 
     def __add__(self, other: Union['Name', str, List[str], List[bytes]]) -> 'Name':
         components: List[bytes] = []
         for c in self._components:
             components.append(c)
-        if type(other) is list:
+        if type(other) in (list, tuple):
             for comp in other:
                 if type(comp) is str:
                     components.append(comp.encode('ascii'))
@@ -101,7 +117,19 @@ class Name(object):
         return Name(components)
 
     def __hash__(self) -> int:
-        return self._components.__str__().__hash__()
+        if self._hash is None:
+            self._hash = hash(self.to_string())
+        return self._hash
+
+    def __reduce__(self):
+        # only the components and the attributes differing from the defaults are pickled; the caches are not, since
+        # the hash of a string differs between interpreters
+        args = (self._components,) if self.suite == 'ndn2013' else (self._components, self.suite)
+        state = {k: v for k, v in self.__dict__.items() if k not in _UNPICKLED and v is not None}
+        return (Name, args, state) if state else (Name, args)
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
 
     def __len__(self):
         return len(self._components)
@@ -115,8 +143,7 @@ class Name(object):
         :param name: name
         :return: true if self is prefix of given name, false otherwise
         """
-        pfx = os.path.commonprefix([self._components, name.components])
-        return len(pfx) == len(self._components)
+        return name.components[:len(self._components)] == self._components
 
     def has_prefix(self, name):
         """
@@ -132,8 +159,20 @@ class Name(object):
         return self._components
 
     @components.setter
-    def components(self, components):
-        self._components = components
+    def components(self, components: Iterable[bytes]):
+        self._components = tuple(c.encode('ascii') if isinstance(c, str) else c for c in components)
+        self._hash = None
+        self._string = None
+
+    @property
+    def digest(self):
+        """Digest of the named content object, part of the string and the hash of the name"""
+        return self._digest
+
+    @digest.setter
+    def digest(self, digest):
+        self._digest = digest
+        self._hash = None
 
     @property
     def string_components(self):
@@ -142,4 +181,4 @@ class Name(object):
 
     @string_components.setter
     def string_components(self, string_components):
-        self._components = [c.encode('ascii') for c in string_components]
+        self.components = [c.encode('ascii') for c in string_components]
@@ -5,9 +5,13 @@ from .Name import Name
 
 class Packet(object):
     """
-    Base class for internal representation of network packets
+    Base class for internal representation of network packets. Packets keep their fields in __slots__ and are pickled
+    as a tuple of the fields (e.g. when they are passed between layer processes); subclasses declare their additional
+    fields in __slots__ and extend __getstate__ and __setstate__.
     """
 
+    __slots__ = ("_name", "_wire_format")
+
     def __init__(self, name: Name = None, wire_format=None):
         if type(name) == str:
             self._name = Name(name)
@@ -23,8 +27,13 @@ class Packet(object):
         return self.name == other.name  # and self.name_payload == other.name_payload
 
     def __hash__(self):
-        # FIXME: What is the property _name_payload?
-        return self._name.__hash__() + self._name_payload.__hash__()
+        return self._name.__hash__()
+
+    def __getstate__(self):
+        return self._name, self._wire_format
+
+    def __setstate__(self, state):
+        self._name, self._wire_format = state
 
     def __repr__(self):
         return f"Packet of type {type(self)}: {self._name.components_to_string()}"
@@ -1,4 +1,5 @@
 """Test Content Object"""
+import pickle
 import unittest
 
 from PiCN.Packets import Content
@@ -32,3 +33,25 @@ class TestContent(unittest.TestCase):
         c2 = Content("/test/data", "the-payload")
         payload_as_string2 = c2.content
         self.assertEqual("the-payload", payload_as_string2)
+
+
+    def test_payload_accessors(self):
+        """Test accessing the payload as bytes, memoryview and text"""
+        c = Content("/test/data", bytes([0x00, 0xb1, 0x01]))
+        self.assertEqual(b"\x00\xb1\x01", c.payload)
+        self.assertEqual(3, c.payload_size)
+        self.assertEqual(b"\x00\xb1\x01", c.payload_view().tobytes())
+        self.assertEqual("\x00\ufffd\x01", c.decode(errors="replace"))
+        with self.assertRaises(UnicodeDecodeError):
+            c.decode()
+        self.assertEqual("HelloWorld", Content("/test/data", "HelloWorld").decode())
+
+    def test_slots_and_pickle(self):
+        """Test that content objects have no attribute dict and are pickled with their fields"""
+        c1 = Content("/test/data", b"x" * 100)
+        self.assertFalse(hasattr(c1, "__dict__"))
+        with self.assertRaises(AttributeError):
+            c1.name_payload = "Hello World"
+        c2 = pickle.loads(pickle.dumps(c1))
+        self.assertEqual(c1, c2)
+        self.assertLess(len(pickle.dumps(c1)), 250)
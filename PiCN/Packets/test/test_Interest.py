@@ -1,4 +1,5 @@
 """Test interest Object"""
+import pickle
 import unittest
 
 from PiCN.Packets import Interest
@@ -21,4 +22,24 @@ class TestInterest(unittest.TestCase):
         """Test if two interest objects are not equal"""
         i1 = Interest("/test/data")
         i2 = Interest("/test/data2")
-        self.assertNotEqual(i1, i2)
\ No newline at end of file
+        self.assertNotEqual(i1, i2)
+
+    def test_interest_nonce(self):
+        """Test that the nonce is pickled and not part of the equality"""
+        i1 = Interest("/test/data", nonce=b"\x01\x02\x03\x04")
+        i2 = pickle.loads(pickle.dumps(i1))
+        self.assertEqual(b"\x01\x02\x03\x04", i2.nonce)
+        self.assertEqual(Interest("/test/data"), i2)
+        self.assertIsNone(Interest("/test/data").nonce)
+
+    def test_interest_with_nonce(self):
+        """Test that a copy with another nonce keeps the other fields and drops the wire format"""
+        i1 = Interest("/test/data", wire_format=b"\x05\x00", nonce=b"\x01\x02\x03\x04")
+        i1.hops = 3
+        i2 = i1.with_nonce(b"\x05\x06\x07\x08")
+        self.assertEqual(b"\x05\x06\x07\x08", i2.nonce)
+        self.assertEqual(b"\x01\x02\x03\x04", i1.nonce)
+        self.assertEqual(i1, i2)
+        self.assertEqual(3, i2.hops)
+        self.assertIsNone(i2.wire_format)
+        self.assertEqual(b"\x05\x00", i1.wire_format)
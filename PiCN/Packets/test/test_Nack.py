@@ -1,4 +1,5 @@
 """Test Nack Object"""
+import pickle
 import unittest
 
 from PiCN.Packets import Nack, NackReason
@@ -24,4 +25,13 @@ class TestNack(unittest.TestCase):
         interest = Interest("/test/data")
         nack1 = Nack("/test/data", NackReason.NO_ROUTE, interest=interest)
         nack2 = Nack("/test/data", NackReason.NO_CONTENT, interest=interest)
-        self.assertNotEqual(nack1, nack2)
\ No newline at end of file
+        self.assertNotEqual(nack1, nack2)
+
+    def test_pickle(self):
+        """Test pickling a nack with its interest"""
+        interest = Interest("/test/data")
+        nack1 = Nack("/test/data", NackReason.NO_ROUTE, interest=interest)
+        nack2 = pickle.loads(pickle.dumps(nack1))
+        self.assertEqual(nack1, nack2)
+        self.assertEqual(interest, nack2.interest)
+        self.assertFalse(hasattr(nack2, "__dict__"))
@@ -1,4 +1,5 @@
 """Test Name Object"""
+import pickle
 import unittest
 
 from PiCN.Packets import Name
@@ -26,11 +27,11 @@ class TestName(unittest.TestCase):
 
     def test_constructor_str(self):
         n = Name('/test/data')
-        self.assertEqual([b'test', b'data'], n._components)
+        self.assertEqual((b'test', b'data'), n._components)
 
     def test_constructor_byteslist(self):
         n = Name([b'test', b'data'])
-        self.assertEqual([b'test', b'data'], n._components)
+        self.assertEqual((b'test', b'data'), n._components)
         self.assertEqual('/test/data', n.components_to_string())
 
     def test_constructor_unprintable(self):
@@ -40,19 +41,19 @@ class TestName(unittest.TestCase):
         n1 = Name('/test')
         n2 = Name('/data')
         n = n1 + n2
-        self.assertEqual([b'test', b'data'], n._components)
+        self.assertEqual((b'test', b'data'), n._components)
         self.assertEqual('/test/data', n.components_to_string())
 
     def test_add_str(self):
         n1 = Name('/test')
         n = n1 + 'data'
-        self.assertEqual([b'test', b'data'], n._components)
+        self.assertEqual((b'test', b'data'), n._components)
         self.assertEqual('/test/data', n.components_to_string())
 
     def test_add_list(self):
         n1 = Name('/test')
         n = n1 + [b'data']
-        self.assertEqual([b'test', b'data'], n._components)
+        self.assertEqual((b'test', b'data'), n._components)
         self.assertEqual('/test/data', n.components_to_string())
 
     def test_add_type_error(self):
@@ -63,5 +64,71 @@ class TestName(unittest.TestCase):
     def test_add_inplace(self):
         n = Name('/test')
         n += 'data'
-        self.assertEqual([b'test', b'data'], n._components)
+        self.assertEqual((b'test', b'data'), n._components)
         self.assertEqual('/test/data', n.components_to_string())
+
+    def test_hash_and_equality(self):
+        """Test that equal names have equal hashes and that suite and digest are compared"""
+        n1 = Name("/test/data")
+        n2 = Name([b'test', b'data'])
+        self.assertEqual(n1, n2)
+        self.assertEqual(hash(n1), hash(n2))
+        self.assertEqual({n1: 1}[n2], 1)
+        self.assertNotEqual(n1, Name("/test/data", suite='ndn2014'))
+        self.assertNotEqual(n1, Name("/test/data").set_digest(b'\x01'))
+        n3 = Name("/test/_(/test/data)")
+        n4 = Name("/test") + "_(/test/data)"
+        self.assertEqual(n3, n4)
+        self.assertEqual(hash(n3), hash(n4))
+
+    def test_hash_after_set_digest(self):
+        """Test that setting the digest of a hashed name updates its hash"""
+        n = Name("/test/data")
+        hash(n)
+        n.digest = b"\x01"
+        m = Name("/test/data").set_digest(b"\x01")
+        self.assertEqual(n, m)
+        self.assertEqual(hash(n), hash(m))
+        self.assertIn(m, {n})
+        hash(m)
+        m.set_digest(None)
+        self.assertEqual(hash(Name("/test/data")), hash(m))
+        self.assertNotIn(m, {n})
+
+    def test_components_immutable(self):
+        """Test that the components are a tuple and that assigning components resets the cached hash and string"""
+        n = Name("/test/data")
+        self.assertIs(n.components, Name("/test/data").components)
+        with self.assertRaises(AttributeError):
+            n.components.append(b'x')
+        hash(n)
+        n.components = n.components[:-1]
+        self.assertEqual(Name("/test"), n)
+        self.assertEqual(hash(Name("/test")), hash(n))
+        self.assertEqual("/test", n.to_string())
+        n.string_components = ['test', 'other']
+        self.assertEqual(Name("/test/other"), n)
+
+    def test_prefix(self):
+        """Test prefix checks"""
+        self.assertTrue(Name("/test").is_prefix_of(Name("/test/data")))
+        self.assertTrue(Name("/test/data").has_prefix(Name("/test/data")))
+        self.assertTrue(Name().is_prefix_of(Name("/test")))
+        self.assertFalse(Name("/test/data").is_prefix_of(Name("/test")))
+        self.assertFalse(Name("/tes").is_prefix_of(Name("/test")))
+
+    def test_pickle(self):
+        """Test that a pickled name is equal to the original name and does not carry the cached hash"""
+        n = Name("/test/data")
+        hash(n)
+        restored = pickle.loads(pickle.dumps(n))
+        self.assertEqual(n, restored)
+        self.assertIsNone(restored._hash)
+        self.assertEqual(hash(n), hash(restored))
+        self.assertLess(len(pickle.dumps(n)), 80)
+        n = Name("/test/data", suite="ndn2014").set_digest(b"\x01\x02")
+        n.format = "ndntlv"
+        restored = pickle.loads(pickle.dumps(n))
+        self.assertEqual(n, restored)
+        self.assertEqual(b"\x01\x02", restored.digest)
+        self.assertEqual("ndntlv", restored.format)
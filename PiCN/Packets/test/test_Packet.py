@@ -14,9 +14,7 @@ class TestPacket(unittest.TestCase):
     def test_packet_equal(self):
         """Test if two packet objects are equal"""
         p1 = Packet("/test/data")
-        p1.name_payload = "Hello World"
         p2 = Packet("/test/data")
-        p2.name_payload = "Hello World"
         self.assertEqual(p1, p2)
 
     def test_packet_not_equal_name(self):
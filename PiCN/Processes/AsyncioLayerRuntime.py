@@ -0,0 +1,120 @@
+"""Runtime driving one or more LayerProcesses with an asyncio event loop"""
+
+import os
+from typing import List
+
+from PiCN.Processes.InProcessQueue import InProcessQueue
+
+
+class AsyncioLayerRuntime(object):
+    """Runtime driving one or more LayerProcesses with an asyncio event loop. Queue readers and sockets of the layers
+    are registered as readers of the loop, periodic tasks of the layers (e.g. ageing) and other timers of the layers
+    are scheduled on the timer wheels of the layers, which are fired by a single callback of the loop. Items on
+    in-process queues are dispatched to the layers directly. Layers keep their synchronous data_from_lower and
+    data_from_higher; if a handler is a coroutine function, the returned coroutine is scheduled as a task, so a layer
+    can serve many requests concurrently without additional threads.
+    :param layers: layers driven by the runtime
+    :param queues: in-process queues between the layers
+    :param wakeup_fd: read end of a pipe, that is written if another thread puts into one of the in-process queues
+    """
+
+    def __init__(self, layers: List, queues: List[InProcessQueue] = None, wakeup_fd: int = None):
+        self.layers = layers
+        self.queues = queues if queues is not None else []
+        self.wakeup_fd = wakeup_fd
+        self.loop: 'asyncio.AbstractEventLoop' = None
+        self._dispatch_scheduled: bool = False
+        self._stopped: bool = False
+        self._timer_handle: 'asyncio.TimerHandle' = None
+
+    def run(self):
+        """Run the event loop until stop is called"""
+        import asyncio  # imported on first use, most programs never start an event loop
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        for q in self.queues:
+            q.bind_to_current_thread()
+            q.on_put = self._request_dispatch
+        for layer in self.layers:
+            layer.coroutine_handler = self._schedule_coroutine
+            for source in layer.in_process_sources():
+                self.loop.add_reader(source, self._on_readable, layer, source)
+            layer.schedule_periodic_tasks()
+        if self.wakeup_fd is not None:
+            self.loop.add_reader(self.wakeup_fd, self._on_wakeup)
+        self.loop.call_soon(self._dispatch)
+        try:
+            if not self._stopped:
+                self.loop.run_forever()
+        finally:
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self.loop.close()
+
+    def stop(self):
+        """Stop the event loop, can be called from any thread"""
+        self._stopped = True
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+    def _on_readable(self, layer, source):
+        try:
+            layer.handle_in_process_source(source)
+        except Exception as e:
+            layer.logger.error("Exception in asyncio layer runtime: " + str(e))
+        self._dispatch()
+
+    def _on_wakeup(self):
+        try:
+            while os.read(self.wakeup_fd, 4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+        self._dispatch()
+
+    def _request_dispatch(self):
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            self.loop.call_soon(self._dispatch)
+
+    def _dispatch(self):
+        """Hand all items on in-process queues to the layers"""
+        self._dispatch_scheduled = False
+        busy = True
+        while busy:
+            busy = False
+            for layer in self.layers:
+                try:
+                    busy = layer.dispatch_in_process() or busy
+                except Exception as e:
+                    layer.logger.error("Exception in asyncio layer runtime: " + str(e))
+                    busy = True
+        self._arm_timers()
+
+    def _arm_timers(self):
+        """Schedule the callback firing the timer wheels of the layers, if a timer is due before it is called"""
+        timeouts = [t for t in (layer.timers.next_timeout() for layer in self.layers) if t is not None]
+        if not timeouts:
+            return
+        when = self.loop.time() + min(timeouts)
+        if self._timer_handle is not None:
+            if self._timer_handle.when() <= when:
+                return
+            self._timer_handle.cancel()
+        self._timer_handle = self.loop.call_at(when, self._on_timers)
+
+    def _on_timers(self):
+        self._timer_handle = None
+        for layer in self.layers:
+            try:
+                layer.timers.expire()
+            except Exception as e:
+                layer.logger.warning("Exception during timer: " + str(e))
+        self._dispatch()
+
+    def _schedule_coroutine(self, coro):
+        import asyncio
+        if asyncio.iscoroutine(coro):
+            self.loop.create_task(coro)
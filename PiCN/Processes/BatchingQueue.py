@@ -0,0 +1,85 @@
+"""Batching of items that are sent between layer processes"""
+
+import multiprocessing
+import threading
+import time
+
+
+class PacketBatch(list):
+    """A list of queue items (e.g. [face id, packet]) that crossed a queue as one message. LayerProcess unpacks
+    batches, so layers that do not handle batches themselves receive the items one by one."""
+
+
+class BatchingQueue(object):
+    """Producer side of a multiprocessing queue that collects the items put by the thread running the layer and sends
+    them as one PacketBatch, i.e. with one pickle and one pipe write. A batch is sent if it reaches batch_size items,
+    if its first item is older than max_delay, or if flush is called (the layer does so at the end of each wakeup).
+    Items put by other threads (e.g. timers) are sent immediately.
+    :param queue: the multiprocessing queue to send to
+    :param batch_size: maximum number of items in a batch
+    :param max_delay: maximum time in seconds an item is delayed for batching
+    """
+
+    def __init__(self, queue: multiprocessing.Queue, batch_size: int = 16, max_delay: float = 0.001):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self._buffer = []
+        self._first_timestamp = 0.0
+        self._owner = None
+
+    def bind_to_current_thread(self):
+        """mark the calling thread as the thread running the layer. Only puts of this thread are batched"""
+        self._owner = threading.get_ident()
+
+    def put(self, obj, block=True, timeout=None):
+        if threading.get_ident() != self._owner:
+            self.queue.put(obj, block, timeout)
+            return
+        if not self._buffer:
+            self._first_timestamp = time.monotonic()
+        if type(obj) is PacketBatch:
+            self._buffer.extend(obj)
+        else:
+            self._buffer.append(obj)
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._first_timestamp >= self.max_delay:
+            self.flush()
+
+    def put_nowait(self, obj):
+        self.put(obj, block=False)
+
+    def flush(self):
+        """send all buffered items"""
+        if not self._buffer:
+            return
+        if len(self._buffer) == 1:
+            self.queue.put(self._buffer[0])
+        else:
+            self.queue.put(PacketBatch(self._buffer))
+        self._buffer = []
+
+    def get(self, block=True, timeout=None):
+        return self.queue.get(block, timeout)
+
+    def get_nowait(self):
+        return self.queue.get_nowait()
+
+    def empty(self) -> bool:
+        return not self._buffer and self.queue.empty()
+
+    def close(self):
+        self.queue.close()
+
+    def join_thread(self):
+        self.queue.join_thread()
+
+    def cancel_join_thread(self):
+        self.queue.cancel_join_thread()
+
+    @property
+    def _closed(self):
+        return self.queue._closed
+
+    @property
+    def _reader(self):
+        return self.queue._reader
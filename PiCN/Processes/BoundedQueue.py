@@ -0,0 +1,141 @@
+"""Bounded queues between layer processes, dropping packets and signalling congestion if a layer falls behind"""
+
+import multiprocessing
+import queue
+from enum import Enum
+
+from PiCN.Packets import Interest, Nack, NackReason
+from PiCN.Processes.BatchingQueue import PacketBatch
+
+
+class DropPolicy(Enum):
+    """Packets dropped by a BoundedQueue above its high watermark"""
+
+    TAIL_DROP = "tail drop"
+    """all packets are dropped"""
+
+    DROP_INTERESTS = "drop interests"
+    """Interests are dropped, Content and Nacks are only dropped if the queue is full"""
+
+
+class BoundedQueue(object):
+    """Producer side of a bounded multiprocessing queue between two layers. If the queue (or the shard of the queue an
+    item is put into) holds high_watermark messages, the queue is congested until it drained to low_watermark. Items
+    put into a congested queue are dropped according to the drop policy, items put into a full queue are always
+    dropped; the producer never blocks. For each dropped item [face id, Interest], a Nack with reason CONGESTION is put
+    into the reverse queue, which is read by the producer, so the Nack travels back towards the sender of the Interest.
+    Counters of the queue are kept in shared memory and can be read by any process.
+    :param queue: the bounded multiprocessing queue (or ShardedQueue of bounded queues) to send to
+    :param reverse: the queue in the opposite direction between the same layers
+    :param capacity: maximum number of messages in the queue (or in each shard)
+    :param high_watermark: number of messages at which the queue becomes congested
+    :param low_watermark: number of messages at which the queue is no longer congested
+    :param policy: drop policy of a congested queue
+    """
+
+    # indices of the counters
+    MAX_DEPTH, DROPPED, CONGESTION_NACKS, CONGESTED = range(4)
+
+    def __init__(self, queue, reverse, capacity: int, high_watermark: int = None, low_watermark: int = None,
+                 policy: DropPolicy = DropPolicy.DROP_INTERESTS):
+        self.queue = queue
+        self.reverse = reverse
+        self.capacity = capacity
+        self.high_watermark = high_watermark if high_watermark is not None else max(1, capacity * 3 // 4)
+        self.low_watermark = low_watermark if low_watermark is not None else self.high_watermark // 2
+        self.policy = policy
+        self.counters = multiprocessing.Array('q', 4)
+        self._congested = {}
+
+    def put(self, obj, block=True, timeout=None):
+        items = obj if type(obj) is PacketBatch else [obj]
+        admitted = [item for item in items if self._admit(item)]
+        if not admitted:
+            return
+        try:
+            self.queue.put(admitted[0] if len(admitted) == 1 else PacketBatch(admitted), block=False)
+        except queue.Full:
+            for item in admitted:
+                self._drop(item)
+
+    def put_nowait(self, obj):
+        self.put(obj, block=False)
+
+    def get(self, block=True, timeout=None):
+        return self.queue.get(block, timeout)
+
+    def get_nowait(self):
+        return self.queue.get_nowait()
+
+    def empty(self) -> bool:
+        return self.queue.empty()
+
+    def close(self):
+        self.queue.close()
+
+    def join_thread(self):
+        self.queue.join_thread()
+
+    def cancel_join_thread(self):
+        self.queue.cancel_join_thread()
+
+    @property
+    def _closed(self):
+        return self.queue._closed
+
+    def depth(self) -> int:
+        """number of messages in the queue, summed up over all shards"""
+        shards = getattr(self.queue, "shards", [self.queue])
+        return sum(self._qsize(q) for q in shards)
+
+    def stats(self) -> dict:
+        """counters of the queue: current depth, maximum depth seen by the producer, number of dropped items, number
+        of congestion Nacks sent and number of times the queue became congested"""
+        with self.counters.get_lock():
+            counters = list(self.counters)
+        return {"depth": self.depth(), "capacity": self.capacity, "max_depth": counters[self.MAX_DEPTH],
+                "dropped": counters[self.DROPPED], "congestion_nacks": counters[self.CONGESTION_NACKS],
+                "congested": counters[self.CONGESTED]}
+
+    def _admit(self, item) -> bool:
+        """decide if an item is put into the queue, drop it otherwise"""
+        target = self.queue.queue_for(item) if hasattr(self.queue, "queue_for") else self.queue
+        depth = self._qsize(target)
+        if depth > self.counters[self.MAX_DEPTH]:
+            self.counters[self.MAX_DEPTH] = depth
+        congested = self._congested.get(id(target), False)
+        if not congested and depth >= self.high_watermark:
+            congested = self._congested[id(target)] = True
+            self._count(self.CONGESTED)
+        elif congested and depth <= self.low_watermark:
+            congested = self._congested[id(target)] = False
+        if depth >= self.capacity or (congested and (self.policy == DropPolicy.TAIL_DROP or self._is_interest(item))):
+            self._drop(item)
+            return False
+        return True
+
+    def _drop(self, item):
+        self._count(self.DROPPED)
+        if not self._is_interest(item):
+            return
+        interest = item[1]
+        try:
+            self.reverse.put([item[0], Nack(interest.name, NackReason.CONGESTION, interest=interest)], block=False)
+            self._count(self.CONGESTION_NACKS)
+        except queue.Full:
+            pass
+
+    def _count(self, index: int):
+        with self.counters.get_lock():
+            self.counters[index] += 1
+
+    @staticmethod
+    def _is_interest(item) -> bool:
+        return isinstance(item, list) and len(item) == 2 and isinstance(item[1], Interest)
+
+    @staticmethod
+    def _qsize(q) -> int:
+        try:
+            return q.qsize()
+        except NotImplementedError:  # not available on macOS, only the capacity is enforced
+            return 0
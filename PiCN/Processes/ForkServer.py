@@ -0,0 +1,30 @@
+"""Prewarmed fork server to start the processes of a program"""
+
+import multiprocessing
+from typing import List
+
+PRELOAD_MODULES = ["PiCN.LayerStack", "PiCN.Layers.LinkLayer", "PiCN.Layers.PacketEncodingLayer",
+                   "PiCN.Layers.ICNLayer", "PiCN.Layers.ChunkLayer", "PiCN.Layers.TimeoutPreventionLayer"]
+"""modules imported by the fork server before it forks the first process"""
+
+
+def use_fork_server(preload: List[str] = None, force: bool = False) -> bool:
+    """Start the processes of the program (layers, managers) by forking them from a fork server, which imported the
+    preload modules once, instead of starting a new interpreter importing PiCN for each process. The server is started
+    immediately, so its start overlaps with setting up the layers instead of delaying the first layer process.
+    Must be called by the main program before it creates any queue or process, objects are passed to the new
+    processes by pickling them.
+    :param preload: modules imported by the fork server, PRELOAD_MODULES if None
+    :param force: use the fork server even if processes are forked directly by default (Linux), which is faster for
+                  small programs but copies the whole calling process
+    :return: True if processes are started by the fork server
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return False
+    if not force and multiprocessing.get_start_method() == "fork":
+        return False
+    multiprocessing.set_forkserver_preload(preload if preload is not None else PRELOAD_MODULES)
+    multiprocessing.set_start_method("forkserver", force=True)
+    from multiprocessing import forkserver
+    forkserver.ensure_running()
+    return True
@@ -0,0 +1,76 @@
+"""Queue between layers of a LayerStack that runs in a single process"""
+
+import collections
+import os
+import queue
+import threading
+import time
+
+
+class InProcessQueue(object):
+    """Queue between layers of a LayerStack that runs in a single process. Items are kept in a deque and are never
+    pickled. The interface mirrors the parts of multiprocessing.Queue used by the layers.
+    :param wakeup_fd: optional file descriptor to write to, if an item is put by a thread that does not own the queue
+    """
+
+    def __init__(self, wakeup_fd: int = None):
+        self._items = collections.deque()
+        self._wakeup_fd = wakeup_fd
+        self._owner = None
+        self._closed = False
+        self.on_put = None  # optional callable, invoked if an item is put by the thread owning the queue
+
+    def bind_to_current_thread(self):
+        """mark the calling thread as the consumer of the queue. Puts from other threads will trigger the wakeup fd"""
+        self._owner = threading.get_ident()
+
+    def put(self, obj, block=True, timeout=None):
+        """append an item to the queue"""
+        self._items.append(obj)
+        if threading.get_ident() != self._owner:
+            if self._wakeup_fd is not None:
+                try:
+                    os.write(self._wakeup_fd, b'\x00')
+                except (BlockingIOError, OSError):
+                    pass
+        elif self.on_put is not None:
+            self.on_put()
+
+    def put_nowait(self, obj):
+        self.put(obj, block=False)
+
+    def get(self, block=True, timeout=None):
+        """remove and return the first item of the queue
+        :raise queue.Empty if no item is available after timeout
+        """
+        if not block:
+            return self.get_nowait()
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                if deadline is not None and time.time() >= deadline:
+                    raise queue.Empty
+                time.sleep(0.001)
+
+    def get_nowait(self):
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise queue.Empty
+
+    def empty(self) -> bool:
+        return len(self._items) == 0
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def close(self):
+        self._closed = True
+
+    def join_thread(self):
+        pass
+
+    def cancel_join_thread(self):
+        pass
@@ -1,13 +1,16 @@
 """ Abstract Class defining a Process running on a layer"""
 
 import abc
-import inspect
 import multiprocessing
 import os
 import select
 import time
 
 from PiCN.Processes import PiCNProcess
+from PiCN.Processes.InProcessQueue import InProcessQueue
+from PiCN.Processes.BatchingQueue import BatchingQueue, PacketBatch
+from PiCN.Processes.AsyncioLayerRuntime import AsyncioLayerRuntime
+from PiCN.Processes.TimerWheel import TimerWheel, Timer
 
 class LayerProcess(PiCNProcess):
     """ Abstract Class defining a Process running on a layer"""
@@ -19,6 +22,13 @@ class LayerProcess(PiCNProcess):
         self._queue_to_lower: multiprocessing.Queue = None
         self._queue_to_higher: multiprocessing.Queue = None
         self.stop: bool = False
+        self.driven_by_stack: bool = False
+        self.use_asyncio: bool = False
+        self.coroutine_handler = None
+        self.batch_size: int = 1  # maximum number of messages taken from a queue per wakeup
+        self.periodic_in_loop: bool = False  # execute the periodic tasks in the execution loop of the layer process
+        self._sources: dict = {}
+        self.timers: TimerWheel = TimerWheel()  # timers fired by the execution loop of the layer
 
     @property
     def queue_from_lower(self):
@@ -64,6 +74,105 @@ class LayerProcess(PiCNProcess):
     def data_from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
         """ handle incoming data from the higher layer """
 
+    def data_from_lower_batch(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue,
+                              batch: PacketBatch):
+        """ handle a batch of incoming data from the lower layer, by default item by item. Layers that can handle
+            a batch more efficiently may override this """
+        for data in batch:
+            self._handle_result(self.data_from_lower(to_lower, to_higher, data))
+
+    def data_from_higher_batch(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue,
+                               batch: PacketBatch):
+        """ handle a batch of incoming data from the higher layer, by default item by item. Layers that can handle
+            a batch more efficiently may override this """
+        for data in batch:
+            self._handle_result(self.data_from_higher(to_lower, to_higher, data))
+
+    def _from_lower(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        """ hand a message from the lower layer to the layer, unpacking batches """
+        if type(data) is PacketBatch:
+            self.data_from_lower_batch(to_lower, to_higher, data)
+        else:
+            self._handle_result(self.data_from_lower(to_lower, to_higher, data))
+
+    def _from_higher(self, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue, data):
+        """ hand a message from the higher layer to the layer, unpacking batches """
+        if type(data) is PacketBatch:
+            self.data_from_higher_batch(to_lower, to_higher, data)
+        else:
+            self._handle_result(self.data_from_higher(to_lower, to_higher, data))
+
+    def _drain(self, queue, handler, to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
+        """ hand up to batch_size messages waiting in queue to handler """
+        for _ in range(self.batch_size):
+            if queue.empty():
+                return
+            handler(to_lower, to_higher, queue.get())
+
+    def _flush(self, to_lower, to_higher):
+        """ send the items buffered in batching output queues, called at the end of each wakeup """
+        if isinstance(to_lower, BatchingQueue):
+            to_lower.flush()
+        if isinstance(to_higher, BatchingQueue):
+            to_higher.flush()
+
+    def register_source(self, source, handler):
+        """ register an additional selectable object (e.g. the reader of a TableChannel) to the execution loop
+            :param source: selectable object
+            :param handler: callable without arguments, called by the execution loop if source is ready for reading.
+                            Must not block.
+        """
+        self._sources[source] = handler
+
+    def schedule_timer(self, delay: float, callback, *args, interval: float = None) -> Timer:
+        """ schedule a callback (e.g. the expiry of a table entry) on the timer wheel of the layer. The callback is
+            executed by the execution loop of the layer, between handling packets. Must only be called from the
+            execution loop, e.g. by data_from_lower.
+            :param delay: seconds until the callback is called
+            :param callback: function to be called
+            :param args: arguments of the callback
+            :param interval: if set, the callback is called again every interval seconds
+            :return: handle of the timer, to cancel it
+        """
+        return self.timers.schedule(delay, self._run_timer, callback, args, interval=interval)
+
+    def cancel_timer(self, timer: Timer):
+        """ cancel a timer scheduled by schedule_timer
+            :param timer: handle of the timer
+        """
+        self.timers.cancel(timer)
+
+    def _run_timer(self, callback, args):
+        try:
+            callback(*args)
+        except Exception as e:
+            self.logger.warning("Exception during timer: " + str(e))
+
+    def schedule_periodic_tasks(self):
+        """ schedule the periodic tasks of the layer on its timer wheel, called by the runtime executing them """
+        for interval, task in self.periodic_tasks():
+            self.schedule_timer(interval, task, interval=interval)
+
+    def _init_periodic_tasks(self):
+        """ schedule the periodic tasks of the layer, if they are executed by the execution loop """
+        self.timers = TimerWheel()
+        if self.periodic_in_loop and not self.use_asyncio:
+            self.schedule_periodic_tasks()
+
+    def _timer_timeout(self):
+        """ seconds until the next timer is due, None if there is none """
+        return self.timers.next_timeout()
+
+    def _run_timers(self):
+        """ fire the timers that are due """
+        self.timers.expire()
+
+    def _bind_output_queues(self):
+        """ mark the current thread as the thread running the layer, to enable batching on the output queues """
+        for q in [self._queue_to_lower, self._queue_to_higher]:
+            if isinstance(q, BatchingQueue):
+                q.bind_to_current_thread()
+
     def _run_poll(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
             to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
         """ Process loop, handle incoming packets, use poll if many file descriptors are required
@@ -78,13 +187,22 @@ class LayerProcess(PiCNProcess):
             poller.register(from_lower._reader, READ_ONLY)
         if from_higher:
             poller.register(from_higher._reader, READ_ONLY)
+        sources = {}
+        for source, handler in self._sources.items():
+            poller.register(source, READ_ONLY)
+            sources[source if isinstance(source, int) else source.fileno()] = handler
         while True:
-            ready_vars = poller.poll()
+            timeout = self._timer_timeout()
+            ready_vars = poller.poll(None if timeout is None else timeout * 1000)
             for filno, var in ready_vars:
-                if from_lower and filno == from_lower._reader.fileno() and not from_lower.empty():
-                    self.data_from_lower(to_lower, to_higher, from_lower.get())
-                elif from_higher and filno == from_higher._reader.fileno() and not from_higher.empty():
-                    self.data_from_higher(to_lower, to_higher, from_higher.get())
+                if from_lower and filno == from_lower._reader.fileno():
+                    self._drain(from_lower, self._from_lower, to_lower, to_higher)
+                elif from_higher and filno == from_higher._reader.fileno():
+                    self._drain(from_higher, self._from_higher, to_lower, to_higher)
+                elif filno in sources:
+                    sources[filno]()
+            self._run_timers()
+            self._flush(to_lower, to_higher)
 
     def _run_select(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
              to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -99,15 +217,20 @@ class LayerProcess(PiCNProcess):
             in_queues.append(from_lower._reader)
         if from_higher:
             in_queues.append(from_higher._reader)
+        in_queues.extend(self._sources.keys())
         while True:
             if len(in_queues) == 0:
                 continue
-            ready_vars, _, _ = select.select(in_queues, [], [])
+            ready_vars, _, _ = select.select(in_queues, [], [], self._timer_timeout())
             for var in ready_vars:
-                if from_lower and var == from_lower._reader and not from_lower.empty():
-                    self.data_from_lower(to_lower, to_higher, from_lower.get())
-                elif from_higher and var == from_higher._reader and not from_higher.empty():
-                    self.data_from_higher(to_lower, to_higher, from_higher.get())
+                if from_lower and var == from_lower._reader:
+                    self._drain(from_lower, self._from_lower, to_lower, to_higher)
+                elif from_higher and var == from_higher._reader:
+                    self._drain(from_higher, self._from_higher, to_lower, to_higher)
+                elif var in self._sources:
+                    self._sources[var]()
+            self._run_timers()
+            self._flush(to_lower, to_higher)
 
     def _run_sleep(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
                    to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
@@ -121,32 +244,100 @@ class LayerProcess(PiCNProcess):
         while True:
             dequeued: bool = False
             if from_lower and not from_lower.empty():
-                self.data_from_lower(to_lower, to_higher, from_lower.get())
+                self._drain(from_lower, self._from_lower, to_lower, to_higher)
                 dequeued = True
             if from_higher and not from_higher.empty():
-                self.data_from_higher(to_lower, to_higher, from_higher.get())
+                self._drain(from_higher, self._from_higher, to_lower, to_higher)
+            for handler in self._sources.values():
+                handler()
+            self._run_timers()
+            self._flush(to_lower, to_higher)
             if not dequeued:
                 time.sleep(0.3)
 
+    def _run_asyncio(self):
+        """ Process loop, handle incoming packets and periodic tasks using an asyncio event loop"""
+        AsyncioLayerRuntime([self]).run()
+
     def _run(self, from_lower: multiprocessing.Queue, from_higher: multiprocessing.Queue,
              to_lower: multiprocessing.Queue, to_higher: multiprocessing.Queue):
         """
-        Initialize the execution loop. Switch between NT, Unix and Unittest. Use select for Unix, Use poll for
+        Initialize the execution loop. Switch between asyncio, NT, Unix and Unittest. Use select for Unix, Use poll for
         unittest, since select cannot handle more than 1024 File Descriptors.
         :param from_lower: Queue to receive data from lower Layer
         :param from_higher: Queue to receive data from higher Layer
         :param to_lower: Queue to send data to lower Layer
         :param to_higher: Queue to send data to higher Layer
         """
-        if os.name == 'nt': # Exception for windows since MS POSIX api do not support select on File Descriptors
+        self._bind_output_queues()
+        self._init_periodic_tasks()
+        if self.use_asyncio:
+            self._run_asyncio()
+        elif os.name == 'nt': # Exception for windows since MS POSIX api do not support select on File Descriptors
             self._run_sleep(from_lower, from_higher, to_lower, to_higher)
         elif self.in_unittest():
             self._run_poll(from_lower, from_higher, to_lower, to_higher)
         else:
             self._run_select(from_lower, from_higher, to_lower, to_higher)
 
+    def periodic_tasks(self) -> list:
+        """Periodic tasks of the layer (e.g. ageing), executed on the timer wheel of the layer by the asyncio runtime if
+        use_asyncio is set, or by the execution loop of the layer process or in-process LayerStack if periodic_in_loop
+        is set.
+        :return: list of tuples (interval in seconds, callable)
+        """
+        return []
+
+    def in_process_sources(self) -> list:
+        """Objects to select on when the layer is driven by an in-process LayerStack or an asyncio runtime. These are
+        the readers of multiprocessing queues connecting the layer to other processes.
+        :return: list of selectable objects
+        """
+        sources = []
+        for q in [self._queue_from_lower, self._queue_from_higher]:
+            if q is not None and not isinstance(q, InProcessQueue):
+                sources.append(q._reader)
+        sources.extend(self._sources.keys())
+        return sources
+
+    def handle_in_process_source(self, source):
+        """Handle a selectable object returned by in_process_sources that is ready for reading
+        :param source: the ready object
+        """
+        if source in self._sources:
+            self._sources[source]()
+        elif self._queue_from_lower is not None and source is getattr(self._queue_from_lower, '_reader', None):
+            self._drain(self._queue_from_lower, self._from_lower, self._queue_to_lower, self._queue_to_higher)
+        elif self._queue_from_higher is not None and source is getattr(self._queue_from_higher, '_reader', None):
+            self._drain(self._queue_from_higher, self._from_higher, self._queue_to_lower, self._queue_to_higher)
+        self._flush(self._queue_to_lower, self._queue_to_higher)
+
+    def dispatch_in_process(self) -> bool:
+        """Handle all items waiting in the in-process queues of the layer, used by an in-process LayerStack
+        :return: True if at least one item was handled
+        """
+        handled = False
+        from_lower = self._queue_from_lower
+        if isinstance(from_lower, InProcessQueue):
+            while not from_lower.empty():
+                self._from_lower(self._queue_to_lower, self._queue_to_higher, from_lower.get_nowait())
+                handled = True
+        from_higher = self._queue_from_higher
+        if isinstance(from_higher, InProcessQueue):
+            while not from_higher.empty():
+                self._from_higher(self._queue_to_lower, self._queue_to_higher, from_higher.get_nowait())
+                handled = True
+        return handled
+
+    def _handle_result(self, result):
+        """Pass a coroutine returned by an async data handler to the asyncio runtime driving the layer"""
+        if result is not None and self.coroutine_handler is not None:
+            self.coroutine_handler(result)
+
     def start_process(self):
         """Start the Layer Process"""
+        if self.driven_by_stack:
+            return
         self.process = multiprocessing.Process(target=self._run, args=[self._queue_from_lower,
                                                                             self._queue_from_higher,
                                                                             self._queue_to_lower,
@@ -159,8 +350,7 @@ class LayerProcess(PiCNProcess):
         if self.process:
             #self.process.kill()
             self.process.terminate()
-            #self.process.join()
-        time.sleep(0.1)
+            self.process.join(0.1)
         if self.queue_to_lower:
             self.queue_to_lower.close()
             self.queue_to_lower.join_thread()
@@ -173,10 +363,10 @@ class LayerProcess(PiCNProcess):
         if self.queue_from_higher:
             self.queue_from_higher.close()
             self.queue_from_higher.join_thread()
-        time.sleep(0.1)
 
     def in_unittest(self):
         """Check if unittest is running for using poller instead of select, to enable more file descriptor"""
+        import inspect  # only needed when the process starts, slow to import
         try:
             current_stack = inspect.stack()
             for stack_frame in current_stack:
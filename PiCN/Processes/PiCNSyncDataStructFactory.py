@@ -1,6 +1,11 @@
 """Sync Datastruct Factory for PICN to create synced Datastructs such as PIT, FIB, CS"""
 
-from multiprocessing.managers import BaseManager
+
+def _base_manager():
+    """BaseManager class, imported on first use since multiprocessing.managers is slow to import"""
+    from multiprocessing.managers import BaseManager
+    return BaseManager
+
 
 class PiCNSyncDataStructFactory(object):
     """Sync Datastruct Factory for PICN to create synced Datastructs such as PIT, FIB, CS"""
@@ -20,15 +25,15 @@ class PiCNSyncDataStructFactory(object):
         """
         if name in self.names:
             return
-        BaseManager.register(name, data_struct)
+        _base_manager().register(name, data_struct)
         self.names.append(name)
 
     def create_manager(self):
         """create a manager. call is after all data structs are registered"""
-        self.manager = BaseManager()
+        self.manager = _base_manager()()
         self.manager.start()
 
-    def get_manager(self) -> BaseManager:
+    def get_manager(self) -> 'BaseManager':
         """get or create and get a Manager
         :return: the Manager to create synced datastructures
         """
@@ -0,0 +1,55 @@
+"""Queue that dispatches items to the queues of the shards of a layer"""
+
+import multiprocessing
+from typing import Callable, List
+
+from PiCN.Processes.BatchingQueue import PacketBatch
+
+
+class ShardedQueue(object):
+    """Producer side of the queues to a layer that runs in several shard processes (e.g. the ShardedICNLayer). Each
+    item is put into the queue of the shard chosen by shard_of, so a packet is handed to its shard without passing an
+    additional dispatcher process. A PacketBatch is split into one batch per shard.
+    :param shards: one queue per shard, read by the shard processes
+    :param shard_of: function mapping an item to the index of its shard
+    """
+
+    def __init__(self, shards: List[multiprocessing.Queue], shard_of: Callable[[object], int]):
+        self.shards = shards
+        self.shard_of = shard_of
+
+    def put(self, obj, block=True, timeout=None):
+        if type(obj) is not PacketBatch:
+            self.shards[self.shard_of(obj)].put(obj, block, timeout)
+            return
+        batches = {}
+        for item in obj:
+            batches.setdefault(self.shard_of(item), PacketBatch()).append(item)
+        for shard, batch in batches.items():
+            self.shards[shard].put(batch[0] if len(batch) == 1 else batch, block, timeout)
+
+    def queue_for(self, obj) -> multiprocessing.Queue:
+        """The queue of the shard an item is put into"""
+        return self.shards[self.shard_of(obj)]
+
+    def put_nowait(self, obj):
+        self.put(obj, block=False)
+
+    def empty(self) -> bool:
+        return all(q.empty() for q in self.shards)
+
+    def close(self):
+        for q in self.shards:
+            q.close()
+
+    def join_thread(self):
+        for q in self.shards:
+            q.join_thread()
+
+    def cancel_join_thread(self):
+        for q in self.shards:
+            q.cancel_join_thread()
+
+    @property
+    def _closed(self):
+        return any(q._closed for q in self.shards)
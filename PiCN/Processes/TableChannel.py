@@ -0,0 +1,108 @@
+"""Message channel to data structures owned by a single layer process"""
+
+import functools
+import multiprocessing
+import os
+import pickle
+import queue
+from typing import Dict
+
+
+class TableChannel(object):
+    """Message channel to data structures (e.g. CS, PIT, FIB) that are owned by a single layer process. The owner
+    accesses its tables directly, without any IPC. Other processes use a TableClient, which sends each method call as
+    message to the owner and waits for the result. Clients must be created before the processes are started.
+    """
+
+    def __init__(self):
+        self.requests = multiprocessing.Queue()
+        self._replies = []
+        self._tables: Dict[str, object] = {}
+
+    def attach(self, layer, tables: Dict[str, object]):
+        """Let a layer process serve the requests to its tables in its execution loop
+        :param layer: the owning LayerProcess
+        :param tables: tables served, by name
+        """
+        self._tables = tables
+        layer.register_source(self.requests._reader, self.serve)
+
+    def client(self, table_name: str, timeout: float = 5.0):
+        """Create a client for a table served by the channel
+        :param table_name: name of the table
+        :param timeout: time in seconds to wait for the owner to answer a call
+        :return: the TableClient
+        """
+        reply_queue = multiprocessing.Queue()
+        self._replies.append(reply_queue)
+        return TableClient(table_name, self.requests, reply_queue, len(self._replies) - 1, timeout)
+
+    def serve(self):
+        """Handle all waiting requests, executed by the owning process"""
+        while True:
+            try:
+                client_id, request_id, table_name, method, args, kwargs = self.requests.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                table = self._tables[table_name]
+                if method == "snapshot":
+                    result = table
+                else:
+                    result = getattr(table, method)(*args, **kwargs)
+                reply = (request_id, True, result)
+            except Exception as e:
+                try:
+                    pickle.dumps(e)
+                except Exception:
+                    e = RuntimeError(repr(e))
+                reply = (request_id, False, e)
+            self._replies[client_id].put(reply)
+
+    def close(self):
+        self.requests.close()
+        for q in self._replies:
+            q.close()
+
+
+class TableClient(object):
+    """Client of a table served by a TableChannel. Offers the methods of the table; each call is a request to the
+    owning process. snapshot() returns a copy of the whole table, to read many entries with a single request.
+    :param table_name: name of the table
+    :param requests: request queue of the channel
+    :param replies: queue the owner answers the requests of this client to
+    :param client_id: index of the reply queue in the channel
+    :param timeout: time in seconds to wait for the owner to answer a call
+    """
+
+    def __init__(self, table_name: str, requests: multiprocessing.Queue, replies: multiprocessing.Queue,
+                 client_id: int, timeout: float = 5.0):
+        self._table_name = table_name
+        self._requests = requests
+        self._replies = replies
+        self._client_id = client_id
+        self._timeout = timeout
+        self._lock = multiprocessing.Lock()
+        self._counter = 0
+
+    def __getattr__(self, method: str):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        return functools.partial(self._call, method)
+
+    def snapshot(self):
+        """Get a copy of the table"""
+        return self._call("snapshot")
+
+    def _call(self, method: str, *args, **kwargs):
+        with self._lock:
+            self._counter += 1
+            request_id = (os.getpid(), self._counter)
+            self._requests.put((self._client_id, request_id, self._table_name, method, args, kwargs))
+            while True:
+                reply_id, ok, result = self._replies.get(timeout=self._timeout)
+                if reply_id == request_id:  # skip answers to calls that timed out before
+                    break
+        if not ok:
+            raise result
+        return result
@@ -0,0 +1,217 @@
+"""Hierarchical timer wheel, used by the execution loops of the layers to schedule periodic tasks and deadlines"""
+
+import math
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+
+class Timer(object):
+    """Handle of a timer scheduled in a TimerWheel, used to cancel it
+    :param expiry: tick at which the timer fires
+    :param callback: function called when the timer fires
+    :param args: arguments of the callback
+    :param interval: if set, the timer is scheduled again interval seconds after it fired
+    """
+
+    __slots__ = ("expiry", "callback", "args", "interval", "_bucket")
+
+    def __init__(self, expiry: int, callback: Callable, args: tuple, interval: Optional[float]):
+        self.expiry = expiry
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self._bucket: dict = None
+
+    @property
+    def active(self) -> bool:
+        """True if the timer is scheduled and was not cancelled"""
+        return self._bucket is not None
+
+
+class TimerWheel(object):
+    """Hierarchical timer wheel. Scheduling and cancelling a timer is O(1), independent of the number of timers.
+    Time is divided into ticks; level 0 has one slot per tick, each slot of level n covers all slots of level n - 1.
+    Timers are put into the slot of their expiry on the lowest level covering it, and moved down a level when the
+    wheel reaches the slot (cascading). Timers fire at most one tick late.
+    The wheel is not thread safe, it is driven by a single execution loop: the loop waits at most next_timeout()
+    seconds and calls expire() afterwards.
+    :param tick: resolution of the wheel in seconds
+    :param bits: log2 of the number of slots per level
+    :param levels: number of levels, timers further in the future than tick * 2 ** (bits * levels) are cascaded again
+    :param clock: monotonic clock returning seconds
+    """
+
+    def __init__(self, tick: float = 0.01, bits: int = 8, levels: int = 4, clock: Callable[[], float] = time.monotonic):
+        self.tick = tick
+        self._bits = bits
+        self._mask = (1 << bits) - 1
+        self._levels = [[{} for _ in range(1 << bits)] for _ in range(levels)]
+        self._clock = clock
+        self._origin = clock()
+        self._current = 0  # last tick processed by expire
+        self._count = 0
+        self._next_expiry: Optional[int] = None  # cached lower bound of the earliest expiry on level 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay: float, callback: Callable, *args, interval: float = None) -> Timer:
+        """Schedule a callback
+        :param delay: seconds until the callback is called
+        :param callback: function to be called
+        :param args: arguments of the callback
+        :param interval: if set, the callback is called again every interval seconds until the timer is cancelled
+        :return: handle of the timer
+        """
+        timer = Timer(self._tick_of(self._clock() + delay), callback, args, interval)
+        self._insert(timer)
+        return timer
+
+    def cancel(self, timer: Timer):
+        """Cancel a timer, does nothing if it already fired or was cancelled
+        :param timer: handle returned by schedule
+        """
+        if timer._bucket is not None:
+            del timer._bucket[timer]
+            timer._bucket = None
+            self._count -= 1
+        timer.interval = None
+
+    def reschedule(self, timer: Timer, delay: float):
+        """Move a timer to a new deadline, e.g. if the entry it belongs to was refreshed
+        :param timer: handle returned by schedule
+        :param delay: seconds from now until the timer fires
+        """
+        if timer._bucket is not None:
+            del timer._bucket[timer]
+            self._count -= 1
+        timer.expiry = self._tick_of(self._clock() + delay)
+        self._insert(timer)
+
+    def next_timeout(self) -> Optional[float]:
+        """Seconds until expire has to be called for the next timer to fire, None if no timer is scheduled"""
+        if self._count == 0:
+            return None
+        if self._next_expiry is None:
+            self._next_expiry = self._find_next_expiry()
+        return max(0.0, self._origin + self._next_expiry * self.tick - self._clock())
+
+    def expire(self, fire: Callable[[Timer], None] = None) -> int:
+        """Fire all timers that are due. Callbacks are called in the calling thread, exceptions are passed on.
+        :param fire: if set, called with each due timer instead of calling its callback
+        :return: number of timers fired
+        """
+        target = int((self._clock() - self._origin) / self.tick + 1e-9)
+        if self._count == 0:
+            self._current = max(self._current, target)
+        fired = 0
+        while self._current < target:
+            self._current += 1
+            level, index = 0, self._current & self._mask
+            while index == 0 and level + 1 < len(self._levels):  # level wrapped, move the next slot down
+                level += 1
+                index = (self._current >> (self._bits * level)) & self._mask
+                self._cascade(self._levels[level][index])
+            bucket = self._levels[0][self._current & self._mask]
+            while bucket:
+                timer = next(iter(bucket))
+                del bucket[timer]
+                timer._bucket = None
+                self._count -= 1
+                if timer.interval is not None:
+                    timer.expiry = max(self._current + 1, timer.expiry + max(1, round(timer.interval / self.tick)))
+                    self._insert(timer)
+                fired += 1
+                if fire is not None:
+                    fire(timer)
+                else:
+                    timer.callback(*timer.args)
+        if self._next_expiry is not None and self._next_expiry <= self._current:
+            self._next_expiry = None
+        return fired
+
+    def _tick_of(self, deadline: float) -> int:
+        expiry = math.ceil((deadline - self._origin) / self.tick - 1e-9)  # round up, timers never fire early
+        return max(expiry, self._current + 1)
+
+    def _insert(self, timer: Timer):
+        expiry = max(timer.expiry, self._current + 1)
+        delta = expiry - self._current
+        level = 0
+        while delta >> (self._bits * (level + 1)) and level + 1 < len(self._levels):
+            level += 1
+        if level == len(self._levels) - 1 and delta >> (self._bits * (level + 1)):
+            expiry = self._current + (1 << (self._bits * (level + 1))) - 1  # cascaded again when reached
+        bucket = self._levels[level][(expiry >> (self._bits * level)) & self._mask]
+        bucket[timer] = None
+        timer._bucket = bucket
+        self._count += 1
+        if level == 0 and self._next_expiry is not None and expiry < self._next_expiry:
+            self._next_expiry = expiry
+
+    def _cascade(self, bucket: dict):
+        timers = list(bucket)
+        bucket.clear()
+        self._count -= len(timers)
+        for timer in timers:
+            self._insert(timer)
+
+    def _find_next_expiry(self) -> int:
+        """Earliest expiry on level 0, or the next tick at which a higher level is cascaded"""
+        level0 = self._levels[0]
+        for tick in range(self._current + 1, ((self._current >> self._bits) + 1) << self._bits):
+            if level0[tick & self._mask]:
+                return tick
+        return ((self._current >> self._bits) + 1) << self._bits
+
+
+class TimerThread(object):
+    """Thread driving a TimerWheel, for code that is not executed by the execution loop of a layer (e.g. ageing
+    started by a program holding the tables). All timers of a process share one thread, instead of starting a thread
+    per timer. Callbacks are executed by the timer thread and must not block.
+    """
+
+    _shared: 'TimerThread' = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, tick: float = 0.01):
+        self.wheel = TimerWheel(tick)
+        self._pid = os.getpid()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="TimerThread", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def shared() -> 'TimerThread':
+        """The timer thread of the current process, started on first use"""
+        with TimerThread._shared_lock:
+            shared = TimerThread._shared
+            if shared is None or not shared._thread.is_alive() or shared._pid != os.getpid():
+                shared = TimerThread._shared = TimerThread()
+            return shared
+
+    def schedule(self, delay: float, callback: Callable, *args, interval: float = None) -> Timer:
+        """Schedule a callback, see TimerWheel.schedule. Can be called from any thread."""
+        with self._condition:
+            timer = self.wheel.schedule(delay, callback, *args, interval=interval)
+            self._condition.notify()
+        return timer
+
+    def cancel(self, timer: Timer):
+        """Cancel a timer, see TimerWheel.cancel. Can be called from any thread."""
+        with self._condition:
+            self.wheel.cancel(timer)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait(self.wheel.next_timeout())
+                due = []
+                self.wheel.expire(due.append)
+            for timer in due:
+                try:
+                    timer.callback(*timer.args)
+                except Exception:
+                    pass
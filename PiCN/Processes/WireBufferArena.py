@@ -0,0 +1,161 @@
+"""Shared-memory ring for wire format packets that are passed between layer processes by descriptor"""
+
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+
+class WireBufferOverwritten(Exception):
+    """The data of a WireBuffer was overwritten by the writer of the arena"""
+
+
+class WireBufferArena(object):
+    """Ring buffer in shared memory, that holds wire format packets. The link layer receives packets into the arena
+    and passes only a WireBuffer (a small descriptor: arena name, position and length) to the higher layers, so
+    large packets are not pickled and copied on each queue between the layer processes.
+    The arena has a single writer (the link layer). Positions are absolute (they grow monotonically), so a reader can
+    tell if its data was overwritten: the writer publishes the highest position it writes to before writing, data at
+    position p is valid as long as this limit is at most p + size.
+    :param size: size of the ring in bytes
+    :param min_size: packets smaller than min_size are passed as bytes, since pickling them is cheaper than a
+                     descriptor
+    """
+
+    _header = struct.Struct("QQ")  # next write position, highest position written to
+    _attached: Dict[str, shared_memory.SharedMemory] = {}
+
+    def __init__(self, size: int = 1 << 24, min_size: int = 1024):
+        self.size = size
+        self.min_size = min_size
+        self._shm = shared_memory.SharedMemory(create=True, size=self._header.size + size)
+        self._header.pack_into(self._shm.buf, 0, 0, 0)
+        self._creator = os.getpid()
+        WireBufferArena._attached[self._shm.name] = self._shm
+
+    def __getstate__(self):
+        return {"name": self._shm.name, "size": self.size, "min_size": self.min_size, "creator": self._creator}
+
+    def __setstate__(self, state):
+        self.size = state["size"]
+        self.min_size = state["min_size"]
+        self._creator = state["creator"]
+        self._shm = WireBufferArena.attach(state["name"])
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @staticmethod
+    def attach(name: str) -> shared_memory.SharedMemory:
+        """Shared memory of an arena, attached once per process"""
+        shm = WireBufferArena._attached.get(name)
+        if shm is None:
+            shm = shared_memory.SharedMemory(name=name)
+            WireBufferArena._attached[name] = shm
+        return shm
+
+    def close(self):
+        """Release the arena, the shared memory is removed if called by the process that created the arena"""
+        WireBufferArena._attached.pop(self._shm.name, None)
+        self._shm.close()
+        if os.getpid() == self._creator:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # writer
+
+    def reserve(self, length: int) -> Tuple[int, memoryview]:
+        """Reserve space for a packet of at most length bytes. The space is reused by the next reserve, unless it is
+        committed. Must only be called by the writer of the arena.
+        :param length: maximum length of the packet
+        :return: position of the space and a writable view of it
+        """
+        if length > self.size:
+            raise ValueError("Packet larger than the arena")
+        buf = self._shm.buf
+        position, limit = self._header.unpack_from(buf, 0)
+        offset = position % self.size
+        if offset + length > self.size:  # do not wrap a packet around the end of the ring
+            position += self.size - offset
+            offset = 0
+        if position + length > limit:
+            self._header.pack_into(buf, 0, position, position + length)
+        start = self._header.size + offset
+        return position, buf[start:start + length]
+
+    def commit(self, position: int, length: int) -> 'WireBuffer':
+        """Mark length bytes at a reserved position as used
+        :return: the descriptor of the packet
+        """
+        buf = self._shm.buf
+        limit = self._header.unpack_from(buf, 0)[1]
+        self._header.pack_into(buf, 0, position + length, max(limit, position + length))
+        return WireBuffer(self._shm.name, self.size, position, length)
+
+    def write(self, data) -> 'WireBuffer':
+        """Copy a packet into the arena. Must only be called by the writer of the arena.
+        :param data: the packet in wire format
+        :return: the descriptor of the packet
+        """
+        position, view = self.reserve(len(data))
+        view[:] = data
+        view.release()
+        return self.commit(position, len(data))
+
+
+class WireBuffer(object):
+    """Descriptor of a packet in a WireBufferArena. Pickling a WireBuffer does not copy the packet.
+    :param arena_name: name of the shared memory of the arena
+    :param arena_size: size of the ring of the arena
+    :param position: absolute position of the packet in the arena
+    :param length: length of the packet in bytes
+    """
+
+    __slots__ = ("arena_name", "arena_size", "position", "length")
+
+    def __init__(self, arena_name: str, arena_size: int, position: int, length: int):
+        self.arena_name = arena_name
+        self.arena_size = arena_size
+        self.position = position
+        self.length = length
+
+    def __getstate__(self):
+        return self.arena_name, self.arena_size, self.position, self.length
+
+    def __setstate__(self, state):
+        self.arena_name, self.arena_size, self.position, self.length = state
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return "WireBuffer(%s, position=%d, length=%d)" % (self.arena_name, self.position, self.length)
+
+    def valid(self) -> bool:
+        """True if the packet was not overwritten yet"""
+        buf = WireBufferArena.attach(self.arena_name).buf
+        return WireBufferArena._header.unpack_from(buf, 0)[1] <= self.position + self.arena_size
+
+    def view(self) -> memoryview:
+        """View of the packet in the shared memory, without copying it. The view may be overwritten if the writer
+        laps the ring; check valid() after reading from the view.
+        """
+        buf = WireBufferArena.attach(self.arena_name).buf
+        start = WireBufferArena._header.size + self.position % self.arena_size
+        return buf[start:start + self.length]
+
+    def tobytes(self, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Copy of the packet, or of a part of it
+        :param start: first byte to copy
+        :param end: end of the part to copy, default is the end of the packet
+        :raise WireBufferOverwritten: if the packet was overwritten
+        """
+        view = self.view()
+        data = bytes(view[start:end])
+        view.release()
+        if not self.valid():
+            raise WireBufferOverwritten(repr(self))
+        return data
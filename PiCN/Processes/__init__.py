@@ -1,5 +1,14 @@
 """Abstract superclasses for PiCN"""
 
 from .PiCNProcess import PiCNProcess
+from .InProcessQueue import InProcessQueue
+from .BatchingQueue import BatchingQueue, PacketBatch
+from .BoundedQueue import BoundedQueue, DropPolicy
+from .TimerWheel import TimerWheel, TimerThread, Timer
+from .AsyncioLayerRuntime import AsyncioLayerRuntime
 from .LayerProcess import LayerProcess
 from .PiCNSyncDataStructFactory import PiCNSyncDataStructFactory
+from .TableChannel import TableChannel, TableClient
+from .WireBufferArena import WireBufferArena, WireBuffer, WireBufferOverwritten
+from .ShardedQueue import ShardedQueue
+from .ForkServer import use_fork_server
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Test the AsyncioLayerRuntime"""
+
+import asyncio
+import time
+import unittest
+
+from multiprocessing import Queue
+from PiCN.LayerStack import LayerStack
+from PiCN.Processes import LayerProcess
+
+
+class LayerMock(LayerProcess):
+    """ Mock implementation of a LayerProcess """
+    def __init__(self):
+        LayerProcess.__init__(self)
+
+    def data_from_lower(self, to_lower: Queue, to_higher: Queue, data):
+        to_higher.put(data)
+
+    def data_from_higher(self, to_lower: Queue, to_higher: Queue, data):
+        to_lower.put(data)
+
+
+class AsyncLayerMock(LayerProcess):
+    """ Mock implementation of a LayerProcess with a coroutine handler, that waits before answering """
+    def __init__(self):
+        LayerProcess.__init__(self)
+        self.ticks = 0
+
+    def data_from_lower(self, to_lower: Queue, to_higher: Queue, data):
+        to_higher.put(data)
+
+    async def data_from_higher(self, to_lower: Queue, to_higher: Queue, data):
+        await asyncio.sleep(0.5)
+        to_lower.put(data)
+
+    def periodic_tasks(self):
+        return [(0.1, self.tick)]
+
+    def tick(self):
+        self.ticks += 1
+        self.queue_to_lower.put("tick")
+
+
+class TestAsyncioLayerRuntime(unittest.TestCase):
+    """Test the AsyncioLayerRuntime"""
+
+    def setUp(self):
+        self.lstack: LayerStack = None
+        self.layer: LayerProcess = None
+
+    def tearDown(self):
+        if self.lstack is not None:
+            self.lstack.stop_all()
+            self.lstack.close_all()
+        if self.layer is not None:
+            self.layer.stop_process()
+
+    def test_layer_process_with_asyncio(self):
+        """Test a layer in its own process using the asyncio runtime"""
+        self.layer = LayerMock()
+        self.layer.use_asyncio = True
+        self.layer.queue_from_higher = Queue()
+        self.layer.queue_from_lower = Queue()
+        self.layer.queue_to_higher = Queue()
+        self.layer.queue_to_lower = Queue()
+        self.layer.start_process()
+        self.layer.queue_from_higher.put("down")
+        self.assertEqual("down", self.layer.queue_to_lower.get(timeout=2.0))
+        self.layer.queue_from_lower.put("up")
+        self.assertEqual("up", self.layer.queue_to_higher.get(timeout=2.0))
+
+    def test_in_process_stack_with_asyncio(self):
+        """Test an in-process layer stack driven by the asyncio runtime"""
+        self.lstack = LayerStack([LayerMock(), LayerMock(), LayerMock()], in_process=True, use_asyncio=True)
+        self.lstack.start_all()
+        for i in range(10):
+            self.lstack.queue_from_higher.put([i, "down"])
+        for i in range(10):
+            self.assertEqual([i, "down"], self.lstack.queue_to_lower.get(timeout=2.0))
+        self.lstack.queue_from_lower.put([1, "up"])
+        self.assertEqual([1, "up"], self.lstack.queue_to_higher.get(timeout=2.0))
+
+    def test_concurrent_coroutine_handler(self):
+        """Test that coroutine handlers are executed concurrently"""
+        self.lstack = LayerStack([AsyncLayerMock(), LayerMock()], in_process=True, use_asyncio=True)
+        self.lstack.start_all()
+        start = time.time()
+        for i in range(20):
+            self.lstack.queue_from_higher.put([i, "req"])
+        results = []
+        while len(results) < 20:
+            data = self.lstack.queue_to_lower.get(timeout=2.0)
+            if data != "tick":
+                results.append(data)
+        self.assertLess(time.time() - start, 2.0)
+        self.assertEqual(sorted(r[0] for r in results), list(range(20)))
+
+    def test_periodic_task(self):
+        """Test that periodic tasks are executed by the runtime"""
+        layer = AsyncLayerMock()
+        self.lstack = LayerStack([layer, LayerMock()], in_process=True, use_asyncio=True)
+        self.lstack.start_all()
+        self.assertEqual("tick", self.lstack.queue_to_lower.get(timeout=2.0))
+        self.assertEqual("tick", self.lstack.queue_to_lower.get(timeout=2.0))
+        self.assertGreaterEqual(layer.ticks, 2)
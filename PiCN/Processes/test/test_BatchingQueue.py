@@ -0,0 +1,74 @@
+"""Test the BatchingQueue"""
+
+import multiprocessing
+import threading
+import time
+import unittest
+
+from PiCN.Processes import BatchingQueue, PacketBatch, LayerProcess
+
+
+class LayerMock(LayerProcess):
+    """Layer that records the data it receives"""
+
+    def __init__(self):
+        super().__init__(logger_name="LayerMock")
+        self.received = []
+
+    def data_from_lower(self, to_lower, to_higher, data):
+        self.received.append(data)
+
+    def data_from_higher(self, to_lower, to_higher, data):
+        self.received.append(data)
+
+
+class test_BatchingQueue(unittest.TestCase):
+    """Test the BatchingQueue"""
+
+    def setUp(self):
+        self.mpqueue = multiprocessing.Queue()
+        self.queue = BatchingQueue(self.mpqueue, batch_size=3, max_delay=10.0)
+        self.queue.bind_to_current_thread()
+
+    def tearDown(self):
+        self.mpqueue.close()
+
+    def test_batch_on_size(self):
+        """Test that a batch is sent if batch_size items were put"""
+        self.queue.put([1, "a"])
+        self.queue.put([2, "b"])
+        self.assertTrue(self.mpqueue.empty())
+        self.queue.put([3, "c"])
+        batch = self.mpqueue.get(timeout=2.0)
+        self.assertIsInstance(batch, PacketBatch)
+        self.assertEqual([[1, "a"], [2, "b"], [3, "c"]], batch)
+
+    def test_flush_single_item(self):
+        """Test that a single buffered item is sent unbatched on flush"""
+        self.queue.put([1, "a"])
+        self.queue.flush()
+        data = self.mpqueue.get(timeout=2.0)
+        self.assertNotIsInstance(data, PacketBatch)
+        self.assertEqual([1, "a"], data)
+
+    def test_batch_on_delay(self):
+        """Test that a batch is sent if the first item is older than max_delay"""
+        self.queue.max_delay = 0.05
+        self.queue.put([1, "a"])
+        time.sleep(0.1)
+        self.queue.put([2, "b"])
+        self.assertEqual([[1, "a"], [2, "b"]], self.mpqueue.get(timeout=2.0))
+
+    def test_put_from_other_thread(self):
+        """Test that items put by other threads are not buffered"""
+        t = threading.Thread(target=self.queue.put, args=[[1, "timer"]])
+        t.start()
+        t.join()
+        self.assertEqual([1, "timer"], self.mpqueue.get(timeout=2.0))
+
+    def test_layer_unpacks_batch(self):
+        """Test that a layer receives the items of a batch one by one"""
+        layer = LayerMock()
+        layer._from_lower(None, None, PacketBatch([[1, "a"], [2, "b"]]))
+        layer._from_higher(None, None, [3, "c"])
+        self.assertEqual([[1, "a"], [2, "b"], [3, "c"]], layer.received)
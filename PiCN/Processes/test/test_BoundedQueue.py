@@ -0,0 +1,69 @@
+"""Test the BoundedQueue"""
+
+import multiprocessing
+import unittest
+
+from PiCN.Packets import Content, Interest, Nack, NackReason
+from PiCN.Processes import BoundedQueue, DropPolicy, PacketBatch
+
+
+class test_BoundedQueue(unittest.TestCase):
+    """Test the BoundedQueue"""
+
+    def setUp(self):
+        self.raw = multiprocessing.Queue(8)
+        self.reverse = multiprocessing.Queue()
+        self.queue = BoundedQueue(self.raw, self.reverse, 8, high_watermark=4, low_watermark=2)
+
+    def tearDown(self):
+        self.raw.close()
+        self.reverse.close()
+
+    def test_drop_interests(self):
+        """Test that Interests are dropped and answered with a congestion Nack above the high watermark"""
+        for i in range(4):
+            self.queue.put([1, Interest("/test/" + str(i))])
+        self.queue.put([2, Interest("/test/dropped")])
+        nack = self.reverse.get(timeout=2.0)
+        self.assertEqual(2, nack[0])
+        self.assertIsInstance(nack[1], Nack)
+        self.assertEqual(NackReason.CONGESTION, nack[1].reason)
+        self.assertEqual("/test/dropped", nack[1].name.components_to_string())
+        self.queue.put([1, Content("/test/content", "data")])
+        self.assertEqual(5, self.raw.qsize())
+        stats = self.queue.stats()
+        self.assertEqual(5, stats["depth"])
+        self.assertEqual(1, stats["dropped"])
+        self.assertEqual(1, stats["congestion_nacks"])
+        self.assertEqual(1, stats["congested"])
+
+    def test_capacity(self):
+        """Test that all packets are dropped if the queue is full"""
+        for i in range(10):
+            self.queue.put([1, Content("/test/" + str(i), "data")])
+        self.assertEqual(8, self.raw.qsize())
+        self.assertEqual(2, self.queue.stats()["dropped"])
+        self.assertEqual(8, self.queue.stats()["max_depth"])
+        self.assertTrue(self.reverse.empty())
+
+    def test_low_watermark(self):
+        """Test that a congested queue accepts Interests again after it drained to the low watermark"""
+        for i in range(5):
+            self.queue.put([1, Interest("/test/" + str(i))])
+        self.assertEqual(4, self.raw.qsize())
+        self.raw.get(timeout=2.0)
+        self.queue.put([1, Interest("/test/still/congested")])
+        self.assertEqual(3, self.raw.qsize())
+        self.raw.get(timeout=2.0)
+        self.queue.put([1, Interest("/test/accepted")])
+        self.assertEqual(3, self.raw.qsize())
+        self.assertEqual(2, self.queue.stats()["dropped"])
+
+    def test_tail_drop(self):
+        """Test that a congested queue with tail drop policy drops all packets"""
+        self.queue = BoundedQueue(self.raw, self.reverse, 8, high_watermark=2, policy=DropPolicy.TAIL_DROP)
+        self.queue.put(PacketBatch([[1, Content("/test/" + str(i), "data")] for i in range(3)]))
+        self.queue.put([1, Content("/test/c", "data")])
+        self.queue.put([1, Content("/test/d", "data")])
+        self.assertEqual(2, self.raw.qsize())  # a batch is one message
+        self.assertEqual(1, self.queue.stats()["dropped"])
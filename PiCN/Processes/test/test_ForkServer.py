@@ -0,0 +1,51 @@
+"""Test the fork server"""
+
+import subprocess
+import sys
+import unittest
+
+# the start method of a program can only be set once, so the tests run in a new interpreter
+FORK_SERVER_STACK = """
+import multiprocessing, os
+from PiCN.LayerStack import LayerStack
+from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
+from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder
+from PiCN.Packets import Interest
+from PiCN.Processes import use_fork_server
+
+if __name__ == "__main__":
+    print(use_fork_server(force=True))
+    print(multiprocessing.get_start_method())
+    layer = BasicPacketEncodingLayer(SimpleStringEncoder())
+    lstack = LayerStack([layer])
+    lstack.start_all()
+    lstack.queue_from_higher.put([1, Interest("/test/data")])
+    print(lstack.queue_to_lower.get(timeout=5.0)[1].decode())
+    print(layer.process.pid != os.getpid())
+    lstack.stop_all()
+    lstack.close_all()
+"""
+
+
+class test_ForkServer(unittest.TestCase):
+    """Test the fork server"""
+
+    def run_script(self, script: str) -> list:
+        result = subprocess.run([sys.executable, "-c", script], stdout=subprocess.PIPE, timeout=30)
+        return result.stdout.decode().split("\n")
+
+    def test_layer_stack_from_fork_server(self):
+        """Test starting the processes of a LayerStack from the fork server"""
+        output = self.run_script(FORK_SERVER_STACK)
+        self.assertEqual("True", output[0])
+        self.assertEqual("forkserver", output[1])
+        self.assertEqual("I:/test/data:", output[2])
+        self.assertEqual("True", output[3])
+
+    def test_default_fork(self):
+        """Test that the fork server is only used if forced on platforms forking by default"""
+        output = self.run_script("import multiprocessing\n"
+                                 "from PiCN.Processes import use_fork_server\n"
+                                 "default = multiprocessing.get_start_method()\n"
+                                 "print(default, use_fork_server() == (default != 'fork'))\n")
+        self.assertTrue(output[0].endswith(" True"))
@@ -16,6 +16,11 @@ class LayerMock(LayerProcess):
     def data_from_higher(self, to_lower: Queue, to_higher: Queue, data):
         to_lower.put(data)
 
+class TimerLayerMock(LayerMock):
+    """ Mock implementation of a LayerProcess, that answers data from lower after a delay """
+    def data_from_lower(self, to_lower: Queue, to_higher: Queue, data):
+        self.schedule_timer(0.2, to_higher.put, data)
+
 class TestLayerProcess(unittest.TestCase):
     """Test the Abstract Class LayerProcess"""
 
@@ -47,3 +52,14 @@ class TestLayerProcess(unittest.TestCase):
         self.q2_fromLower.put("Testdata")
         output = self.q3_toHigher.get()
         self.assertEqual(output, "Testdata")
+
+    def test_timer(self):
+        """ Test that timers scheduled by a handler are fired by the execution loop """
+        self.layer = TimerLayerMock()
+        self.layer.queue_from_lower = self.q2_fromLower
+        self.layer.queue_to_higher = self.q3_toHigher
+        self.layer.start_process()
+        self.q2_fromLower.put("Testdata")
+        self.assertTrue(self.q3_toHigher.empty())
+        output = self.q3_toHigher.get(timeout=2.0)
+        self.assertEqual(output, "Testdata")
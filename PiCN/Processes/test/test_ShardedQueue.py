@@ -0,0 +1,34 @@
+"""Test the ShardedQueue"""
+
+import multiprocessing
+import unittest
+
+from PiCN.Processes import ShardedQueue, PacketBatch
+
+
+class test_ShardedQueue(unittest.TestCase):
+    """Test the ShardedQueue"""
+
+    def setUp(self):
+        self.shards = [multiprocessing.Queue() for _ in range(3)]
+        self.queue = ShardedQueue(self.shards, lambda data: data[0] % 3)
+
+    def tearDown(self):
+        self.queue.close()
+
+    def test_dispatch(self):
+        """Test that items are put into the queue of their shard"""
+        self.queue.put([4, "a"])
+        self.queue.put([2, "b"])
+        self.assertEqual([4, "a"], self.shards[1].get(timeout=2.0))
+        self.assertEqual([2, "b"], self.shards[2].get(timeout=2.0))
+        self.assertTrue(self.shards[0].empty())
+
+    def test_dispatch_batch(self):
+        """Test that a batch is split into one batch per shard"""
+        self.queue.put(PacketBatch([[1, "a"], [4, "b"], [2, "c"]]))
+        batch = self.shards[1].get(timeout=2.0)
+        self.assertIs(PacketBatch, type(batch))
+        self.assertEqual([[1, "a"], [4, "b"]], batch)
+        self.assertEqual([2, "c"], self.shards[2].get(timeout=2.0))
+        self.assertTrue(self.shards[0].empty())
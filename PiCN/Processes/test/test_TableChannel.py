@@ -0,0 +1,93 @@
+"""Test the TableChannel"""
+
+import multiprocessing
+import unittest
+
+from PiCN.LayerStack import LayerStack
+from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Packets import Name
+from PiCN.Processes import LayerProcess, TableChannel
+
+
+class OwnerLayerMock(LayerProcess):
+    """Layer owning a FIB, that answers each message from higher with the number of FIB entries"""
+
+    def __init__(self, fib):
+        super().__init__(logger_name="OwnerLayerMock")
+        self.fib = fib
+
+    def data_from_lower(self, to_lower, to_higher, data):
+        pass
+
+    def data_from_higher(self, to_lower, to_higher, data):
+        to_higher.put(self.fib.get_container_size())
+
+
+class TickLayerMock(LayerProcess):
+    """Layer with a periodic task"""
+
+    def data_from_lower(self, to_lower, to_higher, data):
+        pass
+
+    def data_from_higher(self, to_lower, to_higher, data):
+        pass
+
+    def periodic_tasks(self):
+        return [(0.1, lambda: self.queue_to_higher.put("tick"))]
+
+
+class test_TableChannel(unittest.TestCase):
+    """Test the TableChannel"""
+
+    def setUp(self):
+        self.channel = TableChannel()
+        self.layer = OwnerLayerMock(ForwardingInformationBaseMemoryPrefix())
+        self.channel.attach(self.layer, {"fib": self.layer.fib})
+        self.client = self.channel.client("fib")
+        self.lstack = LayerStack([self.layer])
+
+    def tearDown(self):
+        self.lstack.stop_all()
+        self.lstack.close_all()
+        self.channel.close()
+
+    def test_call_owner(self):
+        """Test that calls of a client are executed on the table of the owning process"""
+        self.lstack.start_all()
+        self.client.add_fib_entry(Name("/test"), [1], True)
+        self.assertEqual([1], self.client.find_fib_entry(Name("/test/data")).faceid)
+        self.assertEqual(0, self.layer.fib.get_container_size())
+        self.lstack.queue_from_higher.put("size")
+        self.assertEqual(1, self.lstack.queue_to_higher.get(timeout=2.0))
+
+    def test_snapshot(self):
+        """Test getting a copy of the table"""
+        self.lstack.start_all()
+        self.client.add_fib_entry(Name("/test"), [1], True)
+        snapshot = self.client.snapshot()
+        self.assertEqual(Name("/test"), snapshot.container[0].name)
+
+    def test_exception(self):
+        """Test that exceptions in the owner are raised in the client"""
+        self.lstack.start_all()
+        with self.assertRaises(AttributeError):
+            self.client.no_such_method()
+
+    def test_in_process_stack(self):
+        """Test that an in-process owner serves the channel"""
+        self.lstack = LayerStack([self.layer], in_process=True)
+        self.lstack.start_all()
+        self.client.add_fib_entry(Name("/test"), [1], True)
+        self.assertEqual(1, self.layer.fib.get_container_size())
+
+    def test_periodic_in_loop(self):
+        """Test that periodic tasks are executed by the execution loop of the layer process"""
+        layer = TickLayerMock()
+        layer.periodic_in_loop = True
+        lstack = LayerStack([layer])
+        lstack.start_all()
+        try:
+            self.assertEqual("tick", lstack.queue_to_higher.get(timeout=2.0))
+        finally:
+            lstack.stop_all()
+            lstack.close_all()
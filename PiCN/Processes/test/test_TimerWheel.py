@@ -0,0 +1,102 @@
+"""Test the TimerWheel"""
+
+import threading
+import unittest
+
+from PiCN.Processes import TimerWheel, TimerThread
+
+
+class ClockMock(object):
+    """Clock advanced by the test"""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class test_TimerWheel(unittest.TestCase):
+    """Test the TimerWheel"""
+
+    def setUp(self):
+        self.clock = ClockMock()
+        self.wheel = TimerWheel(tick=0.01, clock=self.clock)
+        self.fired = []
+
+    def advance(self, seconds: float, step: float = 0.005):
+        end = self.clock.now + seconds
+        while self.clock.now < end:
+            self.clock.now = min(end, self.clock.now + step)
+            self.wheel.expire()
+
+    def test_fire_in_order(self):
+        """Test that timers fire after their delay, in the order of their deadlines"""
+        self.wheel.schedule(0.5, self.fired.append, "b")
+        self.wheel.schedule(0.2, self.fired.append, "a")
+        self.assertEqual(2, len(self.wheel))
+        self.advance(0.19)
+        self.assertEqual([], self.fired)
+        self.advance(0.03)
+        self.assertEqual(["a"], self.fired)
+        self.advance(0.5)
+        self.assertEqual(["a", "b"], self.fired)
+        self.assertEqual(0, len(self.wheel))
+        self.assertIsNone(self.wheel.next_timeout())
+
+    def test_cancel_reschedule(self):
+        """Test cancelling and rescheduling timers"""
+        t1 = self.wheel.schedule(0.1, self.fired.append, 1)
+        t2 = self.wheel.schedule(0.1, self.fired.append, 2)
+        self.wheel.cancel(t1)
+        self.assertFalse(t1.active)
+        self.wheel.reschedule(t2, 1.0)
+        self.assertEqual(1, len(self.wheel))
+        self.advance(0.5)
+        self.assertEqual([], self.fired)
+        self.advance(0.6)
+        self.assertEqual([2], self.fired)
+        self.wheel.cancel(t2)
+
+    def test_periodic(self):
+        """Test that periodic timers fire until they are cancelled"""
+        timer = self.wheel.schedule(0.1, self.fired.append, "tick", interval=0.1)
+        self.advance(1.0)
+        self.assertEqual(10, len(self.fired))
+        self.wheel.cancel(timer)
+        self.advance(1.0)
+        self.assertEqual(10, len(self.fired))
+        self.assertEqual(0, len(self.wheel))
+
+    def test_cascading(self):
+        """Test timers on higher levels and beyond the range of the wheel"""
+        self.wheel = TimerWheel(tick=0.01, bits=2, levels=2, clock=self.clock)  # 16 ticks per rotation
+        for delay in [0.03, 0.1, 0.15, 0.5, 2.0]:
+            self.wheel.schedule(delay, self.fired.append, delay)
+        self.advance(0.12, step=0.01)
+        self.assertEqual([0.03, 0.1], self.fired)
+        self.advance(0.4, step=0.03)
+        self.assertEqual([0.03, 0.1, 0.15, 0.5], self.fired)
+        self.advance(1.4, step=0.01)
+        self.assertEqual([0.03, 0.1, 0.15, 0.5], self.fired)
+        self.advance(0.1)
+        self.assertEqual([0.03, 0.1, 0.15, 0.5, 2.0], self.fired)
+
+    def test_next_timeout(self):
+        """Test the time until the next timer is due"""
+        self.assertIsNone(self.wheel.next_timeout())
+        self.wheel.schedule(0.5, self.fired.append, 1)
+        self.assertAlmostEqual(0.5, self.wheel.next_timeout(), places=5)
+        self.wheel.schedule(0.1, self.fired.append, 2)
+        self.assertAlmostEqual(0.1, self.wheel.next_timeout(), places=5)
+        self.clock.now += 0.1
+        self.assertEqual(0.0, self.wheel.next_timeout())
+        self.assertEqual(1, self.wheel.expire())
+        self.assertAlmostEqual(0.4, self.wheel.next_timeout(), places=5)
+
+    def test_timer_thread(self):
+        """Test that the timer thread of the process fires timers"""
+        event = threading.Event()
+        TimerThread.shared().schedule(0.05, event.set)
+        self.assertTrue(event.wait(2.0))
+        self.assertIs(TimerThread.shared(), TimerThread.shared())
@@ -0,0 +1,89 @@
+"""Test the WireBufferArena"""
+
+import multiprocessing
+import pickle
+import unittest
+
+from PiCN.Packets import Content, Name
+from PiCN.Processes import WireBufferArena, WireBufferOverwritten
+
+
+def read_buffer(wire_buffer, results: multiprocessing.Queue):
+    results.put(wire_buffer.tobytes())
+
+
+class test_WireBufferArena(unittest.TestCase):
+    """Test the WireBufferArena"""
+
+    def setUp(self):
+        self.arena = WireBufferArena(size=4096, min_size=16)
+
+    def tearDown(self):
+        self.arena.close()
+
+    def test_write_and_read(self):
+        """Test writing a packet to the arena and reading it"""
+        wire_buffer = self.arena.write(b"packet data")
+        self.assertEqual(11, len(wire_buffer))
+        self.assertTrue(wire_buffer.valid())
+        self.assertEqual(b"packet data", wire_buffer.tobytes())
+        self.assertEqual(b"data", wire_buffer.tobytes(7))
+        view = wire_buffer.view()
+        self.assertEqual(b"packet", bytes(view[:6]))
+        view.release()
+
+    def test_reserve_and_commit(self):
+        """Test that only committed space is kept"""
+        position, view = self.arena.reserve(100)
+        view[:5] = b"first"
+        view.release()
+        first = self.arena.commit(position, 5)
+        position, view = self.arena.reserve(100)
+        view.release()
+        position, view = self.arena.reserve(100)
+        view[:6] = b"second"
+        view.release()
+        second = self.arena.commit(position, 6)
+        self.assertEqual(b"first", first.tobytes())
+        self.assertEqual(b"second", second.tobytes())
+        self.assertEqual(first.position + 5, second.position)
+
+    def test_overwritten(self):
+        """Test that a packet overwritten by the writer is detected"""
+        wire_buffer = self.arena.write(b"a" * 1000)
+        for i in range(3):
+            self.arena.write(b"b" * 1000)
+        self.assertTrue(wire_buffer.valid())
+        self.arena.write(b"c" * 1000)
+        self.assertFalse(wire_buffer.valid())
+        self.assertRaises(WireBufferOverwritten, wire_buffer.tobytes)
+
+    def test_no_wrap_around(self):
+        """Test that a packet is not split at the end of the ring"""
+        self.arena.write(b"a" * 3000)
+        wire_buffer = self.arena.write(b"b" * 2000)
+        self.assertEqual(0, wire_buffer.position % self.arena.size)
+        self.assertEqual(b"b" * 2000, wire_buffer.tobytes())
+
+    def test_pickle_descriptor_only(self):
+        """Test that pickling a WireBuffer or a content object referencing it does not copy the packet"""
+        wire_buffer = self.arena.write(b"x" * 2000)
+        self.assertLess(len(pickle.dumps(wire_buffer)), 200)
+        content = Content.from_wire_buffer(Name("/test/data"), wire_buffer, 1000, 2000)
+        unpickled = pickle.loads(pickle.dumps(content))
+        self.assertLess(len(pickle.dumps(content)), 500)
+        self.assertEqual(1000, unpickled.payload_size)
+        self.assertEqual(b"x" * 1000, unpickled.payload_view().tobytes())
+        self.assertIsNotNone(unpickled.wire_buffer)  # neither accessor copies the payload out of the arena
+        self.assertEqual(b"x" * 1000, unpickled.get_bytes())
+        self.assertEqual(b"x" * 2000, unpickled.wire_format)
+        self.assertEqual(b"x" * 1000, content.materialized().get_bytes())
+
+    def test_read_from_other_process(self):
+        """Test that another process reads a packet by its descriptor"""
+        wire_buffer = self.arena.write(b"packet data")
+        results = multiprocessing.Queue()
+        p = multiprocessing.Process(target=read_buffer, args=[wire_buffer, results])
+        p.start()
+        self.assertEqual(b"packet data", results.get(timeout=5.0))
+        p.join()
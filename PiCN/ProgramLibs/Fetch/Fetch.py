@@ -21,7 +21,8 @@ class Fetch(object):
     """Fetch Tool for PiCN"""
 
     def __init__(self, ip: str, port: Optional[int], log_level=255, encoder: BasicEncoder = None,
-                 autoconfig: bool = False, interfaces=None, name: str = None):
+                 autoconfig: bool = False, interfaces=None, name: str = None, in_process_stack: bool = False,
+                 use_asyncio: bool = False):
         self.ip = ip
         self.name = name
         # create encoder and chunkifyer
@@ -32,13 +33,17 @@ class Fetch(object):
             self.encoder = encoder
         self.chunkifyer = SimpleContentChunkifyer()
 
-        # initialize layers
-        synced_data_struct_factory = PiCNSyncDataStructFactory()
-        synced_data_struct_factory.register("faceidtable", FaceIDDict)
-        synced_data_struct_factory.register("timeoutprevention_dict", TimeoutPreventionMessageDict)
-        synced_data_struct_factory.create_manager()
-        faceidtable = synced_data_struct_factory.manager.faceidtable()
-        timeoutprevention_dict = synced_data_struct_factory.manager.timeoutprevention_dict()
+        # initialize layers, with an in-process stack no manager process is needed to share the tables
+        if in_process_stack:
+            faceidtable = FaceIDDict()
+            timeoutprevention_dict = TimeoutPreventionMessageDict()
+        else:
+            synced_data_struct_factory = PiCNSyncDataStructFactory()
+            synced_data_struct_factory.register("faceidtable", FaceIDDict)
+            synced_data_struct_factory.register("timeoutprevention_dict", TimeoutPreventionMessageDict)
+            synced_data_struct_factory.create_manager()
+            faceidtable = synced_data_struct_factory.manager.faceidtable()
+            timeoutprevention_dict = synced_data_struct_factory.manager.timeoutprevention_dict()
 
         if interfaces is None:
             interfaces = [UDP4Interface(0)]
@@ -55,7 +60,7 @@ class Fetch(object):
             self.timeoutpreventionlayer,
             self.packetencodinglayer,
             self.linklayer
-        ])
+        ], in_process=in_process_stack, use_asyncio=use_asyncio)
         self.timeoutpreventionlayer.ageing()
         self.autoconfig = autoconfig
         if autoconfig:
@@ -7,7 +7,6 @@ from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder
 from PiCN.Packets import Content, Name, Interest, Nack
 
 import time
-from tabulate import tabulate
 from multiprocessing import Process, Queue, Lock, Manager
 
 from typing import Optional, Dict, List, Tuple, Union
@@ -183,4 +182,5 @@ class FetchSessions(Fetch):
     def __repr__(self):
         headers = ['Target', 'Session ID']
         data = [[k, v] for k, v in self._running_sessions.items()]
+        from tabulate import tabulate  # optional, only needed to print the table
         return f"Running sessions for <<{self.name}>>:\n{tabulate(data, headers=headers, showindex=True, tablefmt='fancy_grid')}"
@@ -8,6 +8,7 @@ import unittest
 
 from PiCN.ProgramLibs.Fetch import Fetch
 from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
+from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
 
 from PiCN.Mgmt import MgmtClient
 from PiCN.Packets import Name, NackReason
@@ -93,6 +94,20 @@ class cases_Fetch(object):
         content = self.fetch.fetch_data(Name("/test/data/f3"))
         self.assertEqual(content, self.data3)
 
+    def test_fetch_large_data_in_process(self):
+        """Test fetching a large data object with all layers of the fetch tool in a single process"""
+        self.fetch.stop_fetch()
+        self.fetch = Fetch("127.0.0.1", self.forwarder_port, encoder=self.get_encoder(), in_process_stack=True)
+        self.assertIsNone(self.fetch.linklayer.process)
+        self.assertIsInstance(self.fetch.linklayer.faceidtable, FaceIDDict)
+        self.ICNRepo.start_repo()
+        self.forwarder.start_forwarder()
+        time.sleep(0.1)
+        self.add_face_and_forwadingrule()
+
+        content = self.fetch.fetch_data(Name("/test/data/f3"))
+        self.assertEqual(content, self.data3)
+
     def test_fetching_content_from_second_repo_after_nack(self):
         """Test sending an interest to forwarder with no matching content, choose second route to fetch content"""
         self.forwarder2: ICNForwarder = ICNForwarder(0,  encoder=self.get_encoder(), log_level=255)
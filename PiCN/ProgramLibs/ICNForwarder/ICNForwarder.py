@@ -1,8 +1,13 @@
 """A ICN Forwarder using PiCN"""
 
+import copy
+import os
+
 from PiCN.LayerStack.LayerStack import LayerStack
-from PiCN.Layers.ICNLayer import BasicICNLayer
+from PiCN.Layers.ICNLayer import BasicICNLayer, ShardedICNLayer, PartitionedTable, ReplicatedTable
+from PiCN.Layers.ICNLayer.CachingDecision import BaseCachingDecision
 from PiCN.Layers.ICNLayer.ForwardingInformationBase import ForwardingInformationBaseMemoryPrefix
+from PiCN.Layers.ICNLayer.ForwardingStrategy import StrategyChoiceTable
 from PiCN.Layers.ICNLayer.PendingInterestTable import PendingInterestTableMemoryExact
 from PiCN.Layers.RoutingLayer import BasicRoutingLayer
 from PiCN.Layers.RoutingLayer.RoutingInformationBase import TreeRoutingInformationBase
@@ -10,9 +15,10 @@ from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
 
 from PiCN.Layers.AutoconfigLayer import AutoconfigServerLayer
 
-from PiCN.Processes import PiCNSyncDataStructFactory
+from PiCN.Processes import PiCNSyncDataStructFactory, TableChannel, WireBufferArena
 
-from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact
+from PiCN.Layers.ICNLayer.ContentStore import ContentStoreMemoryExact, ContentStoreTieredExact
+from PiCN.Layers.ICNLayer.ContentStore.ReplacementPolicy import BaseReplacementPolicy
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo, BaseInterface
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
@@ -30,7 +36,11 @@ class ICNForwarder(object):
 
     def __init__(self, port=9000, log_level=255, encoder: BasicEncoder = None, routing: bool = False, peers=None,
                  autoconfig: bool = False, interfaces: List[BaseInterface] = None, ageing_interval: int = 3,
-                 node_name: str = None):
+                 node_name: str = None, in_process_stack: bool = False, use_asyncio: bool = False,
+                 batch_size: int = 1, local_tables: bool = False, wire_buffers: bool = False, icn_workers: int = 1,
+                 queue_capacity: int = 0, cs_max_entries: int = 0, cs_max_bytes: int = 0,
+                 cs_policy: BaseReplacementPolicy = None, cs_db_path: str = None, cs_cold_timeout: int = 3600,
+                 strategy_choice: StrategyChoiceTable = None, caching_decision: BaseCachingDecision = None):
         # debug level
         logger = Logger("ICNForwarder", log_level)  # FIXME: Why isn't this self.logger???
         self._node_name = node_name
@@ -41,25 +51,57 @@ class ICNForwarder(object):
             encoder.set_log_level(log_level=log_level)
             self.encoder = encoder
 
+        # with several ICN workers, each worker owns the PIT and CS entries of its names and a replica of the FIB
+        self.icn_workers = icn_workers
+        if icn_workers > 1:
+            local_tables = True
+
         # setup data structures
         synced_data_struct_factory = PiCNSyncDataStructFactory()
-        synced_data_struct_factory.register("cs", ContentStoreMemoryExact)
+        # with a database path, the in-memory CS is the hot tier of a CS keeping the remaining content on disk
+        cs_class = ContentStoreTieredExact if cs_db_path is not None else ContentStoreMemoryExact
+        synced_data_struct_factory.register("cs", cs_class)
         synced_data_struct_factory.register(
             "fib", ForwardingInformationBaseMemoryPrefix)
         synced_data_struct_factory.register(
             "pit", PendingInterestTableMemoryExact)
         synced_data_struct_factory.register("rib", TreeRoutingInformationBase)
         synced_data_struct_factory.register("faceidtable", FaceIDDict)
-        synced_data_struct_factory.create_manager()
-
-        cs = synced_data_struct_factory.manager.cs()
-        fib = synced_data_struct_factory.manager.fib()
-        pit = synced_data_struct_factory.manager.pit()
+        if not local_tables or routing:
+            synced_data_struct_factory.create_manager()
+
+        # with local tables, the ICN layer owns CS, PIT and FIB and the link layer owns the faceidtable. Other
+        # processes access them through table channels served by the owning layers.
+        self._local_tables = local_tables
+        self._in_process_stack = in_process_stack
+        self.icn_table_channel: TableChannel = None
+        self.link_table_channel: TableChannel = None
+        # the CS capacity is split between the workers, each worker caches the content of its names
+        cs_capacity = {"max_entries": -(-cs_max_entries // icn_workers), "max_bytes": -(-cs_max_bytes // icn_workers)}
+
+        def cs_args(worker: int) -> dict:
+            """arguments of the CS of a worker, each worker stores its cold tier in its own directory"""
+            if cs_db_path is None:
+                return cs_capacity
+            return dict(cs_capacity, db_path=os.path.join(cs_db_path, str(worker)) if icn_workers > 1 else cs_db_path,
+                        cold_timeout=cs_cold_timeout)
+
+        if local_tables:
+            cs = cs_class(policy=copy.deepcopy(cs_policy), **cs_args(0))
+            fib = ForwardingInformationBaseMemoryPrefix()
+            pit = PendingInterestTableMemoryExact()
+            faceidtable = FaceIDDict()
+            self.icn_table_channel = TableChannel()
+            self.link_table_channel = TableChannel()
+        else:
+            cs = synced_data_struct_factory.manager.cs(policy=cs_policy, **cs_args(0))
+            fib = synced_data_struct_factory.manager.fib()
+            pit = synced_data_struct_factory.manager.pit()
+            faceidtable = synced_data_struct_factory.manager.faceidtable()
 
         rib = None
         if routing:
             rib = synced_data_struct_factory.manager.rib()
-        faceidtable = synced_data_struct_factory.manager.faceidtable()
 
         # default interface
         if interfaces is not None:
@@ -69,19 +111,27 @@ class ICNForwarder(object):
             interfaces = [UDP4Interface(port)]
             mgmt_port = interfaces[0].get_port()
 
+        # with wire buffers, large packets are passed between the layers as descriptors into a shared-memory arena
+        self.wire_arena: WireBufferArena = WireBufferArena() if wire_buffers else None
+
         # initialize layers
         self.linklayer = BasicLinkLayer(
-            interfaces, faceidtable, log_level=log_level)
+            interfaces, faceidtable, log_level=log_level, wire_arena=self.wire_arena)
         self.packetencodinglayer = BasicPacketEncodingLayer(
             self.encoder, log_level=log_level)
-        self.icnlayer = BasicICNLayer(
-            log_level=log_level, ageing_interval=ageing_interval)
+        if icn_workers > 1:
+            self.icnlayer = ShardedICNLayer([BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+                                             for _ in range(icn_workers)], log_level=log_level)
+        else:
+            self.icnlayer = BasicICNLayer(
+                log_level=log_level, ageing_interval=ageing_interval)
 
         self.lstack: LayerStack = LayerStack([
             self.icnlayer,
             self.packetencodinglayer,
             self.linklayer
-        ])
+        ], in_process=in_process_stack, use_asyncio=use_asyncio,
+           batch_size=batch_size, queue_capacity=queue_capacity)
 
         if autoconfig:
             self.autoconfiglayer: AutoconfigServerLayer = AutoconfigServerLayer(linklayer=self.linklayer,
@@ -97,31 +147,66 @@ class ICNForwarder(object):
                 self.linklayer, peers=peers, log_level=log_level)
             self.lstack.insert(self.routinglayer, below_of=self.icnlayer)
 
-        self.icnlayer.cs = cs
-        self.icnlayer.fib = fib
-        # ----- by Luc # FIXME: How to pass these parameters to __init__
-        self.icnlayer.fib.logger = logger
-        self.icnlayer.fib.node_name = self._node_name
-        # ----- by Luc # FIXME: How to pass these parameters to __init__
-        self.icnlayer.pit = pit
-        self.icnlayer.pit.logger = logger
-        self.icnlayer.pit.node_name = self._node_name
-        # -----
-
+        icn_layers = self.icnlayer.workers if icn_workers > 1 else [self.icnlayer]
+        self.icn_table_channels = [self.icn_table_channel] if local_tables else []
+        for i, icnlayer in enumerate(icn_layers):
+            if i > 0:
+                cs = cs_class(policy=copy.deepcopy(cs_policy), **cs_args(i))
+                fib = ForwardingInformationBaseMemoryPrefix()
+                pit = PendingInterestTableMemoryExact()
+                self.icn_table_channels.append(TableChannel())
+            icnlayer.cs = cs
+            icnlayer.fib = fib
+            # ----- by Luc # FIXME: How to pass these parameters to __init__
+            icnlayer.fib.logger = logger
+            icnlayer.fib.node_name = self._node_name
+            # ----- by Luc # FIXME: How to pass these parameters to __init__
+            icnlayer.pit = pit
+            icnlayer.pit.logger = logger
+            icnlayer.pit.node_name = self._node_name
+            # -----
+            # each worker measures the next hops of the Interests it forwards with its own strategies
+            if strategy_choice is not None:
+                icnlayer.strategy_choice = copy.deepcopy(strategy_choice)
+            # the workers share the counters of the caching decision
+            if caching_decision is not None:
+                icnlayer.caching_decision = caching_decision
+            if local_tables:
+                self.icn_table_channels[i].attach(icnlayer, {"cs": cs, "fib": fib, "pit": pit})
+            # ageing runs on the timer wheel of the execution loop, between handling packets
+            icnlayer.periodic_in_loop = True
+
+        # tables as seen by other processes
+        self.cs, self.fib, self.pit, self.faceidtable = cs, fib, pit, faceidtable
+        if local_tables:
+            self.link_table_channel.attach(self.linklayer, {"faceidtable": faceidtable})
+            self.cs = self.icn_table_channel.client("cs")
+            self.fib = self.icn_table_channel.client("fib")
+            self.pit = self.icn_table_channel.client("pit")
+            self.faceidtable = self.link_table_channel.client("faceidtable")
+        if icn_workers > 1:
+            self.cs = PartitionedTable([channel.client("cs") for channel in self.icn_table_channels])
+            self.pit = PartitionedTable([channel.client("pit") for channel in self.icn_table_channels])
+            self.fib = ReplicatedTable([channel.client("fib") for channel in self.icn_table_channels])
+
+        # layers driven by the same thread as the owner must not wait for it
+        stack_fib = fib if in_process_stack else self.fib
+        stack_pit = pit if in_process_stack else self.pit
+        # faces removed by the link layer are removed from PIT and FIB
+        self.linklayer.pit, self.linklayer.fib = stack_pit, stack_fib
         if autoconfig:
-            self.autoconfiglayer.fib = fib
+            self.autoconfiglayer.fib = stack_fib
         if routing:
             self.routinglayer.rib = rib
-            self.routinglayer.fib = fib
+            self.routinglayer.fib = stack_fib
 
         # mgmt
-        self.mgmt = Mgmt(cs, fib, pit, self.linklayer, mgmt_port, self.stop_forwarder,
-                         log_level=log_level)
+        self.mgmt = Mgmt(self.cs, self.fib, self.pit, self.linklayer, mgmt_port, self.stop_forwarder,
+                         log_level=log_level, faceidtable=self.faceidtable, lstack=self.lstack)
 
     def start_forwarder(self):
         # start processes
         self.lstack.start_all()
-        self.icnlayer.ageing()
         self.mgmt.start_process()
 
     def stop_forwarder(self):
@@ -131,3 +216,9 @@ class ICNForwarder(object):
         if self.mgmt.process:
             self.mgmt.stop_process()
         self.lstack.close_all()
+        if self._local_tables:
+            for channel in self.icn_table_channels:
+                channel.close()
+            self.link_table_channel.close()
+        if self.wire_arena is not None:
+            self.wire_arena.close()
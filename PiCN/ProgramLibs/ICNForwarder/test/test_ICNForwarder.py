@@ -1,7 +1,9 @@
 """Test the ICN Forwarder"""
 
 import abc
+import shutil
 import socket
+import tempfile
 import time
 import unittest
 
@@ -9,6 +11,7 @@ from PiCN.Layers.PacketEncodingLayer.Encoder import SimpleStringEncoder, NdnTlvE
 from PiCN.Packets import Content, Interest, Name
 from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
 from PiCN.Layers.LinkLayer.Interfaces import AddressInfo
+from PiCN.Mgmt import MgmtClient
 
 class cases_ICNForwarder(object):
     """Test the ICN Forwarder"""
@@ -120,6 +123,139 @@ class cases_ICNForwarder(object):
         time.sleep(2)
         self.assertEqual(self.forwarder1.icnlayer.pit.get_container_size(), 0)
 
+    def test_ICNForwarder_local_tables_two_nodes(self):
+        """Test forwarding with tables owned by the layers, accessed through table clients"""
+        self.forwarder1.stop_forwarder()
+        self.forwarder2.stop_forwarder()
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, local_tables=True)
+        self.forwarder2 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, local_tables=True)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder2_port = self.forwarder2.linklayer.interfaces[0].get_port()
+        self.forwarder1.start_forwarder()
+        self.forwarder2.start_forwarder()
+
+        fid = self.forwarder1.faceidtable.get_or_create_faceid(AddressInfo(("127.0.0.1", self.forwarder2_port), 0))
+        self.forwarder1.fib.add_fib_entry(Name("/test"), [fid], True)
+        test_content = Content("/test/data/object", "HelloWorld")
+        self.forwarder2.cs.add_content_object(test_content, static=True)
+        self.assertEqual(self.forwarder2.cs.find_content_object(test_content.name).content.content, "HelloWorld")
+
+        self.testSock.sendto(self.encoder.encode(Interest("/test/data/object")), ("127.0.0.1", self.forwarder1_port))
+        encoded_content, addr = self.testSock.recvfrom(8192)
+        content = self.encoder.decode(encoded_content)
+        self.assertEqual(test_content.name, content.name)
+        self.assertEqual("HelloWorld", content.content)
+        self.assertEqual(self.forwarder1.pit.get_container_size(), 0)
+        self.assertEqual(1, len(self.forwarder1.cs.snapshot().container))
+
+    def test_ICNForwarder_wire_buffers_two_nodes(self):
+        """Test forwarding a large content object that is passed between the layers in a wire buffer arena"""
+        self.forwarder1.stop_forwarder()
+        self.forwarder2.stop_forwarder()
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, local_tables=True,
+                                       wire_buffers=True)
+        self.forwarder2 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, local_tables=True)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder2_port = self.forwarder2.linklayer.interfaces[0].get_port()
+        self.forwarder1.start_forwarder()
+        self.forwarder2.start_forwarder()
+
+        fid = self.forwarder1.faceidtable.get_or_create_faceid(AddressInfo(("127.0.0.1", self.forwarder2_port), 0))
+        self.forwarder1.fib.add_fib_entry(Name("/test"), [fid], True)
+        payload = "x" * 6000
+        self.forwarder2.cs.add_content_object(Content("/test/data/object", payload), static=True)
+
+        self.testSock.sendto(self.encoder.encode(Interest("/test/data/object")), ("127.0.0.1", self.forwarder1_port))
+        encoded_content, addr = self.testSock.recvfrom(8192)
+        content = self.encoder.decode(encoded_content)
+        self.assertEqual(Name("/test/data/object"), content.name)
+        self.assertEqual(payload, content.content)
+        cached = self.forwarder1.cs.find_content_object(Name("/test/data/object")).content
+        self.assertIsNone(cached.wire_buffer)
+        self.assertEqual(payload, cached.content)
+
+    def test_ICNForwarder_sharded_two_nodes(self):
+        """Test forwarding with the ICN layer sharded over several workers"""
+        self.forwarder1.stop_forwarder()
+        self.forwarder2.stop_forwarder()
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, icn_workers=3)
+        self.forwarder2 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, icn_workers=2)
+        self.assertEqual(3, self.forwarder1.icn_workers)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder2_port = self.forwarder2.linklayer.interfaces[0].get_port()
+        self.forwarder1.start_forwarder()
+        self.forwarder2.start_forwarder()
+
+        fid = self.forwarder1.faceidtable.get_or_create_faceid(AddressInfo(("127.0.0.1", self.forwarder2_port), 0))
+        self.forwarder1.fib.add_fib_entry(Name("/test"), [fid], True)
+        names = [Name("/test/data/" + str(i)) for i in range(6)]
+        for name in names:
+            self.forwarder2.cs.add_content_object(Content(name, "data" + name.components_to_string()), static=True)
+        self.assertEqual(6, self.forwarder2.cs.get_container_size())
+
+        for name in names:
+            self.testSock.sendto(self.encoder.encode(Interest(name)), ("127.0.0.1", self.forwarder1_port))
+            encoded_content, addr = self.testSock.recvfrom(8192)
+            content = self.encoder.decode(encoded_content)
+            self.assertEqual(name, content.name)
+            self.assertEqual("data" + name.components_to_string(), content.content)
+        self.assertEqual(0, self.forwarder1.pit.get_container_size())
+        self.assertEqual(6, self.forwarder1.cs.get_container_size())
+        self.assertEqual(3, len(self.forwarder1.cs.snapshot()))
+
+    def test_ICNForwarder_bounded_queues(self):
+        """Test forwarding with bounded queues between the layers and reading their counters"""
+        self.forwarder1.stop_forwarder()
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, queue_capacity=16)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder1.start_forwarder()
+        self.forwarder1.cs.add_content_object(Content("/test/data/object", "HelloWorld"), static=True)
+
+        self.testSock.sendto(self.encoder.encode(Interest("/test/data/object")), ("127.0.0.1", self.forwarder1_port))
+        encoded_content, addr = self.testSock.recvfrom(8192)
+        self.assertEqual("HelloWorld", self.encoder.decode(encoded_content).content)
+
+        stats = MgmtClient(self.forwarder1_port).get_queue_stats().split("\n")
+        self.assertEqual(4, len(stats))
+        self.assertTrue(stats[0].startswith("BasicICNLayer->BasicPacketEncodingLayer depth="))
+        self.assertIn("capacity=16", stats[0])
+        self.assertIn("dropped=0", stats[0])
+
+    def test_ICNForwarder_cs_capacity(self):
+        """Test answering repeated Interests from a capacity-bounded CS"""
+        self.forwarder1.stop_forwarder()
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, cs_max_entries=2)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder1.start_forwarder()
+        for i in range(3):
+            self.forwarder1.cs.add_content_object(Content("/test/data/" + str(i), "HelloWorld" + str(i)))
+        self.assertEqual(2, self.forwarder1.cs.get_container_size())
+
+        for _ in range(3):  # each hit refreshes the entry
+            self.testSock.sendto(self.encoder.encode(Interest("/test/data/2")), ("127.0.0.1", self.forwarder1_port))
+            encoded_content, addr = self.testSock.recvfrom(8192)
+            self.assertEqual("HelloWorld2", self.encoder.decode(encoded_content).content)
+        self.assertEqual(1, self.forwarder1.cs.get_stats()["evictions"])
+
+    def test_ICNForwarder_cs_tiered(self):
+        """Test answering Interests from the disk tier of the CS"""
+        self.forwarder1.stop_forwarder()
+        db_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, db_path, True)
+        self.forwarder1 = ICNForwarder(0, encoder=self.get_encoder(), log_level=255, cs_max_entries=1,
+                                       cs_db_path=db_path)
+        self.forwarder1_port = self.forwarder1.linklayer.interfaces[0].get_port()
+        self.forwarder1.start_forwarder()
+        for i in range(3):
+            self.forwarder1.cs.add_content_object(Content("/test/data/" + str(i), "HelloWorld" + str(i)))
+        self.assertEqual(3, self.forwarder1.cs.get_container_size())
+
+        self.testSock.sendto(self.encoder.encode(Interest("/test/data/0")), ("127.0.0.1", self.forwarder1_port))
+        encoded_content, addr = self.testSock.recvfrom(8192)
+        self.assertEqual("HelloWorld0", self.encoder.decode(encoded_content).content)
+        stats = self.forwarder1.cs.get_stats()
+        self.assertEqual(1, stats["cold_hits"])
+        self.assertEqual(1, stats["hot_entries"])
 
 
 class test_ICNForwarder_SimplePacketEncoder(cases_ICNForwarder, unittest.TestCase):
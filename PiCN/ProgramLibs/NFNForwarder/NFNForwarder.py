@@ -7,7 +7,7 @@ from typing import List
 from PiCN.LayerStack import LayerStack
 from PiCN.Layers.NFNLayer import BasicNFNLayer
 from PiCN.Layers.ChunkLayer import BasicChunkLayer
-from PiCN.Layers.ICNLayer import BasicICNLayer
+from PiCN.Layers.ICNLayer import BasicICNLayer, SharedNameIndex, ShardedICNLayer, PartitionedTable, ReplicatedTable
 from PiCN.Layers.PacketEncodingLayer import BasicPacketEncodingLayer
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 
@@ -24,7 +24,7 @@ from PiCN.Layers.NFNLayer.Parser import DefaultNFNParser
 from PiCN.Layers.ThunkLayer import BasicThunkLayer
 from PiCN.Logger import Logger
 from PiCN.Mgmt import Mgmt
-from PiCN.Processes import PiCNSyncDataStructFactory
+from PiCN.Processes import PiCNSyncDataStructFactory, TableChannel, WireBufferArena
 from PiCN.Layers.LinkLayer import BasicLinkLayer
 from PiCN.Layers.LinkLayer.Interfaces import UDP4Interface, AddressInfo, BaseInterface
 from PiCN.Layers.LinkLayer.FaceIDTable import FaceIDDict
@@ -36,7 +36,10 @@ class NFNForwarder(object):
     """NFN Forwarder for PICN"""
     # TODO add chunking layer
     def __init__(self, port=9000, log_level=255, encoder: BasicEncoder=None, interfaces: List[BaseInterface]=None,
-                 executors: BaseNFNExecutor = None, ageing_interval: int = 3, use_thunks=False):
+                 executors: BaseNFNExecutor = None, ageing_interval: int = 3, use_thunks=False,
+                 in_process_stack: bool = False, use_asyncio: bool = False, batch_size: int = 1,
+                 local_tables: bool = False, name_index: bool = False, wire_buffers: bool = False,
+                 icn_workers: int = 1, queue_capacity: int = 0):
         # debug level
         logger = Logger("NFNForwarder", log_level)
         logger.info("Start PiCN NFN Forwarder on port " + str(port))
@@ -48,6 +51,13 @@ class NFNForwarder(object):
             encoder.set_log_level(log_level)
             self.encoder = encoder
 
+        # with several ICN workers, each worker owns the PIT and CS entries of its names and a replica of the FIB
+        self.icn_workers = icn_workers
+        if icn_workers > 1:
+            if name_index:
+                raise ValueError("The name index is published by a single ICN worker")
+            local_tables = True
+
        # setup data structures
         synced_data_struct_factory = PiCNSyncDataStructFactory()
         synced_data_struct_factory.register("cs", ContentStoreMemoryExact)
@@ -63,10 +73,39 @@ class NFNForwarder(object):
 
         synced_data_struct_factory.create_manager()
 
-        cs = synced_data_struct_factory.manager.cs()
-        fib = synced_data_struct_factory.manager.fib()
-        pit = synced_data_struct_factory.manager.pit()
-        faceidtable = synced_data_struct_factory.manager.faceidtable()
+        # with local tables, the ICN layer owns CS, PIT and FIB and the link layer owns the faceidtable. Other
+        # processes access them through table channels served by the owning layers.
+        self._local_tables = local_tables
+        self._in_process_stack = in_process_stack
+        self.icn_table_channel: TableChannel = None
+        self.link_table_channel: TableChannel = None
+        if local_tables:
+            cs = ContentStoreMemoryExact()
+            fib = ForwardingInformationBaseMemoryPrefix()
+            pit = PendingInterestTableMemoryExact()
+            faceidtable = FaceIDDict()
+            self.icn_table_channel = TableChannel()
+            self.link_table_channel = TableChannel()
+            self.cs = self.icn_table_channel.client("cs")
+            self.fib = self.icn_table_channel.client("fib")
+            self.pit = self.icn_table_channel.client("pit")
+            self.faceidtable = self.link_table_channel.client("faceidtable")
+            self.icn_table_channels = [self.icn_table_channel] + [TableChannel() for _ in range(icn_workers - 1)]
+            if icn_workers > 1:
+                self.cs = PartitionedTable([channel.client("cs") for channel in self.icn_table_channels])
+                self.pit = PartitionedTable([channel.client("pit") for channel in self.icn_table_channels])
+                self.fib = ReplicatedTable([channel.client("fib") for channel in self.icn_table_channels])
+        else:
+            cs = synced_data_struct_factory.manager.cs()
+            fib = synced_data_struct_factory.manager.fib()
+            pit = synced_data_struct_factory.manager.pit()
+            faceidtable = synced_data_struct_factory.manager.faceidtable()
+            self.cs, self.fib, self.pit, self.faceidtable = cs, fib, pit, faceidtable
+        # layers driven by the same thread as the owning layers must not wait for them
+        if in_process_stack:
+            stack_cs, stack_fib, stack_pit, stack_faceidtable = cs, fib, pit, faceidtable
+        else:
+            stack_cs, stack_fib, stack_pit, stack_faceidtable = self.cs, self.fib, self.pit, self.faceidtable
 
         self.parser = DefaultNFNParser()
         if use_thunks:
@@ -85,26 +124,39 @@ class NFNForwarder(object):
             mgmt_port = interfaces[0].get_port()
 
         # initialize layers
-        self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level)
+        # with wire buffers, large packets are passed between the layers as descriptors into a shared-memory arena
+        self.wire_arena: WireBufferArena = WireBufferArena() if wire_buffers else None
+        self.linklayer = BasicLinkLayer(interfaces, faceidtable, log_level=log_level, wire_arena=self.wire_arena)
+        # faces removed by the link layer are removed from PIT and FIB
+        self.linklayer.pit, self.linklayer.fib = stack_pit, stack_fib
         self.packetencodinglayer = BasicPacketEncodingLayer(self.encoder, log_level=log_level)
-        self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+        if icn_workers > 1:
+            self.icnlayer = ShardedICNLayer([BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+                                             for _ in range(icn_workers)], log_level=log_level)
+        else:
+            self.icnlayer = BasicICNLayer(log_level=log_level, ageing_interval=ageing_interval)
+        icn_layers = self.icnlayer.workers if icn_workers > 1 else [self.icnlayer]
         self.chunklayer = BasicChunkLayer(self.chunkifier, log_level=log_level)
 
         # setup nfn
-        self.icnlayer._interest_to_app = True
+        for icnlayer in icn_layers:
+            icnlayer._interest_to_app = True
         if executors is None:
             self.executors = {"PYTHON": NFNPythonExecutor()}
         else:
             self.executors = executors
         self.r2cclient = TimeoutR2CHandler()
         comp_table = synced_data_struct_factory.manager.computation_table(self.r2cclient, self.parser)
-        self.nfnlayer = BasicNFNLayer(cs, fib, pit, faceidtable, comp_table, self.executors, self.parser, self.r2cclient, log_level=log_level)
+        self.nfnlayer = BasicNFNLayer(stack_cs, stack_fib, stack_pit, stack_faceidtable, comp_table, self.executors, self.parser, self.r2cclient, log_level=log_level)
         if use_thunks:
-            self.thunk_layer = BasicThunkLayer(cs, fib, pit, faceidtable, thunktable, plantable, self.parser, log_level=log_level)
-            self.nfnlayer.optimizer = ThunkPlanExecutor(cs, fib, pit, faceidtable, plantable)
+            self.thunk_layer = BasicThunkLayer(stack_cs, stack_fib, stack_pit, stack_faceidtable, thunktable, plantable,
+                                               self.parser, log_level=log_level)
+            self.nfnlayer.optimizer = ThunkPlanExecutor(stack_cs, stack_fib, stack_pit, stack_faceidtable, plantable)
 
         timeoutprevention_dict = synced_data_struct_factory.manager.timeoutprevention_dict()
-        self.timeoutpreventionlayer = BasicTimeoutPreventionLayer(timeoutprevention_dict, comp_table, pit=pit, log_level=log_level)
+        self.timeoutpreventionlayer = BasicTimeoutPreventionLayer(timeoutprevention_dict, comp_table, pit=stack_pit,
+                                                                  log_level=log_level)
+        self.timeoutpreventionlayer.periodic_in_loop = True
 
         if use_thunks:
             self.lstack: LayerStack = LayerStack([
@@ -115,7 +167,8 @@ class NFNForwarder(object):
                 self.icnlayer,
                 self.packetencodinglayer,
                 self.linklayer
-            ])
+            ], in_process=in_process_stack, use_asyncio=use_asyncio,
+               batch_size=batch_size, queue_capacity=queue_capacity)
         else:
             self.lstack: LayerStack = LayerStack([
                 self.nfnlayer,
@@ -124,22 +177,39 @@ class NFNForwarder(object):
                 self.icnlayer,
                 self.packetencodinglayer,
                 self.linklayer
-            ])
-
-        self.icnlayer.cs = cs
-        self.icnlayer.fib = fib
-        self.icnlayer.pit = pit
+            ], in_process=in_process_stack, use_asyncio=use_asyncio,
+               batch_size=batch_size, queue_capacity=queue_capacity)
+
+        for i, icnlayer in enumerate(icn_layers):
+            if i > 0:
+                cs = ContentStoreMemoryExact()
+                fib = ForwardingInformationBaseMemoryPrefix()
+                pit = PendingInterestTableMemoryExact()
+            icnlayer.cs = cs
+            icnlayer.fib = fib
+            icnlayer.pit = pit
+            if local_tables:
+                self.icn_table_channels[i].attach(icnlayer, {"cs": cs, "fib": fib, "pit": pit})
+            # ageing runs on the timer wheel of the execution loop, between handling packets
+            icnlayer.periodic_in_loop = True
+        if local_tables:
+            self.link_table_channel.attach(self.linklayer, {"faceidtable": faceidtable})
+
+        # the ICN layer publishes FIB prefixes and CS names for the optimizers
+        self.name_index: SharedNameIndex = None
+        if name_index:
+            self.name_index = SharedNameIndex()
+            self.icnlayer.name_index = self.name_index
+            self.nfnlayer.name_index = self.name_index
 
         # mgmt
-        self.mgmt = Mgmt(self.icnlayer.cs, self.icnlayer.fib, self.icnlayer.pit, self.linklayer,
+        self.mgmt = Mgmt(self.cs, self.fib, self.pit, self.linklayer,
                          mgmt_port, self.stop_forwarder,
-                         log_level=log_level)
+                         log_level=log_level, faceidtable=self.faceidtable, lstack=self.lstack)
 
     def start_forwarder(self):
         # start processes
         self.lstack.start_all()
-        self.icnlayer.ageing()
-        self.timeoutpreventionlayer.ageing()
         self.mgmt.start_process()
 
     def stop_forwarder(self):
@@ -149,3 +219,11 @@ class NFNForwarder(object):
         if self.mgmt.process:
             self.mgmt.stop_process()
         self.lstack.close_all()
+        if self._local_tables:
+            for channel in self.icn_table_channels:
+                channel.close()
+            self.link_table_channel.close()
+        if self.name_index is not None:
+            self.name_index.close()
+        if self.wire_arena is not None:
+            self.wire_arena.close()
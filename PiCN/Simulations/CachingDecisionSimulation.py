@@ -0,0 +1,110 @@
+"""Compare the network-wide hit ratios of the caching decisions on a chain of forwarders with small content stores.
+
+A client requests content objects of a repository with Zipf distributed popularity. The network-wide hit ratio is
+the share of the Interests answered from the CS of a forwarder instead of the repository; each Interest is answered at
+most once, so it is the sum of the CS hits of all forwarders divided by the number of CS lookups of the first one
+(the requests and retransmissions of the client).
+
+Client <--------> Fwd1 <--------> Fwd2 <--------> Fwd3 <--------> Repo
+"""
+
+import abc
+import random
+import unittest
+
+from PiCN.Layers.ICNLayer.CachingDecision import BaseCachingDecision, HopCountCaching, LeaveCopyDown, \
+    LeaveCopyEverywhere, ProbCache
+from PiCN.Layers.LinkLayer.Interfaces import SimulationBus
+from PiCN.Layers.PacketEncodingLayer.Encoder import BasicEncoder, SimpleStringEncoder
+from PiCN.Mgmt import MgmtClient
+from PiCN.Packets import Name
+from PiCN.ProgramLibs.Fetch import Fetch
+from PiCN.ProgramLibs.ICNDataRepository import ICNDataRepository
+from PiCN.ProgramLibs.ICNForwarder import ICNForwarder
+
+
+class CachingDecisionSimulation(unittest.TestCase):
+    """Compare the network-wide hit ratios of the caching decisions"""
+
+    forwarders = 3
+    cs_max_entries = 3
+    objects = 20
+    requests = 200
+    zipf_alpha = 0.8
+    seed = 42
+
+    @abc.abstractmethod
+    def get_encoder(self) -> BasicEncoder:
+        return SimpleStringEncoder
+
+    def setUp(self):
+        self.encoder_type = self.get_encoder()
+        self.simulation_bus = SimulationBus(packetencoder=self.encoder_type())
+        self.fetch_tool = Fetch("fwd1", None, 255, self.encoder_type(),
+                                interfaces=[self.simulation_bus.add_interface("fetchtool")])
+        self.repo = ICNDataRepository(None, Name("/repo"), 0, 255, self.encoder_type(), False, False,
+                                      [self.simulation_bus.add_interface("repo")])
+        for i in range(self.objects):
+            self.repo.repo.add_content(Name("/repo/obj" + str(i)), "DATA" + str(i))
+        self.fwds = []
+
+    def tearDown(self):
+        for fwd in self.fwds:
+            fwd.stop_forwarder()
+        self.fetch_tool.stop_fetch()
+        self.repo.stop_repo()
+        self.simulation_bus.stop_process()
+
+    def run_scenario(self, decisions: [BaseCachingDecision]) -> float:
+        """
+        Request the content objects through the chain
+        :param decisions: caching decision of each forwarder, from the client to the repository
+        :return: network-wide hit ratio
+        """
+        for i in range(self.forwarders):
+            fwd = ICNForwarder(port=0, encoder=self.encoder_type(), log_level=255,
+                               interfaces=[self.simulation_bus.add_interface("fwd" + str(i + 1))],
+                               cs_max_entries=self.cs_max_entries, caching_decision=decisions[i])
+            fwd.icnlayer.cs.set_cs_timeout(600)
+            self.fwds.append(fwd)
+            fwd.start_forwarder()
+        self.repo.start_repo()
+        self.simulation_bus.start_process()
+        for i, fwd in enumerate(self.fwds):
+            mgmt_client = MgmtClient(fwd.mgmt.mgmt_sock.getsockname()[1])
+            next_hop = "fwd" + str(i + 2) if i + 1 < self.forwarders else "repo"
+            mgmt_client.add_face(next_hop, None, 0)
+            mgmt_client.add_forwarding_rule(Name("/repo"), [0])
+
+        rand = random.Random(self.seed)
+        weights = [1 / (rank + 1) ** self.zipf_alpha for rank in range(self.objects)]
+        for i in rand.choices(range(self.objects), weights=weights, k=self.requests):
+            res = self.fetch_tool.fetch_data(Name("/repo/obj" + str(i)), timeout=4)
+            self.assertEqual("DATA" + str(i), res)
+
+        stats = [decision.get_stats() for decision in decisions]
+        interests = stats[0]["hits"] + stats[0]["misses"]
+        self.assertGreaterEqual(interests, self.requests)
+        hit_ratio = sum(s["hits"] for s in stats) / interests
+        self.assertLessEqual(hit_ratio, 1.0)
+        print(type(decisions[0]).__name__, "network-wide hit ratio: %.3f," % hit_ratio,
+              "per forwarder:", ", ".join("%.3f" % s["hit_ratio"] for s in stats))
+        return hit_ratio
+
+    def test_leave_copy_everywhere(self):
+        """Every forwarder caches every content object (the default)"""
+        self.run_scenario([LeaveCopyEverywhere() for _ in range(self.forwarders)])
+
+    def test_leave_copy_down(self):
+        """Content objects are cached one hop below the node which served them"""
+        self.run_scenario([LeaveCopyDown() for _ in range(self.forwarders)])
+
+    def test_prob_cache(self):
+        """Content objects are cached with the ProbCache probability"""
+        self.run_scenario([ProbCache(target_window=self.cs_max_entries, seed=self.seed + i)
+                           for i in range(self.forwarders)])
+
+    def test_hop_count_caching(self):
+        """Content objects are cached with a probability growing with their hop count"""
+        self.run_scenario([HopCountCaching(max_hops=self.forwarders, seed=self.seed + i)
+                           for i in range(self.forwarders)])
@@ -28,7 +28,7 @@ config_PiCN = {
                  'PiCN.ProgramLibs.ICNDataRepository', 'PiCN.Layers.NFNLayer', 'PiCN.Layers.NFNLayer.Parser',
                  'PiCN.Layers.NFNLayer.NFNOptimizer', 'PiCN.Layers.NFNLayer.NFNExecutor', 'PiCN.Layers.TimeoutPreventionLayer',
                  'PiCN.Layers.ThunkLayer', 'PiCN.Layers.ThunkLayer.ThunkTable',
-                 'PiCN.ProgramLibs.NFNForwarder', 'PiCN.Simulations'],
+                 'PiCN.ProgramLibs.NFNForwarder', 'PiCN.Simulations', 'PiCN.Benchmarks'],
     'scripts': [],
     'test_suite': 'nose2.collector.collector',
     'tests_require': ['nose2', 'rednose', 'nose-progressive', 'numpy', 'cv'],